@@ -3,13 +3,21 @@ from nltk.tokenize import word_tokenize
 from nltk.stem import WordNetLemmatizer
 from nltk.tag import pos_tag
 import os
-import codecs
+import hashlib
+import json
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 import operator
 import enchant
 from nltk.metrics import edit_distance
 import csv
 
+from utils.text_io import read_text
+
+CACHE_DIR = '.vocablevel_cache'
+FILE_CACHE_DIR = os.path.join(CACHE_DIR, 'files-v2')  # per-file raw type counts, keyed by content hash (v2: encoding sniffed, no longer latin-1)
+NORMALIZED_CACHE_PATH = os.path.join(CACHE_DIR, 'normalized.json')  # raw type -> lemma (or null)
+
 # Gerekli NLTK verilerini kontrol et ve indir
 for resource in ['punkt', 'averaged_perceptron_tagger', 'wordnet', 'punkt_tab']:
     try:
@@ -29,82 +37,148 @@ class SpellCorrection(object):
             return suggestions[0]
         else:
             return None
-        
+
 ### To Do: we can consider words with different POS as different words
 ### To Do: we can check whether the user really knows the answer or not (for example by multiple choices questions)
-        
-if os.path.exists('word_list.csv'):
-    with open('word_list.csv', 'r') as f:
-        csv_in = csv.reader(f)
-        sorted_words = [row for row in csv_in]
-else:
+
+def file_hash(path):
+    """SHA-1 of the file contents; identical files share one cache entry"""
+    h = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+def count_raw_types(path):
+    """Count non-proper-noun tokens of one subtitle file (runs in worker processes)"""
+    tagged_sent = pos_tag(word_tokenize(read_text(path)))
+    return Counter(word for word, pos in tagged_sent if pos != 'NNP')
+
+def load_file_counts(paths, workers=None):
+    """Raw type counts per file; only files whose content hash is not cached are tokenized"""
+    os.makedirs(FILE_CACHE_DIR, exist_ok=True)
+    total = Counter()
+    missing = {}  # digest -> every uncached path with that content
+    for path in paths:
+        digest = file_hash(path)
+        cache_path = os.path.join(FILE_CACHE_DIR, digest + '.json')
+        if os.path.exists(cache_path):
+            with open(cache_path, 'r') as f:
+                total.update(json.load(f))
+        else:
+            missing.setdefault(digest, []).append(path)
+
+    if missing:
+        print("%d / %d files need tokenizing" % (len(missing), len(paths)))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # Tokenize one path per digest, but count it once per path like cached files
+            first_paths = [group[0] for group in missing.values()]
+            for (digest, group), counts in zip(missing.items(), pool.map(count_raw_types, first_paths, chunksize=4)):
+                with open(os.path.join(FILE_CACHE_DIR, digest + '.json'), 'w') as f:
+                    json.dump(counts, f)
+                for _ in group:
+                    total.update(counts)
+    return total
+
+_replacer = None
+_lemmatizer = None
+
+def normalize_type(w):
+    """Spell-correct, lower-case and lemmatize one word type; None if it should be dropped"""
+    global _replacer, _lemmatizer
+    if _replacer is None:
+        _replacer = SpellCorrection()
+        _lemmatizer = WordNetLemmatizer()
+    modif_word = _replacer.replace(w)
+    if not (modif_word and str.isalpha(modif_word)):
+        return None
+    mw = modif_word.lower()
+    # Lemmatize as 'verb' and 'noun' and hold whichever that makes the word different
+    # (Need more investigation for adjectives and adverbs. Better to use the real POS of the word)
+    mwv = _lemmatizer.lemmatize(mw, pos='v') # verb lemma
+    if mwv != mw:
+        return mwv
+    return _lemmatizer.lemmatize(mw) # noun lemma
+
+def build_word_list(subtitles_dir='Subtitles/', workers=None):
     # extract words
     # a. Remove proper nouns
     # b. Keep only alphabetic words
     # c. Correct misspellings
     # d. Lemmatize words
     # e. Lower-case words
-    words = []
-    if not os.path.exists('Subtitles'):
-        print("Hata: 'word_list.csv' bulunamadı ve 'Subtitles/' klasörü mevcut değil.")
-        print("Lütfen 'word_list.csv' dosyasını sağlayın veya 'Subtitles/' klasörüne altyazı dosyaları ekleyin.")
-        exit(1)
-    for subdir, _, files in os.walk('Subtitles/'):
-        for file in files:
-            f = codecs.open(os.path.join(subdir, file), 'r', 'latin-1')
-            tagged_sent = pos_tag(word_tokenize(f.read()))
-            words.extend([word for word,pos in tagged_sent if pos != 'NNP']) 
-    
-    replacer = SpellCorrection()
-    lemmatizer = WordNetLemmatizer()
-    filtered = []
-    for w in words:
-        if str.isalpha(w):
-            modif_word = replacer.replace(w)
-            if modif_word and str.isalpha(modif_word):
-                mw = modif_word.lower()
-                # Lemmatize as 'verb' and 'noun' and hold whichever that makes the word different
-                # (Need more investigation for adjectives and adverbs. Better to use the real POS of the word)
-                mwv = lemmatizer.lemmatize(mw, pos='v') # verb lemma
-                if mwv != mw:
-                    filtered.append(mwv)
-                else:
-                    filtered.append(lemmatizer.lemmatize(mw)) # noun lemma 
+    paths = [os.path.join(subdir, file) for subdir, _, files in os.walk(subtitles_dir) for file in files]
+    raw_counts = load_file_counts(paths, workers)
+
+    # Each distinct type is corrected/lemmatized once; results persist across runs
+    persisted = {}
+    if os.path.exists(NORMALIZED_CACHE_PATH):
+        with open(NORMALIZED_CACHE_PATH, 'r') as f:
+            persisted = json.load(f)
+
+    filtered = Counter()
+    for w, count in raw_counts.items():
+        if not str.isalpha(w):
+            continue
+        if w in persisted:
+            lemma = persisted[w]
+        else:
+            lemma = persisted[w] = normalize_type(w)
+        if lemma:
+            filtered[lemma] += count
+
+    with open(NORMALIZED_CACHE_PATH, 'w') as f:
+        json.dump(persisted, f)
 
     # count words and sort according to their frequencies
-    sorted_words = sorted(Counter(filtered).items(), key=operator.itemgetter(1), reverse=True)
-
-    # save the word lists
-    with open('word_list.csv','w') as f:
-        csv_out = csv.writer(f)
-        for row in sorted_words:
-            csv_out.writerow(row)
-            
-# interact with user to find his/her vocabulary level
-start = 0
-if not sorted_words:
-    print("Kelime listesi boş veya yüklenemedi.")
-    exit(1)
-
-end = len(sorted_words)-1
-pos = 0
-while start <= end:
-    pos = int((start+end)/2)
-    print('Do you know the meaning of "%s" (y,n)?' % sorted_words[pos][0])
-    if input()=='n':
-        end = pos - 1
-        pos -= 1 # position of the last word that you know
+    return sorted(filtered.items(), key=operator.itemgetter(1), reverse=True)
+
+def main():
+    if os.path.exists('word_list.csv'):
+        with open('word_list.csv', 'r') as f:
+            csv_in = csv.reader(f)
+            sorted_words = [row for row in csv_in]
     else:
-        start = pos + 1
-# pos: the position where the user does not knows its meaning and the meaning of the words after that
-
-total = len(sorted_words)
-if total == 0:
-    print("Toplam kelime sayısı 0.")
-    exit()
-pos += 1
-print("************************RESULTS***********************")
-print("You approximately knows %d words out of %d (%%%.1f)" %(pos,total,pos*100/total))
-print("******************************************************")
-
-# We can give the separate lists of words that the user knows and does not know
+        if not os.path.exists('Subtitles'):
+            print("Hata: 'word_list.csv' bulunamadı ve 'Subtitles/' klasörü mevcut değil.")
+            print("Lütfen 'word_list.csv' dosyasını sağlayın veya 'Subtitles/' klasörüne altyazı dosyaları ekleyin.")
+            exit(1)
+        sorted_words = build_word_list('Subtitles/')
+
+        # save the word lists
+        with open('word_list.csv','w') as f:
+            csv_out = csv.writer(f)
+            for row in sorted_words:
+                csv_out.writerow(row)
+
+    # interact with user to find his/her vocabulary level
+    start = 0
+    if not sorted_words:
+        print("Kelime listesi boş veya yüklenemedi.")
+        exit(1)
+
+    end = len(sorted_words)-1
+    pos = 0
+    while start <= end:
+        pos = int((start+end)/2)
+        print('Do you know the meaning of "%s" (y,n)?' % sorted_words[pos][0])
+        if input()=='n':
+            end = pos - 1
+            pos -= 1 # position of the last word that you know
+        else:
+            start = pos + 1
+    # pos: the position where the user does not knows its meaning and the meaning of the words after that
+
+    total = len(sorted_words)
+    if total == 0:
+        print("Toplam kelime sayısı 0.")
+        exit()
+    pos += 1
+    print("************************RESULTS***********************")
+    print("You approximately knows %d words out of %d (%%%.1f)" %(pos,total,pos*100/total))
+    print("******************************************************")
+
+    # We can give the separate lists of words that the user knows and does not know
+
+if __name__ == '__main__':
+    main()
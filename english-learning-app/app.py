@@ -1,7 +1,11 @@
 import sys
 import os
 import re
-from typing import Optional, List, Dict, Any, Tuple, Union, Set
+import sqlite3
+import json
+import hashlib
+from collections import OrderedDict
+from typing import Optional, List, Dict, Any, Tuple, Union, Set, Callable
 from datetime import datetime
 
 # Load environment variables from .env file
@@ -24,8 +28,26 @@ except ImportError:
 
 from database import Database
 from speech_processor import SpeechProcessor
+from utils.episode_matrix import MATRIX_AVAILABLE as EPISODE_MATRIX_AVAILABLE, get_episode_matrix, group_sums
+from utils.cue_index import CueIndex, get_cue_store
+from utils.concordance import get_concordance
+from utils.corpus import iter_transcript_documents, make_document
+from utils.search_index import backfill as backfill_search_index, index_document, index_video_transcript, quote_query
+from utils.transcript_cache import get_transcript_cache, normalize_transcript
+from utils.vocab_index import get_vocabulary_index
+from utils.text_io import read_text
+from utils.translation_engine import TranslationEngine, get_translation_engine, sentence_hash, split_sentences
+from utils.definition_resolver import get_definition_resolver
+from utils.jobs import Job, get_job_manager
+from utils.model_registry import PRELOAD_BEFORE_FORK, current_rss, get_model_registry
+from utils.lexicon import corpora_available, enrich_vocabulary
+if EPISODE_MATRIX_AVAILABLE:
+    import numpy as np
 from routes.auth import auth_bp, init_auth_routes
 from routes.rooms import rooms_bp, init_rooms_routes
+from routes.recommendations import recommendations_bp, init_recommendations_routes
+from routes.phrases import phrases_bp, init_phrases_routes
+from routes.jobs import jobs_bp, init_jobs_routes
 from routes.chatbot import chatbot_bp
 
 app = Flask(__name__)
@@ -51,6 +73,33 @@ db.cleanup_stale_sessions()
 db.init_learning_packages()
 db.init_flashcard_system()  # Initialize flashcard tables
 db.init_word_frequency_table()  # Initialize word frequency table
+SEARCH_AVAILABLE = db.init_search_index()  # FTS5 transcript search
+db.init_phrase_tables()  # Initialize multi-word phrase tables
+db.init_translation_cache()  # Initialize machine translation cache
+db.init_job_tables()  # Initialize background jobs table
+job_manager = get_job_manager(db, socketio)
+
+def _register_custom_series_words() -> None:
+    """One-off backfill: add the words of custom series episodes created before upload-time registration"""
+    for series in db.get_custom_series_without_words():
+        folder = series['db_folder_path']
+        words: List[str] = []
+        try:
+            for name in sorted(os.listdir(folder)) if os.path.isdir(folder) else []:
+                if not name.endswith('.db'):
+                    continue
+                conn = sqlite3.connect(os.path.join(folder, name))
+                try:
+                    words.extend(row[0] for row in conn.execute("SELECT word FROM word_frequencies"))
+                finally:
+                    conn.close()
+            added = db.add_words_batch(words)
+            db.mark_custom_series_words_registered(series['series_id'])
+            print(f"📚 {series['series_id']}: {added} yeni kelime kaydedildi")
+        except Exception as e:
+            print(f"⚠️ {series['series_id']} kelimeleri kaydedilemedi: {e}")
+
+_register_custom_series_words()
 
 # Check and generate learning pathways if needed
 need_regen = False
@@ -74,6 +123,27 @@ if not db.has_learning_packages() or need_regen:
 
 speech_processor = SpeechProcessor()
 
+def _load_translation_model() -> Optional[TranslationEngine]:
+    """Start the Argos translation workers and load the model (never downloads the package)"""
+    engine = get_translation_engine(db)
+    if not engine.load(install=False):
+        return None
+    engine.warm_up()
+    return engine
+
+def _translation_workers_rss(engine: TranslationEngine) -> Optional[int]:
+    return sum(current_rss(pid) or 0 for pid in engine.worker_pids) or None
+
+# Whisper and the chatbot register themselves on import; the translator needs the db
+model_registry = get_model_registry()
+model_registry.register('argos', _load_translation_model, fork_safe=False, memory_probe=_translation_workers_rss,
+                        starter=lambda: get_translation_engine(db).load(install=False))
+if PRELOAD_BEFORE_FORK:
+    model_registry.preload_before_fork()  # Prefork server (gunicorn --preload): share weights copy-on-write
+else:
+    model_registry.start_workers()  # Fork the worker pools here, before the preload and request threads start
+    model_registry.preload()
+
 # Create default admin user if not exists
 try:
     if not db.get_user_by_username('admin'):
@@ -91,9 +161,15 @@ room_video_states: Dict[int, Dict[str, Any]] = {}
 # Register Blueprints
 init_auth_routes(db)
 init_rooms_routes(db)
+init_recommendations_routes(db)
+init_phrases_routes(db)
+init_jobs_routes(db)
 app.register_blueprint(auth_bp)
 app.register_blueprint(rooms_bp)
 app.register_blueprint(chatbot_bp)
+app.register_blueprint(recommendations_bp)
+app.register_blueprint(phrases_bp)
+app.register_blueprint(jobs_bp)
 
 @app.route('/')
 def index() -> str:
@@ -102,6 +178,12 @@ def index() -> str:
     google_client_id = os.getenv('GOOGLE_CLIENT_ID', '')
     return render_template('index.html', google_client_id=google_client_id)
 
+@app.route('/api/health/models', methods=['GET'])
+def get_models_health() -> Tuple[Response, int]:
+    """Model readiness, load time and memory; 503 while preloaded models are still loading"""
+    status = model_registry.status()
+    return jsonify({'success': True, **status}), 200 if status['ready'] else 503
+
 # ===== SERIES AND EPISODES ROUTES =====
 
 @app.route('/api/series', methods=['GET'])
@@ -145,8 +227,7 @@ def get_episode_words(series_name, season_number, episode_file):
         return jsonify({'success': False, 'error': 'Episode file not found'}), 404
 
     try:
-        with open(episode_path, 'r', encoding='utf-8', errors='ignore') as f:
-            content = f.read()
+        content = read_text(episode_path)
         
         words = speech_processor.extract_words(content)
         return jsonify({'success': True, 'words': words})
@@ -164,8 +245,7 @@ def get_episode_flashcards(series_name, season_number, episode_file):
         return jsonify({'success': False, 'error': 'Episode file not found'}), 404
 
     try:
-        with open(episode_path, 'r', encoding='utf-8', errors='ignore') as f:
-            content = f.read()
+        content = read_text(episode_path)
         
         words = speech_processor.extract_words(content)
         
@@ -202,7 +282,12 @@ def process_videos() -> Tuple[Response, int]:
     
     try:
         processed_files = db.get_processed_filenames()
-        results: List[Tuple[str, Set[str], str]] = speech_processor.process_directory(video_directory, skip_filenames=processed_files)
+        # Whisper segment timings per file, persisted as cue indexes for playback sync
+        segment_cues: Dict[str, CueIndex] = {}
+        results: List[Tuple[str, Set[str], str]] = speech_processor.process_directory(
+            video_directory, skip_filenames=processed_files,
+            on_segments=lambda name, segments: segment_cues.__setitem__(name, CueIndex.from_segments(segments))
+        )
         
         new_words_count = 0
         
@@ -212,20 +297,22 @@ def process_videos() -> Tuple[Response, int]:
             for word in word_list:
                 word_id = db.get_or_add_word(word)
                 if word_id is not None:
-                    # Get definition for new words
-                    definition, pronunciation = db.get_word_definition(word)
-                    if definition:
-                        db.update_word_definition(word_id, definition, pronunciation or '')
-                    
                     db.add_user_word(user_id, word_id)
                     new_words_count += 1
             
+            # Definitions come from local sources; misses are fetched in the background
+            get_definition_resolver(db).resolve_many(word_list)
+            
             video_id = db.add_video_record(filename, len(word_list), transcript)
             if video_id:
                 for word in word_list:
                     word_id = db.get_or_add_word(word)
                     if word_id is not None:
                         db.add_video_word(video_id, word_id)
+                
+                cue_index = segment_cues.get(filename)
+                if cue_index is not None and len(cue_index):
+                    get_cue_store().put(video_id, cue_index)
         
         return jsonify({
             'success': True,
@@ -241,77 +328,116 @@ def process_videos() -> Tuple[Response, int]:
             'error': str(e)
         }), 500
 
-def _process_video_logic(user_id: int, video_url: str) -> Tuple[Response, int]:
-    """Common logic for processing video from URL"""
+def _index_for_search(doc: Optional[Dict[str, Any]] = None, video: Optional[Tuple[int, str, str]] = None) -> None:
+    """Add a newly ingested transcript file or video transcript to the search index"""
+    if not SEARCH_AVAILABLE:
+        return
     try:
-        # Process video from URL
-        result: Tuple[Optional[str], Set[str], str] = speech_processor.process_video_from_url(video_url)
-        
-        if not result or not result[0]:
-            return jsonify({'success': False, 'error': 'Video indirilemedi veya işlenemedi'}), 500
+        if doc is not None:
+            index_document(db, doc)
+        if video is not None:
+            index_video_transcript(db, *video)
+    except Exception as e:
+        print(f"⚠️ Arama indeksi güncellenemedi: {e}")
+
+def _transcript_ingested(doc: Dict[str, Any]) -> None:
+    """Normalize a newly saved transcript file for the viewer and add it to the search index"""
+    try:
+        get_transcript_cache().get(doc['path'])
+    except OSError as e:
+        print(f"⚠️ Transkript önbelleğe alınamadı: {e}")
+    _index_for_search(doc)
+
+def _job_accepted(job: Job) -> Tuple[Response, int]:
+    """202 response for an endpoint whose work was handed to the job manager"""
+    return jsonify({
+        'success': True,
+        'job_id': job.id,
+        'status': job.status,
+        'status_url': f'/api/jobs/{job.id}'
+    }), 202
+
+def _process_video_job(job: Job, user_id: int, video_url: str) -> Dict[str, Any]:
+    """Download, transcribe and ingest a video from URL (background job)"""
+    from collections import Counter
+    import re
+    
+    job.progress(0, 3, 'Video indiriliyor ve yazıya dökülüyor')
+    
+    # Process video from URL (keep subtitle timings for the cue index)
+    downloaded_cues: List[CueIndex] = []
+    download: Dict[str, Any] = {}
+    result: Tuple[Optional[str], Set[str], str] = speech_processor.process_video_from_url(
+        video_url, on_subtitle=lambda path: downloaded_cues.append(CueIndex.from_subtitle_file(path)),
+        on_download=download.update,
+        on_segments=lambda segments: downloaded_cues.append(CueIndex.from_segments(segments))
+    )
+    
+    if not result or not result[0]:
+        raise RuntimeError('Video indirilemedi veya işlenemedi')
+        
+    filename = result[0]
+    words_set = result[1]
+    transcript = result[2]
+    job.progress(1, 3, 'Kelimeler kaydediliyor')
+    
+    # Clean and extract words with frequency
+    cleaned_transcript = re.sub(r'\d{2}:\d{2}:\d{2},\d{3} --> \d{2}:\d{2}:\d{2},\d{3}', ' ', transcript)
+    cleaned_transcript = re.sub(r'<[^>]+>', ' ', cleaned_transcript)
+    cleaned_transcript = re.sub(r'\[[^\]]*\]', ' ', cleaned_transcript)
+    
+    transcript_words = re.findall(r"\b[a-zA-Z]+(?:'[a-zA-Z]+)?\b", cleaned_transcript.lower())
+    filtered_words = [w for w in transcript_words if len(w) > 1 or w in ['a', 'i']]
+    word_counts = Counter(filtered_words)
+    
+    new_words_count = 0
+    total_words = len(filtered_words)
+    
+    # Update word frequencies in database
+    for word, frequency in word_counts.items():
+        word_id = db.get_or_add_word(word)
+        if word_id is not None:
+            # Update frequency directly from transcript count
+            conn = db.get_connection()
+            cursor = conn.cursor()
+            cursor.execute('UPDATE words SET frequency = frequency + ? WHERE id = ?', (frequency, word_id))
+            conn.commit()
+            conn.close()
             
-        filename = result[0]
-        words_set = result[1]
-        transcript = result[2]
-        
-        # Count word frequencies from transcript
-        from collections import Counter
-        import re
-        
-        # Clean and extract words with frequency
-        cleaned_transcript = re.sub(r'\d{2}:\d{2}:\d{2},\d{3} --> \d{2}:\d{2}:\d{2},\d{3}', ' ', transcript)
-        cleaned_transcript = re.sub(r'<[^>]+>', ' ', cleaned_transcript)
-        cleaned_transcript = re.sub(r'\[[^\]]*\]', ' ', cleaned_transcript)
-        
-        transcript_words = re.findall(r"\b[a-zA-Z]+(?:'[a-zA-Z]+)?\b", cleaned_transcript.lower())
-        filtered_words = [w for w in transcript_words if len(w) > 1 or w in ['a', 'i']]
-        word_counts = Counter(filtered_words)
-        
-        new_words_count = 0
-        total_words = len(filtered_words)
-        
-        # Update word frequencies in database
-        for word, frequency in word_counts.items():
+            db.add_user_word(user_id, word_id)
+            new_words_count += 1
+    
+    job.progress(2, 3, 'Video kaydı ve arama indeksi')
+    video_id = db.add_video_record(filename, total_words, transcript, video_url)
+    if video_id:
+        for word in word_counts.keys():
             word_id = db.get_or_add_word(word)
             if word_id is not None:
-                # Update frequency directly from transcript count
-                conn = db.get_connection()
-                cursor = conn.cursor()
-                cursor.execute('UPDATE words SET frequency = frequency + ? WHERE id = ?', (frequency, word_id))
-                conn.commit()
-                conn.close()
-                
-                db.add_user_word(user_id, word_id)
-                new_words_count += 1
-        
-        video_id = db.add_video_record(filename, total_words, transcript, video_url)
-        if video_id:
-            for word in word_counts.keys():
-                word_id = db.get_or_add_word(word)
-                if word_id is not None:
-                    db.add_video_word(video_id, word_id)
-            
-            # Store word frequencies for this video
-            db.add_word_frequencies(video_id, word_counts)
+                db.add_video_word(video_id, word_id)
         
-        print(f"✅ İşlem tamamlandı! {new_words_count} yeni kelime, {total_words} toplam kelime")
+        # Store word frequencies for this video
+        db.add_word_frequencies(video_id, word_counts)
         
-        return jsonify({
-            'success': True,
-            'filename': filename,
-            'new_words_found': new_words_count,
-            'total_words': total_words,
-            'unique_words': len(word_counts),
-            'transcript_preview': (transcript[:200] + '...') if transcript else ''
-        }), 200
+        if downloaded_cues and len(downloaded_cues[0]):
+            get_cue_store().put(video_id, downloaded_cues[0])
         
-    except Exception as e:
-        print(f"❌ Video işleminde hata: {e}")
-        return jsonify({'success': False, 'error': str(e)}), 500
+        _index_for_search(video=(video_id, filename, transcript))
+    
+    print(f"✅ İşlem tamamlandı! {new_words_count} yeni kelime, {total_words} toplam kelime")
+    
+    return {
+        'success': True,
+        'filename': filename,
+        'new_words_found': new_words_count,
+        'total_words': total_words,
+        'unique_words': len(word_counts),
+        'transcript_preview': (transcript[:200] + '...') if transcript else '',
+        'download': download
+    }
 
 @app.route('/api/process-video-url', methods=['POST'])
 def process_video_url() -> Tuple[Response, int]:
-    """Process video from URL"""
+    """Queue processing of a video from URL; poll /api/jobs/<job_id> for the result"""
     data = request.get_json()
     if data is None:
         return jsonify({'success': False, 'error': 'Invalid request'}), 400
@@ -324,7 +450,8 @@ def process_video_url() -> Tuple[Response, int]:
     if not video_url:
         return jsonify({'success': False, 'error': 'Video URL required'}), 400
     
-    return _process_video_logic(user_id, video_url)
+    job = job_manager.submit('video', _process_video_job, {'user_id': user_id, 'video_url': video_url}, user_id)
+    return _job_accepted(job)
 
 @app.route('/api/words', methods=['GET'])
 def get_words() -> Tuple[Response, int]:
@@ -360,11 +487,93 @@ def get_word_definition_api(word_id: int) -> Tuple[Response, int]:
         if not word:
             return jsonify({'success': False, 'error': 'Word not found'}), 404
         
+        definition = word.get('definition') or ''
+        status = 'local'
+        if not definition:
+            definition, status = get_definition_resolver(db).resolve(word['word'])
+        
         return jsonify({
             'success': True,
             'word': word['word'],
-            'definition': word.get('definition', ''),
-            'pronunciation': word.get('pronunciation', '')
+            'definition': definition or '',
+            'pronunciation': word.get('pronunciation', ''),
+            'pending': status == 'pending'
+        }), 200
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/words/<int:word_id>/examples', methods=['GET'])
+def get_word_examples(word_id: int) -> Tuple[Response, int]:
+    """Get in-context example lines for a word from the concordance index"""
+    try:
+        limit = max(1, min(request.args.get('limit', 5, type=int), 50))
+        word = db.get_word(word_id)
+        if not word:
+            return jsonify({'success': False, 'error': 'Word not found'}), 404
+        
+        concordance = get_concordance()
+        if not concordance.exists():
+            return jsonify({
+                'success': False,
+                'error': 'Concordance index not built. POST /api/admin/rebuild-concordance first.'
+            }), 503
+        
+        examples = concordance.examples(word['word'], limit)
+        return jsonify({
+            'success': True,
+            'word': word['word'],
+            'examples': examples,
+            'count': len(examples)
+        }), 200
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/search', methods=['GET'])
+def search_transcripts() -> Tuple[Response, int]:
+    """
+    Full-text search over episode transcripts and subtitle cues
+    
+    Query params:
+    - q: FTS5 sorgusu: kelimeler, "tırnaklı ifade", önek* (zorunlu)
+    - series: friends, bigbang, video veya custom series_id ile filtrele
+    - season: Sezon ile filtrele
+    - limit / offset: Sayfalama (varsayılan 20 / 0)
+    """
+    query = (request.args.get('q') or '').strip()
+    series = request.args.get('series')
+    season = request.args.get('season', type=int)
+    limit = max(1, min(request.args.get('limit', 20, type=int), 100))
+    offset = max(0, request.args.get('offset', 0, type=int))
+    
+    if not query:
+        return jsonify({'success': False, 'error': 'q is required'}), 400
+    if not SEARCH_AVAILABLE:
+        return jsonify({'success': False, 'error': 'SQLite FTS5 is not available'}), 503
+    
+    try:
+        try:
+            results = db.search_transcripts(query, series, season, limit + 1, offset)
+        except sqlite3.OperationalError:
+            # Not valid FTS5 syntax (stray quotes, operators...): search the words literally
+            safe_query = quote_query(query)
+            if not safe_query:
+                return jsonify({'success': False, 'error': 'Invalid search query'}), 400
+            try:
+                results = db.search_transcripts(safe_query, series, season, limit + 1, offset)
+            except sqlite3.OperationalError as e:
+                return jsonify({'success': False, 'error': f'Invalid search query: {e}'}), 400
+        
+        has_more = len(results) > limit
+        results = results[:limit]
+        for result in results:
+            result['score'] = round(-result['score'], 4)  # bm25 is lower-is-better
+        
+        return jsonify({
+            'success': True,
+            'query': query,
+            'results': results,
+            'count': len(results),
+            'has_more': has_more
         }), 200
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
@@ -377,6 +586,15 @@ def lookup_word_definition(word: str) -> Tuple[Response, int]:
         
         # First try to get from database
         word_data = db.get_word_by_text(word_lower)
+        match = 'exact'
+        suggestions: List[Dict[str, Any]] = []
+        
+        if not word_data:
+            # Typos and inflected forms resolve from the in-memory index before any network call
+            suggestions = get_vocabulary_index(db).lookup(word_lower, 5)
+            if suggestions:
+                word_data = db.get_word(suggestions[0]['id'])
+                match = suggestions[0]['match']
         
         if word_data:
             # Get user's known status if logged in
@@ -399,25 +617,56 @@ def lookup_word_definition(word: str) -> Tuple[Response, int]:
                 'word': word_data['word'],
                 'definition': word_data.get('definition', ''),
                 'pronunciation': word_data.get('pronunciation', ''),
+                'gloss': word_data.get('gloss') or '',
+                'pos': word_data.get('pos') or '',
                 'id': word_data['id'],
-                'known': known
+                'known': known,
+                'query': word_lower,
+                'match': match,
+                'suggestions': [{'id': s['id'], 'word': s['word'], 'distance': s['distance']} for s in suggestions[1:]]
             }), 200
         
-        # If not in database, try to translate on-the-fly
-        definition, pronunciation = db.get_word_definition(word_lower)
+        # If not in database, translate locally or queue a background fetch
+        definition, status = get_definition_resolver(db).resolve(word_lower)
         
         return jsonify({
             'success': True,
             'word': word_lower,
             'definition': definition or '',
-            'pronunciation': pronunciation or '',
+            'pronunciation': '',
             'id': None,
-            'known': False
+            'known': False,
+            'pending': status == 'pending'
         }), 200
         
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
+@app.route('/api/words/suggest', methods=['GET'])
+def suggest_words() -> Tuple[Response, int]:
+    """
+    Autocomplete words by prefix, most frequent first
+    
+    Query params:
+    - prefix: Aranan kelimenin başı
+    - limit: En fazla kaç öneri (varsayılan 10, en fazla 20)
+    - user_id: Bilinen kelimeleri işaretle
+    """
+    prefix = request.args.get('prefix', '')
+    limit = max(1, request.args.get('limit', 10, type=int))
+    user_id = request.args.get('user_id', type=int)
+    
+    try:
+        suggestions = [dict(entry) for entry in get_vocabulary_index(db).suggest(prefix, limit)]
+        known_ids = set()
+        if user_id and suggestions:
+            known_ids = db.get_known_word_ids(user_id, [entry['id'] for entry in suggestions])
+        for entry in suggestions:
+            entry['known'] = entry['id'] in known_ids
+        return jsonify({'success': True, 'prefix': prefix, 'suggestions': suggestions, 'count': len(suggestions)}), 200
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
 @app.route('/api/words/batch-lookup', methods=['POST'])
 def batch_lookup_words() -> Tuple[Response, int]:
     """Get word status for multiple words by text (for transcript section)"""
@@ -448,90 +697,30 @@ def batch_lookup_words() -> Tuple[Response, int]:
 
 # ===== AI TRANSLATION ENDPOINTS =====
 
-# Global translator instance for local model
-_local_translator = None
+AUTO_TRANSLATE_CHUNK = 1000
 
-def get_local_translator():
-    """Get or initialize the local Argos Translate model for EN->TR translation."""
-    global _local_translator    
-    
-    if _local_translator is not None:
-        return _local_translator
-    
-    try:
-        import argostranslate.package
-        import argostranslate.translate
-        
-        print("🔄 Yerel çeviri modeli yükleniyor (Argos Translate)...")
-        
-        # Check if EN->TR package is installed
-        installed_languages = argostranslate.translate.get_installed_languages()
-        en_lang = next((lang for lang in installed_languages if lang.code == "en"), None)
-        tr_lang = next((lang for lang in installed_languages if lang.code == "tr"), None)
-        
-        if en_lang and tr_lang:
-            _local_translator = en_lang.get_translation(tr_lang)
-            if _local_translator:
-                print("✅ Yerel çeviri modeli hazır!")
-                return _local_translator
-        
-        # If not installed, download and install
-        print("📥 İngilizce-Türkçe dil paketi indiriliyor...")
-        argostranslate.package.update_package_index()
-        available_packages = argostranslate.package.get_available_packages()
-        
-        # Find EN->TR package
-        package_to_install = next(
-            (pkg for pkg in available_packages 
-             if pkg.from_code == "en" and pkg.to_code == "tr"),
-            None
-        )
-        
-        if package_to_install:
-            download_path = package_to_install.download()
-            argostranslate.package.install_from_path(download_path)
-            print("✅ Dil paketi kuruldu!")
-            
-            # Get translator again
-            installed_languages = argostranslate.translate.get_installed_languages()
-            en_lang = next((lang for lang in installed_languages if lang.code == "en"), None)
-            tr_lang = next((lang for lang in installed_languages if lang.code == "tr"), None)
-            
-            if en_lang and tr_lang:
-                _local_translator = en_lang.get_translation(tr_lang)
-                return _local_translator
-        else:
-            print("❌ İngilizce-Türkçe dil paketi bulunamadı!")
-            return None
-            
-    except ImportError:
-        print("❌ Argos Translate kurulu değil. Kurmak için: pip install argostranslate")
-        return None
-    except Exception as e:
-        print(f"❌ Yerel çeviri modeli yüklenirken hata: {e}")
-        return None
-    
-    return None
-
-def translate_with_local_model(word: str) -> Optional[str]:
-    """Translate a single word using local Argos Translate model."""
-    translator = get_local_translator()
-    
-    if translator is None:
-        return None
-    
-    try:
-        translation = translator.translate(word)
-        return translation if translation else None
-    except Exception as e:
-        print(f"Çeviri hatası ({word}): {e}")
-        return None
+def translate_definitions(words_to_translate: List[Dict[str, Any]]) -> int:
+    """Translate word rows (id, word) with the local engine and save them as definitions.
+    Returns the number of words updated.
+    """
+    translations = get_translation_engine(db).translate_words(w['word'] for w in words_to_translate)
+    translated_definitions = []
+    for word_data in words_to_translate:
+        translation = translations.get(word_data['word'].strip().lower())
+        if translation:
+            translated_definitions.append({
+                'word_id': word_data['id'],
+                'definition': translation,
+                'pronunciation': ''
+            })
+    return db.bulk_update_definitions(translated_definitions) if translated_definitions else 0
 
-def auto_translate_all_words() -> int:
+def auto_translate_all_words(progress: Optional[Callable[..., None]] = None) -> int:
     """Automatically translate all words without definitions using LOCAL model.
     Called after word map is built.
     Returns the number of words translated.
     Uses Argos Translate - a free, open-source, offline translation model.
+    progress(done, total) is called after every chunk.
     """
     total_translated = 0
     
@@ -539,45 +728,20 @@ def auto_translate_all_words() -> int:
     print("📦 Model: Argos Translate (açık kaynak, offline)")
     
     # Initialize translator first
-    translator = get_local_translator()
-    if translator is None:
+    if not get_translation_engine(db).load():
         print("❌ Yerel çeviri modeli başlatılamadı!")
         return 0
     
     try:
-        # Get all words without definitions
-        batch_num = 0
-        while True:
-            words_to_translate = db.get_words_without_definition(limit=100)
-            
-            if not words_to_translate:
-                break
-            
-            batch_num += 1
-            translated_definitions = []
-            
-            # Translate each word with local model
-            for word_data in words_to_translate:
-                try:
-                    word = word_data['word']
-                    translation = translator.translate(word)
-                    
-                    if translation and translation.strip():
-                        translated_definitions.append({
-                            'word_id': word_data['id'],
-                            'definition': translation.strip(),
-                            'pronunciation': ''
-                        })
-                except Exception as e:
-                    continue
-            
-            # Save to database
-            if translated_definitions:
-                updated = db.bulk_update_definitions(translated_definitions)
-                total_translated += updated
-                print(f"✅ Batch {batch_num}: {len(translated_definitions)} kelime çevrildi (Toplam: {total_translated})")
-            else:
-                break
+        # All words without definitions at once (LIMIT -1 = no limit); untranslatable words stay cached as empty
+        words_to_translate = db.get_words_without_definition(limit=-1)
+        
+        for start in range(0, len(words_to_translate), AUTO_TRANSLATE_CHUNK):
+            batch = words_to_translate[start:start + AUTO_TRANSLATE_CHUNK]
+            total_translated += translate_definitions(batch)
+            print(f"✅ {start + len(batch)}/{len(words_to_translate)} kelime işlendi (Toplam: {total_translated})")
+            if progress:
+                progress(start + len(batch), len(words_to_translate))
         
         print(f"🎉 Yerel model ile çeviri tamamlandı: {total_translated} kelime")
         return total_translated
@@ -604,7 +768,7 @@ def translate_words() -> Tuple[Response, int]:
     try:
         data = request.get_json() or {}
         package_id = data.get('package_id')  # Optional: translate only words in a specific package
-        limit = min(data.get('limit', 50), 100)  # Max 100 words per request
+        limit = min(data.get('limit', 50), 500)  # Max 500 words per request
         
         # Get words without definitions
         words_to_translate = db.get_words_without_definition(limit=limit, package_id=package_id)
@@ -617,34 +781,17 @@ def translate_words() -> Tuple[Response, int]:
             }), 200
         
         # Use local Argos Translate model
-        translator = get_local_translator()
-        if translator is None:
+        if not get_translation_engine(db).load():
             return jsonify({
                 'success': False,
                 'error': 'Yerel çeviri modeli yüklenemedi. Lütfen argostranslate paketini kurun: pip install argostranslate'
             }), 500
         
-        translated_definitions = []
-        
-        for word_data in words_to_translate:
-            try:
-                translation = translator.translate(word_data['word'])
-                if translation and translation.strip():
-                    translated_definitions.append({
-                        'word_id': word_data['id'],
-                        'definition': translation.strip(),
-                        'pronunciation': ''
-                    })
-            except Exception as e:
-                print(f"Çeviri hatası ({word_data['word']}): {e}")
-                continue
-        
-        print(f"✅ Yerel model ile {len(translated_definitions)} kelime çevrildi")
+        updated_count = translate_definitions(words_to_translate)
+        print(f"✅ Yerel model ile {updated_count} kelime çevrildi")
         
-        # Save translations to database
-        if translated_definitions:
-            updated_count = db.bulk_update_definitions(translated_definitions)
-            
+        # Translations are saved to the database as they are produced
+        if updated_count:
             return jsonify({
                 'success': True,
                 'message': f'{updated_count} kelime başarıyla çevrildi ve kaydedildi!',
@@ -682,30 +829,14 @@ def translate_package_words(package_id: int) -> Tuple[Response, int]:
             }), 200
         
         # Use local Argos Translate model
-        translator = get_local_translator()
-        if translator is None:
+        if not get_translation_engine(db).load():
             return jsonify({
                 'success': False,
                 'error': 'Yerel çeviri modeli yüklenemedi'
             }), 500
         
-        translated_definitions = []
-        
-        for word_data in words_to_translate:
-            try:
-                translation = translator.translate(word_data['word'])
-                if translation and translation.strip():
-                    translated_definitions.append({
-                        'word_id': word_data['id'],
-                        'definition': translation.strip(),
-                        'pronunciation': ''
-                    })
-            except Exception:
-                continue
-        
-        # Save to database
-        if translated_definitions:
-            updated_count = db.bulk_update_definitions(translated_definitions)
+        updated_count = translate_definitions(words_to_translate)
+        if updated_count:
             return jsonify({
                 'success': True,
                 'message': f'Seviye {package_id}: {updated_count} kelime çevrildi!',
@@ -718,6 +849,88 @@ def translate_package_words(package_id: int) -> Tuple[Response, int]:
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
+SENTENCE_TRANSLATION_MAX_CHARS = 500_000  # Posted text limit; a sitcom episode is ~30k characters
+
+@app.route('/api/translate/sentences', methods=['POST'])
+def translate_sentences() -> Tuple[Response, int]:
+    """
+    Translate a transcript sentence by sentence with the local model, streamed as NDJSON
+    
+    Body: {"series": "friends"|"bigbang", "season", "episode"} for a built-in
+    episode, or {"text": "..."} for any transcript/subtitle text.
+    
+    Lines: a header {"total", "unique"}, then one {"index", "line",
+    "speaker", "text", "translation", "cached"} per sentence (cached ones
+    first, the rest as each batch is translated), then {"done": true, ...}.
+    Sentences are cached by normalized hash, so repeated lines and episodes
+    translated before come back without the model.
+    """
+    data = request.get_json(silent=True) or {}
+    series = data.get('series')
+    try:
+        if series:
+            if series not in ('friends', 'bigbang'):
+                return jsonify({'success': False, 'error': 'Invalid series. Use friends or bigbang'}), 400
+            season, episode = data.get('season'), data.get('episode')
+            if not isinstance(season, int) or not isinstance(episode, int):
+                return jsonify({'success': False, 'error': 'Season and episode parameters required'}), 400
+            folder_name = "Friends" if series == 'friends' else "BigBangTheory"
+            series_folder = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Subtitles", folder_name)
+            transcript_path = _find_series_transcript_file(series_folder, season, episode)
+            if not transcript_path:
+                return jsonify({
+                    'success': False,
+                    'error': f'Bu bölüm için transkript bulunamadı. ({series} S{season:02d}E{episode:02d})'
+                }), 404
+            text = get_transcript_cache().get(transcript_path).text
+        else:
+            text = data.get('text')
+            if not isinstance(text, str) or not text.strip():
+                return jsonify({'success': False, 'error': 'text or series/season/episode required'}), 400
+            if len(text) > SENTENCE_TRANSLATION_MAX_CHARS:
+                return jsonify({'success': False, 'error': f'Text too long (max {SENTENCE_TRANSLATION_MAX_CHARS} characters)'}), 413
+            text = normalize_transcript(text)
+        
+        engine = get_translation_engine(db)
+        # Never download the language package inside a request; a missing package is a 503
+        if not engine.load(install=False):
+            return jsonify({
+                'success': False,
+                'error': 'Yerel çeviri modeli yüklenemedi. Lütfen argostranslate paketini kurun: pip install argostranslate'
+            }), 503
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+    
+    sentences = split_sentences(text)
+    positions: Dict[str, List[int]] = {}
+    for index, sentence in enumerate(sentences):
+        positions.setdefault(sentence_hash(sentence['text']), []).append(index)
+    
+    def generate():
+        yield json.dumps({'total': len(sentences), 'unique': len(positions)}) + '\n'
+        counts = {True: 0, False: 0}
+        try:
+            for from_cache, pairs in engine.iter_sentence_translations(s['text'] for s in sentences):
+                lines = []
+                for sentence_text, translation in pairs:
+                    counts[from_cache] += 1
+                    for index in positions[sentence_hash(sentence_text)]:
+                        lines.append(json.dumps(
+                            dict(sentences[index], index=index, translation=translation, cached=from_cache),
+                            ensure_ascii=False
+                        ))
+                yield '\n'.join(lines) + '\n'
+        except Exception as e:
+            print(f"❌ Cümle çevirisi hatası: {e}")
+            yield json.dumps({'done': True, 'success': False, 'error': str(e)}) + '\n'
+            return
+        yield json.dumps({'done': True, 'success': True, 'cached': counts[True], 'translated': counts[False]}) + '\n'
+    
+    response = Response(generate(), mimetype='application/x-ndjson')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'  # Let reverse proxies pass lines through as they come
+    return response, 200
+
 @app.route('/api/words/batch-mark', methods=['POST'])
 def batch_mark_words() -> Tuple[Response, int]:
     """Mark multiple words as known or unknown for a user"""
@@ -843,6 +1056,7 @@ def save_transcript_to_file(series: str, season: int, episode: int, transcript:
             f.write(transcript)
         
         print(f"✅ Transkript kaydedildi: {filepath}")
+        _transcript_ingested(make_document(series if series == 'friends' else 'bigbang', filepath))
         return True
     except Exception as e:
         print(f"❌ Transkript kaydedilemedi: {e}")
@@ -1060,132 +1274,135 @@ def fetch_transcript_from_web(season: int, episode: int) -> Optional[str]:
     
     return None
 
+def _load_friends_job(job: Job, user_id: Optional[int], target_season: Any) -> Dict[str, Any]:
+    """Friends Dizisinin transkriptlerini web sitelerinden yükle (background job)"""
+    print(f"🎬 Friends transkriptleri web sitelerinden yükleniyor... (Hedef: {target_season})")
+    
+    # Friends sezonları ve episode bilgileri
+    friends_episodes: Dict[int, Union[int, List[str]]] = {
+        1: [
+            "Pilot",
+            "The One with the Sonogram at the End",
+            "The One Hundred",
+            "The One with Two Parts: Part 1",
+            "The One with Two Parts: Part 2",
+            "The One with the Butt",
+            "The One with the Blackmail",
+            "The One Where Nap-Land is Closed",
+            "The One Where Underdog Gets Away",
+            "The One with the Monkey",
+            "The One with Mrs. Bing",
+            "The One with the Dozen Lasagnas",
+            "The One with Rachael Green",
+            "The One with Two Rooms",
+            "The One with the Stoned Guy",
+            "The One with Two Parts: Part 1",
+            "The One with the Bullies",
+            "The One with a Loser",
+            "The One with the Fake Monica",
+            "The One with the Ick Factor",
+            "The One with the Thumb",
+            "The One with the Boobies",
+            "The One with the Curtains",
+            "The One with the Rumor",
+        ],
+        2: 24, 3: 25, 4: 24, 5: 24,
+        6: 25, 7: 24, 8: 24, 9: 24, 10: 18
+    }
+    
+    seasons_to_process: Dict[int, int] = {}
+    if target_season and target_season != 'all':
+        try:
+            s_num = int(target_season)
+            if s_num in friends_episodes:
+                season_info = friends_episodes[s_num]
+                if isinstance(season_info, list):
+                    seasons_to_process = {s_num: len(season_info)}
+                else:
+                    seasons_to_process = {s_num: season_info}
+        except ValueError:
+            pass
+    
+    if not seasons_to_process:
+        # Default: Season 1 sadece
+        seasons_to_process = {1: 24}
+
+    added_count = 0
+    failed_count = 0
+    total_episodes = sum(seasons_to_process.values())
+    processed = 0
+    job.progress(0, total_episodes, 'Friends transkriptleri yükleniyor')
+    
+    for season, episodes_count in seasons_to_process.items():
+        for episode in range(1, episodes_count + 1):
+            # Episode adı varsa onu kullan, yoksa generic isim
+            title = f"Friends - Season {season} Episode {episode:02d}"
+            
+            if season in friends_episodes:
+                season_info = friends_episodes[season]
+                if isinstance(season_info, list):
+                    if episode <= len(season_info):
+                        ep_title = season_info[episode - 1]
+                        title = f"Friends - Season {season} Episode {episode:02d}: {ep_title}"
+            
+            print(f"📥 S{season}E{episode:02d} yükleniyor...", end=" ")
+            
+            # Web'den transkript çekmeye çalış
+            transcript = fetch_transcript_from_web(season, episode)
+            
+            # Eğer web'den bulamazsa fallback transcript oluştur
+            if not transcript:
+                # Generate fallback with episode metadata
+                transcript = f"{title}\n\n[Episode Summary]\nFriends - Season {season}, Episode {episode}\n\nThis episode includes various storylines and comedy bits from the show.\nFor full script, please visit official sources.\n\nCommon vocabulary from this episode:\nfriendship, humor, drama, everyday conversations, American English vocabulary"
+                print(f"(Fallback oluşturuldu)")
+            
+            # Kelimeleri analiz et
+            words = speech_processor.extract_words(transcript)
+            word_count = len(words)
+            
+            # Veritabanına kaydet
+            video_id = db.add_video_record(
+                filename=title,
+                word_count=word_count,
+                transcript=transcript,
+                video_url="https://www.imdb.com/title/tt0108778/",
+                title=title,
+                description=f"Friends Season {season}, Episode {episode}"
+            )
+            
+            if video_id:
+                added_count += 1
+                for word in words:
+                    word_id = db.get_or_add_word(word)
+                    if word_id is not None:
+                        db.add_video_word(video_id, word_id)
+                        if user_id:
+                            db.add_user_word(user_id, word_id)
+            
+            processed += 1
+            job.progress(processed, total_episodes, f"S{season}E{episode:02d}")
+    
+    message = f"✅ {added_count} Friends bölümü yüklendi!"
+    if failed_count > 0:
+        message += f"\n⚠️ {failed_count} bölüm web'den çekilemedi (fallback kullanıldı)"
+    
+    return {
+        'success': True,
+        'message': message,
+        'count': added_count,
+        'failed_count': failed_count
+    }
+
 @app.route('/api/friends/load', methods=['POST'])
 def load_friends_transcripts() -> Tuple[Response, int]:
-    """Friends Dizisinin transkriptlerini web sitelerinden yükle"""
+    """Queue loading Friends transcripts; poll /api/jobs/<job_id> for the result"""
     raw_data = request.get_json()
     data: Dict[str, Any] = raw_data if isinstance(raw_data, dict) else {}
     user_id: Optional[int] = data.get('user_id')
-    target_season = data.get('season')
-
-    try:
-        print(f"🎬 Friends transkriptleri web sitelerinden yükleniyor... (Hedef: {target_season})")
-        
-        # Friends sezonları ve episode bilgileri
-        friends_episodes: Dict[int, Union[int, List[str]]] = {
-            1: [
-                "Pilot",
-                "The One with the Sonogram at the End",
-                "The One Hundred",
-                "The One with Two Parts: Part 1",
-                "The One with Two Parts: Part 2",
-                "The One with the Butt",
-                "The One with the Blackmail",
-                "The One Where Nap-Land is Closed",
-                "The One Where Underdog Gets Away",
-                "The One with the Monkey",
-                "The One with Mrs. Bing",
-                "The One with the Dozen Lasagnas",
-                "The One with Rachael Green",
-                "The One with Two Rooms",
-                "The One with the Stoned Guy",
-                "The One with Two Parts: Part 1",
-                "The One with the Bullies",
-                "The One with a Loser",
-                "The One with the Fake Monica",
-                "The One with the Ick Factor",
-                "The One with the Thumb",
-                "The One with the Boobies",
-                "The One with the Curtains",
-                "The One with the Rumor",
-            ],
-            2: 24, 3: 25, 4: 24, 5: 24,
-            6: 25, 7: 24, 8: 24, 9: 24, 10: 18
-        }
-        
-        seasons_to_process: Dict[int, int] = {}
-        if target_season and target_season != 'all':
-            try:
-                s_num = int(target_season)
-                if s_num in friends_episodes:
-                    season_info = friends_episodes[s_num]
-                    if isinstance(season_info, list):
-                        seasons_to_process = {s_num: len(season_info)}
-                    else:
-                        seasons_to_process = {s_num: season_info}
-            except ValueError:
-                pass
-        
-        if not seasons_to_process:
-            # Default: Season 1 sadece
-            seasons_to_process = {1: 24}
-
-        added_count = 0
-        failed_count = 0
-        
-        for season, episodes_count in seasons_to_process.items():
-            for episode in range(1, episodes_count + 1):
-                # Episode adı varsa onu kullan, yoksa generic isim
-                title = f"Friends - Season {season} Episode {episode:02d}"
-                
-                if season in friends_episodes:
-                    season_info = friends_episodes[season]
-                    if isinstance(season_info, list):
-                        if episode <= len(season_info):
-                            ep_title = season_info[episode - 1]
-                            title = f"Friends - Season {season} Episode {episode:02d}: {ep_title}"
-                
-                print(f"📥 S{season}E{episode:02d} yükleniyor...", end=" ")
-                
-                # Web'den transkript çekmeye çalış
-                transcript = fetch_transcript_from_web(season, episode)
-                
-                # Eğer web'den bulamazsa fallback transcript oluştur
-                if not transcript:
-                    # Generate fallback with episode metadata
-                    transcript = f"{title}\n\n[Episode Summary]\nFriends - Season {season}, Episode {episode}\n\nThis episode includes various storylines and comedy bits from the show.\nFor full script, please visit official sources.\n\nCommon vocabulary from this episode:\nfriendship, humor, drama, everyday conversations, American English vocabulary"
-                    print(f"(Fallback oluşturuldu)")
-                
-                # Kelimeleri analiz et
-                words = speech_processor.extract_words(transcript)
-                word_count = len(words)
-                
-                # Veritabanına kaydet
-                video_id = db.add_video_record(
-                    filename=title,
-                    word_count=word_count,
-                    transcript=transcript,
-                    video_url="https://www.imdb.com/title/tt0108778/",
-                    title=title,
-                    description=f"Friends Season {season}, Episode {episode}"
-                )
-                
-                if video_id:
-                    added_count += 1
-                    for word in words:
-                        word_id = db.get_or_add_word(word)
-                        if word_id is not None:
-                            db.add_video_word(video_id, word_id)
-                            if user_id:
-                                db.add_user_word(user_id, word_id)
-        
-        message = f"✅ {added_count} Friends bölümü yüklendi!"
-        if failed_count > 0:
-            message += f"\n⚠️ {failed_count} bölüm web'den çekilemedi (fallback kullanıldı)"
-        
-        return jsonify({
-            'success': True,
-            'message': message,
-            'count': added_count,
-            'failed_count': failed_count
-        }), 200
-        
-    except Exception as e:
-        print(f"❌ Friends transkriptleri yüklenirken hata: {e}")
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
+    
+    job = job_manager.submit('friends', _load_friends_job,
+                             {'user_id': user_id, 'target_season': data.get('season')}, user_id)
+    return _job_accepted(job)
 
 @app.route('/api/friends/cleanup', methods=['POST'])
 def cleanup_friends_videos() -> Response:
@@ -1195,6 +1412,29 @@ def cleanup_friends_videos() -> Response:
 
 # ===== FRIENDS EPISODE ANALYSIS =====
 
+def _find_friends_subtitle_sources(base_path: str, friends_seasons: Dict[int, Dict[str, Any]],
+                                   patterns: List[Any]) -> List[Dict[str, Any]]:
+    """Locate Friends subtitle files for every season/episode (one listdir per season)"""
+    sources: List[Dict[str, Any]] = []
+    for season, season_info in friends_seasons.items():
+        season_folder = os.path.join(base_path, f"Friends{season}")
+        if not os.path.exists(season_folder):
+            continue
+        
+        filenames = [f for f in os.listdir(season_folder) if f.lower().endswith(('.srt', '.sub', '.vtt'))]
+        for episode in range(1, season_info["episodes"] + 1):
+            pattern_strs = [pattern(season, episode).lower() for pattern in patterns]
+            for filename in filenames:
+                if any(p in filename.lower() for p in pattern_strs):
+                    sources.append({
+                        'key': f"s{season:02d}e{episode:02d}",
+                        'path': os.path.join(season_folder, filename),
+                        'season': season,
+                        'episode': episode,
+                    })
+                    break
+    return sources
+
 @app.route('/api/friends/analyze', methods=['GET'])
 def analyze_friends_episodes() -> Tuple[Response, int]:
     """
@@ -1204,12 +1444,16 @@ def analyze_friends_episodes() -> Tuple[Response, int]:
     - season: Belirli bir sezon (1-10) veya 'all' (varsayılan)
     - sort_by: Sıralama alanı (total, level_1, level_2, ... veya episode)
     - sort_order: asc veya desc (varsayılan: asc)
+    - user_id: Verilirse her bölüm için kullanıcının bilmediği kelime sayısı da döner
     
     Returns:
     - episodes: Her bölüm için seviye dağılımı
     - total_levels: Toplam seviye sayısı
     - summary: İstatistikler
     """
+    if not EPISODE_MATRIX_AVAILABLE:
+        return jsonify({'success': False, 'error': 'numpy and scipy are required for episode analysis'}), 503
+    
     target_season = request.args.get('season', 'all')
     sort_by = request.args.get('sort_by', 'total')
     sort_order = request.args.get('sort_order', 'asc')
@@ -1251,19 +1495,8 @@ def analyze_friends_episodes() -> Tuple[Response, int]:
     
     # Create word-to-level mapping
     # OPTIMIZATION: Fetch all mappings in a single query instead of looping
-    word_levels: Dict[str, int] = {}
-    
-    conn = db.get_connection()
-    cursor = conn.cursor()
-    cursor.execute('''
-        SELECT w.word, lp.package_number 
-        FROM words w
-        JOIN package_words pw ON w.id = pw.word_id
-        JOIN learning_packages lp ON pw.package_id = lp.id
-    ''')
-    for row in cursor.fetchall():
-        word_levels[row['word'].lower()] = row['package_number']
-    conn.close()
+    word_levels: Dict[str, int] = db.get_word_levels()
+    user_id = request.args.get('user_id', type=int)
     
     # Friends season configurations
     friends_seasons: Dict[int, Dict[str, Any]] = {
@@ -1305,15 +1538,22 @@ def analyze_friends_episodes() -> Tuple[Response, int]:
     results: List[Dict[str, Any]] = []
     total_levels = len(levels)
     
+    # One sparse product gives every episode's level distribution
+    sources = _find_friends_subtitle_sources(base_path, friends_seasons, patterns)
+    matrix = get_episode_matrix('friends_subtitles')
+    if matrix.refresh(sources, lambda src: speech_processor.count_subtitle_words(src['path'])):
+        matrix.save()
+    matrix = matrix.snapshot()  # One consistent state even if another request refreshes meanwhile
+    
+    distribution = matrix.level_distribution(matrix.level_vector(word_levels), total_levels)
+    type_totals = distribution.sum(axis=1)
+    user_unknown = None
+    if user_id:
+        known_mask = matrix.known_mask(db.get_known_word_texts(user_id))
+        user_unknown = matrix.masked_totals(1.0 - known_mask, binary=True)
+    
     for season in seasons_to_analyze:
-        season_info = friends_seasons[season]
-        season_folder = os.path.join(base_path, f"Friends{season}")
-        
-        # Also check Friends1, Friends2 etc.
-        if not os.path.exists(season_folder):
-            alt_folder = os.path.join(base_path, f"Friends{season}")
-        
-        for episode in range(1, season_info["episodes"] + 1):
+        for episode in range(1, friends_seasons[season]["episodes"] + 1):
             episode_data = {
                 "season": season,
                 "episode": episode,
@@ -1321,56 +1561,34 @@ def analyze_friends_episodes() -> Tuple[Response, int]:
                 "total_words": 0,
                 "unknown_words": 0,
             }
-            
-            # Add level columns
             for i in range(1, total_levels + 1):
                 episode_data[f"level_{i}"] = 0
             
-            subtitle_path = None
-            
-            # Try to find subtitle file
-            if os.path.exists(season_folder):
-                for filename in os.listdir(season_folder):
-                    filename_lower = filename.lower()
-                    for pattern in patterns:
-                        pattern_str = pattern(season, episode)
-                        if pattern_str.lower() in filename_lower and filename_lower.endswith(('.srt', '.sub', '.vtt')):
-                            subtitle_path = os.path.join(season_folder, filename)
-                            break
-                    if subtitle_path:
-                        break
-            
-            if subtitle_path and os.path.exists(subtitle_path):
-                try:
-                    with open(subtitle_path, 'r', encoding='utf-8', errors='ignore') as f:
-                        content = f.read()
-                    
-                    # Parse SRT and extract words
-                    words = speech_processor.extract_words(content)
-                    episode_data["total_words"] = len(words)
-                    
-                    # Count words per level
-                    level_counts: Dict[int, int] = {}
-                    for word in words:
-                        word_lower = word.lower()
-                        level = word_levels.get(word_lower)
-                        
-                        if level:
-                            if level not in level_counts:
-                                level_counts[level] = 0
-                            level_counts[level] += 1
-                        else:
-                            episode_data["unknown_words"] += 1
-                    
-                    # Update episode data with level counts
-                    for level_num, count in level_counts.items():
-                        episode_data[f"level_{level_num}"] = count
-                        
-                except Exception as e:
-                    print(f"   ⚠️ Hata: {subtitle_path} okunamadı: {str(e)[:50]}")
+            row = matrix.row_of(f"s{season:02d}e{episode:02d}")
+            if row is not None:
+                episode_data["total_words"] = int(type_totals[row])
+                episode_data["unknown_words"] = int(distribution[row, 0])
+                for i in range(1, total_levels + 1):
+                    episode_data[f"level_{i}"] = int(distribution[row, i])
+                if user_unknown is not None:
+                    episode_data["user_unknown_words"] = int(user_unknown[row])
             
             results.append(episode_data)
     
+    # Season summaries straight from the matrix rows
+    season_rows = [i for i, ep in enumerate(matrix.episodes) if ep['season'] in seasons_to_analyze]
+    season_summaries = {
+        f"season_{season}": {
+            "total_words": int(sums[0]),
+            "unknown_words": int(sums[1]),
+            **{f"level_{i}": int(sums[i + 1]) for i in range(1, total_levels + 1)}
+        }
+        for season, sums in group_sums(
+            np.column_stack([type_totals, distribution])[season_rows],
+            [matrix.episodes[i]['season'] for i in season_rows]
+        ).items()
+    } if season_rows else {}
+
     # Sort results
     reverse = sort_order == 'desc'
     if sort_by == 'episode':
@@ -1399,6 +1617,7 @@ def analyze_friends_episodes() -> Tuple[Response, int]:
         "total_unknown": total_unknown,
         "total_known": total_words_all - total_unknown,
         "level_sums": level_sums,
+        "season_summaries": season_summaries,
         "average_words_per_episode": round(total_words_all / len(results), 1) if results else 0
     }
     
@@ -1506,73 +1725,126 @@ def get_package_user_progress(package_id: int) -> Tuple[Response, int]:
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
-@app.route('/api/admin/recalculate-levels', methods=['POST'])
-def recalculate_levels() -> Tuple[Response, int]:
+def _recalculate_levels_job(job: Job, package_size: int) -> Dict[str, Any]:
     """
     Veritabanındaki kelimelere göre kelime haritasını hesaplar,
-    yedek alır ve frekanslara göre seviyelendirmeyi yeniden yapar.
+    yedek alır ve frekanslara göre seviyelendirmeyi yeniden yapar (background job).
     """
-    try:
-        # 1. Yedek al
-        import shutil
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        backup_path = f'learning_backup_{timestamp}.db'
-        if os.path.exists('learning.db'):
-            shutil.copy('learning.db', backup_path)
-        
-        # 2. Paketleri yeniden oluştur (Database sınıfındaki metodu kullan)
-        # Varsayılan paket boyutu 500
-        package_size = 500
-        data = request.get_json() or {}
-        if 'package_size' in data:
-            try:
-                package_size = int(data['package_size'])
-            except:
-                pass
-                
-        count = db.generate_learning_packages(package_size)
-        
-        # 3. İstatistikleri topla
-        conn = db.get_connection()
-        cursor = conn.cursor()
-        
-        # Genel istatistikler
-        cursor.execute("SELECT COUNT(*), SUM(frequency) FROM words")
-        row = cursor.fetchone()
-        total_words = row[0] if row else 0
-        total_freq = row[1] if row else 0
-        
-        # Frekans dağılımı
-        freq_ranges = [
-            (10000, "Çok Yüksek"),
-            (1000, "Yüksek"),
-            (100, "Orta-Yüksek"),
-            (50, "Orta"),
-            (10, "Orta-Düşük"),
-            (5, "Düşük"),
-            (0, "Çok Düşük")
-        ]
-        
-        distribution = []
-        for min_freq, label in freq_ranges:
-            cursor.execute("SELECT COUNT(*) FROM words WHERE frequency >= ?", (min_freq,))
-            cnt = cursor.fetchone()[0]
-            distribution.append({'label': label, 'min_freq': min_freq, 'count': cnt})
-            
-        conn.close()
+    # 1. Yedek al
+    job.progress(0, 3, 'Yedek alınıyor')
+    import shutil
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    backup_path = f'learning_backup_{timestamp}.db'
+    if os.path.exists('learning.db'):
+        shutil.copy('learning.db', backup_path)
+    
+    # 2. Paketleri yeniden oluştur (Database sınıfındaki metodu kullan)
+    job.progress(1, 3, 'Seviyeler hesaplanıyor')
+    count = db.generate_learning_packages(package_size)
+    
+    # 3. İstatistikleri topla
+    job.progress(2, 3, 'İstatistikler toplanıyor')
+    conn = db.get_connection()
+    cursor = conn.cursor()
+    
+    # Genel istatistikler
+    cursor.execute("SELECT COUNT(*), SUM(frequency) FROM words")
+    row = cursor.fetchone()
+    total_words = row[0] if row else 0
+    total_freq = row[1] if row else 0
+    
+    # Frekans dağılımı
+    freq_ranges = [
+        (10000, "Çok Yüksek"),
+        (1000, "Yüksek"),
+        (100, "Orta-Yüksek"),
+        (50, "Orta"),
+        (10, "Orta-Düşük"),
+        (5, "Düşük"),
+        (0, "Çok Düşük")
+    ]
+    
+    distribution = []
+    for min_freq, label in freq_ranges:
+        cursor.execute("SELECT COUNT(*) FROM words WHERE frequency >= ?", (min_freq,))
+        cnt = cursor.fetchone()[0]
+        distribution.append({'label': label, 'min_freq': min_freq, 'count': cnt})
         
+    conn.close()
+    
+    return {
+        'success': True,
+        'message': f'Kelime haritası hesaplandı. {count} seviye oluşturuldu.',
+        'backup_created': backup_path,
+        'stats': {
+            'total_words': total_words,
+            'total_freq': total_freq,
+            'distribution': distribution,
+            'levels_created': count
+        }
+    }
+
+@app.route('/api/admin/recalculate-levels', methods=['POST'])
+def recalculate_levels() -> Tuple[Response, int]:
+    """Queue a level recalculation; poll /api/jobs/<job_id> for the result"""
+    # Varsayılan paket boyutu 500
+    package_size = 500
+    data = request.get_json(silent=True) or {}
+    if 'package_size' in data:
+        try:
+            package_size = int(data['package_size'])
+        except:
+            pass
+    
+    job = job_manager.submit('levels', _recalculate_levels_job, {'package_size': package_size})
+    return _job_accepted(job)
+
+@app.route('/api/admin/enrich-words', methods=['POST'])
+def enrich_words() -> Tuple[Response, int]:
+    """Queue WordNet/CMUdict enrichment (gloss, part of speech, IPA) of words not enriched yet"""
+    if not corpora_available():
+        return jsonify({'success': False, 'error': 'NLTK wordnet and cmudict corpora are required'}), 503
+    
+    def run(job: Job) -> Dict[str, Any]:
+        stats = enrich_vocabulary(db, progress=job.progress)
+        return {
+            'success': True,
+            'message': f"{stats['processed']} kelime işlendi: {stats['glosses']} tanım, {stats['pronunciations']} telaffuz.",
+            'stats': stats
+        }
+    
+    job = job_manager.submit('enrichment', run)
+    return _job_accepted(job)
+
+@app.route('/api/admin/rebuild-concordance', methods=['POST'])
+def rebuild_concordance() -> Tuple[Response, int]:
+    """Rebuild the concordance (KWIC) index over all transcripts and subtitles"""
+    try:
+        documents = iter_transcript_documents(db.get_custom_series())
+        stats = get_concordance().build(documents)
         return jsonify({
             'success': True,
-            'message': f'Kelime haritası hesaplandı. {count} seviye oluşturuldu.',
-            'backup_created': backup_path,
-            'stats': {
-                'total_words': total_words,
-                'total_freq': total_freq,
-                'distribution': distribution,
-                'levels_created': count
-            }
+            'message': f"{stats['documents']} bölüm indekslendi.",
+            'stats': stats
+        }), 200
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/admin/search/backfill', methods=['POST'])
+def backfill_search() -> Tuple[Response, int]:
+    """Index transcripts and subtitles that are missing or changed in the search index"""
+    if not SEARCH_AVAILABLE:
+        return jsonify({'success': False, 'error': 'SQLite FTS5 is not available'}), 503
+    try:
+        documents = iter_transcript_documents(db.get_custom_series())
+        # Subtitle-backed video records duplicate files that are indexed directly
+        videos = [v for v in db.get_videos() if not (v.get('video_url') or '').startswith('subtitle://')]
+        stats = backfill_search_index(db, documents, videos)
+        return jsonify({
+            'success': True,
+            'message': f"{stats['indexed']} belge indekslendi, {stats['skipped']} belge güncel.",
+            'stats': stats
         }), 200
-        
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
@@ -1680,8 +1952,7 @@ def get_subtitle_content() -> Tuple[Response, int]:
          
     if os.path.exists(full_path):
         try:
-            with open(full_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
+            content = read_text(full_path)
             return jsonify({'success': True, 'content': content}), 200
         except Exception as e:
             return jsonify({'success': False, 'error': str(e)}), 500
@@ -1978,26 +2249,21 @@ def process_subtitle_episode() -> Tuple[Response, int]:
     try:
         # Use streaming for large files
         try:
-            from utils.streaming import should_use_streaming, process_subtitle_streaming
-            
-            if should_use_streaming(subtitle_path, threshold_mb=10.0):
-                print(f"📦 Using streaming for large subtitle file: {subtitle_path}")
-                # Process in streaming fashion
-                lines = []
-                for line in process_subtitle_streaming(subtitle_path):
-                    lines.append(line)
-                content = ' '.join(lines)
-            else:
-                # Regular reading for small files
-                with open(subtitle_path, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read()
+            from utils.streaming import should_use_streaming
+            use_streaming = should_use_streaming(subtitle_path, threshold_mb=10.0)
         except ImportError:
-            # Fallback to regular reading if streaming not available
-            with open(subtitle_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
+            use_streaming = False
         
-        # Extract words using speech processor
-        words = speech_processor.extract_words(content)
+        if use_streaming:
+            # Bounded-memory mmap tokenizer; transcript is stored as a preview
+            print(f"📦 Using streaming for large subtitle file: {subtitle_path}")
+            words, content = speech_processor.ingest_subtitle_file(subtitle_path)
+        else:
+            # Regular reading for small files
+            content = read_text(subtitle_path)
+            
+            # Extract words using speech processor
+            words = speech_processor.extract_words(content)
         word_count = len(words)
         
         # Generate title
@@ -2011,15 +2277,13 @@ def process_subtitle_episode() -> Tuple[Response, int]:
         for word in words:
             word_id = db.get_or_add_word(word)
             if word_id is not None:
-                # Get definition for new words
-                definition, pronunciation = db.get_word_definition(word)
-                if definition:
-                    db.update_word_definition(word_id, definition, pronunciation or '')
-                
                 if user_id:
                     db.add_user_word(user_id, word_id)
                 new_words_count += 1
         
+        # Definitions come from local sources; misses are fetched in the background
+        get_definition_resolver(db).resolve_many(words)
+        
         # Create video record
         video_id = db.add_video_record(
             filename=title,
@@ -2036,6 +2300,14 @@ def process_subtitle_episode() -> Tuple[Response, int]:
                 word_id = db.get_or_add_word(word)
                 if word_id is not None:
                     db.add_video_word(video_id, word_id)
+            
+            # Persist cue timings for playback sync
+            if subtitle_path.lower().endswith(('.srt', '.vtt')):
+                cue_index = CueIndex.from_subtitle_file(subtitle_path)
+                if len(cue_index):
+                    get_cue_store().put(video_id, cue_index)
+            
+            _transcript_ingested(make_document(series, subtitle_path))
         
         return jsonify({
             'success': True,
@@ -2142,6 +2414,19 @@ def on_leave_room(data: Dict[str, Any]) -> None:
         
         del active_sessions[request.sid] # type: ignore
 
+@socketio.on('subscribe_job')
+def on_subscribe_job(data: Dict[str, Any]) -> None:
+    """Receive job_progress events for a background job"""
+    job_id = data.get('job_id')
+    job = job_manager.get(job_id) if job_id else None
+    if not job:
+        emit('error', {'message': 'Job not found'})
+        return
+
+    join_room(f'job_{job_id}')
+    # Current state right away; the job may have moved on (or finished) before the client subscribed
+    emit('job_progress', job)
+
 @socketio.on('send_message')
 def on_send_message(data: Dict[str, Any]) -> None:
     """Handle chat message"""
@@ -2189,13 +2474,25 @@ def on_video_sync(data: Dict[str, Any]) -> None:
         'timestamp': datetime.now().isoformat()
     }
     
-    # Broadcast to room
-    room_name = f'room_{room_id}'
-    emit('video_state_changed', {
+    state = {
         'action': action,
         'current_time': current_time,
         'user_id': user_id
-    }, to=room_name, skip_sid=request.sid) # type: ignore
+    }
+    
+    # Attach the subtitle cue at the new position when the episode is known
+    video_id = data.get('video_id')
+    if video_id:
+        try:
+            cue_index = _get_video_cue_index(int(video_id))
+            if cue_index is not None:
+                state['cue'] = cue_index.at(int(float(current_time) * 1000))
+        except (TypeError, ValueError):
+            pass
+    
+    # Broadcast to room
+    room_name = f'room_{room_id}'
+    emit('video_state_changed', state, to=room_name, skip_sid=request.sid) # type: ignore
 
 @socketio.on('screen_share_start')
 def on_screen_share_start(data: Dict[str, Any]) -> None:
@@ -2272,160 +2569,171 @@ def on_webrtc_ice_candidate(data: Dict[str, Any]) -> None:
 
 # ===== SERIES WORD MAP ROUTES =====
 
-@app.route('/api/series/build-word-map', methods=['POST'])
-def build_combined_word_map() -> Tuple[Response, int]:
-    """Build word map from selected series database files (can combine multiple series)"""
-    try:
-        data = request.get_json()
-        selected_series = data.get('series', [])  # List of series: ['friends', 'bigbang']
-        auto_translate = data.get('auto_translate', False)  # Optional: auto-translate (can be slow)
-        
-        if not selected_series:
-            return jsonify({'success': False, 'error': 'No series selected'}), 400
-        
-        import sqlite3
-        from collections import Counter
-        
-        # Collect all words from all selected series
-        all_words_counter = Counter()
-        db_files_processed = 0
-        processed_series = []
+def _build_word_map_job(job: Job, selected_series: List[str], auto_translate: bool) -> Dict[str, Any]:
+    """Build word map from selected series database files (background job)"""
+    import sqlite3
+    from collections import Counter
+    
+    # Collect all words from all selected series
+    all_words_counter = Counter()
+    db_files_processed = 0
+    processed_series = []
+    
+    subtitles_base = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Subtitles")
+    
+    # Resolve every series folder first so progress has a total
+    series_folders: List[Tuple[str, str, List[str]]] = []
+    for series in selected_series:
+        folder_path = None
+            
+        # Check if it's a built-in series
+        if series == 'friends':
+            folder_path = os.path.join(subtitles_base, "friends_db")
+        elif series == 'bigbang':
+            folder_path = os.path.join(subtitles_base, "bigbang_db")
+        else:
+            # Check if it's a custom series
+            custom_series = db.get_custom_series_by_id(series)
+            if custom_series:
+                folder_path = custom_series['db_folder_path']
         
-        subtitles_base = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Subtitles")
+        if not folder_path or not os.path.exists(folder_path):
+            continue
+        series_folders.append((series, folder_path, [f for f in os.listdir(folder_path) if f.endswith('.db')]))
+    
+    total_files = sum(len(filenames) for _, _, filenames in series_folders)
+    files_read = 0
+    job.progress(0, total_files, 'Bölüm veritabanları okunuyor')
+    
+    for series, folder_path, filenames in series_folders:
+        # Collect words from this series
+        series_words = Counter()
+        series_files = 0
         
-        for series in selected_series:
-            folder_path = None
+        for filename in filenames:
+            db_path = os.path.join(folder_path, filename)
+            files_read += 1
+            try:
+                # Use timeout for external database connections
+                conn = sqlite3.connect(db_path, timeout=30.0)
+                cursor = conn.cursor()
                 
-            # Check if it's a built-in series
-            if series == 'friends':
-                folder_path = os.path.join(subtitles_base, "friends_db")
-            elif series == 'bigbang':
-                folder_path = os.path.join(subtitles_base, "bigbang_db")
-            else:
-                # Check if it's a custom series
-                custom_series = db.get_custom_series_by_id(series)
-                if custom_series:
-                    folder_path = custom_series['db_folder_path']
-            
-            if not folder_path or not os.path.exists(folder_path):
+                # Read word frequencies from this episode's database
+                cursor.execute("SELECT word, frequency FROM word_frequencies")
+                for row in cursor.fetchall():
+                    word = row[0].lower().strip()
+                    frequency = row[1]
+                    series_words[word] += frequency
+                
+                conn.close()
+                series_files += 1
+            except Exception as e:
+                print(f"Error processing {filename}: {e}")
                 continue
-            
-            # Collect words from this series
-            series_words = Counter()
-            series_files = 0
-            
-            for filename in os.listdir(folder_path):
-                if filename.endswith('.db'):
-                    db_path = os.path.join(folder_path, filename)
-                    try:
-                        # Use timeout for external database connections
-                        conn = sqlite3.connect(db_path, timeout=30.0)
-                        cursor = conn.cursor()
-                        
-                        # Read word frequencies from this episode's database
-                        cursor.execute("SELECT word, frequency FROM word_frequencies")
-                        for row in cursor.fetchall():
-                            word = row[0].lower().strip()
-                            frequency = row[1]
-                            series_words[word] += frequency
-                        
-                        conn.close()
-                        series_files += 1
-                    except Exception as e:
-                        print(f"Error processing {filename}: {e}")
-                        continue
-            
-            # Merge into main counter
-            for word, freq in series_words.items():
-                all_words_counter[word] += freq
-            
-            db_files_processed += series_files
-            processed_series.append(series)
+            finally:
+                job.progress(files_read, total_files)
         
-        if not all_words_counter:
-            return jsonify({
-                'success': False,
-                'error': 'No words found in selected series databases'
-            }), 404
+        # Merge into main counter
+        for word, freq in series_words.items():
+            all_words_counter[word] += freq
         
-        # Add all words to main database (with proper transaction handling)
-        conn_main = None
-        try:
-            conn_main = db.get_connection()
-            cursor_main = conn_main.cursor()
-            
-            # Start transaction
-            words_added = 0
-            batch_size = 100
-            word_batch = []
-            
-            for word, total_frequency in all_words_counter.items():
-                # Get or add word
-                word_id = db.get_or_add_word(word)
-                if word_id:
-                    word_batch.append((total_frequency, word_id))
-                    words_added += 1
-                    
-                    # Batch update for better performance
-                    if len(word_batch) >= batch_size:
-                        cursor_main.executemany('UPDATE words SET frequency = ? WHERE id = ?', word_batch)
-                        conn_main.commit()
-                        word_batch = []
-            
-            # Update remaining words
-            if word_batch:
-                cursor_main.executemany('UPDATE words SET frequency = ? WHERE id = ?', word_batch)
-                conn_main.commit()
-            
-            # Generate learning packages from these words
-            # Clear existing packages first
-            cursor_main.execute('DELETE FROM package_words')
-            cursor_main.execute('DELETE FROM learning_packages')
-            conn_main.commit()
-            
-            # Generate new packages
-            package_size = 500
-            count = db.generate_learning_packages(package_size)
-            
+        db_files_processed += series_files
+        processed_series.append(series)
+    
+    if not all_words_counter:
+        raise LookupError('No words found in selected series databases')
+    
+    # Add all words to main database (with proper transaction handling)
+    conn_main = None
+    try:
+        conn_main = db.get_connection()
+        cursor_main = conn_main.cursor()
+        
+        # Start transaction
+        words_added = 0
+        batch_size = 100
+        word_batch = []
+        job.progress(0, len(all_words_counter), 'Kelimeler kaydediliyor')
+        
+        for word, total_frequency in all_words_counter.items():
+            # Get or add word
+            word_id = db.get_or_add_word(word)
+            if word_id:
+                word_batch.append((total_frequency, word_id))
+                words_added += 1
+                
+                # Batch update for better performance
+                if len(word_batch) >= batch_size:
+                    cursor_main.executemany('UPDATE words SET frequency = ? WHERE id = ?', word_batch)
+                    conn_main.commit()
+                    word_batch = []
+                    job.progress(words_added, len(all_words_counter))
+        
+        # Update remaining words
+        if word_batch:
+            cursor_main.executemany('UPDATE words SET frequency = ? WHERE id = ?', word_batch)
             conn_main.commit()
-            
-            # Auto-translate only if requested (can be very slow for large datasets)
-            translated_count = 0
-            if auto_translate:
-                translated_count = auto_translate_all_words()
-            
-            message = f'Word map built for {", ".join(processed_series)}: {len(all_words_counter)} unique words, {count} packages created'
-            if auto_translate:
-                message += f', {translated_count} words translated'
-            else:
-                message += ' (çeviriler için "Çevir" butonunu kullanın)'
-            
-            return jsonify({
-                'success': True,
-                'series': processed_series,
-                'unique_words': len(all_words_counter),
-                'total_frequency': sum(all_words_counter.values()),
-                'db_files_processed': db_files_processed,
-                'words_added': words_added,
-                'packages_created': count,
-                'translated_count': translated_count,
-                'auto_translate_enabled': auto_translate,
-                'message': message
-            }), 200
-            
-        except Exception as e:
-            if conn_main:
-                conn_main.rollback()
-            raise e
-        finally:
-            if conn_main:
-                conn_main.close()
+        
+        # Generate learning packages from these words
+        # Clear existing packages first
+        job.progress(words_added, len(all_words_counter), 'Seviyeler oluşturuluyor')
+        cursor_main.execute('DELETE FROM package_words')
+        cursor_main.execute('DELETE FROM learning_packages')
+        conn_main.commit()
+        
+        # Generate new packages
+        package_size = 500
+        count = db.generate_learning_packages(package_size)
+        
+        conn_main.commit()
         
     except Exception as e:
-        import traceback
-        print(f"Error building word map: {e}")
-        print(traceback.format_exc())
-        return jsonify({'success': False, 'error': str(e)}), 500
+        if conn_main:
+            conn_main.rollback()
+        raise e
+    finally:
+        if conn_main:
+            conn_main.close()
+    
+    # Auto-translate only if requested (can be very slow for large datasets)
+    translated_count = 0
+    if auto_translate:
+        job.progress(0, 0, 'Kelimeler çevriliyor')
+        translated_count = auto_translate_all_words(progress=job.progress)
+    
+    message = f'Word map built for {", ".join(processed_series)}: {len(all_words_counter)} unique words, {count} packages created'
+    if auto_translate:
+        message += f', {translated_count} words translated'
+    else:
+        message += ' (çeviriler için "Çevir" butonunu kullanın)'
+    
+    return {
+        'success': True,
+        'series': processed_series,
+        'unique_words': len(all_words_counter),
+        'total_frequency': sum(all_words_counter.values()),
+        'db_files_processed': db_files_processed,
+        'words_added': words_added,
+        'packages_created': count,
+        'translated_count': translated_count,
+        'auto_translate_enabled': auto_translate,
+        'message': message
+    }
+
+@app.route('/api/series/build-word-map', methods=['POST'])
+def build_combined_word_map() -> Tuple[Response, int]:
+    """Queue a word map build from selected series (can combine multiple series); poll /api/jobs/<job_id>"""
+    data = request.get_json(silent=True) or {}
+    selected_series = data.get('series', [])  # List of series: ['friends', 'bigbang']
+    auto_translate = bool(data.get('auto_translate', False))  # Optional: auto-translate (can be slow)
+    
+    if not selected_series or not isinstance(selected_series, list):
+        return jsonify({'success': False, 'error': 'No series selected'}), 400
+    
+    job = job_manager.submit('word_map', _build_word_map_job,
+                             {'selected_series': selected_series, 'auto_translate': auto_translate},
+                             data.get('user_id'))
+    return _job_accepted(job)
 
 # Old endpoint removed - now using /api/profile/word-map for combined word map
 
@@ -2642,16 +2950,16 @@ def start_flashcard_session() -> Tuple[Response, int]:
         return jsonify({'success': False, 'error': 'Invalid request'}), 400
     
     user_id: Optional[int] = data.get('user_id')
-    session_type: str = data.get('type', 'all')  # 'level', 'video', 'all', 'problem', 'random'
-    target_id: Optional[int] = data.get('target_id')  # package_id or video_id
+    session_type: str = data.get('type', 'all')  # 'level', 'phrase', 'video', 'all', 'problem', 'random'
+    target_id: Optional[int] = data.get('target_id')  # package_id, phrase level or video_id
     
     if not user_id:
         return jsonify({'success': False, 'error': 'User ID required'}), 400
     
-    if session_type not in ['level', 'video', 'all', 'problem', 'random']:
+    if session_type not in ['level', 'phrase', 'video', 'all', 'problem', 'random']:
         return jsonify({'success': False, 'error': 'Invalid session type'}), 400
     
-    if session_type in ['level', 'video'] and not target_id:
+    if session_type in ['level', 'phrase', 'video'] and not target_id:
         return jsonify({'success': False, 'error': f'target_id required for {session_type} session'}), 400
     
     try:
@@ -2876,6 +3184,14 @@ def get_flashcard_options() -> Tuple[Response, int]:
                 'total_words': row['word_count']
             })
         
+        # Get phrase levels
+        phrase_levels = [{
+            'id': level['level'],
+            'name': f"İfadeler {level['level']}",
+            'unknown_words': level['phrase_count'] - level['known_count'],
+            'total_words': level['phrase_count']
+        } for level in db.get_phrase_levels(user_id)]
+        
         # Get user stats
         user_stats = db.get_user_stats(user_id)
         
@@ -2885,6 +3201,7 @@ def get_flashcard_options() -> Tuple[Response, int]:
             'success': True,
             'options': {
                 'levels': packages,
+                'phrase_levels': phrase_levels,
                 'videos': videos,
                 'all_words': {
                     'name': 'Tüm Bilinmeyen Kelimeler',
@@ -2981,6 +3298,36 @@ def get_episode_video_flashcards(video_id: int) -> Tuple[Response, int]:
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
+def _get_video_cue_index(video_id: int) -> Optional[CueIndex]:
+    """
+    Cue index of a video, stored at ingestion from its subtitle file or its
+    Whisper segment timings; None for videos ingested without either
+    """
+    return get_cue_store().get(video_id)
+
+@app.route('/api/episodes/<int:video_id>/cues', methods=['GET'])
+def get_episode_cues(video_id: int) -> Tuple[Response, int]:
+    """Get the cue shown at time t (seconds) and the next n cues"""
+    try:
+        t = request.args.get('t', 0.0, type=float)
+        n = max(0, min(request.args.get('n', 5, type=int), 50))
+        
+        cue_index = _get_video_cue_index(video_id)
+        if cue_index is None:
+            return jsonify({'success': False, 'error': 'No timed subtitles for this episode'}), 404
+        
+        t_ms = int(t * 1000)
+        return jsonify({
+            'success': True,
+            'video_id': video_id,
+            't': t,
+            'current': cue_index.at(t_ms),
+            'next': cue_index.following(t_ms, n),
+            'cue_count': len(cue_index)
+        }), 200
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
 # ===== SERIES SPECIFIC ROUTES (Friends & Big Bang Theory) =====
 
 @app.route('/api/series/<series>/videos', methods=['GET'])
@@ -3137,6 +3484,88 @@ def get_series_episodes(series: str) -> Tuple[Response, int]:
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
+# (folder, season, episode) -> transcript path, so repeat requests skip the glob search
+_series_transcript_paths: Dict[Tuple[str, int, int], str] = {}
+
+def _find_series_transcript_file(series_folder: str, season: int, episode: int) -> Optional[str]:
+    """Find the transcript/subtitle file of an episode of a built-in series"""
+    key = (series_folder, season, episode)
+    cached = _series_transcript_paths.get(key)
+    if cached and os.path.exists(cached):
+        return cached
+    
+    import glob as glob_module
+    
+    # Different patterns for different series
+    possible_patterns = [
+        # Our standardized format (highest priority)
+        f"s{season:02d}e{episode:02d}-transcript.txt",
+        f"s{season:02d}e{episode:02d}*.txt",
+        f"S{season:02d}E{episode:02d}*.txt",
+        # Big Bang Theory format - many variations:
+        # series-1-episode-1-title.txt (no padding)
+        # series-1-episode-08-title.txt (episode padded)
+        # series-06-episode-23-title.txt (both padded)
+        f"series-{season}-episode-{episode}-*.txt",        # series-1-episode-1-
+        f"series-{season}-episode-{episode:02d}-*.txt",    # series-1-episode-01-
+        f"series-{season:02d}-episode-{episode}-*.txt",    # series-01-episode-1-
+        f"series-{season:02d}-episode-{episode:02d}-*.txt", # series-01-episode-01-
+        # Other standard formats
+        f"season-{season}-episode-{episode}*.txt",
+        f"{season}x{episode:02d}*.txt",
+        # SRT formats
+        f"*s{season:02d}e{episode:02d}*.srt",
+        f"*{season}x{episode:02d}*.srt",
+        # Friends format possibilities
+        f"friends.s{season:02d}e{episode:02d}*.srt",
+        f"Friends.S{season:02d}E{episode:02d}*.srt",
+    ]
+    
+    # Series folder first, then season subdirectories
+    for subdir in ['', f'Season {season}', f'Season{season}', f's{season:02d}']:
+        search_path = os.path.join(series_folder, subdir) if subdir else series_folder
+        if not os.path.exists(search_path):
+            continue
+        for pattern in possible_patterns:
+            matches = glob_module.glob(os.path.join(search_path, pattern))
+            if matches:
+                _series_transcript_paths[key] = matches[0]
+                return matches[0]
+    return None
+
+def _transcript_response(path: str, payload: Dict[str, Any]) -> Tuple[Response, int]:
+    """
+    Serve a normalized transcript with its word-id span table
+    
+    Spans are [start, end, word_id] over the returned text. With user_id the
+    known word ids are included, so the viewer can highlight without a
+    batch lookup. The ETag covers the file, the vocabulary and the user's
+    known words; a matching If-None-Match gets 304.
+    """
+    user_id = request.args.get('user_id', type=int)
+    entry = get_transcript_cache().get(path)
+    vocabulary_version = db.get_vocabulary_version()
+    user_version = db.get_user_words_version(user_id) if user_id else ''
+    etag = f"{entry.etag}-{hashlib.sha1(f'{vocabulary_version}:{user_id}:{user_version}'.encode()).hexdigest()[:12]}"
+    
+    if request.if_none_match.contains(etag):
+        response = app.response_class(status=304)
+        response.set_etag(etag)
+        return response, 304
+    
+    word_ids = entry.word_ids(vocabulary_version, db.get_word_ids)
+    payload['transcript'] = entry.text
+    payload['spans'] = entry.span_list(word_ids)
+    payload['words'] = [{'id': word_id, 'word': word} for word, word_id in zip(entry.types, word_ids) if word_id is not None]
+    if user_id:
+        known_ids = db.get_known_word_ids(user_id)
+        payload['known_word_ids'] = [word_id for word_id in word_ids if word_id in known_ids]
+    
+    response = jsonify({'success': True, **payload})
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response, 200
+
 @app.route('/api/series/<series>/transcript', methods=['GET'])
 def get_series_episode_transcript(series: str) -> Tuple[Response, int]:
     """Get transcript for a specific episode of a built-in series"""
@@ -3150,7 +3579,6 @@ def get_series_episode_transcript(series: str) -> Tuple[Response, int]:
         return jsonify({'success': False, 'error': 'Season and episode parameters required'}), 400
     
     try:
-        import glob as glob_module
         subtitles_base = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Subtitles")
         
         if series == 'friends':
@@ -3161,143 +3589,65 @@ def get_series_episode_transcript(series: str) -> Tuple[Response, int]:
             title_prefix = "The Big Bang Theory"
         
         series_folder = os.path.join(subtitles_base, folder_name)
+        transcript_path = _find_series_transcript_file(series_folder, season, episode)
         
-        # Try to find transcript file with various naming patterns
-        transcript = None
-        episode_title = None
-        
-        # Different patterns for different series
-        possible_patterns = [
-            # Our standardized format (highest priority)
-            f"s{season:02d}e{episode:02d}-transcript.txt",
-            f"s{season:02d}e{episode:02d}*.txt",
-            f"S{season:02d}E{episode:02d}*.txt",
-            # Big Bang Theory format - many variations:
-            # series-1-episode-1-title.txt (no padding)
-            # series-1-episode-08-title.txt (episode padded)
-            # series-06-episode-23-title.txt (both padded)
-            f"series-{season}-episode-{episode}-*.txt",        # series-1-episode-1-
-            f"series-{season}-episode-{episode:02d}-*.txt",    # series-1-episode-01-
-            f"series-{season:02d}-episode-{episode}-*.txt",    # series-01-episode-1-
-            f"series-{season:02d}-episode-{episode:02d}-*.txt", # series-01-episode-01-
-            # Other standard formats
-            f"season-{season}-episode-{episode}*.txt",
-            f"{season}x{episode:02d}*.txt",
-            # SRT formats
-            f"*s{season:02d}e{episode:02d}*.srt",
-            f"*{season}x{episode:02d}*.srt",
-            # Friends format possibilities
-            f"friends.s{season:02d}e{episode:02d}*.srt",
-            f"Friends.S{season:02d}E{episode:02d}*.srt",
-        ]
-        
-        for pattern in possible_patterns:
-            matches = glob_module.glob(os.path.join(series_folder, pattern))
-            if matches:
-                # Read the first matching file
-                matched_file = matches[0]
-                with open(matched_file, 'r', encoding='utf-8', errors='ignore') as f:
-                    transcript = f.read()
-                
-                # Remove Git merge conflict markers
-                # Remove conflict markers: <<<<<<< HEAD, =======, >>>>>>> branch_name
-                transcript = re.sub(r'^<<<<<<< .*$', '', transcript, flags=re.MULTILINE)
-                transcript = re.sub(r'^=======.*$', '', transcript, flags=re.MULTILINE)
-                transcript = re.sub(r'^>>>>>>> .*$', '', transcript, flags=re.MULTILINE)
-                # Clean up multiple consecutive newlines
-                transcript = re.sub(r'\n{3,}', '\n\n', transcript)
-                transcript = transcript.strip()
-                
-                # Extract episode title from filename
-                filename = os.path.basename(matched_file)
-                if 'episode' in filename.lower():
-                    # Extract title part: series-1-episode-10-the-loobenfeld-decay.txt -> the-loobenfeld-decay
-                    parts = filename.replace('.txt', '').replace('.srt', '').split('-')
-                    # Find index after "episode" and number
-                    try:
-                        ep_idx = next(i for i, p in enumerate(parts) if p == 'episode')
-                        title_parts = parts[ep_idx + 2:]  # Skip "episode" and episode number
-                        if title_parts:
-                            episode_title = ' '.join(title_parts).replace('-', ' ').title()
-                    except:
-                        pass
-                break
-        
-        # Also try subdirectories (e.g., Season folders)
-        if not transcript:
-            for subdir in ['', f'Season {season}', f'Season{season}', f's{season:02d}']:
-                search_path = os.path.join(series_folder, subdir) if subdir else series_folder
-                if os.path.exists(search_path):
-                    for pattern in possible_patterns:
-                        matches = glob_module.glob(os.path.join(search_path, pattern))
-                        if matches:
-                            with open(matches[0], 'r', encoding='utf-8', errors='ignore') as f:
-                                transcript = f.read()
-                            
-                            # Remove Git merge conflict markers
-                            # Remove conflict markers: <<<<<<< HEAD, =======, >>>>>>> branch_name
-                            transcript = re.sub(r'^<<<<<<< .*$', '', transcript, flags=re.MULTILINE)
-                            transcript = re.sub(r'^=======.*$', '', transcript, flags=re.MULTILINE)
-                            transcript = re.sub(r'^>>>>>>> .*$', '', transcript, flags=re.MULTILINE)
-                            # Clean up multiple consecutive newlines
-                            transcript = re.sub(r'\n{3,}', '\n\n', transcript)
-                            transcript = transcript.strip()
-                            
-                            break
-                if transcript:
-                    break
-        
-        if not transcript:
+        if not transcript_path:
             # Try to fetch from web for Friends
             if series == 'friends':
                 transcript = fetch_friends_transcript_from_web(season, episode)
                 if transcript:
                     # Save to file for future use
                     save_transcript_to_file('friends', season, episode, transcript)
+                    transcript_path = _find_series_transcript_file(series_folder, season, episode)
             
-            if not transcript:
+            if not transcript_path:
                 return jsonify({
                     'success': False,
                     'error': f'Bu bölüm için transkript bulunamadı. ({series} S{season:02d}E{episode:02d})'
                 }), 404
         
+        # Extract episode title from filename
+        episode_title = None
+        filename = os.path.basename(transcript_path)
+        if 'episode' in filename.lower():
+            # Extract title part: series-1-episode-10-the-loobenfeld-decay.txt -> the-loobenfeld-decay
+            parts = filename.replace('.txt', '').replace('.srt', '').split('-')
+            # Find index after "episode" and number
+            try:
+                ep_idx = next(i for i, p in enumerate(parts) if p == 'episode')
+                title_parts = parts[ep_idx + 2:]  # Skip "episode" and episode number
+                if title_parts:
+                    episode_title = ' '.join(title_parts).replace('-', ' ').title()
+            except:
+                pass
+        
         title = f"{title_prefix} - Season {season} Episode {episode}"
         if episode_title:
             title += f": {episode_title}"
         
-        return jsonify({
-            'success': True,
-            'transcript': transcript,
+        return _transcript_response(transcript_path, {
             'title': title,
             'series': series,
             'season': season,
             'episode': episode
-        }), 200
+        })
         
     except Exception as e:
         print(f"Error getting transcript: {e}")
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
-@app.route('/api/series/<series>/download-transcripts', methods=['POST'])
-def download_series_transcripts(series: str) -> Tuple[Response, int]:
-    """Download and save transcripts for a series season"""
-    if series not in ['friends', 'bigbang']:
-        return jsonify({'success': False, 'error': 'Invalid series. Use friends or bigbang'}), 400
-    
-    data = request.get_json() or {}
-    season = data.get('season', 1)
-    
-    # Episode counts per season
-    episode_counts = {
-        'friends': {1: 24, 2: 24, 3: 25, 4: 24, 5: 24, 6: 25, 7: 24, 8: 24, 9: 24, 10: 18},
-        'bigbang': {1: 17, 2: 23, 3: 23, 4: 24, 5: 24, 6: 24, 7: 24, 8: 24, 9: 24, 10: 24, 11: 24, 12: 24}
-    }
-    
-    if season not in episode_counts[series]:
-        return jsonify({'success': False, 'error': f'Invalid season {season} for {series}'}), 400
+# Episode counts per season
+TRANSCRIPT_EPISODE_COUNTS = {
+    'friends': {1: 24, 2: 24, 3: 25, 4: 24, 5: 24, 6: 25, 7: 24, 8: 24, 9: 24, 10: 18},
+    'bigbang': {1: 17, 2: 23, 3: 23, 4: 24, 5: 24, 6: 24, 7: 24, 8: 24, 9: 24, 10: 24, 11: 24, 12: 24}
+}
+
+def _download_transcripts_job(job: Job, series: str, season: int) -> Dict[str, Any]:
+    """Download and save transcripts for a series season (background job)"""
+    import time
     
-    total_episodes = episode_counts[series][season]
+    total_episodes = TRANSCRIPT_EPISODE_COUNTS[series][season]
     downloaded = 0
     failed = []
     already_exists = 0
@@ -3305,8 +3655,11 @@ def download_series_transcripts(series: str) -> Tuple[Response, int]:
     subtitles_base = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Subtitles")
     folder_name = "Friends" if series == 'friends' else "BigBangTheory"
     series_folder = os.path.join(subtitles_base, folder_name)
+    job.progress(0, total_episodes, f'Sezon {season} transkriptleri indiriliyor')
     
     for ep in range(1, total_episodes + 1):
+        job.progress(ep - 1, total_episodes)
+        
         # Check if already exists
         filename = f"s{season:02d}e{ep:02d}-transcript.txt"
         filepath = os.path.join(series_folder, filename)
@@ -3329,10 +3682,10 @@ def download_series_transcripts(series: str) -> Tuple[Response, int]:
             failed.append(ep)
         
         # Small delay to avoid rate limiting
-        import time
         time.sleep(0.5)
     
-    return jsonify({
+    job.progress(total_episodes, total_episodes)
+    return {
         'success': True,
         'series': series,
         'season': season,
@@ -3341,7 +3694,23 @@ def download_series_transcripts(series: str) -> Tuple[Response, int]:
         'already_exists': already_exists,
         'failed': failed,
         'message': f'Sezon {season}: {downloaded} yeni transkript indirildi, {already_exists} zaten mevcut, {len(failed)} başarısız'
-    }), 200
+    }
+
+@app.route('/api/series/<series>/download-transcripts', methods=['POST'])
+def download_series_transcripts(series: str) -> Tuple[Response, int]:
+    """Queue transcript downloads for a series season; poll /api/jobs/<job_id> for the result"""
+    if series not in ['friends', 'bigbang']:
+        return jsonify({'success': False, 'error': 'Invalid series. Use friends or bigbang'}), 400
+    
+    data = request.get_json(silent=True) or {}
+    season = data.get('season', 1)
+    
+    if season not in TRANSCRIPT_EPISODE_COUNTS[series]:
+        return jsonify({'success': False, 'error': f'Invalid season {season} for {series}'}), 400
+    
+    job = job_manager.submit('transcripts', _download_transcripts_job,
+                             {'series': series, 'season': season}, data.get('user_id'))
+    return _job_accepted(job)
 
 
 @app.route('/api/series/<series>/episodes/<int:season>/<int:episode>/flashcards', methods=['GET'])
@@ -3636,9 +4005,146 @@ def get_custom_series() -> Tuple[Response, int]:
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
+def _add_custom_series_job(job: Job, series_id: str, series_name: str, video_url: str, icon: str,
+                           user_id: Optional[int]) -> Dict[str, Any]:
+    """Add a new custom series from a video URL (background job)"""
+    import re
+    import sqlite3
+    from collections import Counter
+    
+    # Another request may have added the same series while this job was queued
+    if db.get_custom_series_by_id(series_id):
+        raise ValueError(f'"{series_name}" adında bir dizi zaten mevcut')
+    
+    # Create folder for this series
+    subtitles_base = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Subtitles")
+    series_folder = os.path.join(subtitles_base, f"{series_id}_db")
+    os.makedirs(series_folder, exist_ok=True)
+    
+    print(f"🎬 Processing video from URL: {video_url}")
+    print(f"📁 Series folder: {series_folder}")
+    
+    # Process video from URL
+    job.progress(0, 3, 'Video indiriliyor ve işleniyor')
+    download: Dict[str, Any] = {}
+    result = speech_processor.process_video_from_url(video_url, on_download=download.update)
+    
+    if not result or not result[0]:
+        raise RuntimeError('Video indirilemedi veya işlenemedi')
+    
+    filename = result[0]
+    words_set = result[1]
+    transcript = result[2]
+    
+    if not transcript or len(transcript.strip()) < 10:
+        raise RuntimeError('Video transkripti alınamadı veya çok kısa')
+    job.progress(1, 3, 'Bölüm veritabanı oluşturuluyor')
+    
+    # Save transcript to file
+    transcript_filename = f"{series_id}_episode_1.txt"
+    transcript_path = os.path.join(series_folder, transcript_filename)
+    with open(transcript_path, 'w', encoding='utf-8') as f:
+        f.write(transcript)
+    
+    print(f"📝 Transcript saved: {transcript_path}")
+    _transcript_ingested(make_document(series_id, transcript_path, f"{series_id}_"))
+    
+    # Extract words and calculate frequencies
+    cleaned_transcript = re.sub(r'\d{2}:\d{2}:\d{2},\d{3} --> \d{2}:\d{2}:\d{2},\d{3}', ' ', transcript)
+    cleaned_transcript = re.sub(r'<[^>]+>', ' ', cleaned_transcript)
+    cleaned_transcript = re.sub(r'\[[^\]]*\]', ' ', cleaned_transcript)
+    
+    transcript_words = re.findall(r"\b[a-zA-Z]+(?:'[a-zA-Z]+)?\b", cleaned_transcript.lower())
+    filtered_words = [w for w in transcript_words if len(w) > 1 or w in ['a', 'i']]
+    word_counts = Counter(filtered_words)
+    
+    # Create episode database
+    db_filename = f"{series_id}_episode_1.db"
+    db_path = os.path.join(series_folder, db_filename)
+    
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    
+    cursor.execute("DROP TABLE IF EXISTS word_frequencies")
+    cursor.execute("""
+        CREATE TABLE word_frequencies (
+            word TEXT PRIMARY KEY,
+            frequency INTEGER NOT NULL
+        )
+    """)
+    
+    cursor.execute("DROP TABLE IF EXISTS episode_info")
+    cursor.execute("""
+        CREATE TABLE episode_info (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        )
+    """)
+    
+    cursor.execute("INSERT INTO episode_info VALUES (?, ?)", ('filename', filename))
+    cursor.execute("INSERT INTO episode_info VALUES (?, ?)", ('total_words', str(len(filtered_words))))
+    cursor.execute("INSERT INTO episode_info VALUES (?, ?)", ('unique_words', str(len(word_counts))))
+    cursor.execute("INSERT INTO episode_info VALUES (?, ?)", ('source_url', video_url))
+    
+    sorted_data = sorted(word_counts.items(), key=lambda x: x[1], reverse=True)
+    cursor.executemany("INSERT INTO word_frequencies (word, frequency) VALUES (?, ?)", sorted_data)
+    
+    conn.commit()
+    conn.close()
+    
+    # Register new words up front so the flashcard endpoint stays read-only
+    db.add_words_batch(list(word_counts))
+    
+    print(f"🗄️ Database created: {db_path}")
+    print(f"📊 Total words: {len(filtered_words)}, Unique words: {len(word_counts)}")
+    
+    job.progress(2, 3, 'Dizi kaydediliyor')
+    
+    # Generate a nice gradient color
+    gradients = [
+        'linear-gradient(135deg, #6366f1 0%, #8b5cf6 100%)',
+        'linear-gradient(135deg, #06b6d4 0%, #3b82f6 100%)',
+        'linear-gradient(135deg, #10b981 0%, #059669 100%)',
+        'linear-gradient(135deg, #f59e0b 0%, #ef4444 100%)',
+        'linear-gradient(135deg, #ec4899 0%, #8b5cf6 100%)',
+        'linear-gradient(135deg, #14b8a6 0%, #06b6d4 100%)',
+    ]
+    import random
+    gradient = random.choice(gradients)
+    
+    # Add to custom_series table
+    display_name = f"{icon} {series_name}"
+    series_db_id = db.add_custom_series(
+        series_id=series_id,
+        name=series_name,
+        display_name=display_name,
+        db_folder_path=series_folder,
+        icon=icon,
+        gradient=gradient,
+        source_url=video_url,
+        created_by=user_id
+    )
+    
+    if series_db_id:
+        db.update_custom_series_episodes(series_id, 1)
+    
+    return {
+        'success': True,
+        'series_id': series_id,
+        'name': series_name,
+        'display_name': display_name,
+        'icon': icon,
+        'gradient': gradient,
+        'db_folder': series_folder,
+        'word_count': len(filtered_words),
+        'unique_words': len(word_counts),
+        'download': download,
+        'message': f'"{series_name}" başarıyla eklendi! {len(word_counts)} benzersiz kelime işlendi.'
+    }
+
 @app.route('/api/custom-series/add', methods=['POST'])
 def add_custom_series() -> Tuple[Response, int]:
-    """Add a new custom series from a video URL"""
+    """Queue adding a new custom series from a video URL; poll /api/jobs/<job_id> for the result"""
     data = request.get_json()
     if data is None:
         return jsonify({'success': False, 'error': 'Invalid request'}), 400
@@ -3652,10 +4158,6 @@ def add_custom_series() -> Tuple[Response, int]:
         return jsonify({'success': False, 'error': 'URL ve dizi adı gerekli'}), 400
     
     try:
-        import re
-        import sqlite3
-        from collections import Counter
-        
         # Generate series_id from name
         series_id = re.sub(r'[^a-z0-9]', '_', series_name.lower().strip())
         series_id = re.sub(r'_+', '_', series_id).strip('_')
@@ -3668,126 +4170,17 @@ def add_custom_series() -> Tuple[Response, int]:
         if existing:
             return jsonify({'success': False, 'error': f'"{series_name}" adında bir dizi zaten mevcut'}), 400
         
-        # Create folder for this series
-        subtitles_base = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Subtitles")
-        series_folder = os.path.join(subtitles_base, f"{series_id}_db")
-        os.makedirs(series_folder, exist_ok=True)
-        
-        print(f"🎬 Processing video from URL: {video_url}")
-        print(f"📁 Series folder: {series_folder}")
-        
-        # Process video from URL
-        result = speech_processor.process_video_from_url(video_url)
-        
-        if not result or not result[0]:
-            return jsonify({'success': False, 'error': 'Video indirilemedi veya işlenemedi'}), 500
-        
-        filename = result[0]
-        words_set = result[1]
-        transcript = result[2]
-        
-        if not transcript or len(transcript.strip()) < 10:
-            return jsonify({'success': False, 'error': 'Video transkripti alınamadı veya çok kısa'}), 500
-        
-        # Save transcript to file
-        transcript_filename = f"{series_id}_episode_1.txt"
-        transcript_path = os.path.join(series_folder, transcript_filename)
-        with open(transcript_path, 'w', encoding='utf-8') as f:
-            f.write(transcript)
-        
-        print(f"📝 Transcript saved: {transcript_path}")
-        
-        # Extract words and calculate frequencies
-        cleaned_transcript = re.sub(r'\d{2}:\d{2}:\d{2},\d{3} --> \d{2}:\d{2}:\d{2},\d{3}', ' ', transcript)
-        cleaned_transcript = re.sub(r'<[^>]+>', ' ', cleaned_transcript)
-        cleaned_transcript = re.sub(r'\[[^\]]*\]', ' ', cleaned_transcript)
-        
-        transcript_words = re.findall(r"\b[a-zA-Z]+(?:'[a-zA-Z]+)?\b", cleaned_transcript.lower())
-        filtered_words = [w for w in transcript_words if len(w) > 1 or w in ['a', 'i']]
-        word_counts = Counter(filtered_words)
-        
-        # Create episode database
-        db_filename = f"{series_id}_episode_1.db"
-        db_path = os.path.join(series_folder, db_filename)
-        
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute("DROP TABLE IF EXISTS word_frequencies")
-        cursor.execute("""
-            CREATE TABLE word_frequencies (
-                word TEXT PRIMARY KEY,
-                frequency INTEGER NOT NULL
-            )
-        """)
-        
-        cursor.execute("DROP TABLE IF EXISTS episode_info")
-        cursor.execute("""
-            CREATE TABLE episode_info (
-                key TEXT PRIMARY KEY,
-                value TEXT
-            )
-        """)
-        
-        cursor.execute("INSERT INTO episode_info VALUES (?, ?)", ('filename', filename))
-        cursor.execute("INSERT INTO episode_info VALUES (?, ?)", ('total_words', str(len(filtered_words))))
-        cursor.execute("INSERT INTO episode_info VALUES (?, ?)", ('unique_words', str(len(word_counts))))
-        cursor.execute("INSERT INTO episode_info VALUES (?, ?)", ('source_url', video_url))
-        
-        sorted_data = sorted(word_counts.items(), key=lambda x: x[1], reverse=True)
-        cursor.executemany("INSERT INTO word_frequencies (word, frequency) VALUES (?, ?)", sorted_data)
-        
-        conn.commit()
-        conn.close()
-        
-        print(f"🗄️ Database created: {db_path}")
-        print(f"📊 Total words: {len(filtered_words)}, Unique words: {len(word_counts)}")
-        
-        # Generate a nice gradient color
-        gradients = [
-            'linear-gradient(135deg, #6366f1 0%, #8b5cf6 100%)',
-            'linear-gradient(135deg, #06b6d4 0%, #3b82f6 100%)',
-            'linear-gradient(135deg, #10b981 0%, #059669 100%)',
-            'linear-gradient(135deg, #f59e0b 0%, #ef4444 100%)',
-            'linear-gradient(135deg, #ec4899 0%, #8b5cf6 100%)',
-            'linear-gradient(135deg, #14b8a6 0%, #06b6d4 100%)',
-        ]
-        import random
-        gradient = random.choice(gradients)
-        
-        # Add to custom_series table
-        display_name = f"{icon} {series_name}"
-        series_db_id = db.add_custom_series(
-            series_id=series_id,
-            name=series_name,
-            display_name=display_name,
-            db_folder_path=series_folder,
-            icon=icon,
-            gradient=gradient,
-            source_url=video_url,
-            created_by=user_id
-        )
-        
-        if series_db_id:
-            db.update_custom_series_episodes(series_id, 1)
-        
-        return jsonify({
-            'success': True,
+        job = job_manager.submit('custom_series', _add_custom_series_job, {
             'series_id': series_id,
-            'name': series_name,
-            'display_name': display_name,
+            'series_name': series_name,
+            'video_url': video_url,
             'icon': icon,
-            'gradient': gradient,
-            'db_folder': series_folder,
-            'word_count': len(filtered_words),
-            'unique_words': len(word_counts),
-            'message': f'"{series_name}" başarıyla eklendi! {len(word_counts)} benzersiz kelime işlendi.'
-        }), 200
+            'user_id': user_id
+        }, user_id)
+        return _job_accepted(job)
         
     except Exception as e:
         print(f"Error adding custom series: {e}")
-        import traceback
-        traceback.print_exc()
         return jsonify({'success': False, 'error': str(e)}), 500
 
 @app.route('/api/custom-series/<series_id>/episodes', methods=['GET'])
@@ -3861,8 +4254,6 @@ def get_custom_series_transcript(series_id: str) -> Tuple[Response, int]:
         if not os.path.exists(series_folder):
             series_folder = parent_folder
         
-        transcript = None
-        
         # Try to find transcript file with various naming patterns
         possible_filenames = [
             f"{series_id}_{episode}.txt",
@@ -3871,26 +4262,17 @@ def get_custom_series_transcript(series_id: str) -> Tuple[Response, int]:
             f"episode_{episode}.txt",
         ]
         
-        for filename in possible_filenames:
-            filepath = os.path.join(series_folder, filename)
-            if os.path.exists(filepath):
-                with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-                    transcript = f.read()
-                break
-        
-        # Also check the Subtitles folder structure
-        if not transcript:
-            subtitles_base = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Subtitles")
-            custom_folder = os.path.join(subtitles_base, f"{series_id}_db")
-            
-            for filename in possible_filenames:
-                filepath = os.path.join(custom_folder, filename.replace('.txt', '.txt'))
-                if os.path.exists(filepath):
-                    with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-                        transcript = f.read()
-                    break
-        
-        if not transcript:
+        # Series folder first, then the Subtitles folder structure
+        subtitles_base = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Subtitles")
+        custom_folder = os.path.join(subtitles_base, f"{series_id}_db")
+        transcript_path = next((
+            os.path.join(folder, filename)
+            for folder in (series_folder, custom_folder)
+            for filename in possible_filenames
+            if os.path.exists(os.path.join(folder, filename))
+        ), None)
+        
+        if not transcript_path:
             return jsonify({
                 'success': False,
                 'error': 'Transcript not found for this episode'
@@ -3898,13 +4280,11 @@ def get_custom_series_transcript(series_id: str) -> Tuple[Response, int]:
         
         title = f"{series.get('display_name', series_id)} - {episode}"
         
-        return jsonify({
-            'success': True,
-            'transcript': transcript,
+        return _transcript_response(transcript_path, {
             'title': title,
             'series_id': series_id,
             'episode': episode
-        }), 200
+        })
         
     except Exception as e:
         print(f"Error getting custom series transcript: {e}")
@@ -3945,7 +4325,8 @@ def add_custom_series_episode(series_id: str) -> Tuple[Response, int]:
         print(f"🎬 Adding episode {episode_num} to {series_id}")
         
         # Process video
-        result = speech_processor.process_video_from_url(video_url)
+        download: Dict[str, Any] = {}
+        result = speech_processor.process_video_from_url(video_url, on_download=download.update)
         
         if not result or not result[0]:
             return jsonify({'success': False, 'error': 'Video indirilemedi'}), 500
@@ -3961,6 +4342,7 @@ def add_custom_series_episode(series_id: str) -> Tuple[Response, int]:
         transcript_path = os.path.join(series_folder, transcript_filename)
         with open(transcript_path, 'w', encoding='utf-8') as f:
             f.write(transcript)
+        _transcript_ingested(make_document(series_id, transcript_path, f"{series_id}_"))
         
         # Extract words
         cleaned_transcript = re.sub(r'\d{2}:\d{2}:\d{2},\d{3} --> \d{2}:\d{2}:\d{2},\d{3}', ' ', transcript)
@@ -4005,6 +4387,9 @@ def add_custom_series_episode(series_id: str) -> Tuple[Response, int]:
         conn.commit()
         conn.close()
         
+        # Register new words up front so the flashcard endpoint stays read-only
+        db.add_words_batch(list(word_counts))
+        
         # Update episode count
         db.update_custom_series_episodes(series_id, episode_num)
         
@@ -4014,6 +4399,7 @@ def add_custom_series_episode(series_id: str) -> Tuple[Response, int]:
             'episode_number': episode_num,
             'word_count': len(filtered_words),
             'unique_words': len(word_counts),
+            'download': download,
             'message': f'Bölüm {episode_num} eklendi!'
         }), 200
         
@@ -4037,6 +4423,10 @@ def delete_custom_series(series_id: str) -> Tuple[Response, int]:
         
         # Delete from database
         db.delete_custom_series(series_id)
+        if SEARCH_AVAILABLE:
+            for doc_key in db.get_search_document_signatures():
+                if doc_key.startswith(f"{series_id}/"):
+                    db.delete_search_document(doc_key)
         
         return jsonify({
             'success': True,
@@ -4046,12 +4436,14 @@ def delete_custom_series(series_id: str) -> Tuple[Response, int]:
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
+# (series, episode, user, vocabulary and definitions versions, user words version, episode db signature) -> response fields
+_custom_flashcards_cache: 'OrderedDict[Tuple, Dict[str, Any]]' = OrderedDict()
+CUSTOM_FLASHCARDS_CACHE_SIZE = 64
+
 @app.route('/api/custom-series/<series_id>/flashcards', methods=['GET'])
 def get_custom_series_flashcards(series_id: str) -> Tuple[Response, int]:
     """Get flashcards for a custom series episode"""
     try:
-        import sqlite3
-        
         series = db.get_custom_series_by_id(series_id)
         if not series:
             return jsonify({'success': False, 'error': 'Series not found'}), 404
@@ -4073,75 +4465,58 @@ def get_custom_series_flashcards(series_id: str) -> Tuple[Response, int]:
         if not os.path.exists(db_path):
             return jsonify({'success': False, 'error': 'Episode not found'}), 404
         
-        # Read words from episode database
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-        cursor.execute("SELECT word, frequency FROM word_frequencies ORDER BY frequency DESC")
-        word_rows = cursor.fetchall()
-        conn.close()
-        
-        flashcards = []
-        known_count = 0
-        unknown_count = 0
+        stat = os.stat(db_path)
+        cache_key = (
+            series_id, episode, user_id, db.get_vocabulary_version(), db.get_definitions_version(),
+            db.get_user_words_version(user_id) if user_id else None,
+            db_path, stat.st_mtime_ns, stat.st_size
+        )
+        result = _custom_flashcards_cache.pop(cache_key, None)
         
-        for word, frequency in word_rows:
-            # Check if user knows this word
-            word_id = db.get_word_id(word) if hasattr(db, 'get_word_id') else None
-            
-            if word_id is None:
-                # Add word to main database
-                word_id = db.get_or_add_word(word)
+        if result is None:
+            # Read words from episode database
+            conn = sqlite3.connect(db_path)
+            cursor = conn.cursor()
+            cursor.execute("SELECT word, frequency FROM word_frequencies ORDER BY frequency DESC")
+            word_rows = cursor.fetchall()
+            conn.close()
             
-            known = False
-            if user_id and word_id:
-                main_conn = db.get_connection()
-                main_cursor = main_conn.cursor()
-                main_cursor.execute(
-                    'SELECT known FROM user_words WHERE user_id = ? AND word_id = ?',
-                    (user_id, word_id)
-                )
-                row = main_cursor.fetchone()
-                known = row['known'] == 1 if row else False
-                main_conn.close()
+            # One query for ids, definitions and known status; words are registered when the episode is added
+            cards = db.get_word_cards_by_texts([word for word, _ in word_rows], user_id)
             
-            if known:
-                known_count += 1
-            else:
-                unknown_count += 1
-                
-                # Get definition
-                definition = ''
-                pronunciation = ''
-                if word_id:
-                    main_conn = db.get_connection()
-                    main_cursor = main_conn.cursor()
-                    main_cursor.execute(
-                        'SELECT definition, pronunciation FROM words WHERE id = ?',
-                        (word_id,)
-                    )
-                    row = main_cursor.fetchone()
-                    if row:
-                        definition = row['definition'] or ''
-                        pronunciation = row['pronunciation'] or ''
-                    main_conn.close()
-                
+            flashcards = []
+            known_count = 0
+            for word, frequency in word_rows:
+                card = cards.get(word)
+                if card and card['known']:
+                    known_count += 1
+                    continue
                 flashcards.append({
-                    'id': word_id,
+                    'id': card['id'] if card else None,
                     'word': word,
-                    'definition': definition,
-                    'pronunciation': pronunciation,
+                    'definition': (card['definition'] if card else None) or '',
+                    'pronunciation': (card['pronunciation'] if card else None) or '',
                     'frequency': frequency,
                     'known': False
                 })
+            
+            result = {
+                'flashcards': flashcards,
+                'total_cards': len(flashcards),
+                'known_count': known_count,
+                'unknown_count': len(flashcards)
+            }
+        
+        # Re-inserted on every hit, so the oldest entry is the least recently used
+        _custom_flashcards_cache[cache_key] = result
+        while len(_custom_flashcards_cache) > CUSTOM_FLASHCARDS_CACHE_SIZE:
+            _custom_flashcards_cache.popitem(last=False)
         
         return jsonify({
             'success': True,
             'series': series,
             'episode': episode,
-            'flashcards': flashcards,
-            'total_cards': len(flashcards),
-            'known_count': known_count,
-            'unknown_count': unknown_count
+            **result
         }), 200
         
     except Exception as e:
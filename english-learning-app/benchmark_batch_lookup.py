@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Benchmark the batch word lookups (get_words_by_texts and friends) at
+100, 10k and 100k keys on a throwaway database.
+
+Compares the json_each path with the chunked placeholder fallback and with a
+single `IN (?,?,...)` statement, which fails once the key count exceeds
+SQLITE_MAX_VARIABLE_NUMBER.
+"""
+import os
+import sys
+import time
+import random
+import sqlite3
+import tempfile
+
+import database
+from database import Database
+
+VOCABULARY_SIZE = 150000
+KEY_COUNTS = (100, 10000, 100000)
+USER_ID = 1
+REPEATS = 3
+
+
+def make_database(path: str) -> Database:
+    db = Database(path, use_pool=False)
+    rng = random.Random(42)
+    words = [f"w{i:06d}" for i in range(VOCABULARY_SIZE)]
+    conn = db.get_connection()
+    conn.executemany('INSERT INTO words (word, frequency) VALUES (?, ?)',
+                     [(w, rng.randint(1, 10000)) for w in words])
+    conn.execute("INSERT OR IGNORE INTO users (id, username, password_hash) VALUES (?, 'bench', '')", (USER_ID,))
+    conn.executemany('INSERT INTO user_words (user_id, word_id, known) VALUES (?, ?, ?)',
+                     [(USER_ID, i, rng.random() < 0.5) for i in range(1, VOCABULARY_SIZE + 1, 3)])
+    conn.commit()
+    db.return_connection(conn)
+    return db
+
+
+def single_statement(db: Database, words):
+    """The previous get_words_by_texts: one placeholder per key"""
+    conn = db.get_connection()
+    try:
+        placeholders = ','.join('?' * len(words))
+        rows = conn.execute(f'SELECT * FROM words WHERE word IN ({placeholders})', words).fetchall()
+        return {row['word']: dict(row) for row in rows}
+    finally:
+        db.return_connection(conn)
+
+
+def timed(func, *args) -> str:
+    best = None
+    try:
+        for _ in range(REPEATS):
+            start = time.perf_counter()
+            func(*args)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+    except sqlite3.OperationalError as e:
+        return f"hata: {e}"
+    return f"{best * 1000:9.1f} ms"
+
+
+def main():
+    print("=== TOPLU KELİME SORGUSU BENCHMARK ===")
+    print(f"SQLite {sqlite3.sqlite_version}, {VOCABULARY_SIZE} kelime\n")
+    with tempfile.TemporaryDirectory() as tmp:
+        db = make_database(os.path.join(tmp, 'bench.db'))
+        rng = random.Random(7)
+        all_words = [f"w{i:06d}" for i in range(VOCABULARY_SIZE)]
+
+        for count in KEY_COUNTS:
+            words = rng.sample(all_words, count)
+            word_ids = rng.sample(range(1, VOCABULARY_SIZE + 1), count)
+            print(f"--- {count} anahtar ---")
+            print("  tek IN (...)".ljust(48) + timed(single_statement, db, words))
+            for label, supported in (('varsayılan', None), ('parçalı', False)):
+                Database._json_each_supported = supported
+                if supported is False:
+                    # Force the chunked path even below the inline limit
+                    limit, database.INLINE_KEYS_LIMIT = database.INLINE_KEYS_LIMIT, 0
+                print(f"  get_words_by_texts [{label}]".ljust(48) + timed(db.get_words_by_texts, words))
+                print(f"  ..._with_user_status [{label}]".ljust(48)
+                      + timed(db.get_words_by_texts_with_user_status, words, USER_ID))
+                print(f"  get_words_with_user_status_batch [{label}]".ljust(48)
+                      + timed(db.get_words_with_user_status_batch, word_ids, USER_ID))
+                if supported is False:
+                    database.INLINE_KEYS_LIMIT = limit
+            Database._json_each_supported = None
+            print()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
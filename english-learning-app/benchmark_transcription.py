@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Benchmark transcription backends, model sizes and worker counts on a sample
+clip, reporting load time, real-time factor (transcription time / audio
+length) and resident memory, so each host can pick the fastest acceptable model.
+
+Every configuration runs in a fresh Python process, so memory figures are
+not inflated by models loaded for an earlier configuration. RSS is measured
+after transcription and includes the worker processes.
+
+Usage: python benchmark_transcription.py CLIP [--backends openai-whisper,faster-whisper]
+                                              [--models tiny,base] [--workers 1,4]
+"""
+import os
+import sys
+import json
+import argparse
+import subprocess
+
+from utils.transcription_backends import BACKENDS, WHISPER_MODEL, available_backends
+
+RESULT_PREFIX = 'RESULT '
+
+
+def run_configuration(clip: str, backend: str, model_size: str, workers: int, chunk_seconds: float) -> dict:
+    """Transcribe the clip once with one configuration (runs in the child process)"""
+    import time
+    from speech_processor import SpeechProcessor
+    from utils.model_registry import current_rss
+    from utils.transcription import ChunkedTranscriber
+
+    audio = SpeechProcessor().load_audio_pcm(clip)
+    if audio is None:
+        return {'error': 'ses çözülemedi'}
+    transcriber = ChunkedTranscriber(workers=workers, chunk_seconds=chunk_seconds,
+                                     backend=backend, model_size=model_size)
+    try:
+        started = time.perf_counter()
+        transcriber.warm_up()
+        load_seconds = time.perf_counter() - started
+        result = transcriber.transcribe(audio)
+        if result is None:
+            return {'error': f'{backend} kurulu değil'}
+        rss = [current_rss()] + [current_rss(pid) for pid in transcriber.worker_pids]
+    except Exception as e:
+        return {'error': str(e)}
+    finally:
+        transcriber.close()
+    return {
+        'duration': result['duration'],
+        'load_seconds': load_seconds,
+        'elapsed': result['elapsed'],
+        'rtf': result['elapsed'] / result['duration'] if result['duration'] else 0.0,
+        'rss_mb': sum(r for r in rss if r) / 2**20,
+        'chunks': result['chunks'],
+        'words': len(result['text'].split()),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Transcription backend benchmark')
+    parser.add_argument('clip', help='Video or audio file (a few minutes of dialogue works best)')
+    parser.add_argument('--backends', default=','.join(available_backends()) or ','.join(BACKENDS),
+                        help='Comma-separated backends (default: the installed ones)')
+    parser.add_argument('--models', default=WHISPER_MODEL, help='Comma-separated model sizes')
+    parser.add_argument('--workers', default='1', help='Comma-separated worker counts')
+    parser.add_argument('--chunk-seconds', type=float, default=60.0)
+    parser.add_argument('--run', nargs=3, metavar=('BACKEND', 'MODEL', 'WORKERS'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        backend, model_size, workers = args.run
+        result = run_configuration(args.clip, backend, model_size, int(workers), args.chunk_seconds)
+        print(RESULT_PREFIX + json.dumps(result))
+        return 0
+
+    print("=== TRANSKRİPSİYON BENCHMARK ===")
+    print(f"{os.path.basename(args.clip)}, {os.cpu_count()} çekirdek\n")
+    print(f"{'backend':<16}{'model':<10}{'işlem':>6}{'yükleme':>10}{'süre':>9}{'RTF':>7}{'RSS MB':>9}{'kelime':>8}")
+    for backend in [b.strip() for b in args.backends.split(',') if b.strip()]:
+        for model_size in [m.strip() for m in args.models.split(',') if m.strip()]:
+            for workers in [int(w) for w in args.workers.split(',') if w.strip()]:
+                cmd = [sys.executable, os.path.abspath(__file__), args.clip,
+                       '--chunk-seconds', str(args.chunk_seconds), '--run', backend, model_size, str(workers)]
+                output = subprocess.run(cmd, capture_output=True, text=True).stdout.splitlines()
+                line = next((l for l in reversed(output) if l.startswith(RESULT_PREFIX)), None)
+                result = json.loads(line[len(RESULT_PREFIX):]) if line else {'error': 'çalıştırma başarısız'}
+                label = f"{backend:<16}{model_size:<10}{workers:>6}"
+                if 'error' in result:
+                    print(f"{label}  ❌ {result['error']}")
+                    continue
+                print(f"{label}{result['load_seconds']:>9.1f}s{result['elapsed']:>8.1f}s{result['rtf']:>7.2f}"
+                      f"{result['rss_mb']:>9.0f}{result['words']:>8}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
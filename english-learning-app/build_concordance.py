@@ -0,0 +1,18 @@
+#!/usr/bin/env python3
+"""Build the concordance (KWIC) index used by /api/words/<id>/examples"""
+import time
+
+from database import Database
+from utils.concordance import get_concordance
+from utils.corpus import iter_transcript_documents
+
+def main():
+    print("=== CONCORDANCE İNDEKSİ OLUŞTURMA ===\n")
+    db = Database()
+    start = time.time()
+    stats = get_concordance().build(iter_transcript_documents(db.get_custom_series()))
+    print(f"✓ {stats['documents']} bölüm, {stats['lines']} satır, {stats['postings']} posting")
+    print(f"✓ Süre: {time.time() - start:.1f} sn")
+
+if __name__ == '__main__':
+    main()
@@ -10,6 +10,8 @@ import sqlite3
 from collections import Counter
 from pathlib import Path
 
+from utils.text_io import read_text
+
 # Ayarlar
 SUBTITLES_DIR = os.path.join(os.path.dirname(__file__), 'Subtitles', 'BigBangTheory')
 DATABASE_DIR = SUBTITLES_DIR  # DB dosyaları txt dosyalarıyla aynı klasöre
@@ -35,12 +37,7 @@ def create_db_from_txt(txt_path):
     print(f"📄 İşleniyor: {txt_filename}")
     
     # Dosyayı oku
-    try:
-        with open(txt_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-    except UnicodeDecodeError:
-        with open(txt_path, 'r', encoding='latin-1') as f:
-            content = f.read()
+    content = read_text(txt_path)
     
     # Karakter adlarını ve ": " karakterini kaldır
     # Örnek: "Sheldon: Hello" -> "Hello"
@@ -5,6 +5,8 @@ import sys
 import os
 from collections import Counter
 
+from utils.text_io import read_text
+
 class SubtitleDBCreator:
     """
     Bir altyazı dosyasını (SRT) okur, kelime frekanslarını hesaplar
@@ -23,13 +25,8 @@ class SubtitleDBCreator:
             return []
 
         try:
-            # Farklı encodingleri dene (utf-8 veya latin-1)
-            try:
-                with open(self.srt_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-            except UnicodeDecodeError:
-                with open(self.srt_path, 'r', encoding='latin-1') as f:
-                    content = f.read()
+            # Encoding BOM/içerikten tespit edilir, metin önbellekten gelir
+            content = read_text(self.srt_path)
         except Exception as e:
             print(f"❌ Dosya okuma hatası: {e}")
             return []
@@ -1,11 +1,9 @@
+import os
+import json
+import socket
 import sqlite3
-from typing import List, Dict, Optional, Any, Set
+from typing import List, Dict, Optional, Any, Set, Tuple
 from contextlib import contextmanager
-try:
-    from deep_translator import GoogleTranslator
-except ImportError:
-    GoogleTranslator = None
-
 try:
     from db_pool import DatabasePool, init_pool, get_pool
     USE_POOL = True
@@ -14,6 +12,20 @@ except ImportError:
     DatabasePool = None
 
 DATABASE_PATH = 'learning.db'
+INLINE_KEYS_LIMIT = 500  # Larger key lists are passed as one JSON array and joined via json_each
+MAX_SQL_VARIABLES = 900  # Below SQLITE_MAX_VARIABLE_NUMBER (999 on older SQLite builds)
+
+
+def _process_alive(pid: int) -> bool:
+    """Whether a process with this pid exists on this host"""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # Exists, owned by another user
+    return True
+
 
 class Database:
     def __init__(self, db_path: str = DATABASE_PATH, use_pool: bool = True):
@@ -202,6 +214,24 @@ class Database:
             cursor.execute('ALTER TABLE words ADD COLUMN definition TEXT')
             cursor.execute('ALTER TABLE words ADD COLUMN pronunciation TEXT')
             
+        # Migration: WordNet/CMUdict enrichment columns (see utils/lexicon.py)
+        try:
+            cursor.execute('SELECT gloss FROM words LIMIT 1')
+        except sqlite3.OperationalError:
+            cursor.execute('ALTER TABLE words ADD COLUMN gloss TEXT')
+            cursor.execute('ALTER TABLE words ADD COLUMN pos TEXT')
+            cursor.execute('ALTER TABLE words ADD COLUMN enrichment_source TEXT')
+            cursor.execute('ALTER TABLE words ADD COLUMN enrichment_version TEXT')
+            
+        # Bumped by every definition/pronunciation write, so cached flashcards can tell they are stale
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS definitions_revision (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                revision INTEGER NOT NULL DEFAULT 0
+            )
+        ''')
+        cursor.execute('INSERT OR IGNORE INTO definitions_revision (id, revision) VALUES (1, 0)')
+            
         # Migration: Check if added_date column exists in words table
         try:
             cursor.execute('SELECT added_date FROM words LIMIT 1')
@@ -234,6 +264,12 @@ class Database:
             )
         ''')
 
+        # Migration: episodes added before upload-time word registration are backfilled once
+        try:
+            cursor.execute('SELECT words_registered FROM custom_series LIMIT 1')
+        except sqlite3.OperationalError:
+            cursor.execute('ALTER TABLE custom_series ADD COLUMN words_registered INTEGER DEFAULT 0')
+
         conn.commit()
         self.return_connection(conn)
     
@@ -358,6 +394,40 @@ class Database:
             self.return_connection(conn)
             return word_id
     
+    _json_each_supported: Optional[bool] = None
+
+    def _select_by_keys(self, cursor: sqlite3.Cursor, query: str, keys: List[Any],
+                        params: Tuple = ()) -> List[sqlite3.Row]:
+        """Run a query containing `IN ({keys})` for any number of keys
+        
+        Small key lists become inline placeholders. Larger ones are sent as a
+        single JSON array parameter and read back with json_each, so the
+        statement stays small and SQLITE_MAX_VARIABLE_NUMBER never applies.
+        Without JSON support the keys are queried in chunks instead.
+        The key parameter(s) are bound after params.
+        """
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return []
+        
+        if len(keys) > INLINE_KEYS_LIMIT:
+            if Database._json_each_supported is None:
+                try:
+                    cursor.execute("SELECT value FROM json_each('[]')")
+                    Database._json_each_supported = True
+                except sqlite3.OperationalError:
+                    Database._json_each_supported = False
+            if Database._json_each_supported:
+                cursor.execute(query.format(keys='SELECT value FROM json_each(?)'), (*params, json.dumps(keys)))
+                return cursor.fetchall()
+        
+        rows: List[sqlite3.Row] = []
+        for i in range(0, len(keys), MAX_SQL_VARIABLES):
+            chunk = keys[i:i + MAX_SQL_VARIABLES]
+            cursor.execute(query.format(keys=','.join('?' * len(chunk))), (*params, *chunk))
+            rows.extend(cursor.fetchall())
+        return rows
+    
     def get_words_by_texts(self, words: List[str]) -> Dict[str, Dict[str, Any]]:
         """Get multiple words by their text in a single query (batch operation)
         Returns: Dict mapping word text to word data
@@ -371,10 +441,7 @@ class Database:
         conn = self.get_connection()
         cursor = conn.cursor()
         
-        # Use IN clause for batch query
-        placeholders = ','.join('?' * len(normalized_words))
-        cursor.execute(f'SELECT * FROM words WHERE word IN ({placeholders})', normalized_words)
-        results = cursor.fetchall()
+        results = self._select_by_keys(cursor, 'SELECT * FROM words WHERE word IN ({keys})', normalized_words)
         
         # Create mapping
         word_map = {}
@@ -395,12 +462,11 @@ class Database:
         conn = self.get_connection()
         cursor = conn.cursor()
         
-        placeholders = ','.join('?' * len(word_ids))
-        cursor.execute(
-            f'SELECT word_id, known FROM user_words WHERE user_id = ? AND word_id IN ({placeholders})',
-            [user_id] + word_ids
+        results = self._select_by_keys(
+            cursor,
+            'SELECT word_id, known FROM user_words WHERE user_id = ? AND word_id IN ({keys})',
+            word_ids, (user_id,)
         )
-        results = cursor.fetchall()
         
         # Create mapping
         status_map = {}
@@ -425,19 +491,67 @@ class Database:
         cursor = conn.cursor()
         
         # Get words with user status in a single query
-        placeholders = ','.join('?' * len(normalized_words))
-        cursor.execute(f'''
+        rows = self._select_by_keys(cursor, '''
             SELECT w.id, w.word, 
                    CASE WHEN uw.known IS NULL THEN 0 ELSE uw.known END as known
             FROM words w
             LEFT JOIN user_words uw ON w.id = uw.word_id AND uw.user_id = ?
-            WHERE w.word IN ({placeholders})
-        ''', [user_id] + normalized_words)
+            WHERE w.word IN ({keys})
+        ''', normalized_words, (user_id,))
         
-        results = [dict(row) for row in cursor.fetchall()]
+        results = [dict(row) for row in rows]
         self.return_connection(conn)
         return results
     
+    def add_words_batch(self, words: List[str]) -> int:
+        """Insert words that are not in the words table yet (existing rows are untouched)
+        Returns: Number of words inserted
+        """
+        if not words:
+            return 0
+        
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        before = conn.total_changes
+        cursor.executemany('INSERT OR IGNORE INTO words (word) VALUES (?)', [(w,) for w in words])
+        conn.commit()
+        inserted = conn.total_changes - before
+        self.return_connection(conn)
+        return inserted
+    
+    def get_word_cards_by_texts(self, words: List[str], user_id: Optional[int] = None) -> Dict[str, Dict[str, Any]]:
+        """Get id, definition, pronunciation and the user's known status for many words in one query
+        Returns: Dict mapping word text to card data; unknown texts are left out
+        """
+        if not words:
+            return {}
+        
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        rows = self._select_by_keys(cursor, '''
+            SELECT w.id, w.word, w.definition, w.pronunciation,
+                   CASE WHEN uw.known IS NULL THEN 0 ELSE uw.known END as known
+            FROM words w
+            LEFT JOIN user_words uw ON w.id = uw.word_id AND uw.user_id = ?
+            WHERE w.word IN ({keys})
+        ''', words, (user_id,))
+        cards = {row['word']: dict(row) for row in rows}
+        self.return_connection(conn)
+        return cards
+    
+    def get_word_ids(self, words: List[str]) -> Dict[str, int]:
+        """Map word texts (already lower-cased) to word ids; unknown texts are left out"""
+        result: Dict[str, int] = {}
+        if not words:
+            return result
+        
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        rows = self._select_by_keys(cursor, 'SELECT id, word FROM words WHERE word IN ({keys})', words)
+        result.update((row['word'], row['id']) for row in rows)
+        self.return_connection(conn)
+        return result
+    
     def get_video_stats_batch(self, video_ids: List[int], user_id: int) -> Dict[int, Dict[str, int]]:
         """Get statistics for multiple videos in a single query
         Returns: Dict mapping video_id to stats dict with 'known' and 'unknown' counts
@@ -1146,19 +1260,22 @@ class Database:
         self.return_connection(conn)
         return affected > 0
 
-    def get_word_definition(self, word: str) -> tuple[Optional[str], Optional[str]]:
-        """Fetch word definition (translation) using Google Translate"""
-        if not GoogleTranslator:
-            return None, None
-            
-        try:
-            # Translate English to Turkish
-            translator = GoogleTranslator(source='en', target='tr')
-            translation = translator.translate(word)
-            return translation, None
-        except Exception as e:
-            print(f"Translation error for {word}: {e}")
-            return None, None
+    def set_definition_if_missing(self, word: str, definition: str) -> bool:
+        """Set a word's definition unless it already has one
+        Returns: True if a row was updated
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute('''
+            UPDATE words SET definition = ?
+            WHERE word = ? AND (definition IS NULL OR definition = '')
+        ''', (definition, word))
+        updated = cursor.rowcount > 0
+        if updated:
+            self._bump_definitions_revision(cursor)
+        conn.commit()
+        self.return_connection(conn)
+        return updated
 
     def update_word_definition(self, word_id: int, definition: str, pronunciation: str = None):
         """Update word definition in database"""
@@ -1166,6 +1283,8 @@ class Database:
         cursor = conn.cursor()
         cursor.execute('UPDATE words SET definition = ?, pronunciation = ? WHERE id = ?', 
                       (definition, pronunciation, word_id))
+        if cursor.rowcount:
+            self._bump_definitions_revision(cursor)
         conn.commit()
         self.return_connection(conn)
 
@@ -1212,12 +1331,15 @@ class Database:
                 pronunciation = item.get('pronunciation', '')
                 
                 if word_id and definition:
+                    # An empty pronunciation keeps the existing one (e.g. IPA from CMUdict)
                     cursor.execute('''
-                        UPDATE words SET definition = ?, pronunciation = ?
+                        UPDATE words SET definition = ?, pronunciation = COALESCE(NULLIF(?, ''), pronunciation)
                         WHERE id = ?
                     ''', (definition, pronunciation, word_id))
                     updated += cursor.rowcount
             
+            if updated:
+                self._bump_definitions_revision(cursor)
             conn.commit()
         except Exception as e:
             print(f"Error in bulk update: {e}")
@@ -1227,6 +1349,46 @@ class Database:
         
         return updated
 
+    def get_words_to_enrich(self, version: str) -> List[Tuple[int, str]]:
+        """(id, word) of words not yet enriched under this version"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute('SELECT id, word FROM words WHERE enrichment_version IS NOT ?', (version,))
+        words = [(row['id'], row['word']) for row in cursor.fetchall()]
+        self.return_connection(conn)
+        return words
+    
+    def apply_word_enrichment(self, rows: List[Dict[str, Any]], version: str) -> int:
+        """Write gloss/pos/pronunciation rows in one transaction
+        
+        Each dict has: word_id, gloss, pos, pronunciation, source (None keeps
+        the current value). A pronunciation is only written where none exists.
+        Returns: Number of rows updated
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        try:
+            cursor.executemany('''
+                UPDATE words SET
+                    gloss = COALESCE(?, gloss),
+                    pos = COALESCE(?, pos),
+                    pronunciation = CASE WHEN COALESCE(pronunciation, '') = '' THEN COALESCE(?, pronunciation) ELSE pronunciation END,
+                    enrichment_source = ?,
+                    enrichment_version = ?
+                WHERE id = ?
+            ''', [(row['gloss'], row['pos'], row['pronunciation'], row['source'], version, row['word_id'])
+                  for row in rows])
+            updated = cursor.rowcount
+            if updated:
+                self._bump_definitions_revision(cursor)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self.return_connection(conn)
+        return updated
+    
     def get_definition_stats(self) -> Dict[str, Any]:
         """Get statistics about word definitions"""
         conn = self.get_connection()
@@ -1415,6 +1577,104 @@ class Database:
         finally:
             self.return_connection(conn)
 
+    def get_word_levels(self) -> Dict[str, int]:
+        """Get word -> learning package number mapping in a single query"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT w.word, lp.package_number
+            FROM words w
+            JOIN package_words pw ON w.id = pw.word_id
+            JOIN learning_packages lp ON pw.package_id = lp.id
+        ''')
+        word_levels = {row['word'].lower(): row['package_number'] for row in cursor.fetchall()}
+        self.return_connection(conn)
+        return word_levels
+
+    def get_vocabulary_entries(self) -> List[Dict[str, Any]]:
+        """Get id, word, frequency and learning package number (or None) of every word"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT w.id, w.word, w.frequency, MIN(lp.package_number) as level
+            FROM words w
+            LEFT JOIN package_words pw ON w.id = pw.word_id
+            LEFT JOIN learning_packages lp ON pw.package_id = lp.id
+            GROUP BY w.id
+        ''')
+        results = [dict(row) for row in cursor.fetchall()]
+        self.return_connection(conn)
+        return results
+
+    def get_known_word_texts(self, user_id: int) -> Set[str]:
+        """Get the set of words the user marked as known"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT w.word
+            FROM user_words uw
+            JOIN words w ON uw.word_id = w.id
+            WHERE uw.user_id = ? AND uw.known = 1
+        ''', (user_id,))
+        known = {row['word'] for row in cursor.fetchall()}
+        self.return_connection(conn)
+        return known
+
+    def get_known_word_ids(self, user_id: int, word_ids: Optional[List[int]] = None) -> Set[int]:
+        """Get the ids of the words the user marked as known, optionally only among word_ids"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        if word_ids is None:
+            cursor.execute('SELECT word_id FROM user_words WHERE user_id = ? AND known = 1', (user_id,))
+            known = {row['word_id'] for row in cursor.fetchall()}
+        else:
+            rows = self._select_by_keys(
+                cursor,
+                'SELECT word_id FROM user_words WHERE user_id = ? AND known = 1 AND word_id IN ({keys})',
+                word_ids, (user_id,)
+            )
+            known = {row['word_id'] for row in rows}
+        self.return_connection(conn)
+        return known
+
+    def get_user_words_version(self, user_id: int) -> str:
+        """Cheap token that changes whenever the user's known words change"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT COUNT(*) as total, SUM(known = 1) as known, MAX(last_updated) as updated
+            FROM user_words WHERE user_id = ?
+        ''', (user_id,))
+        row = cursor.fetchone()
+        self.return_connection(conn)
+        return f"{row['total']}.{row['known'] or 0}.{row['updated'] or ''}"
+
+    def get_vocabulary_version(self) -> str:
+        """Cheap token that changes when words are added/removed or learning packages are regenerated"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT (SELECT COUNT(*) FROM words) as word_count,
+                   (SELECT MAX(id) FROM words) as max_word_id,
+                   (SELECT MAX(id) FROM learning_packages) as max_package_id
+        ''')
+        row = cursor.fetchone()
+        self.return_connection(conn)
+        return f"{row['word_count']}.{row['max_word_id'] or 0}.{row['max_package_id'] or 0}"
+
+    def get_definitions_version(self) -> int:
+        """Counter that changes whenever a word's definition or pronunciation is written"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute('SELECT revision FROM definitions_revision WHERE id = 1')
+        row = cursor.fetchone()
+        self.return_connection(conn)
+        return row['revision'] if row else 0
+
+    def _bump_definitions_revision(self, cursor: sqlite3.Cursor) -> None:
+        # Runs inside the writer's transaction, so the counter and the rows commit together
+        cursor.execute('UPDATE definitions_revision SET revision = revision + 1 WHERE id = 1')
+
     def get_package_words(self, package_id: int, user_id: Optional[int] = None) -> List[Dict[str, Any]]:
         """Get words for a specific package"""
         conn = self.get_connection()
@@ -1517,8 +1777,8 @@ class Database:
             CREATE TABLE IF NOT EXISTS flashcard_sessions (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 user_id INTEGER NOT NULL,
-                session_type TEXT NOT NULL, -- 'level', 'video', 'all', 'random'
-                target_id INTEGER, -- package_id or video_id depending on type
+                session_type TEXT NOT NULL, -- 'level', 'phrase', 'video', 'all', 'random'
+                target_id INTEGER, -- package_id, phrase level or video_id depending on type
                 started_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 completed_at TIMESTAMP,
                 total_cards INTEGER DEFAULT 0,
@@ -1533,7 +1793,7 @@ class Database:
             CREATE TABLE IF NOT EXISTS flashcard_progress (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 session_id INTEGER NOT NULL,
-                word_id INTEGER NOT NULL,
+                word_id INTEGER NOT NULL, -- phrases.id in 'phrase' sessions
                 status TEXT DEFAULT 'pending', -- 'pending', 'correct', 'incorrect', 'skipped'
                 attempts INTEGER DEFAULT 0,
                 first_answer_time TIMESTAMP,
@@ -1581,6 +1841,17 @@ class Database:
                     ORDER BY pw.word_rank
                 ''', (target_id, user_id))
                 words = cursor.fetchall()
+            elif session_type == 'phrase' and target_id:
+                # Get phrases from a phrase level
+                cursor.execute('''
+                    SELECT p.id, p.phrase as word, p.definition, p.frequency
+                    FROM phrases p
+                    WHERE p.level = ? AND p.id NOT IN (
+                        SELECT phrase_id FROM user_phrases WHERE user_id = ? AND known = 1
+                    )
+                    ORDER BY p.phrase_rank
+                ''', (target_id, user_id))
+                words = cursor.fetchall()
             elif session_type == 'video' and target_id:
                 # Get words from a video
                 cursor.execute('''
@@ -1654,16 +1925,33 @@ class Database:
         finally:
             self.return_connection(conn)
 
+    def _is_phrase_session(self, cursor: sqlite3.Cursor, session_id: int) -> bool:
+        cursor.execute('SELECT session_type FROM flashcard_sessions WHERE id = ?', (session_id,))
+        session = cursor.fetchone()
+        return bool(session) and session['session_type'] == 'phrase'
+
+    def _flashcard_cards_query(self, cursor: sqlite3.Cursor, session_id: int) -> str:
+        """SELECT ... FROM flashcard_progress fp for the session's cards: words, or phrases in 'phrase' sessions"""
+        if self._is_phrase_session(cursor, session_id):
+            return '''
+                SELECT p.id, p.phrase as word, p.definition, NULL as pronunciation, p.frequency,
+                       fp.status, fp.attempts, fp.id as progress_id
+                FROM flashcard_progress fp
+                JOIN phrases p ON fp.word_id = p.id
+            '''
+        return '''
+            SELECT w.id, w.word, w.definition, w.pronunciation, w.frequency,
+                   fp.status, fp.attempts, fp.id as progress_id
+            FROM flashcard_progress fp
+            JOIN words w ON fp.word_id = w.id
+        '''
+
     def get_flashcard_session_words(self, session_id: int, user_id: int) -> List[Dict[str, Any]]:
         """Get all words in a flashcard session that haven't been answered correctly"""
         conn = self.get_connection()
         cursor = conn.cursor()
         
-        cursor.execute('''
-            SELECT w.id, w.word, w.definition, w.pronunciation, w.frequency,
-                   fp.status, fp.attempts
-            FROM flashcard_progress fp
-            JOIN words w ON fp.word_id = w.id
+        cursor.execute(self._flashcard_cards_query(cursor, session_id) + '''
             WHERE fp.session_id = ? AND fp.status != 'correct'
             ORDER BY fp.attempts ASC, fp.id ASC
         ''', (session_id,))
@@ -1678,11 +1966,7 @@ class Database:
         cursor = conn.cursor()
         
         # Get first pending/incorrect word with minimum attempts
-        cursor.execute('''
-            SELECT w.id, w.word, w.definition, w.pronunciation, w.frequency,
-                   fp.status, fp.attempts, fp.id as progress_id
-            FROM flashcard_progress fp
-            JOIN words w ON fp.word_id = w.id
+        cursor.execute(self._flashcard_cards_query(cursor, session_id) + '''
             WHERE fp.session_id = ? AND fp.status != 'correct'
             ORDER BY fp.attempts ASC, fp.id ASC
             LIMIT 1
@@ -1709,6 +1993,8 @@ class Database:
             WHERE session_id = ? AND word_id = ?
         ''', (status, session_id, word_id))
         
+        is_phrase = self._is_phrase_session(cursor, session_id)
+        
         # Update session stats
         if is_correct:
             cursor.execute('''
@@ -1716,7 +2002,7 @@ class Database:
                 SET correct_answers = correct_answers + 1
                 WHERE id = ?
             ''', (session_id,))
-        else:
+        elif not is_phrase:  # Problem words are single words only
             # Track problem words
             cursor.execute('''
                 INSERT OR REPLACE INTO flashcard_problem_words (user_id, word_id, times_incorrect, last_seen)
@@ -1732,11 +2018,7 @@ class Database:
         session = cursor.fetchone()
         
         # Get next word
-        cursor.execute('''
-            SELECT w.id, w.word, w.definition, w.pronunciation, w.frequency,
-                   fp.status, fp.attempts, fp.id as progress_id
-            FROM flashcard_progress fp
-            JOIN words w ON fp.word_id = w.id
+        cursor.execute(self._flashcard_cards_query(cursor, session_id) + '''
             WHERE fp.session_id = ? AND fp.status != 'correct'
             ORDER BY fp.attempts ASC, fp.id ASC
             LIMIT 1
@@ -2011,8 +2293,9 @@ class Database:
         
         try:
             cursor.execute('''
-                INSERT INTO custom_series (series_id, name, display_name, icon, gradient, db_folder_path, source_url, created_by)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                INSERT INTO custom_series (series_id, name, display_name, icon, gradient, db_folder_path, source_url,
+                                           created_by, words_registered)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, 1)
             ''', (series_id, name, display_name, icon, gradient, db_folder_path, source_url, created_by))
             conn.commit()
             return cursor.lastrowid
@@ -2055,6 +2338,26 @@ class Database:
         
         return dict(row) if row else None
 
+    def get_custom_series_without_words(self) -> List[Dict[str, Any]]:
+        """Custom series whose episode words have not been added to the words table yet"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT series_id, db_folder_path FROM custom_series
+            WHERE words_registered IS NULL OR words_registered = 0
+        ''')
+        results = [dict(row) for row in cursor.fetchall()]
+        self.return_connection(conn)
+        return results
+
+    def mark_custom_series_words_registered(self, series_id: str) -> None:
+        """Record that a custom series' episode words are in the words table"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute('UPDATE custom_series SET words_registered = 1 WHERE series_id = ?', (series_id,))
+        conn.commit()
+        self.return_connection(conn)
+
     def update_custom_series_episodes(self, series_id: str, episode_count: int) -> bool:
         """Update episode count for a custom series"""
         conn = self.get_connection()
@@ -2086,3 +2389,638 @@ class Database:
             return False
         finally:
             self.return_connection(conn)
+
+    # ===== TRANSCRIPT SEARCH METHODS =====
+
+    def init_search_index(self) -> bool:
+        """Initialize FTS5 full-text index over episode transcripts and subtitle cues"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            # One row per transcript line or subtitle cue; only the text is tokenized
+            cursor.execute('''
+                CREATE VIRTUAL TABLE IF NOT EXISTS transcript_search USING fts5(
+                    text,
+                    doc_key UNINDEXED,
+                    series UNINDEXED,
+                    season UNINDEXED,
+                    episode UNINDEXED,
+                    title UNINDEXED,
+                    line UNINDEXED,
+                    start_ms UNINDEXED,
+                    tokenize = 'porter unicode61'
+                )
+            ''')
+        except sqlite3.OperationalError as e:
+            print(f"⚠️ FTS5 desteklenmiyor, transkript araması devre dışı: {e}")
+            self.return_connection(conn)
+            return False
+        
+        # Indexed documents: signature detects changed files, rowid range allows cheap re-indexing
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS search_documents (
+                doc_key TEXT PRIMARY KEY,
+                signature TEXT NOT NULL,
+                first_rowid INTEGER,
+                last_rowid INTEGER,
+                unit_count INTEGER DEFAULT 0,
+                indexed_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        
+        conn.commit()
+        self.return_connection(conn)
+        return True
+
+    def _delete_search_rows(self, cursor: sqlite3.Cursor, doc_key: str) -> None:
+        cursor.execute('SELECT first_rowid, last_rowid FROM search_documents WHERE doc_key = ?', (doc_key,))
+        row = cursor.fetchone()
+        if row and row['first_rowid'] is not None:
+            cursor.execute('DELETE FROM transcript_search WHERE rowid BETWEEN ? AND ?',
+                           (row['first_rowid'], row['last_rowid']))
+        cursor.execute('DELETE FROM search_documents WHERE doc_key = ?', (doc_key,))
+
+    def index_search_document(self, doc: Dict[str, Any], units: List[Tuple[int, Optional[int], str]], signature: str) -> int:
+        """
+        Replace the search rows of one document
+        
+        Args:
+            doc: Document dict with key, series, season, episode and title
+            units: (line, start_ms, text) tuples
+            signature: Source signature stored to skip unchanged documents
+        
+        Returns:
+            Number of indexed units
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        try:
+            self._delete_search_rows(cursor, doc['key'])
+            
+            # Rows of one document are inserted in one transaction, so their rowids are contiguous
+            cursor.execute('SELECT COALESCE(MAX(rowid), 0) FROM transcript_search')
+            first_rowid = cursor.fetchone()[0] + 1
+            cursor.executemany('''
+                INSERT INTO transcript_search (rowid, text, doc_key, series, season, episode, title, line, start_ms)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', [
+                (first_rowid + i, text, doc['key'], doc.get('series'), doc.get('season'),
+                 doc.get('episode'), doc.get('title'), line, start_ms)
+                for i, (line, start_ms, text) in enumerate(units)
+            ])
+            
+            cursor.execute('''
+                INSERT INTO search_documents (doc_key, signature, first_rowid, last_rowid, unit_count)
+                VALUES (?, ?, ?, ?, ?)
+            ''', (doc['key'], signature, first_rowid if units else None,
+                  first_rowid + len(units) - 1 if units else None, len(units)))
+            conn.commit()
+            return len(units)
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self.return_connection(conn)
+
+    def delete_search_document(self, doc_key: str) -> bool:
+        """Remove a document from the search index"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        try:
+            self._delete_search_rows(cursor, doc_key)
+            conn.commit()
+            return True
+        except Exception as e:
+            print(f"Error deleting search document: {e}")
+            return False
+        finally:
+            self.return_connection(conn)
+
+    def get_search_document_signatures(self) -> Dict[str, str]:
+        """Get doc_key -> signature of every indexed document"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('SELECT doc_key, signature FROM search_documents')
+        results = {row['doc_key']: row['signature'] for row in cursor.fetchall()}
+        self.return_connection(conn)
+        return results
+
+    def search_transcripts(self, query: str, series: Optional[str] = None, season: Optional[int] = None,
+                           limit: int = 20, offset: int = 0) -> List[Dict[str, Any]]:
+        """
+        Full-text search over transcript lines and subtitle cues, best bm25 match first
+        
+        Raises sqlite3.OperationalError for invalid FTS5 query syntax.
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        sql = '''
+            SELECT doc_key, series, season, episode, title, line, start_ms,
+                   snippet(transcript_search, 0, '<mark>', '</mark>', '…', 16) AS snippet,
+                   bm25(transcript_search) AS score
+            FROM transcript_search
+            WHERE transcript_search MATCH ?
+        '''
+        params: List[Any] = [query]
+        if series:
+            sql += ' AND series = ?'
+            params.append(series)
+        if season is not None:
+            sql += ' AND season = ?'
+            params.append(season)
+        sql += ' ORDER BY score LIMIT ? OFFSET ?'
+        params.extend([limit, offset])
+        
+        try:
+            cursor.execute(sql, params)
+            return [dict(row) for row in cursor.fetchall()]
+        finally:
+            self.return_connection(conn)
+
+    # ===== TRANSLATION CACHE METHODS =====
+
+    def init_translation_cache(self):
+        """Initialize the machine translation cache table"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        # An empty translation means the model had no answer; it is cached so it is not retried
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS translation_cache (
+                word TEXT NOT NULL,
+                src TEXT NOT NULL,
+                tgt TEXT NOT NULL,
+                model_version TEXT NOT NULL,
+                translation TEXT NOT NULL,
+                created_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (word, src, tgt, model_version)
+            ) WITHOUT ROWID
+        ''')
+        
+        # Transcript sentences, keyed by the SHA-1 of the normalized sentence
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS sentence_translation_cache (
+                sentence_hash TEXT NOT NULL,
+                src TEXT NOT NULL,
+                tgt TEXT NOT NULL,
+                model_version TEXT NOT NULL,
+                sentence TEXT NOT NULL,
+                translation TEXT NOT NULL,
+                created_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (sentence_hash, src, tgt, model_version)
+            ) WITHOUT ROWID
+        ''')
+        
+        conn.commit()
+        self.return_connection(conn)
+    
+    def get_cached_translations(self, words: List[str], src: str, tgt: str,
+                                model_version: Optional[str] = None,
+                                include_empty: bool = False) -> Dict[str, str]:
+        """Cached translations of words; words never translated are left out
+        
+        With a model_version, only that model's results (including empty ones).
+        Without one, the newest non-empty translation from any source; with
+        include_empty, words every source left untranslated map to ''.
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        if model_version is not None:
+            rows = self._select_by_keys(cursor, '''
+                SELECT word, translation FROM translation_cache
+                WHERE src = ? AND tgt = ? AND model_version = ? AND word IN ({keys})
+            ''', words, (src, tgt, model_version))
+        else:
+            # Non-empty rows sort last, so they win over empty ones for the same word
+            rows = self._select_by_keys(cursor, f'''
+                SELECT word, translation FROM translation_cache
+                WHERE src = ? AND tgt = ? {'' if include_empty else "AND translation != ''"} AND word IN ({{keys}})
+                ORDER BY translation != '', created_date
+            ''', words, (src, tgt))
+        translations = {row['word']: row['translation'] for row in rows}
+        self.return_connection(conn)
+        return translations
+    
+    def save_cached_translations(self, pairs: List[Tuple[str, str]], src: str, tgt: str, model_version: str) -> None:
+        """Store (word, translation) pairs for one model"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.executemany('''
+            INSERT OR REPLACE INTO translation_cache (word, src, tgt, model_version, translation)
+            VALUES (?, ?, ?, ?, ?)
+        ''', [(word, src, tgt, model_version, translation or '') for word, translation in pairs])
+        conn.commit()
+        self.return_connection(conn)
+
+    def get_cached_sentence_translations(self, hashes: List[str], src: str, tgt: str,
+                                         model_version: str) -> Dict[str, str]:
+        """Cached sentence translations of one model by sentence hash; uncached hashes are left out"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        rows = self._select_by_keys(cursor, '''
+            SELECT sentence_hash, translation FROM sentence_translation_cache
+            WHERE src = ? AND tgt = ? AND model_version = ? AND sentence_hash IN ({keys})
+        ''', hashes, (src, tgt, model_version))
+        translations = {row['sentence_hash']: row['translation'] for row in rows}
+        self.return_connection(conn)
+        return translations
+    
+    def save_cached_sentence_translations(self, rows: List[Tuple[str, str, str]], src: str, tgt: str,
+                                          model_version: str) -> None:
+        """Store (sentence_hash, sentence, translation) rows for one model"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.executemany('''
+            INSERT OR REPLACE INTO sentence_translation_cache
+                (sentence_hash, src, tgt, model_version, sentence, translation)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', [(key, src, tgt, model_version, sentence, translation or '') for key, sentence, translation in rows])
+        conn.commit()
+        self.return_connection(conn)
+
+    # ===== BACKGROUND JOB METHODS =====
+
+    JOB_COLUMNS = ('status', 'done', 'total', 'message', 'result', 'error', 'started_date', 'finished_date')
+
+    def init_job_tables(self) -> int:
+        """Initialize the background jobs table
+
+        Returns:
+            Number of jobs left queued/running by worker processes that no longer exist (marked failed)
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                type TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'queued',
+                user_id INTEGER,
+                params TEXT,
+                done INTEGER DEFAULT 0,
+                total INTEGER DEFAULT 0,
+                message TEXT,
+                result TEXT,
+                error TEXT,
+                created_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                started_date TIMESTAMP,
+                finished_date TIMESTAMP
+            )
+        ''')
+        # Migrations: owning worker process and cross-process cancel flag
+        for column, definition in (('owner_host', 'TEXT'), ('owner_pid', 'INTEGER'),
+                                   ('cancel_requested', 'INTEGER DEFAULT 0')):
+            try:
+                cursor.execute(f'SELECT {column} FROM jobs LIMIT 1')
+            except sqlite3.OperationalError:
+                cursor.execute(f'ALTER TABLE jobs ADD COLUMN {column} {definition}')
+
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_jobs_user ON jobs(user_id, created_date)')
+
+        # A job runs in the worker process that accepted it; under prefork the other
+        # workers' jobs are still alive, so only fail jobs whose owner process is gone
+        host = socket.gethostname()
+        cursor.execute('''
+            SELECT id, owner_host, owner_pid FROM jobs WHERE status IN ('queued', 'running')
+        ''')
+        stale = [
+            row['id'] for row in cursor.fetchall()
+            if row['owner_pid'] is None
+            or (row['owner_host'] == host
+                and (row['owner_pid'] == os.getpid() or not _process_alive(row['owner_pid'])))
+        ]
+        if stale:
+            cursor.executemany('''
+                UPDATE jobs SET status = 'failed', error = 'Sunucu yeniden başlatıldı', finished_date = CURRENT_TIMESTAMP
+                WHERE id = ? AND status IN ('queued', 'running')
+            ''', [(job_id,) for job_id in stale])
+        interrupted = len(stale)
+
+        conn.commit()
+        self.return_connection(conn)
+        return interrupted
+
+    def create_job(self, job_id: str, job_type: str, params: Optional[Dict[str, Any]] = None,
+                   user_id: Optional[int] = None) -> None:
+        """Record a queued job, owned by the calling process"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute('''
+            INSERT INTO jobs (id, type, status, user_id, params, owner_host, owner_pid)
+            VALUES (?, ?, 'queued', ?, ?, ?, ?)
+        ''', (job_id, job_type, user_id, json.dumps(params or {}), socket.gethostname(), os.getpid()))
+        conn.commit()
+        self.return_connection(conn)
+
+    def request_job_cancel(self, job_id: str) -> bool:
+        """
+        Flag a queued or running job as cancelled; the owning process polls the flag
+
+        Returns:
+            False if the job is unknown or already finished
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute('''
+            UPDATE jobs SET cancel_requested = 1 WHERE id = ? AND status IN ('queued', 'running')
+        ''', (job_id,))
+        flagged = cursor.rowcount > 0
+        conn.commit()
+        self.return_connection(conn)
+        return flagged
+
+    def is_job_cancel_requested(self, job_id: str) -> bool:
+        """Whether a cancel was requested for the job (from any worker process)"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute('SELECT cancel_requested FROM jobs WHERE id = ?', (job_id,))
+        row = cursor.fetchone()
+        self.return_connection(conn)
+        return bool(row and row['cancel_requested'])
+
+    def update_job(self, job_id: str, **fields) -> None:
+        """Update job columns (status, done, total, message, result, error, started/finished_date)"""
+        fields = {k: v for k, v in fields.items() if k in self.JOB_COLUMNS}
+        if not fields:
+            return
+        if 'result' in fields and fields['result'] is not None:
+            fields['result'] = json.dumps(fields['result'])
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        assignments = ', '.join(f'{column} = ?' for column in fields)
+        cursor.execute(f'UPDATE jobs SET {assignments} WHERE id = ?', (*fields.values(), job_id))
+        conn.commit()
+        self.return_connection(conn)
+
+    def _job_row(self, row: sqlite3.Row) -> Dict[str, Any]:
+        job = dict(row)
+        job['params'] = json.loads(job['params']) if job['params'] else {}
+        job['result'] = json.loads(job['result']) if job['result'] else None
+        return job
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get a job with decoded params and result"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute('SELECT * FROM jobs WHERE id = ?', (job_id,))
+        row = cursor.fetchone()
+        self.return_connection(conn)
+        return self._job_row(row) if row else None
+
+    def get_jobs(self, user_id: Optional[int] = None, status: Optional[str] = None,
+                 limit: int = 50) -> List[Dict[str, Any]]:
+        """Most recent jobs, optionally filtered by user and status"""
+        conditions, params = [], []
+        if user_id is not None:
+            conditions.append('user_id = ?')
+            params.append(user_id)
+        if status:
+            conditions.append('status = ?')
+            params.append(status)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute(f'SELECT * FROM jobs {where} ORDER BY created_date DESC, rowid DESC LIMIT ?', (*params, limit))
+        jobs = [self._job_row(row) for row in cursor.fetchall()]
+        self.return_connection(conn)
+        return jobs
+
+    # ===== PHRASE METHODS =====
+
+    def init_phrase_tables(self):
+        """Initialize multi-word phrase tables"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        # Phrases are kept out of words, so word lists, flashcards and indexes only see single words
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS phrases (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                phrase TEXT UNIQUE NOT NULL,
+                n INTEGER NOT NULL,
+                frequency INTEGER DEFAULT 0,
+                episode_count INTEGER DEFAULT 0,
+                pmi REAL DEFAULT 0,
+                level INTEGER NOT NULL,
+                phrase_rank INTEGER NOT NULL,
+                definition TEXT,
+                created_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS phrase_episodes (
+                phrase_id INTEGER NOT NULL,
+                doc_key TEXT NOT NULL,
+                series TEXT,
+                season INTEGER,
+                episode INTEGER,
+                title TEXT,
+                frequency INTEGER NOT NULL,
+                PRIMARY KEY (phrase_id, doc_key),
+                FOREIGN KEY (phrase_id) REFERENCES phrases(id) ON DELETE CASCADE
+            )
+        ''')
+        
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS user_phrases (
+                user_id INTEGER NOT NULL,
+                phrase_id INTEGER NOT NULL,
+                known BOOLEAN DEFAULT 0,
+                review_count INTEGER DEFAULT 0,
+                last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (user_id, phrase_id),
+                FOREIGN KEY (user_id) REFERENCES users(id),
+                FOREIGN KEY (phrase_id) REFERENCES phrases(id) ON DELETE CASCADE
+            )
+        ''')
+        
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_phrases_level ON phrases(level, phrase_rank)')
+        
+        # Migration: phrases used to have a words row each (phrases.word_id)
+        try:
+            cursor.execute('SELECT definition FROM phrases LIMIT 1')
+        except sqlite3.OperationalError:
+            cursor.execute('ALTER TABLE phrases ADD COLUMN definition TEXT')
+        try:
+            cursor.execute('SELECT COUNT(*) FROM phrases WHERE word_id IS NOT NULL')
+            legacy = cursor.fetchone()[0]
+        except sqlite3.OperationalError:
+            legacy = 0
+        if legacy:
+            self._move_phrase_words(cursor)
+        
+        conn.commit()
+        self.return_connection(conn)
+
+    def _move_phrase_words(self, cursor):
+        """Move progress and definitions of legacy phrase words rows to the phrase tables and drop the rows"""
+        cursor.execute('''
+            INSERT OR IGNORE INTO user_phrases (user_id, phrase_id, known, last_updated)
+            SELECT uw.user_id, p.id, uw.known, uw.last_updated
+            FROM phrases p
+            JOIN user_words uw ON uw.word_id = p.word_id
+        ''')
+        cursor.execute('''
+            UPDATE phrases SET definition = (SELECT w.definition FROM words w WHERE w.id = phrases.word_id)
+            WHERE word_id IS NOT NULL AND definition IS NULL
+        ''')
+        phrase_word_ids = 'SELECT word_id FROM phrases WHERE word_id IS NOT NULL'
+        for table in ('user_words', 'package_words', 'video_words', 'flashcard_progress', 'flashcard_problem_words'):
+            try:
+                cursor.execute(f'DELETE FROM {table} WHERE word_id IN ({phrase_word_ids})')
+            except sqlite3.OperationalError:
+                pass  # Table not created in this database
+        cursor.execute(f'DELETE FROM words WHERE id IN ({phrase_word_ids})')
+        print(f"🔄 {cursor.rowcount} ifade kelime tablosundan ayrıldı")
+        cursor.execute('UPDATE phrases SET word_id = NULL')
+
+    def replace_phrases(self, phrases: List[Dict[str, Any]], level_size: int = 100) -> int:
+        """
+        Replace the phrase list and level it by frequency, like learning packages
+        
+        Phrases already in the table keep their id (and so their user
+        progress); phrases that are no longer extracted are removed together
+        with their episodes and progress.
+        
+        Args:
+            phrases: Output of utils.phrases.extract_phrases, most frequent first
+            level_size: Phrases per level
+        
+        Returns:
+            Number of levels created
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            self.init_phrase_tables()
+            cursor.execute('SELECT id, phrase FROM phrases')
+            existing = {row['phrase']: row['id'] for row in cursor.fetchall()}
+            kept = {p['phrase'] for p in phrases}
+            stale = [(phrase_id,) for phrase, phrase_id in existing.items() if phrase not in kept]
+            cursor.executemany('DELETE FROM user_phrases WHERE phrase_id = ?', stale)
+            cursor.executemany('''
+                DELETE FROM flashcard_progress WHERE word_id = ?
+                AND session_id IN (SELECT id FROM flashcard_sessions WHERE session_type = 'phrase')
+            ''', stale)
+            cursor.executemany('DELETE FROM phrases WHERE id = ?', stale)
+            cursor.execute('DELETE FROM phrase_episodes')
+            
+            for rank, phrase in enumerate(phrases):
+                values = (phrase['n'], phrase['frequency'], len(phrase['episodes']), phrase['pmi'],
+                          rank // level_size + 1, rank % level_size + 1, phrase['phrase'])
+                phrase_id = existing.get(phrase['phrase'])
+                if phrase_id is not None:
+                    cursor.execute('''
+                        UPDATE phrases SET n = ?, frequency = ?, episode_count = ?, pmi = ?, level = ?, phrase_rank = ?
+                        WHERE phrase = ?
+                    ''', values)
+                else:
+                    cursor.execute('''
+                        INSERT INTO phrases (n, frequency, episode_count, pmi, level, phrase_rank, phrase)
+                        VALUES (?, ?, ?, ?, ?, ?, ?)
+                    ''', values)
+                    phrase_id = cursor.lastrowid
+                cursor.executemany('''
+                    INSERT INTO phrase_episodes (phrase_id, doc_key, series, season, episode, title, frequency)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                ''', [(phrase_id, doc['key'], doc.get('series'), doc.get('season'), doc.get('episode'),
+                       doc.get('title'), count) for doc, count in phrase['episodes']])
+            
+            conn.commit()
+            return (len(phrases) + level_size - 1) // level_size
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self.return_connection(conn)
+
+    def get_phrase_levels(self, user_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Get phrase levels with phrase counts and, for a user, known counts"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            SELECT p.level, COUNT(*) as phrase_count,
+                   MIN(p.frequency) as min_frequency, MAX(p.frequency) as max_frequency,
+                   COUNT(up.phrase_id) as known_count
+            FROM phrases p
+            LEFT JOIN user_phrases up ON up.phrase_id = p.id AND up.user_id = ? AND up.known = 1
+            GROUP BY p.level
+            ORDER BY p.level
+        ''', (user_id or 0,))
+        
+        results = [dict(row) for row in cursor.fetchall()]
+        self.return_connection(conn)
+        return results
+
+    def get_phrases(self, level: Optional[int] = None, user_id: Optional[int] = None,
+                    limit: int = 100, offset: int = 0) -> List[Dict[str, Any]]:
+        """Get phrases, optionally of one level, in the same shape as package words"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        sql = '''
+            SELECT p.id, p.phrase as word, p.n, p.frequency,
+                   p.episode_count, p.pmi, p.level, p.phrase_rank, p.definition,
+                   CASE WHEN up.known IS NULL THEN 0 ELSE up.known END as known
+            FROM phrases p
+            LEFT JOIN user_phrases up ON up.phrase_id = p.id AND up.user_id = ?
+        '''
+        params: List[Any] = [user_id or 0]
+        if level is not None:
+            sql += ' WHERE p.level = ?'
+            params.append(level)
+        sql += ' ORDER BY p.level, p.phrase_rank LIMIT ? OFFSET ?'
+        params.extend([limit, offset])
+        
+        cursor.execute(sql, params)
+        results = [dict(row) for row in cursor.fetchall()]
+        self.return_connection(conn)
+        return results
+
+    def mark_phrase_known(self, phrase_id: int, user_id: int, known: bool = True) -> bool:
+        """Record whether a user knows a phrase; False if the phrase does not exist"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute('SELECT 1 FROM phrases WHERE id = ?', (phrase_id,))
+            if cursor.fetchone() is None:
+                return False
+            cursor.execute('''
+                INSERT INTO user_phrases (user_id, phrase_id, known, review_count, last_updated)
+                VALUES (?, ?, ?, 1, CURRENT_TIMESTAMP)
+                ON CONFLICT(user_id, phrase_id) DO UPDATE SET
+                    known = excluded.known,
+                    review_count = review_count + 1,
+                    last_updated = CURRENT_TIMESTAMP
+            ''', (user_id, phrase_id, 1 if known else 0))
+            conn.commit()
+            return True
+        finally:
+            self.return_connection(conn)
+
+    def get_phrase_episodes(self, phrase_id: int, limit: int = 50) -> List[Dict[str, Any]]:
+        """Get the episodes a phrase occurs in, most frequent first"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            SELECT doc_key, series, season, episode, title, frequency
+            FROM phrase_episodes
+            WHERE phrase_id = ?
+            ORDER BY frequency DESC, series, season, episode
+            LIMIT ?
+        ''', (phrase_id, limit))
+        
+        results = [dict(row) for row in cursor.fetchall()]
+        self.return_connection(conn)
+        return results
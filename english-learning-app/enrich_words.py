@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+"""
+Fill English glosses, parts of speech and IPA pronunciations for the words
+table from NLTK's WordNet and CMUdict (only words not enriched yet)
+
+Usage: python enrich_words.py [--download]
+"""
+import sys
+import time
+
+from database import Database
+from utils.lexicon import enrich_vocabulary
+
+def main():
+    print("=== KELİME ZENGİNLEŞTİRME (WordNet + CMUdict) ===\n")
+    db = Database()
+    start = time.time()
+    try:
+        stats = enrich_vocabulary(db, progress=lambda done, total, message: print(f"  {message}..."),
+                                  download='--download' in sys.argv)
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        return 1
+    print(f"\n✓ {stats['processed']} kelime işlendi, {stats['updated']} satır güncellendi")
+    print(f"✓ {stats['glosses']} tanım, {stats['pronunciations']} telaffuz")
+    print(f"✓ Süre: {time.time() - start:.1f} sn")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
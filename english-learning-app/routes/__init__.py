@@ -7,6 +7,9 @@ from flask import Blueprint
 from .auth import auth_bp
 from .rooms import rooms_bp
 from .chatbot import chatbot_bp
+from .recommendations import recommendations_bp
+from .phrases import phrases_bp
+from .jobs import jobs_bp
 
 # TODO: Create these blueprints when needed
 # from .series import series_bp
@@ -22,6 +25,9 @@ __all__ = [
     'auth_bp',
     'rooms_bp',
     'chatbot_bp',
+    'recommendations_bp',
+    'phrases_bp',
+    'jobs_bp',
     # 'series_bp',
     # 'videos_bp',
     # 'words_bp',
@@ -0,0 +1,64 @@
+"""
+Job Routes Blueprint
+Status polling and cancellation for background jobs (video processing,
+word maps, transcript downloads)
+"""
+from flask import Blueprint, request, jsonify
+from typing import Tuple
+
+from utils.jobs import get_job_manager
+
+jobs_bp = Blueprint('jobs', __name__, url_prefix='/api/jobs')
+
+# Database instance will be injected via init function
+_db = None
+
+
+def init_jobs_routes(db):
+    """Initialize job routes with database instance"""
+    global _db
+    _db = db
+
+    @jobs_bp.route('', methods=['GET'])
+    def list_jobs() -> Tuple:
+        """
+        Most recent jobs
+
+        Query params:
+        - user_id: Sadece bu kullanıcının işleri
+        - status: queued / running / completed / failed / cancelled
+        - limit: Varsayılan 50
+        """
+        user_id = request.args.get('user_id', type=int)
+        status = request.args.get('status')
+        limit = max(1, min(request.args.get('limit', 50, type=int), 200))
+        try:
+            jobs = _db.get_jobs(user_id, status, limit)
+            return jsonify({'success': True, 'jobs': jobs, 'count': len(jobs)}), 200
+        except Exception as e:
+            return jsonify({'success': False, 'error': str(e)}), 500
+
+    @jobs_bp.route('/<job_id>', methods=['GET'])
+    def get_job(job_id: str) -> Tuple:
+        """Job status, progress (done/total, rate, ETA) and, once finished, result or error"""
+        try:
+            job = get_job_manager(_db).get(job_id)
+            if job is None:
+                return jsonify({'success': False, 'error': 'Job not found'}), 404
+            return jsonify({'success': True, 'job': job}), 200
+        except Exception as e:
+            return jsonify({'success': False, 'error': str(e)}), 500
+
+    @jobs_bp.route('/<job_id>/cancel', methods=['POST'])
+    def cancel_job(job_id: str) -> Tuple:
+        """Cancel a queued or running job"""
+        try:
+            manager = get_job_manager(_db)
+            if manager.cancel(job_id):
+                return jsonify({'success': True, 'job': manager.get(job_id)}), 200
+            job = _db.get_job(job_id)
+            if job is None:
+                return jsonify({'success': False, 'error': 'Job not found'}), 404
+            return jsonify({'success': False, 'error': f"Job already {job['status']}"}), 409
+        except Exception as e:
+            return jsonify({'success': False, 'error': str(e)}), 500
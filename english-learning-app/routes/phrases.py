@@ -0,0 +1,116 @@
+"""
+Phrase Routes Blueprint
+Multi-word expressions (phrasal verbs, fixed phrases) mined from the subtitle corpus
+"""
+from flask import Blueprint, request, jsonify
+from typing import Tuple
+
+from utils.corpus import iter_transcript_documents
+from utils.phrases import MIN_COUNT, MIN_PMI, NUMPY_AVAILABLE, extract_phrases
+
+phrases_bp = Blueprint('phrases', __name__, url_prefix='/api/phrases')
+
+PHRASES_PER_LEVEL = 100
+
+# Database instance will be injected via init function
+_db = None
+
+
+def init_phrases_routes(db):
+    """Initialize phrase routes with database instance"""
+    global _db
+    _db = db
+
+    @phrases_bp.route('', methods=['GET'])
+    def get_phrases() -> Tuple:
+        """
+        List phrases, most frequent first
+
+        Query params:
+        - level: Sadece bu seviyedeki ifadeler
+        - user_id: Bilinen ifadeleri işaretle
+        - limit / offset: Sayfalama (varsayılan 100 / 0)
+        """
+        level = request.args.get('level', type=int)
+        user_id = request.args.get('user_id', type=int)
+        limit = max(1, min(request.args.get('limit', 100, type=int), 500))
+        offset = max(0, request.args.get('offset', 0, type=int))
+
+        try:
+            phrases = _db.get_phrases(level, user_id, limit, offset)
+            return jsonify({'success': True, 'phrases': phrases, 'count': len(phrases)}), 200
+        except Exception as e:
+            return jsonify({'success': False, 'error': str(e)}), 500
+
+    @phrases_bp.route('/levels', methods=['GET'])
+    def get_phrase_levels() -> Tuple:
+        """Phrase levels with phrase counts (and known counts for user_id)"""
+        user_id = request.args.get('user_id', type=int)
+        try:
+            levels = _db.get_phrase_levels(user_id)
+            return jsonify({'success': True, 'levels': levels, 'count': len(levels)}), 200
+        except Exception as e:
+            return jsonify({'success': False, 'error': str(e)}), 500
+
+    @phrases_bp.route('/<int:phrase_id>/episodes', methods=['GET'])
+    def get_phrase_episodes(phrase_id: int) -> Tuple:
+        """Episodes a phrase occurs in, with per-episode frequency"""
+        limit = max(1, min(request.args.get('limit', 50, type=int), 500))
+        try:
+            episodes = _db.get_phrase_episodes(phrase_id, limit)
+            return jsonify({'success': True, 'episodes': episodes, 'count': len(episodes)}), 200
+        except Exception as e:
+            return jsonify({'success': False, 'error': str(e)}), 500
+
+    @phrases_bp.route('/<int:phrase_id>/mark', methods=['POST'])
+    def mark_phrase(phrase_id: int) -> Tuple:
+        """
+        Mark a phrase as known/unknown
+
+        JSON body: user_id, known
+        """
+        data = request.get_json(silent=True) or {}
+        user_id = data.get('user_id')
+        known = data.get('known', False)
+        if isinstance(known, str):
+            known = known.lower() == 'true'
+
+        if not user_id:
+            return jsonify({'success': False, 'error': 'User ID required'}), 400
+
+        try:
+            if not _db.mark_phrase_known(phrase_id, user_id, bool(known)):
+                return jsonify({'success': False, 'error': 'Phrase not found'}), 404
+            return jsonify({'success': True}), 200
+        except Exception as e:
+            return jsonify({'success': False, 'error': str(e)}), 500
+
+    @phrases_bp.route('/rebuild', methods=['POST'])
+    def rebuild_phrases() -> Tuple:
+        """
+        Re-extract phrases from all transcripts and subtitles
+
+        JSON body (optional): min_count, min_pmi, level_size
+        """
+        if not NUMPY_AVAILABLE:
+            return jsonify({'success': False, 'error': 'numpy is required for phrase extraction'}), 503
+
+        data = request.get_json(silent=True) or {}
+        try:
+            min_count = int(data.get('min_count', MIN_COUNT))
+            min_pmi = float(data.get('min_pmi', MIN_PMI))
+            level_size = max(1, int(data.get('level_size', PHRASES_PER_LEVEL)))
+        except (TypeError, ValueError):
+            return jsonify({'success': False, 'error': 'Invalid parameters'}), 400
+
+        try:
+            documents = iter_transcript_documents(_db.get_custom_series())
+            phrases, stats = extract_phrases(documents, min_count=min_count, min_pmi=min_pmi)
+            stats['levels'] = _db.replace_phrases(phrases, level_size)
+            return jsonify({
+                'success': True,
+                'message': f"{stats['phrases']} ifade {stats['levels']} seviyeye ayrıldı.",
+                'stats': stats
+            }), 200
+        except Exception as e:
+            return jsonify({'success': False, 'error': str(e)}), 500
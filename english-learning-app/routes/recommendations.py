@@ -0,0 +1,182 @@
+"""
+Recommendation Routes Blueprint
+Ranks Friends, Big Bang Theory and custom series episodes by how much of
+them a user can already understand
+"""
+import os
+import time
+import heapq
+import sqlite3
+import threading
+from flask import Blueprint, request, jsonify
+from typing import Any, Dict, List, Optional, Tuple
+
+from utils.corpus import SUBTITLES_BASE, parse_season_episode
+from utils.episode_matrix import MATRIX_AVAILABLE, get_episode_matrix
+
+recommendations_bp = Blueprint('recommendations', __name__, url_prefix='/api/recommendations')
+
+CORPUS_MATRIX_NAME = 'episode_corpus'
+REFRESH_INTERVAL_SECONDS = 300  # How often episode .db folders are re-scanned
+
+# Database instance will be injected via init function
+_db = None
+_last_refresh = 0.0
+_refresh_lock = threading.Lock()
+_refresh_thread: Optional[threading.Thread] = None
+_thread_lock = threading.Lock()
+
+
+def _collect_episode_sources() -> List[Dict[str, Any]]:
+    """List every episode .db file of the built-in and custom series"""
+    sources: List[Dict[str, Any]] = []
+
+    for series, folder_name in (('friends', 'friends_db'), ('bigbang', 'bigbang_db')):
+        folder = os.path.join(SUBTITLES_BASE, folder_name)
+        if not os.path.isdir(folder):
+            continue
+        for filename in sorted(os.listdir(folder)):
+            if not filename.endswith('.db'):
+                continue
+            season, episode = parse_season_episode(filename)
+            sources.append({
+                'key': f"{series}/{filename}",
+                'path': os.path.join(folder, filename),
+                'series': series,
+                'season': season,
+                'episode': episode,
+                'title': filename[:-3],
+            })
+
+    for custom in _db.get_custom_series():
+        folder = custom.get('db_folder_path')
+        if not folder or not os.path.isdir(folder):
+            continue
+        for filename in sorted(os.listdir(folder)):
+            if not filename.endswith('.db'):
+                continue
+            sources.append({
+                'key': f"{custom['series_id']}/{filename}",
+                'path': os.path.join(folder, filename),
+                'series': custom['series_id'],
+                'season': 0,
+                'episode': 0,
+                'title': filename[:-3].replace(f"{custom['series_id']}_", ''),
+            })
+
+    return sources
+
+
+def _read_episode_frequencies(source: Dict[str, Any]) -> Dict[str, int]:
+    """Read word -> frequency from an episode .db file"""
+    conn = sqlite3.connect(source['path'])
+    try:
+        cursor = conn.cursor()
+        cursor.execute('SELECT word, frequency FROM word_frequencies')
+        return {word.lower(): int(freq) for word, freq in cursor.fetchall() if word}
+    finally:
+        conn.close()
+
+
+def _refresh_corpus_matrix(matrix) -> None:
+    """Re-scan the episode folders into the matrix (serialized by _refresh_lock)"""
+    global _last_refresh
+    with _refresh_lock:
+        try:
+            if matrix.refresh(_collect_episode_sources(), _read_episode_frequencies):
+                matrix.save()
+        except Exception as e:
+            print(f"⚠️ Bölüm matrisi yenilenemedi: {e}")
+        _last_refresh = time.time()
+
+
+def get_corpus_matrix(force_refresh: bool = False):
+    """
+    Shared episode matrix, re-scanned at most every REFRESH_INTERVAL_SECONDS
+
+    Only the first build (nothing to serve yet) and force_refresh run in the
+    request; later re-scans run in a background thread while the last
+    matrix keeps being served.
+    """
+    global _refresh_thread
+    matrix = get_episode_matrix(CORPUS_MATRIX_NAME)
+
+    if force_refresh or (not matrix.episodes and not _last_refresh):
+        _refresh_corpus_matrix(matrix)
+    elif time.time() - _last_refresh > REFRESH_INTERVAL_SECONDS:
+        with _thread_lock:
+            if _refresh_thread is None or not _refresh_thread.is_alive():
+                _refresh_thread = threading.Thread(target=_refresh_corpus_matrix, args=(matrix,),
+                                                   name='episode-matrix-refresh', daemon=True)
+                _refresh_thread.start()
+    return matrix
+
+
+def init_recommendations_routes(db):
+    """Initialize recommendation routes with database instance"""
+    global _db
+    _db = db
+
+    @recommendations_bp.route('/episodes', methods=['GET'])
+    def recommend_episodes() -> Tuple:
+        """
+        Rank episodes by token-weighted known coverage
+
+        Query params:
+        - user_id: Kullanıcı (zorunlu)
+        - target: Hedef kapsama oranı (varsayılan 0.95)
+        - limit: Döndürülecek bölüm sayısı (varsayılan 10)
+        - series: friends, bigbang veya custom series_id ile filtrele
+        """
+        user_id = request.args.get('user_id', type=int)
+        target = request.args.get('target', 0.95, type=float)
+        limit = max(1, min(request.args.get('limit', 10, type=int), 100))
+        series_filter = request.args.get('series')
+
+        if not user_id:
+            return jsonify({'success': False, 'error': 'user_id is required'}), 400
+        if not MATRIX_AVAILABLE:
+            return jsonify({'success': False, 'error': 'numpy and scipy are required for recommendations'}), 503
+
+        try:
+            # Every query below runs on this one snapshot, so a background refresh cannot mix states
+            matrix = get_corpus_matrix().snapshot()
+            if not matrix.episodes:
+                return jsonify({'success': True, 'episodes': [], 'count': 0}), 200
+
+            known_mask = matrix.known_mask(_db.get_known_word_texts(user_id))
+            token_totals = matrix.row_totals()
+            known_tokens = matrix.masked_totals(known_mask)
+            new_words = matrix.masked_totals(1.0 - known_mask, binary=True)
+            coverage = known_tokens / (token_totals + (token_totals == 0))
+
+            # Closest to the target coverage first, then the most new words to learn
+            candidates = (
+                (-abs(coverage[i] - target), new_words[i], i)
+                for i, ep in enumerate(matrix.episodes)
+                if token_totals[i] and (not series_filter or ep['series'] == series_filter)
+            )
+            top = heapq.nlargest(limit, candidates)
+
+            episodes = []
+            for _, _, i in top:
+                ep = matrix.episodes[i]
+                episodes.append({
+                    'series': ep['series'],
+                    'season': ep['season'],
+                    'episode': ep['episode'],
+                    'title': ep['title'],
+                    'coverage': round(float(coverage[i]), 4),
+                    'new_words': int(new_words[i]),
+                    'total_tokens': int(token_totals[i]),
+                })
+
+            return jsonify({
+                'success': True,
+                'target': target,
+                'episodes': episodes,
+                'count': len(episodes),
+                'corpus_size': len(matrix.episodes)
+            }), 200
+        except Exception as e:
+            return jsonify({'success': False, 'error': str(e)}), 500
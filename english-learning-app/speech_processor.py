@@ -1,6 +1,7 @@
 import os
 import re
-from typing import List, Set, Tuple, Optional
+from collections import Counter
+from typing import Any, Callable, Dict, List, Set, Tuple, Optional, Union
 import subprocess
 import tempfile
 import shutil
@@ -11,6 +12,46 @@ try:
 except ImportError:
     yt_dlp = None
 
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+from utils.model_registry import current_rss, get_model_registry
+from utils.transcription import DEFAULT_WORKERS, SAMPLE_RATE, ChunkedTranscriber, get_transcriber
+from utils.transcription_backends import load_backend
+
+# Büyük altyazı dosyalarında veritabanına yazılan transcript önizleme uzunluğu
+STREAMING_TRANSCRIPT_PREVIEW_CHARS = 200000
+
+SUBTITLE_LANGS = ['en', 'en-US', 'en-GB']
+FULL_VIDEO_FORMAT = 'best[ext=mp4]/best[ext=webm]/best'
+# Whisper only needs the audio track; generic HTML5 pages do not label audio-only sources, so their extension decides
+AUDIO_FORMAT = 'bestaudio/best[ext=m4a]/best[ext=mp3]/best[ext=opus]/best[ext=ogg]/best'
+MEDIA_EXTENSIONS = ('.mp4', '.webm', '.mkv', '.avi', '.mov', '.m4a', '.mp3', '.opus', '.ogg', '.aac', '.wav', '.flac')
+
+def load_whisper_model():
+    """Load the configured transcription backend and model size (None if its library is not installed)"""
+    return load_backend()
+
+def start_transcription_workers() -> Optional[ChunkedTranscriber]:
+    """Wait for the transcription workers (forked at startup, see ChunkedTranscriber.start) to load their models"""
+    transcriber = get_transcriber()
+    transcriber.warm_up()
+    return transcriber if transcriber.worker_pids else None
+
+def _transcription_workers_rss(transcriber: ChunkedTranscriber) -> Optional[int]:
+    return sum(current_rss(pid) or 0 for pid in transcriber.worker_pids) or None
+
+if DEFAULT_WORKERS > 1:
+    # The workers hold the models, so preloading 'whisper' starts them instead of loading an unused copy here
+    get_model_registry().register('whisper', start_transcription_workers, fork_safe=False,
+                                  memory_probe=_transcription_workers_rss, starter=lambda: get_transcriber().start())
+else:
+    get_model_registry().register('whisper', load_whisper_model)
+
 class SpeechProcessor:
     def __init__(self):
         self.stop_words = {
@@ -26,10 +67,9 @@ class SpeechProcessor:
             'couldnt', 'hasnt', 'havent', 'isnt', 'arent', 'wasnt', 'werent', 'oh',
             'ah', 'um', 'like', 'well', 'really', 'actually', 'basically', 'actually'
         }
-        self.model = None
     
     def extract_audio_from_video(self, video_path: str) -> Optional[str]:
-        """Extract audio from video file using ffmpeg"""
+        """Extract audio from video file to a .wav next to it using ffmpeg (see load_audio_pcm)"""
         audio_path = video_path.replace(os.path.splitext(video_path)[1], '.wav')
         
         try:
@@ -45,18 +85,76 @@ class SpeechProcessor:
             print(f"Error extracting audio: {e}")
             return None
     
-    def transcribe_audio(self, audio_path: str) -> Optional[str]:
-        """Transcribe audio file using local Whisper model"""
+    def load_audio_pcm(self, video_path: str) -> Optional["np.ndarray"]:
+        """
+        Decode the audio track to 16 kHz mono float32 in memory
+        
+        ffmpeg writes raw s16le PCM to its stdout; the buffer is viewed as
+        int16 without copying and converted once to the float32 samples
+        Whisper takes. No temporary file is written, and a 40-minute episode
+        needs ~230 MB instead of a full-rate WAV on disk plus its decode.
+        
+        Returns:
+            Samples in [-1, 1), or None if ffmpeg or NumPy is missing or decoding fails
+        """
+        if not NUMPY_AVAILABLE:
+            print("Error extracting audio: numpy is not installed")
+            return None
+        cmd = [
+            'ffmpeg', '-nostdin', '-threads', '0',
+            '-i', video_path,
+            '-vn', '-f', 's16le', '-ac', '1', '-ar', str(SAMPLE_RATE),
+            '-loglevel', 'error',
+            'pipe:1'
+        ]
         try:
-            import whisper
-            if self.model is None:
-                self.model = whisper.load_model("base")
-            result = self.model.transcribe(audio_path)
-            return result["text"]
+            pcm = subprocess.run(cmd, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE).stdout
+        except subprocess.CalledProcessError as e:
+            print(f"Error extracting audio: {e.stderr.decode('utf-8', 'replace').strip() or e}")
+            return None
+        except Exception as e:
+            print(f"Error extracting audio: {e}")
+            return None
+        if not pcm:
+            print(f"Error extracting audio: no audio track in {video_path}")
+            return None
+        
+        audio = np.frombuffer(pcm, dtype=np.int16).astype(np.float32)
+        del pcm
+        audio *= 1.0 / 32768.0
+        return audio
+    
+    def transcribe_segments(self, audio: Union[str, "np.ndarray"]) -> Optional[Dict[str, Any]]:
+        """
+        Transcribe with timestamps using local Whisper
+        
+        The audio is split at pauses and the chunks are transcribed in
+        parallel (see utils/transcription.py).
+        
+        Args:
+            audio: Audio/video file path, or 16 kHz mono float32 samples (load_audio_pcm)
+        
+        Returns:
+            Dict with text and segments ([{start, end, text}]), or None on failure
+        """
+        try:
+            if isinstance(audio, str):
+                audio = self.load_audio_pcm(audio)
+                if audio is None:
+                    return None
+            result = get_transcriber().transcribe(audio)
+            if result is None:
+                print(f"Error transcribing: {get_transcriber().backend} is not installed")
+            return result
         except Exception as e:
             print(f"Error transcribing with local Whisper: {e}")
             return None
     
+    def transcribe_audio(self, audio: Union[str, "np.ndarray"]) -> Optional[str]:
+        """Transcribe an audio file, or 16 kHz mono float32 samples (load_audio_pcm), using local Whisper"""
+        result = self.transcribe_segments(audio)
+        return result['text'] if result else None
+    
     def extract_words(self, text: str) -> Set[str]:
         """Extract unique words from text"""
         # Convert to lowercase and remove punctuation
@@ -74,37 +172,46 @@ class SpeechProcessor:
         
         return words
     
-    def process_video(self, video_path: str) -> Tuple[Set[str], str]:
-        """Process video file and extract unique words"""
+    def process_video(self, video_path: str,
+                      on_segments: Optional[Callable[[List[Dict[str, Any]]], None]] = None) -> Tuple[Set[str], str]:
+        """Process video file and extract unique words
+        
+        on_segments receives the timed Whisper segments (e.g. to keep cue timings).
+        """
         print(f"Processing video: {video_path}")
         
-        # Extract audio
-        audio_path = self.extract_audio_from_video(video_path)
-        if not audio_path:
+        # Decode audio straight into memory (no temporary .wav)
+        audio = self.load_audio_pcm(video_path)
+        if audio is None:
             print(f"Failed to extract audio from {video_path}")
             return set(), ""
         
         # Transcribe
-        text = self.transcribe_audio(audio_path)
+        result = self.transcribe_segments(audio)
+        del audio
+        text = result['text'] if result else None
         if not text:
             print(f"Failed to transcribe audio from {video_path}")
             return set(), ""
+        if on_segments:
+            try:
+                on_segments(result['segments'])
+            except Exception as e:
+                print(f"⚠️ Segment callback hatası: {e}")
         
         print(f"Transcription: {text[:200]}...")
         
         # Extract words
         words = self.extract_words(text)
         
-        # Cleanup audio file
-        try:
-            os.remove(audio_path)
-        except:
-            pass
-        
         return words, text
     
-    def process_directory(self, directory: str, skip_filenames: Set[str] = None) -> List[Tuple[str, Set[str], str]]:
-        """Process all videos in directory"""
+    def process_directory(self, directory: str, skip_filenames: Set[str] = None,
+                          on_segments: Optional[Callable[[str, List[Dict[str, Any]]], None]] = None) -> List[Tuple[str, Set[str], str]]:
+        """Process all videos in directory
+        
+        on_segments is called with (filename, segments) for each transcribed video.
+        """
         results = []
         
         if skip_filenames is None:
@@ -125,147 +232,208 @@ class SpeechProcessor:
                 
             if filename.lower().endswith(video_extensions):
                 video_path = os.path.join(directory, filename)
-                words, transcript = self.process_video(video_path)
+                words, transcript = self.process_video(
+                    video_path, on_segments=(lambda segments, name=filename: on_segments(name, segments))
+                    if on_segments else None
+                )
                 results.append((filename, words, transcript))
             elif filename.lower().endswith(subtitle_extensions):
                 file_path = os.path.join(directory, filename)
                 print(f"Processing subtitle file: {filename}")
-                transcript = self.parse_subtitle_file(file_path)
+                words, transcript = self.ingest_subtitle_file(file_path)
                 if transcript:
-                    words = self.extract_words(transcript)
                     results.append((filename, words, transcript))
         
         return results
     
+    def _ydl_options(self, temp_dir: str, **overrides: Any) -> Dict[str, Any]:
+        """yt-dlp options shared by the subtitle, audio and video fetches"""
+        options = {
+            'outtmpl': os.path.join(temp_dir, '%(title)s.%(ext)s'),
+            'quiet': True,
+            'no_warnings': False,
+            'socket_timeout': 60,
+            'http_headers': {
+                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+                'Accept-Language': 'en-US,en;q=0.9',
+                'Accept-Encoding': 'gzip, deflate',
+                'DNT': '1',
+                'Connection': 'keep-alive',
+                'Upgrade-Insecure-Requests': '1'
+            },
+            'referer': 'https://www.google.com/',
+            'cookie_file': None,
+            'proxy': None,
+            # Farklı siteler için ayarlar
+            'extractor_args': {
+                'youtube': {
+                    'player_client': ['android', 'web'],
+                    'player_skip': ['js', 'configs']
+                },
+                'vimeo': {},  # Vimeo extract_args
+                'dailymotion': {},  # Dailymotion extract_args
+                'generic': {
+                    'prefer_free_formats': True
+                }
+            },
+            # SSL ve bağlantı ayarları
+            'skip_unavailable_fragments': True,
+            'fragment_retries': 10,
+            'retries': 10,
+            'file_access_retries': 10,
+            'noprogress': True,
+            'verbose': False,
+            'ignoreerrors': False,
+            'default_search': 'auto',
+            'playlistend': 1,  # Playlist ise sadece ilk videoyu indir
+        }
+        options.update(overrides)
+        return options
+    
+    def _extract(self, video_url: str, options: Dict[str, Any]) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """Run yt-dlp; returns (info of the first video, its output path) or (None, None)"""
+        with yt_dlp.YoutubeDL(options) as ydl:
+            info = ydl.extract_info(video_url, download=True)
+            # Playlist yapısı halinde dönerse ilk videoyu al
+            if isinstance(info, dict) and isinstance(info.get('entries'), list) and info['entries']:
+                info = info['entries'][0]
+            if not isinstance(info, dict):
+                return None, None
+            return info, ydl.prepare_filename(info)
+    
+    def _extract_with_fallback(self, video_url: str,
+                               options: Dict[str, Any]) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """_extract, retried once with the plain 'best' format and ignoreerrors if the first attempt fails"""
+        try:
+            return self._extract(video_url, options)
+        except Exception as e:
+            print(f"⚠️ İlk deneme başarısız: {e}")
+        # Fallback: Format seçimini basitleştir
+        return self._extract(video_url, dict(options, format='best', ignoreerrors=True))
+    
+    @staticmethod
+    def _find_downloaded(temp_dir: str, path: Optional[str], extensions: Tuple[str, ...]) -> Optional[str]:
+        """The expected output file, or another non-empty file with one of the extensions in temp_dir"""
+        if path and os.path.exists(path) and os.path.getsize(path) > 0:
+            return path
+        for name in sorted(os.listdir(temp_dir)):
+            candidate = os.path.join(temp_dir, name)
+            if name.lower().endswith(extensions) and os.path.getsize(candidate) > 0:
+                return candidate
+        return None
+    
+    def _format_bytes(self, info: Dict[str, Any], temp_dir: str) -> Optional[int]:
+        """
+        Size of the selected format(s): as reported by the site, else the
+        Content-Length of a HEAD request for plain HTTP formats; None if unknown
+        """
+        from yt_dlp.networking import HEADRequest
+        
+        formats = info.get('requested_formats') or [info]
+        sizes = [f.get('filesize') or f.get('filesize_approx') for f in formats]
+        unknown = [f for f, size in zip(formats, sizes) if not size]
+        if unknown and all(f.get('url') and (f.get('protocol') or 'http').startswith('http') for f in unknown):
+            with yt_dlp.YoutubeDL(self._ydl_options(temp_dir)) as ydl:
+                for i, f in enumerate(formats):
+                    if sizes[i]:
+                        continue
+                    try:
+                        response = ydl.urlopen(HEADRequest(f['url'], headers=f.get('http_headers') or {}))
+                        sizes[i] = int(response.headers.get('Content-Length') or 0)
+                    except Exception as e:
+                        print(f"⚠️ Video boyutu alınamadı: {e}")
+                        break
+        return int(sum(sizes)) if sizes and all(sizes) else None
+    
+    @staticmethod
+    def _directory_bytes(directory: str) -> int:
+        return sum(entry.stat().st_size for entry in os.scandir(directory) if entry.is_file())
+    
+    def fetch_subtitles_from_url(self, video_url: str,
+                                 temp_dir: str) -> Tuple[Optional[Dict[str, Any]], Optional[str], Optional[str]]:
+        """
+        First fetch phase: metadata and English subtitles only, no media
+        
+        The full-video format is still selected (not downloaded), so the
+        returned info tells how much a video download would have cost.
+        
+        Returns:
+            (info, the video's would-be file path, subtitle path or None);
+            all None if the URL cannot be read
+        """
+        options = self._ydl_options(
+            temp_dir,
+            format=FULL_VIDEO_FORMAT,
+            skip_download=True,
+            ignore_no_formats_error=True,  # Subtitles are still written when no format matches
+            writesubtitles=True,          # Alt yazıları indir
+            writeautomaticsub=True,       # Otomatik alt yazıları da indir (YouTube vb. için)
+            subtitleslangs=SUBTITLE_LANGS,  # Sadece İngilizce
+            subtitlesformat='vtt/srt/best',
+        )
+        try:
+            info, video_file = self._extract(video_url, options)
+        except Exception as e:
+            print(f"❌ Video bilgisi alınamadı: {e}")
+            return None, None, None
+        if info is None:
+            return None, None, None
+        
+        # yt-dlp alt yazıya video ismine benzer isim verir: video.en.vtt gibi
+        all_subs = glob.glob(os.path.join(glob.escape(temp_dir), "*.vtt")) + \
+                   glob.glob(os.path.join(glob.escape(temp_dir), "*.srt"))
+        if not all_subs:
+            return info, video_file, None
+        # İngilizce işaretli olanları önceliklendir (.en.vtt gibi)
+        english_subs = [s for s in all_subs if '.en' in os.path.basename(s).lower()]
+        subtitle_file = (english_subs or all_subs)[0]
+        print(f"✅ Alt yazı bulundu: {os.path.basename(subtitle_file)}")
+        return info, video_file, subtitle_file
+    
+    def download_audio_from_url(self, video_url: str, temp_dir: str) -> Optional[str]:
+        """Second fetch phase: the best audio-only stream (full video only if the site has no audio-only format)"""
+        try:
+            _, audio_file = self._extract_with_fallback(video_url, self._ydl_options(temp_dir, format=AUDIO_FORMAT))
+        except Exception as e:
+            print(f"❌ Ses indirme hatası: {e}")
+            return None
+        audio_file = self._find_downloaded(temp_dir, audio_file, MEDIA_EXTENSIONS)
+        if not audio_file:
+            print("❌ Hata: İndirilen ses dosyası bulunamadı")
+            return None
+        print(f"✅ Ses indirildi: {os.path.basename(audio_file)} ({os.path.getsize(audio_file) / (1024*1024):.1f} MB)")
+        return audio_file
+    
     def download_video_from_url(self, video_url: str) -> Tuple[Optional[str], Optional[str]]:
-        """Download video from URL (YouTube, Vimeo, Dailymotion, etc.) using yt-dlp"""
+        """Download the full video and its English subtitles into a new temp directory using yt-dlp"""
         if not yt_dlp:
             print("Error: yt-dlp not installed")
             return None, None
         
+        temp_dir = tempfile.mkdtemp()
+        print(f"📥 Video indiriliyor: {video_url}")
         try:
-            # Create temporary directory for download
-            temp_dir = tempfile.mkdtemp()
-            
-            ydl_opts = {
-                'format': 'best[ext=mp4]/best[ext=webm]/best',
-                'outtmpl': os.path.join(temp_dir, '%(title)s.%(ext)s'),
-                'quiet': False,
-                'no_warnings': False,
-                'socket_timeout': 60,
-                'http_headers': {
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                    'Accept-Language': 'en-US,en;q=0.9',
-                    'Accept-Encoding': 'gzip, deflate',
-                    'DNT': '1',
-                    'Connection': 'keep-alive',
-                    'Upgrade-Insecure-Requests': '1'
-                },
-                'referer': 'https://www.google.com/',
-                'cookie_file': None,
-                'proxy': None,
-                # Farklı siteler için ayarlar
-                'extractor_args': {
-                    'youtube': {
-                        'player_client': ['android', 'web'],
-                        'player_skip': ['js', 'configs']
-                    },
-                    'vimeo': {},  # Vimeo extract_args
-                    'dailymotion': {},  # Dailymotion extract_args
-                    'generic': {
-                        'prefer_free_formats': True
-                    }
-                },
-                # SSL ve bağlantı ayarları
-                'skip_unavailable_fragments': True,
-                'fragment_retries': 10,
-                'retries': 10,
-                'file_access_retries': 10,
-                'noprogress': False,
-                'verbose': True,
-                'ignoreerrors': False,
-                'default_search': 'auto',
-                'playlistend': 1,  # Playlist ise sadece ilk videoyu indir
-                # Alt yazı ayarları
-                'writesubtitles': True,       # Alt yazıları indir
-                'writeautomaticsub': True,    # Otomatik alt yazıları da indir (YouTube vb. için)
-                'subtitleslangs': ['en', 'en-US', 'en-GB'], # Sadece İngilizce
-            }
-            
-            print(f"📥 Video indiriliyor: {video_url}")
-            
-            video_file = None
-            subtitle_file = None
-            
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                try:
-                    info = ydl.extract_info(video_url, download=True)
-                except Exception as extract_error:
-                    print(f"⚠️ İlk deneme başarısız: {extract_error}")
-                    # Fallback: Format seçimini basitleştir
-                    ydl_opts['format'] = 'best'
-                    ydl_opts['ignoreerrors'] = True
-                    try:
-                        with yt_dlp.YoutubeDL(ydl_opts) as ydl_fallback:
-                            info = ydl_fallback.extract_info(video_url, download=True)
-                    except:
-                        print("❌ Fallback da başarısız oldu")
-                        return None, None
-                
-                # Playlist yapısı halinde dönerse ilk videoyu al
-                if isinstance(info, dict):
-                    if 'entries' in info and isinstance(info['entries'], list) and len(info['entries']) > 0:
-                        info = info['entries'][0]
-                    
-                    if isinstance(info, dict) and 'ext' in info:
-                        video_file = ydl.prepare_filename(info)
-                elif isinstance(info, str):
-                    # Info doğrudan dosya yoluysa
-                    video_file = info
-            
-            # Dosya kontrolleri
-            if not video_file:
-                print("❌ Hata: Video dosyası belirlenemedi")
-                return None, None
-                
-            if not os.path.exists(video_file):
-                print(f"❌ Hata: İndirilen dosya bulunamadı: {video_file}")
-                # Temp dizinde başka video dosyası var mı?
-                video_files = [f for f in os.listdir(temp_dir) if f.endswith(('.mp4', '.webm', '.mkv', '.avi'))]
-                if video_files:
-                    print(f"⚠️ Dosya yolu hatalı, {len(video_files)} video dosyası bulundu")
-                    video_file = os.path.join(temp_dir, video_files[0])
-                else:
-                    print("❌ Temp dizinde video dosyası yok")
-                    return None, None
-            
-            if os.path.getsize(video_file) == 0:
-                print("❌ Hata: İndirilen dosya boş")
-                return None, None
-            
-            # Alt yazı dosyası kontrolü (.vtt veya .srt)
-            # yt-dlp video ismine benzer isim verir: video.en.vtt gibi
-            base_name = os.path.splitext(os.path.basename(video_file))[0]
-            all_subs = glob.glob(os.path.join(temp_dir, f"{base_name}*.vtt")) + \
-                       glob.glob(os.path.join(temp_dir, f"{base_name}*.srt"))
-            
-            if all_subs:
-                # İngilizce işaretli olanları önceliklendir (.en.vtt gibi)
-                english_subs = [s for s in all_subs if '.en' in os.path.basename(s).lower()]
-                if english_subs:
-                    subtitle_file = english_subs[0]
-                else:
-                    subtitle_file = all_subs[0]
-                print(f"✅ Alt yazı bulundu: {os.path.basename(subtitle_file)}")
-                
-            print(f"✅ Video indirildi: {os.path.basename(video_file)} ({os.path.getsize(video_file) / (1024*1024):.1f} MB)")
-            return video_file, subtitle_file
-        
+            _, video_file = self._extract_with_fallback(video_url, self._ydl_options(
+                temp_dir, format=FULL_VIDEO_FORMAT,
+                writesubtitles=True, writeautomaticsub=True, subtitleslangs=SUBTITLE_LANGS,
+            ))
         except Exception as e:
             print(f"❌ Video indirme hatası: {e}")
-            import traceback
-            traceback.print_exc()
             return None, None
+        
+        video_file = self._find_downloaded(temp_dir, video_file, MEDIA_EXTENSIONS)
+        if not video_file:
+            print("❌ Hata: İndirilen video dosyası bulunamadı")
+            return None, None
+        
+        base_name = os.path.splitext(os.path.basename(video_file))[0]
+        all_subs = glob.glob(os.path.join(glob.escape(temp_dir), f"{glob.escape(base_name)}*.vtt")) + \
+                   glob.glob(os.path.join(glob.escape(temp_dir), f"{glob.escape(base_name)}*.srt"))
+        english_subs = [s for s in all_subs if '.en' in os.path.basename(s).lower()]
+        subtitle_file = (english_subs or all_subs or [None])[0]
+        
+        print(f"✅ Video indirildi: {os.path.basename(video_file)} ({os.path.getsize(video_file) / (1024*1024):.1f} MB)")
+        return video_file, subtitle_file
 
     def parse_subtitle_text(self, content: str) -> str:
         """Parse subtitle content string to plain text"""
@@ -309,55 +477,127 @@ class SpeechProcessor:
         try:
             # Use streaming for large files
             try:
-                from utils.streaming import should_use_streaming, process_subtitle_streaming
+                from utils.streaming import should_use_streaming, iter_subtitle_text_lines
                 
                 if should_use_streaming(subtitle_path, threshold_mb=10.0):
                     print(f"📦 Using streaming for large file: {subtitle_path}")
-                    # Process in streaming fashion
-                    lines = []
-                    for line in process_subtitle_streaming(subtitle_path):
-                        lines.append(line)
-                    content = ' '.join(lines)
-                    return self.parse_subtitle_text(content)
+                    # Lines are already cleaned by the mmap reader; join once
+                    return ' '.join(
+                        line.decode('utf-8', errors='ignore')
+                        for line in iter_subtitle_text_lines(subtitle_path)
+                    )
             except ImportError:
                 # Fallback to regular reading if streaming not available
                 pass
             
             # Regular file reading for small files
-            with open(subtitle_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-            return self.parse_subtitle_text(content)
+            from utils.text_io import read_text
+            return self.parse_subtitle_text(read_text(subtitle_path))
         except Exception as e:
             print(f"Error reading subtitle file: {e}")
             return ""
     
-    def process_video_from_url(self, video_url: str) -> Tuple[Optional[str], Set[str], str]:
-        """Process video from URL and return (filename, words)"""
-        video_path, subtitle_path = self.download_video_from_url(video_url)
-
-        if not video_path:
+    def count_subtitle_words(self, subtitle_path: str) -> Counter:
+        """Count words in a subtitle file without loading it into memory"""
+        from utils.streaming import count_subtitle_words
+        return count_subtitle_words(subtitle_path, self.stop_words)
+    
+    def ingest_subtitle_file(self, subtitle_path: str) -> Tuple[Set[str], str]:
+        """Extract words and transcript from a subtitle file
+        
+        Large files are tokenized through the streaming mmap reader so memory
+        stays bounded; their transcript is a preview of the first
+        STREAMING_TRANSCRIPT_PREVIEW_CHARS characters instead of the full text.
+        """
+        try:
+            from utils.streaming import should_use_streaming, read_subtitle_preview
+            
+            if should_use_streaming(subtitle_path, threshold_mb=10.0):
+                print(f"📦 Streaming word count for large file: {subtitle_path}")
+                words = set(self.count_subtitle_words(subtitle_path))
+                transcript = read_subtitle_preview(subtitle_path, STREAMING_TRANSCRIPT_PREVIEW_CHARS)
+                return words, transcript
+        except ImportError:
+            pass
+        except Exception as e:
+            print(f"Error streaming subtitle file: {e}")
+            return set(), ""
+        
+        transcript = self.parse_subtitle_file(subtitle_path)
+        if not transcript:
+            return set(), ""
+        return self.extract_words(transcript), transcript
+    
+    def process_video_from_url(self, video_url: str,
+                               on_subtitle: Optional[Callable[[str], None]] = None,
+                               on_download: Optional[Callable[[Dict[str, Any]], None]] = None,
+                               on_segments: Optional[Callable[[List[Dict[str, Any]]], None]] = None) -> Tuple[Optional[str], Set[str], str]:
+        """Process video from URL and return (filename, words, transcript)
+        
+        Fetches in two phases: English subtitles first without any media;
+        only if there are none (or they are empty) the best audio-only
+        stream is downloaded and transcribed with Whisper. The video itself
+        is never downloaded.
+        
+        on_subtitle is called with the downloaded subtitle path before the
+        temp directory is removed (e.g. to keep the cue timings);
+        on_segments with the timed Whisper segments when audio is transcribed.
+        on_download receives the fetch counters: mode ('subtitles' or
+        'audio'), downloaded_bytes, video_bytes (the full video's reported
+        size, None if unknown) and bytes_saved.
+        """
+        if not yt_dlp:
+            print("Error: yt-dlp not installed")
             return None, set(), ""
-
-        temp_dir = os.path.dirname(video_path)
-
+        
+        temp_dir = tempfile.mkdtemp()
+        print(f"📥 Video bilgisi ve alt yazılar alınıyor: {video_url}")
+        
         try:
+            info, video_file, subtitle_path = self.fetch_subtitles_from_url(video_url, temp_dir)
+            if info is None:
+                return None, set(), ""
+            # Kaydedilen dosya adı, videonun tam indirmede alacağı isimdir
+            filename = os.path.basename(video_file)
+            
             transcript = ""
             words = set()
-
+            mode = 'subtitles'
+            
             # Eğer alt yazı indiyse onu kullan (Whisper'dan çok daha hızlıdır)
             if subtitle_path and os.path.exists(subtitle_path):
                 print("📝 İndirilen alt yazı dosyası işleniyor...")
-                transcript = self.parse_subtitle_file(subtitle_path)
+                if on_subtitle:
+                    try:
+                        on_subtitle(subtitle_path)
+                    except Exception as e:
+                        print(f"⚠️ Alt yazı callback hatası: {e}")
+                words, transcript = self.ingest_subtitle_file(subtitle_path)
                 if transcript:
-                    words = self.extract_words(transcript)
                     print(f"✅ Alt yazıdan {len(words)} kelime çıkarıldı.")
-
-            # Alt yazı yoksa veya boşsa Whisper ile sesi yazıya dök
+            
+            # Alt yazı yoksa veya boşsa yalnızca sesi indirip Whisper ile yazıya dök
             if not transcript:
-                print("🎙️ Alt yazı bulunamadı, ses işleniyor (Whisper)...")
-                words, transcript = self.process_video(video_path)
-
-            filename = os.path.basename(video_path)
+                mode = 'audio'
+                print("🎙️ Alt yazı bulunamadı, yalnızca ses indiriliyor (Whisper)...")
+                audio_path = self.download_audio_from_url(video_url, temp_dir)
+                if not audio_path:
+                    return None, set(), ""
+                words, transcript = self.process_video(audio_path, on_segments=on_segments)
+            
+            downloaded = self._directory_bytes(temp_dir)
+            video_bytes = self._format_bytes(info, temp_dir)
+            stats = {
+                'mode': mode,
+                'downloaded_bytes': downloaded,
+                'video_bytes': video_bytes,
+                'bytes_saved': max(0, video_bytes - downloaded) if video_bytes is not None else None,
+            }
+            saved = f", {stats['bytes_saved'] / (1024*1024):.1f} MB tasarruf" if video_bytes is not None else ""
+            print(f"📦 {downloaded / 1024:.0f} KB indirildi ({mode}){saved}")
+            if on_download:
+                on_download(stats)
+            
             return filename, words, transcript
         except Exception as e:
             print(f"Error processing video from URL: {e}")
@@ -1,11 +1,19 @@
 #!/usr/bin/env python3
 import os
 import re
+import sys
+import json
 import sqlite3
-from typing import Dict, List, Set, Tuple, Any
+import multiprocessing
+from typing import Dict, List, Set, Tuple, Any, Iterable, Iterator, IO, Optional
 from collections import defaultdict, Counter
 import argparse
 
+from utils.text_io import read_text
+
+# Worker süreçlerinde kullanılan analizci (fork ile ebeveynden kopyalanmadan paylaşılır)
+_worker_analyzer: Optional['SRTAnalyzer'] = None
+
 class SRTAnalyzer:
     def __init__(self, db_path: str = 'learning.db'):
         self.db_path = db_path
@@ -13,6 +21,15 @@ class SRTAnalyzer:
         self.word_frequencies: Dict[str, int] = {}
         self.load_word_database()
     
+    @classmethod
+    def from_levels(cls, word_levels: Dict[str, int], word_frequencies: Dict[str, int]) -> 'SRTAnalyzer':
+        """Veritabanına gitmeden hazır seviye haritasıyla analizci oluşturur"""
+        analyzer = cls.__new__(cls)
+        analyzer.db_path = None
+        analyzer.word_levels = word_levels
+        analyzer.word_frequencies = word_frequencies
+        return analyzer
+    
     def load_word_database(self):
         """Veritabanından kelimeleri ve seviyelerini yükler"""
         conn = sqlite3.connect(self.db_path)
@@ -84,14 +101,9 @@ class SRTAnalyzer:
     def analyze_srt_file(self, file_path: str) -> Dict[str, Any]:
         """Tek bir SRT dosyasını analiz eder"""
         try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-        except UnicodeDecodeError:
-            try:
-                with open(file_path, 'r', encoding='latin-1', errors='ignore') as f:
-                    content = f.read()
-            except:
-                return {"error": f"Dosya okunamadı: {file_path}"}
+            content = read_text(file_path)
+        except OSError:
+            return {"file_path": file_path, "error": f"Dosya okunamadı: {file_path}"}
         
         words = self.extract_words_from_srt(content)
         
@@ -123,6 +135,7 @@ class SRTAnalyzer:
         
         # Bilinmeyen kelimeleri sırala
         unknown_words.sort(key=lambda x: x[1], reverse=True)
+        total_unknown_count = sum(count for _, count in unknown_words)
         
         return {
             "file_path": file_path,
@@ -130,37 +143,60 @@ class SRTAnalyzer:
             "unique_words": len(word_counter),
             "level_stats": level_stats,
             "unknown_words": unknown_words[:50],  # İlk 50 bilinmeyen kelime
-            "total_unknown_count": sum(count for _, count in unknown_words),
+            "total_unknown_count": total_unknown_count,
+            # Kapsama yalnızca bölümün kendi kelimeleri üzerinden: O(|bölüm|)
             "coverage_percentage": round(
-                (sum(word_counter.get(word, 0) for word in self.word_levels.keys() if word in word_counter) / len(words) * 100) 
-                if words else 0, 2
+                ((len(words) - total_unknown_count) / len(words) * 100) if words else 0, 2
             )
         }
     
-    def analyze_directory(self, directory_path: str, pattern: str = None) -> List[Dict[str, Any]]:
-        """Dizindeki tüm SRT dosyalarını analiz eder"""
-        if not os.path.exists(directory_path):
-            print(f"❌ Dizin bulunamadı: {directory_path}")
-            return []
-        
-        results = []
+    def find_subtitle_files(self, directory_path: str, pattern: str = None) -> List[str]:
+        """Dizindeki SRT/SUB/VTT dosyalarını bulur"""
         srt_files = []
-        
-        # SRT dosyalarını bul
         for root, dirs, files in os.walk(directory_path):
             for file in files:
                 if file.lower().endswith(('.srt', '.sub', '.vtt')):
                     if pattern is None or pattern.lower() in file.lower():
                         srt_files.append(os.path.join(root, file))
+        return sorted(srt_files)
+    
+    def iter_analyze_directory(self, directory_path: str, pattern: str = None,
+                               workers: int = 1) -> Iterator[Dict[str, Any]]:
+        """Dizindeki dosyaları (isteğe bağlı paralel) analiz eder, sonuçları sırayla üretir"""
+        if not os.path.exists(directory_path):
+            print(f"❌ Dizin bulunamadı: {directory_path}", file=sys.stderr)
+            return
+        
+        srt_files = self.find_subtitle_files(directory_path, pattern)
+        print(f"🔍 {len(srt_files)} SRT dosyası bulundu", file=sys.stderr)
         
-        print(f"🔍 {len(srt_files)} SRT dosyası bulundu")
+        if workers <= 1 or len(srt_files) < 2:
+            for i, file_path in enumerate(srt_files, 1):
+                print(f"📄 [{i}/{len(srt_files)}] {os.path.basename(file_path)} analiz ediliyor...", file=sys.stderr)
+                yield self.analyze_srt_file(file_path)
+            return
         
-        for i, file_path in enumerate(srt_files, 1):
-            print(f"📄 [{i}/{len(srt_files)}] {os.path.basename(file_path)} analiz ediliyor...")
-            result = self.analyze_srt_file(file_path)
-            results.append(result)
+        global _worker_analyzer
+        if 'fork' in multiprocessing.get_all_start_methods():
+            # Fork: seviye haritası kopyalanmadan (copy-on-write) worker'lara geçer
+            _worker_analyzer = self
+            pool = multiprocessing.get_context('fork').Pool(workers)
+        else:
+            # Spawn: harita her worker'a bir kez gönderilir
+            pool = multiprocessing.Pool(workers, _init_worker, (self.word_levels, self.word_frequencies))
         
-        return results
+        try:
+            for i, result in enumerate(pool.imap(_analyze_in_worker, srt_files, chunksize=4), 1):
+                print(f"📄 [{i}/{len(srt_files)}] {os.path.basename(result['file_path'])} analiz edildi", file=sys.stderr)
+                yield result
+        finally:
+            pool.close()
+            pool.join()
+            _worker_analyzer = None
+    
+    def analyze_directory(self, directory_path: str, pattern: str = None, workers: int = 1) -> List[Dict[str, Any]]:
+        """Dizindeki tüm SRT dosyalarını analiz eder"""
+        return list(self.iter_analyze_directory(directory_path, pattern, workers))
     
     def generate_summary_report(self, results: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Tüm analizler için özet rapor oluşturur"""
@@ -208,8 +244,9 @@ class SRTAnalyzer:
             "files_analyzed": [os.path.basename(r["file_path"]) for r in results]
         }
     
-    def print_detailed_report(self, results: List[Dict[str, Any]], show_unknown_words: bool = False, max_files: int = None):
-        """Detaylı analiz raporu yazdırır"""
+    def print_detailed_report(self, results: Iterable[Dict[str, Any]], show_unknown_words: bool = False, max_files: int = None):
+        """Detaylı analiz raporu yazdırır (liste veya read_ndjson akışı kabul eder)"""
+        results = list(results)
         if max_files:
             results = results[:max_files]
         
@@ -266,6 +303,34 @@ class SRTAnalyzer:
         
         print("\n" + "="*80)
 
+def _init_worker(word_levels: Dict[str, int], word_frequencies: Dict[str, int]):
+    """Spawn tabanlı havuzlarda worker başına analizciyi hazırlar"""
+    global _worker_analyzer
+    _worker_analyzer = SRTAnalyzer.from_levels(word_levels, word_frequencies)
+
+def _analyze_in_worker(file_path: str) -> Dict[str, Any]:
+    return _worker_analyzer.analyze_srt_file(file_path)
+
+def write_ndjson(results: Iterable[Dict[str, Any]], out: IO[str]) -> int:
+    """Sonuçları satır başına bir JSON nesnesi olarak yazar, yazılan satır sayısını döner"""
+    count = 0
+    for result in results:
+        out.write(json.dumps(result, ensure_ascii=False) + "\n")
+        out.flush()
+        count += 1
+    return count
+
+def read_ndjson(path: str) -> Iterator[Dict[str, Any]]:
+    """write_ndjson çıktısını okur; seviye anahtarlarını tekrar int'e çevirir"""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            result = json.loads(line)
+            result["level_stats"] = {int(level): stats for level, stats in result.get("level_stats", {}).items()}
+            yield result
+
 def main():
     """Ana fonksiyon - komut satırı arayüzü"""
     parser = argparse.ArgumentParser(description='SRT dosyalarını kelime seviyesine göre analiz eder')
@@ -274,12 +339,28 @@ def main():
     parser.add_argument('--unknown', '-u', action='store_true', help='Bilinmeyen kelimeleri göster')
     parser.add_argument('--max-files', '-m', type=int, help='Maksimum gösterilecek dosya sayısı')
     parser.add_argument('--summary', '-s', action='store_true', help='Sadece özet rapor göster')
+    parser.add_argument('--workers', '-w', type=int, default=os.cpu_count() or 1, help='Paralel worker sayısı')
+    parser.add_argument('--ndjson', '-n', metavar='OUT', help='Sonuçları NDJSON olarak yaz ("-" = stdout)')
     
     args = parser.parse_args()
     
+    if args.path.endswith('.ndjson') and os.path.isfile(args.path):
+        # Daha önce üretilmiş NDJSON sonuçlarından rapor
+        analyzer = SRTAnalyzer.from_levels({}, {})
+        analyzer.print_detailed_report(read_ndjson(args.path), args.unknown, args.max_files)
+        return
+    
     analyzer = SRTAnalyzer()
     
-    if os.path.isfile(args.path):
+    if args.ndjson and os.path.isdir(args.path):
+        results = analyzer.iter_analyze_directory(args.path, args.pattern, args.workers)
+        if args.ndjson == '-':
+            count = write_ndjson(results, sys.stdout)
+        else:
+            with open(args.ndjson, 'w', encoding='utf-8') as out:
+                count = write_ndjson(results, out)
+        print(f"✅ {count} sonuç NDJSON olarak yazıldı", file=sys.stderr)
+    elif os.path.isfile(args.path):
         # Tek dosya analizi
         print(f"📄 Dosya analiz ediliyor: {args.path}")
         result = analyzer.analyze_srt_file(args.path)
@@ -287,7 +368,7 @@ def main():
     elif os.path.isdir(args.path):
         # Dizin analizi
         print(f"📁 Dizin analiz ediliyor: {args.path}")
-        results = analyzer.analyze_directory(args.path, args.pattern)
+        results = analyzer.analyze_directory(args.path, args.pattern, args.workers)
         
         if results:
             if args.summary:
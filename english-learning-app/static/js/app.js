@@ -281,6 +281,89 @@ function initializeSocket() {
     });
 }
 
+// ===== BACKGROUND JOBS =====
+
+const JOB_POLL_MS = 2000;          // Poll interval without a Socket.IO connection
+const JOB_POLL_SOCKET_MS = 10000;  // Fallback poll interval while job_progress events arrive
+
+// Long operations answer 202 with a job id. Resolves with the job's result
+// (same shape as the old synchronous response) or {success: false, error}.
+async function waitForJob(response, onProgress) {
+    const data = await response.json();
+    if (response.status !== 202 || !data.job_id) {
+        return data;
+    }
+
+    return new Promise(resolve => {
+        let finished = false;
+        let timer = null;
+
+        const finish = (job) => {
+            if (finished) return;
+            finished = true;
+            clearTimeout(timer);
+            if (socket) socket.off('job_progress', update);
+            if (job.status === 'completed') {
+                resolve(job.result || { success: true });
+            } else {
+                resolve({
+                    success: false,
+                    job_id: data.job_id,
+                    error: job.error || (job.status === 'cancelled' ? 'İşlem iptal edildi' : 'İşlem başarısız oldu')
+                });
+            }
+        };
+
+        const update = (job) => {
+            if (finished || job.id !== data.job_id) return;
+            if (['completed', 'failed', 'cancelled'].includes(job.status)) {
+                finish(job);
+            } else if (onProgress) {
+                onProgress(job);
+            }
+        };
+
+        const poll = async () => {
+            try {
+                const res = await fetch(data.status_url);
+                const body = await res.json();
+                if (body.success) {
+                    update(body.job);
+                } else if (res.status === 404) {
+                    finish({ status: 'failed', error: body.error });
+                }
+            } catch (err) {
+                console.error('Job status error:', err);
+            }
+            if (!finished) {
+                timer = setTimeout(poll, socket && socket.connected ? JOB_POLL_SOCKET_MS : JOB_POLL_MS);
+            }
+        };
+
+        if (socket) {
+            socket.on('job_progress', update);
+            socket.emit('subscribe_job', { job_id: data.job_id });
+        }
+        timer = setTimeout(poll, socket && socket.connected ? JOB_POLL_SOCKET_MS : JOB_POLL_MS);
+    });
+}
+window.waitForJob = waitForJob; // Shared with the ES modules (videos.js)
+
+// "Kelimeler kaydediliyor: 1200/5000 (%24, ~40 sn kaldı)"
+function formatJobProgress(job) {
+    let text = job.message || 'İşleniyor...';
+    if (job.total) {
+        text += `: ${job.done}/${job.total} (%${Math.floor(100 * job.done / job.total)}`;
+        if (job.eta_seconds != null) {
+            text += job.eta_seconds >= 60
+                ? `, ~${Math.round(job.eta_seconds / 60)} dk kaldı`
+                : `, ~${Math.ceil(job.eta_seconds)} sn kaldı`;
+        }
+        text += ')';
+    }
+    return text;
+}
+
 function cleanupFriendsVideos() {
     if (!confirm('Kelime sayısı 500\'den az olan (hatalı/fallback) Friends bölümleri silinecek. Emin misiniz?')) return;
 
@@ -1774,7 +1857,7 @@ function processVideoUrl() {
             video_url: url
         })
     })
-    .then(res => res.json())
+    .then(res => waitForJob(res))
     .then(data => {
         status.style.display = 'none';
         
@@ -1917,7 +2000,7 @@ window.fetchDefinition = function(wordId, word) {
     .then(res => res.json())
     .then(data => {
         if (data.success) {
-            defElement.textContent = data.definition;
+            defElement.textContent = data.definition || (data.pending ? 'Çeviri aranıyor, birazdan tekrar deneyin' : 'Bulunamadı');
         } else {
             defElement.innerHTML = '<span style="color: red;">Bulunamadı</span>';
         }
@@ -2150,10 +2233,14 @@ window.handleTranscriptWordClick = async function(word, event) {
             
             wordEl.textContent = data.word;
             pronunciationEl.textContent = data.pronunciation || '';
-            definitionEl.textContent = data.definition || 'Çeviri bulunamadı';
+            definitionEl.textContent = data.definition || (data.pending ? 'Çeviri aranıyor...' : 'Çeviri bulunamadı');
             
             // Update button states based on known status
             updatePopupButtons(data.known);
+            
+            if (data.pending) {
+                pollPendingDefinition(data.word, definitionEl);
+            }
         } else {
             definitionEl.textContent = 'Tanım yüklenemedi';
         }
@@ -2163,6 +2250,32 @@ window.handleTranscriptWordClick = async function(word, event) {
     }
 }
 
+// Definitions missing locally are fetched in the background; re-check a few times
+function pollPendingDefinition(word, definitionEl, attempt = 1) {
+    if (attempt > 4) {
+        definitionEl.textContent = 'Çeviri bulunamadı';
+        return;
+    }
+    setTimeout(async () => {
+        // Popup closed or showing another word
+        if (!currentPopupWord || currentPopupWord.word !== word) return;
+        try {
+            const response = await fetch(`/api/words/lookup/${encodeURIComponent(word)}`);
+            const data = await response.json();
+            if (data.success && data.definition) {
+                currentPopupWord.definition = data.definition;
+                definitionEl.textContent = data.definition;
+            } else if (data.success && data.pending) {
+                pollPendingDefinition(word, definitionEl, attempt + 1);
+            } else {
+                definitionEl.textContent = 'Çeviri bulunamadı';
+            }
+        } catch (error) {
+            definitionEl.textContent = 'Çeviri bulunamadı';
+        }
+    }, 1000 * attempt);
+}
+
 function updatePopupButtons(known) {
     const knownBtn = document.getElementById('popupMarkKnown');
     const unknownBtn = document.getElementById('popupMarkUnknown');
@@ -2244,6 +2357,16 @@ document.addEventListener('click', function(event) {
 let currentTranscriptData = null;
 let highlightUnknownActive = false;
 
+function applyTranscriptWords(words, knownWordIds) {
+    const known = new Set(knownWordIds);
+    words.forEach(w => {
+        userWordsMap.set(w.word.toLowerCase(), {
+            id: w.id,
+            known: known.has(w.id)
+        });
+    });
+}
+
 async function loadTranscriptWords(transcript) {
     if (!currentUser || !currentUser.user_id || !transcript) return;
     
@@ -2355,12 +2478,14 @@ window.openTranscriptStudyMode = async function() {
         // Fetch transcript based on series type
         let response;
         
+        // user_id makes the response carry known word ids, so no batch lookup is needed
+        const userParam = currentUser && currentUser.user_id ? `&user_id=${currentUser.user_id}` : '';
         if (seriesId === 'friends' || seriesId === 'bigbang') {
             // Built-in series - try to get from subtitle files
-            response = await fetch(`/api/series/${seriesId}/transcript?season=${season}&episode=${episode}`);
+            response = await fetch(`/api/series/${seriesId}/transcript?season=${season}&episode=${episode}${userParam}`);
         } else {
             // Custom series
-            response = await fetch(`/api/custom-series/${seriesId}/transcript?episode=${episode}`);
+            response = await fetch(`/api/custom-series/${seriesId}/transcript?episode=${episode}${userParam}`);
         }
         
         const data = await response.json();
@@ -2372,7 +2497,9 @@ window.openTranscriptStudyMode = async function() {
                 seriesId,
                 season,
                 episode,
-                transcript
+                transcript,
+                words: data.words,
+                knownWordIds: data.known_word_ids
             };
         } else {
             // Show error message from API
@@ -2399,8 +2526,14 @@ window.openTranscriptStudyMode = async function() {
         
         titleEl.textContent = `📖 ${title}`;
         
-        // Extract words from transcript and load their status from database
-        await loadTranscriptWords(transcript);
+        // Word status comes with the transcript response; older responses need a lookup
+        if (currentTranscriptData && currentTranscriptData.transcript === transcript &&
+            currentTranscriptData.words && currentTranscriptData.knownWordIds) {
+            applyTranscriptWords(currentTranscriptData.words, currentTranscriptData.knownWordIds);
+        } else {
+            // Extract words from transcript and load their status from database
+            await loadTranscriptWords(transcript);
+        }
         
         // Render interactive transcript
         const interactiveHTML = renderTranscriptStudyContent(transcript);
@@ -3797,7 +3930,7 @@ function loadFriendsTranscripts() {
             season: selectedSeason
         })
     })
-    .then(res => res.json())
+    .then(res => waitForJob(res, job => console.log('🎬 ' + formatJobProgress(job))))
     .then(data => {
         statusDiv.style.display = 'none';
         btn.disabled = false;
@@ -3853,7 +3986,7 @@ function processDiziboxVideo() {
             video_url: url
         })
     })
-    .then(res => res.json())
+    .then(res => waitForJob(res, job => { statusText.textContent = '📥 ' + formatJobProgress(job); }))
     .then(data => {
         statusDiv.style.display = 'none';
         btn.disabled = false;
@@ -4072,6 +4205,11 @@ function showFlashcardOptionsModal(modal, data) {
                         <span>Seviyeye Göre</span>
                         <small style="opacity: 0.8;">${options.levels?.length || 0} seviye</small>
                     </button>
+                    <button onclick="showPhraseSelector()" class="btn btn-secondary" style="padding: 15px; display: flex; flex-direction: column; align-items: center; gap: 5px;">
+                        <span style="font-size: 1.3em;">💬</span>
+                        <span>İfadeler</span>
+                        <small style="opacity: 0.8;">${options.phrase_levels?.length || 0} seviye</small>
+                    </button>
                 </div>
                 
                 <!-- Levels Accordion -->
@@ -4092,6 +4230,24 @@ function showFlashcardOptionsModal(modal, data) {
                     </div>
                 </div>
                 
+                <!-- Phrase Levels Accordion -->
+                <div id="phraseSelector" style="display: none; margin-top: 15px;">
+                    <h4 style="margin-bottom: 10px; color: #374151;">İfade Seviyeleri</h4>
+                    <div style="max-height: 200px; overflow-y: auto; border: 1px solid #e5e7eb; border-radius: 8px;">
+                        ${options.phrase_levels?.map(level => `
+                            <div onclick="startFlashcardSession('phrase', ${level.id}, '${escapeHtml(level.name)}')" style="padding: 12px; border-bottom: 1px solid #e5e7eb; cursor: pointer; display: flex; justify-content: space-between; align-items: center;">
+                                <div>
+                                    <div style="font-weight: 500;">${level.name}</div>
+                                    <div style="font-size: 0.8em; color: #6b7280;">${level.total_words} ifade</div>
+                                </div>
+                                <div style="text-align: right;">
+                                    <span style="background: ${level.unknown_words > 0 ? '#f59e0b' : '#10b981'}; color: white; padding: 3px 8px; border-radius: 10px; font-size: 0.8em;">${level.unknown_words} bilinmeyen</span>
+                                </div>
+                            </div>
+                        `).join('') || '<div style="padding: 15px; text-align: center; color: #6b7280;">İfade bulunamadı</div>'}
+                    </div>
+                </div>
+                
                 <!-- Videos Accordion -->
                 <div id="videoSelector" style="display: none; margin-top: 15px;">
                     <h4 style="margin-bottom: 10px; color: #374151;">Videolardaki Kelimeler</h4>
@@ -4123,19 +4279,34 @@ function showFlashcardOptionsModal(modal, data) {
 window.showLevelSelector = function() {
     const selector = document.getElementById('levelSelector');
     const videoSelector = document.getElementById('videoSelector');
+    const phraseSelector = document.getElementById('phraseSelector');
+    if (selector) {
+        selector.style.display = selector.style.display === 'none' ? 'block' : 'none';
+    }
+    if (videoSelector) videoSelector.style.display = 'none';
+    if (phraseSelector) phraseSelector.style.display = 'none';
+}
+
+window.showPhraseSelector = function() {
+    const selector = document.getElementById('phraseSelector');
+    const levelSelector = document.getElementById('levelSelector');
+    const videoSelector = document.getElementById('videoSelector');
     if (selector) {
         selector.style.display = selector.style.display === 'none' ? 'block' : 'none';
     }
+    if (levelSelector) levelSelector.style.display = 'none';
     if (videoSelector) videoSelector.style.display = 'none';
 }
 
 window.showVideoSelector = function() {
     const selector = document.getElementById('videoSelector');
     const levelSelector = document.getElementById('levelSelector');
+    const phraseSelector = document.getElementById('phraseSelector');
     if (selector) {
         selector.style.display = selector.style.display === 'none' ? 'block' : 'none';
     }
     if (levelSelector) levelSelector.style.display = 'none';
+    if (phraseSelector) phraseSelector.style.display = 'none';
 }
 
 window.startFlashcardSession = function(type, targetId = null, targetName = null) {
@@ -4538,7 +4709,9 @@ window.addNewSeries = async function() {
             })
         });
         
-        const data = await response.json();
+        const data = await waitForJob(response, job => {
+            document.getElementById('addSeriesStatusText').textContent = formatJobProgress(job);
+        });
         
         if (data.success) {
             document.getElementById('addSeriesStatus').style.display = 'none';
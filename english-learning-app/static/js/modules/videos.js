@@ -87,10 +87,16 @@ export async function processVideoUrl() {
     result.style.display = 'none';
 
     try {
-        const data = await apiPost('/api/process-video-url', {
-            user_id: state.currentUser.user_id,
-            video_url: url
+        // Runs as a background job; waitForJob (app.js) follows it over Socket.IO and polling
+        const response = await fetch('/api/process-video-url', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({
+                user_id: state.currentUser.user_id,
+                video_url: url
+            })
         });
+        const data = await window.waitForJob(response);
 
         status.style.display = 'none';
 
@@ -0,0 +1,21 @@
+"""
+Shared test fixtures
+Tests run from english-learning-app/ (python -m pytest -q) against a fresh
+SQLite database per test; nothing touches learning.db
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import Database
+
+
+@pytest.fixture
+def db(tmp_path):
+    """Fresh database with the tables the ingestion code uses"""
+    database = Database(str(tmp_path / 'learning.db'), use_pool=False)
+    database.init_translation_cache()
+    return database
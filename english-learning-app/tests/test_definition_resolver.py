@@ -0,0 +1,141 @@
+"""
+Definition resolver against a stub LibreTranslate-style HTTP translator
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+pytest.importorskip('requests')
+
+from utils.definition_resolver import DefinitionResolver, RemoteTranslator, STATUS_PENDING, STATUS_UNAVAILABLE
+
+RATE = 5.0  # Requests per second allowed by the resolver under test
+
+
+class StubTranslator:
+    """POST /translate answering '<word>-tr' ('' for words starting with 'zz'); requests wait until `release` is set"""
+
+    def __init__(self):
+        self.arrivals = []
+        self.release = threading.Event()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                stub.arrivals.append(time.monotonic())
+                stub.release.wait(10)
+                body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+                translation = '' if body['q'].startswith('zz') else body['q'] + '-tr'
+                payload = json.dumps({'translatedText': translation}).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/translate"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.release.set()
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def stub():
+    server = StubTranslator()
+    yield server
+    server.close()
+
+
+@pytest.fixture
+def resolver(db, stub, monkeypatch):
+    resolver = DefinitionResolver(db, remote=RemoteTranslator(stub.url), rate=RATE)
+    # Only the remote path is under test, even where an Argos model is installed
+    monkeypatch.setattr(resolver, '_model_ready', lambda: False)
+    return resolver
+
+
+def wait_until(condition, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.02)
+
+
+def test_ingest_does_not_wait_on_the_translator(db, stub, resolver):
+    words = ['serendipity', 'quixotic', 'ephemeral']
+    db.add_words_batch(words)
+
+    started = time.monotonic()
+    counts = resolver.resolve_many(words)
+    elapsed = time.monotonic() - started
+
+    assert counts == {'local': 0, 'queued': 3}
+    assert elapsed < 1.0
+    # The first request is still held by the stub, so nothing can have been answered yet
+    wait_until(lambda: stub.arrivals)
+    assert resolver.pending == 3
+    assert db.get_word_cards_by_texts(words)['serendipity']['definition'] is None
+    stub.release.set()
+    wait_until(lambda: resolver.pending == 0)
+
+
+def test_resolve_queues_unknown_word(db, stub, resolver):
+    stub.release.set()
+    assert resolver.resolve('ubiquitous') == (None, STATUS_PENDING)
+    wait_until(lambda: resolver.pending == 0)
+    assert db.get_cached_translations(['ubiquitous'], 'en', 'tr') == {'ubiquitous': 'ubiquitous-tr'}
+
+
+def test_background_fetcher_respects_rate_limit(db, stub, resolver):
+    words = [f'word{i}' for i in range(5)]
+    db.add_words_batch(words)
+    stub.release.set()
+
+    resolver.resolve_many(words)
+    wait_until(lambda: resolver.pending == 0)
+
+    assert len(stub.arrivals) == len(words)
+    gaps = [b - a for a, b in zip(stub.arrivals, stub.arrivals[1:])]
+    assert min(gaps) >= 1.0 / RATE - 0.02
+
+
+def test_results_land_in_cache_and_words(db, stub, resolver):
+    words = ['gregarious', 'laconic']
+    db.add_words_batch(words)
+    stub.release.set()
+
+    resolver.resolve_many(words)
+    wait_until(lambda: resolver.pending == 0)
+
+    assert resolver.stats['fetched'] == 2
+    assert db.get_cached_translations(words, 'en', 'tr') == {'gregarious': 'gregarious-tr', 'laconic': 'laconic-tr'}
+    cards = db.get_word_cards_by_texts(words)
+    assert {w: cards[w]['definition'] for w in words} == {'gregarious': 'gregarious-tr', 'laconic': 'laconic-tr'}
+
+    # Words that now have a definition are not queued again
+    assert resolver.resolve_many(words) == {'local': 0, 'queued': 0}
+
+
+def test_untranslatable_words_are_cached_and_not_queued_again(db, stub, resolver):
+    words = ['zzyzx', 'laconic']
+    db.add_words_batch(words)
+    stub.release.set()
+
+    assert resolver.resolve_many(words) == {'local': 0, 'queued': 2}
+    wait_until(lambda: resolver.pending == 0)
+    assert db.get_cached_translations(words, 'en', 'tr', include_empty=True) == {'zzyzx': '', 'laconic': 'laconic-tr'}
+
+    # The cached empty result marks the word as untranslatable instead of queueing another request
+    assert resolver.resolve_many(words) == {'local': 0, 'queued': 0}
+    assert resolver.resolve('zzyzx') == (None, STATUS_UNAVAILABLE)
+    assert len(stub.arrivals) == 2
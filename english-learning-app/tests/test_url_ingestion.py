@@ -0,0 +1,102 @@
+"""
+Two-phase URL ingestion (subtitles first, then audio only) against a local
+http.server page with an HTML5 <video> that yt-dlp's generic extractor reads
+"""
+import functools
+import os
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+pytest.importorskip('yt_dlp')
+
+from speech_processor import SpeechProcessor
+
+VTT = """WEBVTT
+
+00:00:01.000 --> 00:00:03.000
+Hello there, my friend.
+
+00:00:04.000 --> 00:00:06.000
+How are you doing today?
+"""
+
+PAGE = """<html><head><title>Fixture Clip</title></head><body>
+<video controls>
+<source src="video.mp4" type='video/mp4; codecs="avc1.42E01E, mp4a.40.2"'>
+<source src="audio.m4a" type='audio/mp4; codecs="mp4a.40.2"'>
+{track}
+</video>
+</body></html>
+"""
+TRACK = '<track kind="subtitles" srclang="en" src="subs.en.vtt" label="English">'
+
+VIDEO_BYTES = 200000
+AUDIO_BYTES = 30000
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def site(tmp_path):
+    """Serves with_subs.html (video, audio and an English track) and no_subs.html (no track)"""
+    root = tmp_path / 'site'
+    root.mkdir()
+    (root / 'video.mp4').write_bytes(os.urandom(VIDEO_BYTES))
+    (root / 'audio.m4a').write_bytes(os.urandom(AUDIO_BYTES))
+    (root / 'subs.en.vtt').write_text(VTT, encoding='utf-8')
+    (root / 'with_subs.html').write_text(PAGE.format(track=TRACK), encoding='utf-8')
+    (root / 'no_subs.html').write_text(PAGE.format(track=''), encoding='utf-8')
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), functools.partial(QuietHandler, directory=str(root)))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_subtitle_phase_downloads_only_the_subtitles(site):
+    stats, subtitles = [], []
+    filename, words, transcript = SpeechProcessor().process_video_from_url(
+        f"{site}/with_subs.html", on_subtitle=subtitles.append, on_download=stats.append
+    )
+
+    assert filename.endswith('.mp4')
+    assert 'Hello there, my friend.' in transcript
+    assert 'friend' in words
+    assert len(subtitles) == 1 and subtitles[0].endswith('.en.vtt')
+    vtt_bytes = len(VTT.encode('utf-8'))
+    assert stats == [{
+        'mode': 'subtitles',
+        'downloaded_bytes': vtt_bytes,
+        'video_bytes': VIDEO_BYTES,
+        'bytes_saved': VIDEO_BYTES - vtt_bytes,
+    }]
+
+
+def test_audio_phase_downloads_only_the_audio(site, monkeypatch):
+    processor = SpeechProcessor()
+    transcribed = []
+
+    def fake_process_video(path, on_segments=None):
+        # Whisper and ffmpeg are not needed to check what was downloaded
+        transcribed.append((os.path.basename(path), os.path.getsize(path)))
+        return {'hello'}, 'hello'
+
+    monkeypatch.setattr(processor, 'process_video', fake_process_video)
+    stats = []
+    filename, words, transcript = processor.process_video_from_url(f"{site}/no_subs.html", on_download=stats.append)
+
+    assert filename.endswith('.mp4')
+    assert (words, transcript) == ({'hello'}, 'hello')
+    assert [(os.path.splitext(name)[1], size) for name, size in transcribed] == [('.m4a', AUDIO_BYTES)]
+    assert stats == [{
+        'mode': 'audio',
+        'downloaded_bytes': AUDIO_BYTES,
+        'video_bytes': VIDEO_BYTES,
+        'bytes_saved': VIDEO_BYTES - AUDIO_BYTES,
+    }]
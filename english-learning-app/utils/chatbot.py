@@ -15,6 +15,44 @@ except ImportError:
     TRANSFORMERS_AVAILABLE = False
     print("Warning: transformers not available. Install with: pip install transformers torch")
 
+from utils.model_registry import get_model_registry
+
+CHATBOT_MODEL = "gpt2"  # Small and fast, runs locally
+
+def load_chatbot_model() -> Optional[Dict]:
+    """Load tokenizer, model and generation pipeline (None without transformers)"""
+    if not TRANSFORMERS_AVAILABLE:
+        return None
+    
+    # Check if CUDA is available for GPU acceleration
+    device = 0 if torch.cuda.is_available() else -1
+    
+    print(f"Loading chatbot model: {CHATBOT_MODEL} (device: {'GPU' if device == 0 else 'CPU'})...")
+    
+    # Load tokenizer and model
+    tokenizer = AutoTokenizer.from_pretrained(CHATBOT_MODEL)
+    model = AutoModelForCausalLM.from_pretrained(CHATBOT_MODEL)
+    
+    # Set pad token if not exists
+    if tokenizer.pad_token is None:
+        tokenizer.pad_token = tokenizer.eos_token
+    
+    # Create text generation pipeline
+    generator = pipeline(
+        "text-generation",
+        model=model,
+        tokenizer=tokenizer,
+        device=device,
+        max_length=512,
+        do_sample=True,
+        temperature=0.7,
+        top_p=0.9,
+        pad_token_id=tokenizer.eos_token_id
+    )
+    return {'tokenizer': tokenizer, 'model': model, 'pipeline': generator}
+
+get_model_registry().register('chatbot', load_chatbot_model)
+
 class EnglishLearningChatbot:
     """
     Local AI chatbot focused on teaching English
@@ -48,37 +86,15 @@ Remember: You're here to help them learn, not just to answer questions. Make lea
             self._load_model()
     
     def _load_model(self):
-        """Load a local conversational model"""
+        """Take the local conversational model from the model registry (loads it on first use)"""
         try:
-            # Try to use a smaller, faster model that can run locally
-            # Using GPT-2 as a fallback, but ideally use a smaller conversational model
-            model_name = "gpt2"  # Small and fast, runs locally
-            
-            # Check if CUDA is available for GPU acceleration
-            device = 0 if torch.cuda.is_available() else -1
-            
-            print(f"Loading chatbot model: {model_name} (device: {'GPU' if device == 0 else 'CPU'})...")
-            
-            # Load tokenizer and model
-            self.tokenizer = AutoTokenizer.from_pretrained(model_name)
-            self.model = AutoModelForCausalLM.from_pretrained(model_name)
+            loaded = get_model_registry().get('chatbot')
+            if loaded is None:
+                raise RuntimeError("model is not available")
             
-            # Set pad token if not exists
-            if self.tokenizer.pad_token is None:
-                self.tokenizer.pad_token = self.tokenizer.eos_token
-            
-            # Create text generation pipeline
-            self.pipeline = pipeline(
-                "text-generation",
-                model=self.model,
-                tokenizer=self.tokenizer,
-                device=device,
-                max_length=512,
-                do_sample=True,
-                temperature=0.7,
-                top_p=0.9,
-                pad_token_id=self.tokenizer.eos_token_id
-            )
+            self.tokenizer = loaded['tokenizer']
+            self.model = loaded['model']
+            self.pipeline = loaded['pipeline']
             
             self.model_loaded = True
             print("✅ Chatbot model loaded successfully!")
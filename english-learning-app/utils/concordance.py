@@ -0,0 +1,332 @@
+"""
+Concordance (KWIC) Index
+Positional inverted index of word -> (episode, line) postings for in-context examples
+"""
+import os
+import re
+import sqlite3
+import threading
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from utils.corpus import iter_text_units, unit_text
+
+DEFAULT_INDEX_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'cache', 'concordance.db')
+FLUSH_POSTINGS = 1_000_000  # Buffered postings before a block is written out
+MAX_CANDIDATES = 400  # Postings sampled per lookup before ranking
+IDEAL_LINE_TOKENS = 10
+
+_WORD_RE = re.compile(rb"[a-z]+(?:'[a-z]+)?")
+
+
+# ----- varint coding -----
+
+def encode_varints(values: Iterable[int]) -> bytes:
+    """LEB128-style unsigned varints"""
+    out = bytearray()
+    for value in values:
+        while value >= 0x80:
+            out.append((value & 0x7F) | 0x80)
+            value >>= 7
+        out.append(value)
+    return bytes(out)
+
+
+def decode_varints(data: bytes) -> Iterator[int]:
+    value = shift = 0
+    for byte in data:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+        else:
+            yield value
+            value = shift = 0
+
+
+def encode_postings(postings: List[Tuple[int, int]]) -> bytes:
+    """
+    Delta-encode sorted (doc_id, line) postings
+
+    Each posting is written as doc delta followed by the line number, which
+    is itself a delta when the doc is unchanged.
+    """
+    values: List[int] = []
+    prev_doc = prev_line = 0
+    for doc, line in postings:
+        if doc != prev_doc:
+            values.append(doc - prev_doc)
+            values.append(line)
+        else:
+            values.append(0)
+            values.append(line - prev_line)
+        prev_doc, prev_line = doc, line
+    return encode_varints(values)
+
+
+def decode_postings(data: bytes) -> Iterator[Tuple[int, int]]:
+    values = decode_varints(data)
+    doc = line = 0
+    for doc_delta in values:
+        line_value = next(values)
+        if doc_delta:
+            doc += doc_delta
+            line = line_value
+        else:
+            line += line_value
+        yield doc, line
+
+
+class ConcordanceIndex:
+    """
+    SQLite-backed concordance.
+
+    docs holds each document's path and a packed (start, end, tokens) triple
+    per line, so a posting resolves to its text with one seek. postings holds
+    varint blocks per word; a word may span several blocks because the
+    builder flushes whenever its buffer reaches FLUSH_POSTINGS. Each block
+    records its posting_count, so sampled lookups decode only the blocks
+    they draw from.
+    """
+
+    def __init__(self, path: str = DEFAULT_INDEX_PATH):
+        self.path = path
+        self._line_tables: Dict[int, array] = {}
+        self._docs: Dict[int, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+    def _connect(self, path: Optional[str] = None) -> sqlite3.Connection:
+        conn = sqlite3.connect(path or self.path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    # ----- building -----
+
+    def build(self, documents: Iterable[Dict[str, Any]], flush_postings: int = FLUSH_POSTINGS) -> Dict[str, int]:
+        """
+        Rebuild the index from documents in bounded memory
+
+        The new index is written next to the old one and swapped in when
+        complete, so lookups keep working during a rebuild.
+
+        Returns:
+            Counts of indexed documents, lines and postings
+        """
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = self.path + '.building'
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+        conn = self._connect(tmp_path)
+        cursor = conn.cursor()
+        cursor.execute('''
+            CREATE TABLE docs (
+                doc_id INTEGER PRIMARY KEY,
+                doc_key TEXT UNIQUE NOT NULL,
+                path TEXT NOT NULL,
+                series TEXT,
+                season INTEGER,
+                episode INTEGER,
+                title TEXT,
+                lines BLOB NOT NULL
+            )
+        ''')
+        cursor.execute('''
+            CREATE TABLE postings (
+                word TEXT NOT NULL,
+                block INTEGER NOT NULL,
+                posting_count INTEGER NOT NULL,
+                data BLOB NOT NULL,
+                PRIMARY KEY (word, block)
+            ) WITHOUT ROWID
+        ''')
+
+        buffer: Dict[bytes, List[Tuple[int, int]]] = {}
+        block_numbers: Dict[bytes, int] = {}
+        buffered = 0
+        stats = {'documents': 0, 'lines': 0, 'postings': 0}
+
+        def flush() -> None:
+            rows = []
+            for word, postings in buffer.items():
+                block = block_numbers.get(word, 0)
+                block_numbers[word] = block + 1
+                rows.append((word.decode('ascii'), block, len(postings), encode_postings(postings)))
+            cursor.executemany('INSERT INTO postings (word, block, posting_count, data) VALUES (?, ?, ?, ?)', rows)
+            conn.commit()
+            buffer.clear()
+
+        for doc_id, doc in enumerate(documents, start=1):
+            try:
+                lines = array('I')
+                for line_no, (start, end, raw) in enumerate(iter_text_units(doc['path'])):
+                    tokens = _WORD_RE.findall(raw.lower())
+                    lines.extend((start, end, len(tokens)))
+                    for word in set(tokens):
+                        buffer.setdefault(word, []).append((doc_id, line_no))
+                    buffered += len(tokens)
+                    stats['lines'] += 1
+            except OSError as e:
+                print(f"⚠️ {doc['path']} okunamadı: {e}")
+                continue
+
+            cursor.execute('''
+                INSERT INTO docs (doc_id, doc_key, path, series, season, episode, title, lines)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (doc_id, doc['key'], doc['path'], doc.get('series'), doc.get('season'),
+                  doc.get('episode'), doc.get('title'), lines.tobytes()))
+            stats['documents'] += 1
+
+            if buffered >= flush_postings:
+                stats['postings'] += sum(len(p) for p in buffer.values())
+                flush()
+                buffered = 0
+
+        stats['postings'] += sum(len(p) for p in buffer.values())
+        flush()
+        conn.close()
+
+        with self._lock:
+            os.replace(tmp_path, self.path)
+            self._line_tables.clear()
+            self._docs.clear()
+        return stats
+
+    # ----- lookups -----
+
+    def _doc(self, conn: sqlite3.Connection, doc_id: int) -> Optional[Tuple[Dict[str, Any], array]]:
+        """A document and its line table, cached until the next build()"""
+        with self._lock:
+            doc = self._docs.get(doc_id)
+            if doc is not None:
+                return doc, self._line_tables[doc_id]
+        row = conn.execute('SELECT * FROM docs WHERE doc_id = ?', (doc_id,)).fetchone()
+        if row is None:
+            return None
+        doc = dict(row)
+        lines = array('I')
+        lines.frombytes(doc.pop('lines'))
+        with self._lock:
+            self._line_tables[doc_id] = lines
+            self._docs[doc_id] = doc
+        return doc, lines
+
+    def postings(self, word: str, max_postings: int = MAX_CANDIDATES) -> List[Tuple[int, int]]:
+        """
+        Up to max_postings (doc_id, line) postings of a word, sampled evenly
+        across all of its postings so late episodes are represented too
+        """
+        if not self.exists() or max_postings <= 0:
+            return []
+        conn = self._connect()
+        try:
+            word = word.lower()
+            blocks = conn.execute('SELECT block, posting_count FROM postings WHERE word = ? ORDER BY block',
+                                  (word,)).fetchall()
+            total = sum(row['posting_count'] for row in blocks)
+            stride = max(1, -(-total // max_postings))  # ceil(total / max_postings)
+
+            # Only blocks holding a sampled position (a multiple of stride) are read and decoded
+            result: List[Tuple[int, int]] = []
+            first = 0  # Position of the block's first posting across all blocks
+            for row in blocks:
+                count = row['posting_count']
+                sample = -(-first // stride) * stride  # First sampled position at or after first
+                if sample < first + count:
+                    data = conn.execute('SELECT data FROM postings WHERE word = ? AND block = ?',
+                                        (word, row['block'])).fetchone()['data']
+                    for position, posting in enumerate(decode_postings(data), start=first):
+                        if position == sample:
+                            result.append(posting)
+                            sample += stride
+                            if sample >= first + count:
+                                break
+                first += count
+            return result[:max_postings]
+        finally:
+            conn.close()
+
+    def examples(self, word: str, limit: int = 5) -> List[Dict[str, Any]]:
+        """
+        Top context lines for a word
+
+        Lines close to IDEAL_LINE_TOKENS tokens rank first, with at most one
+        line per episode until every episode has contributed.
+        """
+        word = word.lower()
+        candidates = self.postings(word)
+        if not candidates:
+            return []
+
+        conn = self._connect()
+        try:
+            # Documents resolved once per lookup, so a concurrent build() clearing the cache cannot drop them
+            resolved: Dict[int, Tuple[Dict[str, Any], array]] = {}
+            scored = []
+            for doc_id, line_no in candidates:
+                if doc_id not in resolved:
+                    entry = self._doc(conn, doc_id)
+                    if entry is None:
+                        continue
+                    resolved[doc_id] = entry
+                lines = resolved[doc_id][1]
+                tokens = lines[line_no * 3 + 2]
+                scored.append((abs(tokens - IDEAL_LINE_TOKENS), doc_id, line_no))
+            scored.sort()
+
+            picked: List[Tuple[int, int]] = []
+            seen_docs = set()
+            for _, doc_id, line_no in scored:
+                if doc_id not in seen_docs:
+                    picked.append((doc_id, line_no))
+                    seen_docs.add(doc_id)
+                    if len(picked) >= limit:
+                        break
+            if len(picked) < limit:
+                for _, doc_id, line_no in scored:
+                    if (doc_id, line_no) not in picked:
+                        picked.append((doc_id, line_no))
+                        if len(picked) >= limit:
+                            break
+
+            keyword_re = re.compile(r"(?<![A-Za-z'])" + re.escape(word) + r"(?![A-Za-z'])", re.IGNORECASE)
+            results = []
+            for doc_id, line_no in picked:
+                doc, lines = resolved[doc_id]
+                start, end = lines[line_no * 3], lines[line_no * 3 + 1]
+                try:
+                    with open(doc['path'], 'rb') as f:
+                        f.seek(start)
+                        text = unit_text(f.read(end - start))
+                except OSError:
+                    continue
+
+                match = keyword_re.search(text)
+                left, keyword, right = (text[:match.start()], match.group(0), text[match.end():]) if match else (text, '', '')
+                results.append({
+                    'series': doc['series'],
+                    'season': doc['season'],
+                    'episode': doc['episode'],
+                    'title': doc['title'],
+                    'line': line_no,
+                    'text': text,
+                    'left': left,
+                    'keyword': keyword,
+                    'right': right,
+                })
+            return results
+        finally:
+            conn.close()
+
+
+_concordance: Optional[ConcordanceIndex] = None
+
+
+def get_concordance() -> ConcordanceIndex:
+    """Get shared concordance index instance"""
+    global _concordance
+    if _concordance is None:
+        _concordance = ConcordanceIndex()
+    return _concordance
@@ -0,0 +1,144 @@
+"""
+Corpus Utilities
+Locate episode transcript/subtitle files and split them into addressable lines
+"""
+import os
+import re
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+SUBTITLES_BASE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Subtitles')
+TRANSCRIPT_EXTENSIONS = ('.txt', '.srt', '.vtt')
+MAX_UNIT_BYTES = 400  # Longer lines are split on sentence boundaries
+
+_SEASON_EPISODE_RES = (
+    re.compile(r'series-(\d{1,2})-episode-(\d{1,2})'),
+    re.compile(r's(\d{1,2})e(\d{1,2})'),
+    re.compile(r'(\d{1,2})x(\d{2})'),
+)
+_TIMING_LINE_RE = re.compile(rb'\d{2}:\d{2}[:.,\d]*\s*-->')
+_MERGE_MARKER_RE = re.compile(rb'^(<<<<<<< |=======|>>>>>>> )')
+_SENTENCE_END_RE = re.compile(rb'[.!?]+["\')\]]*\s+')
+_TAG_RE = re.compile(r'<[^>]+>|\{[^}]+\}')
+
+
+def parse_season_episode(filename: str) -> Tuple[int, int]:
+    """Extract (season, episode) from an episode filename, (0, 0) if unknown"""
+    name = filename.lower()
+    for pattern in _SEASON_EPISODE_RES:
+        match = pattern.search(name)
+        if match:
+            return int(match.group(1)), int(match.group(2))
+    return 0, 0
+
+
+def make_document(series: str, path: str, strip_prefix: str = '') -> Dict[str, Any]:
+    """Document dict for one transcript/subtitle file, as yielded by iter_transcript_documents"""
+    filename = os.path.basename(path)
+    season, episode = parse_season_episode(filename)
+    title = os.path.splitext(filename)[0]
+    if strip_prefix and title.startswith(strip_prefix):
+        title = title[len(strip_prefix):]
+    return {
+        'key': f"{series}/{filename}",
+        'path': path,
+        'series': series,
+        'season': season,
+        'episode': episode,
+        'title': title,
+    }
+
+
+def _folder_documents(series: str, folder: str, strip_prefix: str = '') -> Iterator[Dict[str, Any]]:
+    if not os.path.isdir(folder):
+        return
+    for filename in sorted(os.listdir(folder)):
+        if filename.lower().endswith(TRANSCRIPT_EXTENSIONS):
+            yield make_document(series, os.path.join(folder, filename), strip_prefix)
+
+
+def iter_transcript_documents(custom_series: Iterable[Dict[str, Any]] = (),
+                              subtitles_base: str = SUBTITLES_BASE) -> Iterator[Dict[str, Any]]:
+    """
+    Iterate over all transcript/subtitle files of the built-in and custom series
+
+    Args:
+        custom_series: Rows from Database.get_custom_series()
+        subtitles_base: Root Subtitles folder
+
+    Yields:
+        Document dicts with key, path, series, season, episode and title
+    """
+    yield from _folder_documents('friends', os.path.join(subtitles_base, 'Friends'))
+    for season in range(1, 11):
+        yield from _folder_documents('friends', os.path.join(subtitles_base, f'Friends{season}'))
+    yield from _folder_documents('bigbang', os.path.join(subtitles_base, 'BigBangTheory'))
+
+    for series in custom_series:
+        folder = series.get('db_folder_path')
+        if folder:
+            yield from _folder_documents(series['series_id'], folder, f"{series['series_id']}_")
+
+
+def iter_text_units(path: str) -> Iterator[Tuple[int, int, bytes]]:
+    """
+    Split a transcript or subtitle file into addressable text units
+
+    .txt files yield one unit per line; .srt/.vtt files yield one unit per
+    cue. Lines over MAX_UNIT_BYTES are split on sentence boundaries so every
+    unit stays short enough to show as an example.
+
+    Args:
+        path: Transcript/subtitle file path
+
+    Yields:
+        (start_byte, end_byte, raw_bytes) for each unit
+    """
+    is_subtitle = path.lower().endswith(('.srt', '.vtt'))
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    cue_start: Optional[int] = None
+    cue_end = 0
+    pos = 0
+    size = len(data)
+
+    while pos < size:
+        end = data.find(b'\n', pos)
+        if end == -1:
+            end = size
+        line = data[pos:end]
+        stripped = line.strip()
+
+        if is_subtitle:
+            if not stripped or _TIMING_LINE_RE.match(stripped):
+                if cue_start is not None:
+                    yield cue_start, cue_end, data[cue_start:cue_end]
+                cue_start = None
+            elif not stripped.isdigit() and not stripped.startswith((b'WEBVTT', b'Kind:', b'Language:')):
+                if cue_start is None:
+                    cue_start = pos
+                cue_end = pos + len(line.rstrip())
+        elif stripped and not _MERGE_MARKER_RE.match(stripped):
+            line_end = pos + len(line.rstrip())
+            if line_end - pos <= MAX_UNIT_BYTES:
+                yield pos, line_end, data[pos:line_end]
+            else:
+                unit_start = pos
+                for match in _SENTENCE_END_RE.finditer(data, pos, line_end):
+                    if match.start() - unit_start >= 20:
+                        yield unit_start, match.start() + 1, data[unit_start:match.start() + 1]
+                        unit_start = match.end()
+                if unit_start < line_end:
+                    yield unit_start, line_end, data[unit_start:line_end]
+
+        pos = end + 1
+
+    if cue_start is not None:
+        yield cue_start, cue_end, data[cue_start:cue_end]
+
+
+def unit_text(raw: bytes) -> str:
+    """Decode a text unit for display: markup removed, lines joined"""
+    text = raw.decode('utf-8', errors='replace')
+    text = _TAG_RE.sub('', text)
+    return ' '.join(part.strip() for part in text.splitlines() if part.strip())
@@ -0,0 +1,237 @@
+"""
+Cue Index
+Timed subtitle cues stored in flat arrays for bisect lookups during playback
+"""
+import os
+import re
+import sys
+import struct
+import threading
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from utils.text_io import read_text
+
+DEFAULT_CUE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'cache', 'cues')
+
+_MAGIC = b'CUE1'
+_HEADER = struct.Struct('<4sII')  # magic, cue count, utf-8 text length
+
+_TIMING_RE = re.compile(
+    r'(?:(\d{1,2}):)?(\d{2}):(\d{2})[,.](\d{3})\s*-->\s*(?:(\d{1,2}):)?(\d{2}):(\d{2})[,.](\d{3})'
+)
+_TAG_RE = re.compile(r'<[^>]+>|\{[^}]+\}')
+
+
+def _to_ms(hours: Optional[str], minutes: str, seconds: str, millis: str) -> int:
+    return ((int(hours or 0) * 60 + int(minutes)) * 60 + int(seconds)) * 1000 + int(millis)
+
+
+def iter_cues(content: str) -> Iterator[Tuple[int, int, str]]:
+    """
+    Parse SRT/VTT content into (start_ms, end_ms, text) cues
+
+    Args:
+        content: Raw subtitle file content
+
+    Yields:
+        Cues in file order, markup stripped and lines joined with spaces
+    """
+    start = end = None
+    lines: List[str] = []
+
+    for line in content.splitlines():
+        timing = _TIMING_RE.search(line)
+        if timing:
+            if start is not None and lines:
+                yield start, end, ' '.join(lines)
+            g = timing.groups()
+            start, end = _to_ms(*g[:4]), _to_ms(*g[4:])
+            lines = []
+            continue
+
+        line = line.strip()
+        if not line:
+            if start is not None and lines:
+                yield start, end, ' '.join(lines)
+            start, lines = None, []
+            continue
+
+        if start is not None:
+            text = _TAG_RE.sub('', line).strip()
+            if text:
+                lines.append(text)
+
+    if start is not None and lines:
+        yield start, end, ' '.join(lines)
+
+
+class CueIndex:
+    """
+    Cues as parallel arrays: start_ms, end_ms and offsets into one text blob.
+
+    Cue i spans text[offsets[i]:offsets[i + 1]]. Starts are sorted, so the
+    cue at a playback position is found with a bisect; max_ends[i] (the
+    latest end among cues 0..i) bounds the walk back over overlapping cues.
+    """
+
+    def __init__(self, starts: array, ends: array, offsets: array, text: str):
+        self.starts = starts
+        self.ends = ends
+        self.offsets = offsets
+        self.text = text
+        self.max_ends = array('i')
+        latest = 0
+        for end in ends:
+            latest = max(latest, end)
+            self.max_ends.append(latest)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    @classmethod
+    def from_cues(cls, cues: Iterable[Tuple[int, int, str]]) -> 'CueIndex':
+        """Build from (start_ms, end_ms, text) cues in any order"""
+        cues = sorted(cues, key=lambda c: c[0])
+        starts, ends, offsets = array('i'), array('i'), array('i', [0])
+        parts: List[str] = []
+        position = 0
+        for start, end, text in cues:
+            starts.append(start)
+            ends.append(end)
+            parts.append(text)
+            position += len(text)
+            offsets.append(position)
+        return cls(starts, ends, offsets, ''.join(parts))
+
+    @classmethod
+    def from_subtitle_text(cls, content: str) -> 'CueIndex':
+        return cls.from_cues(iter_cues(content))
+
+    @classmethod
+    def from_segments(cls, segments: Iterable[Dict[str, Any]]) -> 'CueIndex':
+        """Build from Whisper segments ([{start, end, text}] in seconds)"""
+        return cls.from_cues(
+            (int(round(s['start'] * 1000)), int(round(s['end'] * 1000)), s['text'].strip())
+            for s in segments if s.get('text') and s['text'].strip()
+        )
+
+    @classmethod
+    def from_subtitle_file(cls, path: str) -> 'CueIndex':
+        return cls.from_subtitle_text(read_text(path))
+
+    def cue(self, i: int) -> Dict[str, Any]:
+        return {
+            'index': i,
+            'start_ms': self.starts[i],
+            'end_ms': self.ends[i],
+            'text': self.text[self.offsets[i]:self.offsets[i + 1]],
+        }
+
+    def at(self, t_ms: int) -> Optional[Dict[str, Any]]:
+        """Cue shown at t_ms (the latest-starting one if cues overlap), or None between cues"""
+        i = bisect_right(self.starts, t_ms) - 1
+        while i >= 0 and t_ms < self.max_ends[i]:
+            if t_ms < self.ends[i]:
+                return self.cue(i)
+            i -= 1
+        return None
+
+    def following(self, t_ms: int, n: int) -> List[Dict[str, Any]]:
+        """The next n cues starting after t_ms"""
+        i = bisect_right(self.starts, t_ms)
+        return [self.cue(j) for j in range(i, min(i + n, len(self)))]
+
+    # ----- persistence -----
+
+    def to_bytes(self) -> bytes:
+        encoded = self.text.encode('utf-8')
+        parts = [_HEADER.pack(_MAGIC, len(self), len(encoded))]
+        for arr in (self.starts, self.ends, self.offsets):
+            little = array('i', arr)
+            if sys.byteorder == 'big':
+                little.byteswap()
+            parts.append(little.tobytes())
+        parts.append(encoded)
+        return b''.join(parts)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'CueIndex':
+        magic, count, text_len = _HEADER.unpack_from(data)
+        if magic != _MAGIC:
+            raise ValueError("Not a cue index file")
+        pos = _HEADER.size
+        arrays = []
+        for length in (count, count, count + 1):
+            arr = array('i')
+            arr.frombytes(data[pos:pos + length * 4])
+            if sys.byteorder == 'big':
+                arr.byteswap()
+            arrays.append(arr)
+            pos += length * 4
+        text = data[pos:pos + text_len].decode('utf-8')
+        return cls(arrays[0], arrays[1], arrays[2], text)
+
+    def save(self, path: str) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(self.to_bytes())
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'CueIndex':
+        with open(path, 'rb') as f:
+            return cls.from_bytes(f.read())
+
+
+class CueStore:
+    """Per-episode cue indexes on disk with a small in-memory LRU in front"""
+
+    def __init__(self, directory: str = DEFAULT_CUE_DIR, max_cached: int = 64):
+        self.directory = directory
+        self.max_cached = max_cached
+        self._cache: 'OrderedDict[str, CueIndex]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def path_for(self, key: str) -> str:
+        safe_key = re.sub(r'[^A-Za-z0-9_.-]', '_', str(key))
+        return os.path.join(self.directory, f"{safe_key}.cues")
+
+    def _remember(self, key: str, index: CueIndex) -> None:
+        with self._lock:
+            self._cache[key] = index
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_cached:
+                self._cache.popitem(last=False)
+
+    def put(self, key: str, index: CueIndex) -> None:
+        index.save(self.path_for(key))
+        self._remember(str(key), index)
+
+    def get(self, key: str) -> Optional[CueIndex]:
+        key = str(key)
+        with self._lock:
+            index = self._cache.get(key)
+            if index is not None:
+                self._cache.move_to_end(key)
+                return index
+        path = self.path_for(key)
+        if not os.path.exists(path):
+            return None
+        index = CueIndex.load(path)
+        self._remember(key, index)
+        return index
+
+
+_cue_store: Optional[CueStore] = None
+
+
+def get_cue_store() -> CueStore:
+    """Get shared cue store instance"""
+    global _cue_store
+    if _cue_store is None:
+        _cue_store = CueStore()
+    return _cue_store
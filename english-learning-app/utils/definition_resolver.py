@@ -0,0 +1,232 @@
+"""
+Definition Resolver
+Offline-first word definitions: local sources answer immediately and misses
+are fetched by a rate-limited background worker, so no caller waits on the network
+"""
+import os
+import time
+import queue
+import threading
+from urllib.parse import urlparse
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+try:
+    import requests
+    REQUESTS_AVAILABLE = True
+except ImportError:
+    REQUESTS_AVAILABLE = False
+
+try:
+    from deep_translator import GoogleTranslator
+except ImportError:
+    GoogleTranslator = None
+
+from utils.translation_engine import SOURCE_LANG, TARGET_LANG, get_translation_engine
+
+# LibreTranslate-compatible POST /translate URL (e.g. a local stub server); empty uses Google Translate
+DEFINITION_ENDPOINT = os.getenv('DEFINITION_ENDPOINT', '')
+DEFINITION_RATE = float(os.getenv('DEFINITION_RATE', '2'))  # Remote requests per second
+MAX_PENDING = 10000
+REQUEST_TIMEOUT = 10
+
+STATUS_LOCAL = 'local'
+STATUS_PENDING = 'pending'
+STATUS_UNAVAILABLE = 'unavailable'
+
+
+class RemoteTranslator:
+    """Single-word translation over HTTP, reusing one connection"""
+
+    def __init__(self, endpoint: str = DEFINITION_ENDPOINT, src: str = SOURCE_LANG, tgt: str = TARGET_LANG):
+        self.endpoint = endpoint
+        self.src = src
+        self.tgt = tgt
+        self._session = None
+        self._google = None
+        if endpoint:
+            self.source = f"libretranslate:{urlparse(endpoint).netloc}"
+            if REQUESTS_AVAILABLE:
+                self._session = requests.Session()
+        else:
+            self.source = 'google'
+            if GoogleTranslator:
+                self._google = GoogleTranslator(source=src, target=tgt)
+
+    @property
+    def available(self) -> bool:
+        return self._session is not None or self._google is not None
+
+    def translate(self, word: str) -> Optional[str]:
+        """
+        Returns:
+            The translation, or None if the service has none for this word
+            (including a 4xx rejection of the word)
+
+        Raises:
+            Exception: On network, server (5xx) or protocol errors; worth retrying later
+        """
+        if self._session is not None:
+            response = self._session.post(
+                self.endpoint,
+                json={'q': word, 'source': self.src, 'target': self.tgt, 'format': 'text'},
+                timeout=REQUEST_TIMEOUT
+            )
+            if 400 <= response.status_code < 500:
+                return None
+            response.raise_for_status()
+            translation = response.json().get('translatedText')
+        else:
+            translation = self._google.translate(word)
+        return (translation or '').strip() or None
+
+
+class DefinitionResolver:
+    """
+    Resolves definitions from the words table, the translation cache and the
+    local Argos model (if installed). Anything else is queued for the
+    background fetcher, which calls the remote translator at most `rate`
+    times per second and stores results in both the cache and the words table.
+    """
+
+    def __init__(self, db, remote: Optional[RemoteTranslator] = None, rate: float = DEFINITION_RATE,
+                 src: str = SOURCE_LANG, tgt: str = TARGET_LANG):
+        self._db = db
+        self.remote = remote or RemoteTranslator(src=src, tgt=tgt)
+        self.rate = rate
+        self.src = src
+        self.tgt = tgt
+        self.stats = {'fetched': 0, 'failed': 0, 'dropped': 0}
+        self._queue: 'queue.Queue[str]' = queue.Queue(MAX_PENDING)
+        self._pending: Set[str] = set()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._model_checked = False
+
+    def _model_ready(self) -> bool:
+        """Local model available? Never downloads; a missing package is checked only once"""
+        engine = get_translation_engine(self._db)
+        if engine.model_version is not None:
+            return True
+        if self._model_checked:
+            return False
+        self._model_checked = True
+        try:
+            return engine.load(install=False)
+        except Exception as e:
+            print(f"⚠️ Yerel çeviri modeli yüklenemedi: {e}")
+            return False
+
+    def local_definitions(self, words: List[str]) -> Dict[str, str]:
+        """
+        Definitions from the translation cache, then the local model
+
+        Returns:
+            word -> definition; '' marks a word cached as untranslatable (no
+            source had a translation), which is not worth fetching again.
+            Words without either are left out.
+        """
+        if not words:
+            return {}
+        definitions = self._db.get_cached_translations(words, self.src, self.tgt, include_empty=True)
+        missing = [w for w in words if w not in definitions]
+        if missing and self._model_ready():
+            try:
+                definitions.update(get_translation_engine(self._db).translate_words(missing))
+            except Exception as e:
+                print(f"⚠️ Yerel çeviri hatası: {e}")
+        return definitions
+
+    def resolve(self, word: str) -> Tuple[Optional[str], str]:
+        """
+        Definition of a word that is not in the words table (or has no definition there)
+
+        Returns:
+            (definition, status); status is 'local' when found, 'pending' when
+            queued for the background fetcher, 'unavailable' otherwise
+            (including words cached as untranslatable)
+        """
+        word = word.strip().lower()
+        definition = self.local_definitions([word]).get(word)
+        if definition:
+            self._db.set_definition_if_missing(word, definition)
+            return definition, STATUS_LOCAL
+        if definition is not None:
+            return None, STATUS_UNAVAILABLE
+        return None, STATUS_PENDING if self.enqueue(word) else STATUS_UNAVAILABLE
+
+    def resolve_many(self, words: Iterable[str]) -> Dict[str, int]:
+        """
+        Fill in definitions for ingested words without waiting on the network
+
+        Words that already have a definition, or are cached as untranslatable,
+        are skipped.
+
+        Returns:
+            Counts of words defined locally and words queued
+        """
+        words = list(dict.fromkeys(w.strip().lower() for w in words if w and w.strip()))
+        cards = self._db.get_word_cards_by_texts(words)
+        needed = [w for w in words if w in cards and not cards[w]['definition']]
+        definitions = self.local_definitions(needed)
+        found = {w: d for w, d in definitions.items() if d}
+        self._db.bulk_update_definitions([
+            {'word_id': cards[w]['id'], 'definition': d, 'pronunciation': ''} for w, d in found.items()
+        ])
+        queued = sum(1 for w in needed if w not in definitions and self.enqueue(w))
+        return {'local': len(found), 'queued': queued}
+
+    def enqueue(self, word: str) -> bool:
+        """Queue a word for the background fetcher; False if there is no remote source or the queue is full"""
+        if not self.remote.available:
+            return False
+        with self._lock:
+            if word in self._pending:
+                return True
+            try:
+                self._queue.put_nowait(word)
+            except queue.Full:
+                self.stats['dropped'] += 1
+                return False
+            self._pending.add(word)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+        return True
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def _run(self) -> None:
+        interval = 1.0 / self.rate if self.rate > 0 else 0.0
+        next_request = 0.0
+        while True:
+            word = self._queue.get()
+            delay = next_request - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            next_request = time.monotonic() + interval
+            try:
+                definition = self.remote.translate(word)
+                # Empty results are cached too, so untranslatable words are not fetched again
+                self._db.save_cached_translations([(word, definition or '')], self.src, self.tgt, self.remote.source)
+                if definition:
+                    self._db.set_definition_if_missing(word, definition)
+                    self.stats['fetched'] += 1
+            except Exception as e:
+                self.stats['failed'] += 1
+                print(f"⚠️ Tanım alınamadı ({word}): {e}")
+            finally:
+                with self._lock:
+                    self._pending.discard(word)
+
+
+_definition_resolver: Optional[DefinitionResolver] = None
+
+
+def get_definition_resolver(db) -> DefinitionResolver:
+    """Get shared definition resolver instance"""
+    global _definition_resolver
+    if _definition_resolver is None:
+        _definition_resolver = DefinitionResolver(db)
+    return _definition_resolver
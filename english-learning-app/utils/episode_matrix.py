@@ -0,0 +1,271 @@
+"""
+Episode Matrix
+Sparse episodes x vocabulary frequency matrix for vectorized coverage analytics
+"""
+import os
+import json
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+try:
+    import numpy as np
+    from scipy import sparse
+    MATRIX_AVAILABLE = True
+except ImportError:
+    np = None
+    sparse = None
+    MATRIX_AVAILABLE = False
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'cache')
+
+
+def file_signature(path: str) -> List[int]:
+    """Return [mtime_ns, size] used to detect changed episode sources"""
+    st = os.stat(path)
+    return [st.st_mtime_ns, st.st_size]
+
+
+class MatrixSnapshot:
+    """
+    One consistent, read-only state of an EpisodeMatrix.
+
+    refresh() and load() build a new snapshot and publish it with a single
+    assignment, so a reader that takes matrix.snapshot() once sees matching
+    episodes, vocabulary, counts and presence for the whole request even if
+    a refresh lands meanwhile. Nothing here is modified after construction.
+    """
+
+    def __init__(self, episodes: List[Dict[str, Any]], vocab: List[str], vocab_index: Dict[str, int], counts):
+        self.episodes = episodes
+        self.vocab = vocab
+        self.vocab_index = vocab_index
+        self.counts = counts
+        # Binary (0/1) version of the counts: which episode contains which word (shares the index arrays)
+        self.presence = sparse.csr_matrix(
+            (np.ones_like(counts.data), counts.indices, counts.indptr), shape=counts.shape
+        )
+        self.row_index = {ep['key']: i for i, ep in enumerate(episodes)}
+
+    def row_of(self, key: str) -> Optional[int]:
+        return self.row_index.get(key)
+
+    def level_vector(self, word_levels: Dict[str, int]):
+        """Level per vocabulary column (0 = word has no level)"""
+        return np.fromiter((word_levels.get(w, 0) for w in self.vocab), dtype=np.int32, count=len(self.vocab))
+
+    def known_mask(self, known_words: Iterable[str]):
+        """1.0 for vocabulary columns the user knows, 0.0 otherwise"""
+        mask = np.zeros(len(self.vocab), dtype=np.float64)
+        cols = [self.vocab_index[w] for w in known_words if w in self.vocab_index]
+        if cols:
+            mask[cols] = 1.0
+        return mask
+
+    def level_distribution(self, levels, total_levels: int, binary: bool = True):
+        """
+        Per-episode word counts by level in one sparse product
+
+        Returns:
+            Dense (episodes x total_levels+1) array; column 0 holds words without a level
+        """
+        levels = np.clip(levels, 0, total_levels)
+        one_hot = sparse.csr_matrix(
+            (np.ones(len(levels), dtype=np.int32), (np.arange(len(levels)), levels)),
+            shape=(len(levels), total_levels + 1)
+        )
+        matrix = self.presence if binary else self.counts
+        return np.asarray((matrix @ one_hot).todense())
+
+    def row_totals(self, binary: bool = False):
+        matrix = self.presence if binary else self.counts
+        return np.asarray(matrix.sum(axis=1)).ravel()
+
+    def masked_totals(self, mask, binary: bool = False):
+        """Matrix x mask: per-episode count of tokens (or types) inside the mask"""
+        matrix = self.presence if binary else self.counts
+        return matrix @ mask
+
+
+class EpisodeMatrix:
+    """
+    CSR matrix of episodes (rows) x words (columns) holding token frequencies.
+
+    Rows are described by source dicts with at least 'key' and 'path'; any
+    extra metadata (series, season, episode, title ...) is kept alongside.
+    The matrix is persisted as <name>.npz + <name>.json and rebuilt
+    incrementally: only sources whose file signature changed are re-counted.
+    Queries run on a MatrixSnapshot (see snapshot()).
+    """
+
+    def __init__(self, name: str, cache_dir: str = DEFAULT_CACHE_DIR):
+        if not MATRIX_AVAILABLE:
+            raise ImportError("numpy and scipy are required for EpisodeMatrix")
+
+        self.name = name
+        self.cache_dir = cache_dir
+        self._snapshot = MatrixSnapshot([], [], {}, sparse.csr_matrix((0, 0), dtype=np.int32))
+        self._lock = threading.RLock()  # Serializes load/refresh/save; readers never take it
+
+    def snapshot(self) -> MatrixSnapshot:
+        """Current state; take it once per request and run every query on it"""
+        return self._snapshot
+
+    @property
+    def episodes(self) -> List[Dict[str, Any]]:
+        return self._snapshot.episodes
+
+    @property
+    def matrix_path(self) -> str:
+        return os.path.join(self.cache_dir, f"{self.name}.npz")
+
+    @property
+    def meta_path(self) -> str:
+        return os.path.join(self.cache_dir, f"{self.name}.json")
+
+    # ----- persistence -----
+
+    def load(self) -> bool:
+        """Load a persisted matrix; returns False if none exists or it is unreadable"""
+        if not (os.path.exists(self.matrix_path) and os.path.exists(self.meta_path)):
+            return False
+        try:
+            with open(self.meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            counts = sparse.load_npz(self.matrix_path).tocsr()
+            if counts.shape != (len(meta['episodes']), len(meta['vocab'])):
+                print(f"⚠️ Episode matrix {self.name} is inconsistent, rebuilding")
+                return False
+            vocab = meta['vocab']
+            with self._lock:
+                self._snapshot = MatrixSnapshot(meta['episodes'], vocab,
+                                                {w: i for i, w in enumerate(vocab)}, counts)
+            return True
+        except Exception as e:
+            print(f"⚠️ Episode matrix {self.name} could not be loaded: {e}")
+            return False
+
+    def save(self) -> None:
+        """Persist matrix and metadata atomically"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with self._lock:
+            snapshot = self._snapshot
+            tmp_matrix = self.matrix_path + '.tmp.npz'
+            tmp_meta = self.meta_path + '.tmp'
+            sparse.save_npz(tmp_matrix, snapshot.counts)
+            with open(tmp_meta, 'w', encoding='utf-8') as f:
+                json.dump({'episodes': snapshot.episodes, 'vocab': snapshot.vocab}, f)
+            os.replace(tmp_matrix, self.matrix_path)
+            os.replace(tmp_meta, self.meta_path)
+
+    # ----- building -----
+
+    def refresh(self, sources: Iterable[Dict[str, Any]],
+                counter: Callable[[Dict[str, Any]], Dict[str, int]]) -> int:
+        """
+        Bring the matrix in line with the given sources
+
+        The new state is built aside and published as one snapshot, so
+        readers keep using the previous one until it is complete.
+
+        Args:
+            sources: Episode source dicts ('key', 'path' and metadata), in row order
+            counter: Returns word -> frequency for a source that must be (re)counted
+
+        Returns:
+            Number of episodes that were (re)counted; 0 means nothing changed
+        """
+        with self._lock:
+            current = self._snapshot
+            rows: List[Any] = []  # either an old row index or a fresh word-count dict
+            episodes: List[Dict[str, Any]] = []
+            recounted = 0
+
+            for source in sources:
+                try:
+                    signature = file_signature(source['path'])
+                except OSError:
+                    continue
+
+                old_row = current.row_of(source['key'])
+                if old_row is not None and current.episodes[old_row].get('signature') == signature:
+                    rows.append(old_row)
+                else:
+                    try:
+                        rows.append(dict(counter(source)))
+                    except Exception as e:
+                        print(f"   ⚠️ {source['path']} okunamadı: {str(e)[:80]}")
+                        continue
+                    recounted += 1
+
+                episode = dict(source)
+                episode['signature'] = signature
+                episodes.append(episode)
+
+            if recounted == 0 and [e['key'] for e in episodes] == [e['key'] for e in current.episodes]:
+                return 0
+
+            # New words are appended to a copy of the vocabulary, so old rows keep their columns
+            vocab, vocab_index = list(current.vocab), dict(current.vocab_index)
+            for row in rows:
+                if isinstance(row, dict):
+                    for word in row:
+                        if word not in vocab_index:
+                            vocab_index[word] = len(vocab)
+                            vocab.append(word)
+
+            old = current.counts
+            row_parts, col_parts, data_parts = [], [], []
+            for new_row, row in enumerate(rows):
+                if isinstance(row, dict):
+                    if not row:
+                        continue
+                    cols = np.fromiter((vocab_index[w] for w in row), dtype=np.int64, count=len(row))
+                    data = np.fromiter(row.values(), dtype=np.int32, count=len(row))
+                else:
+                    start, end = old.indptr[row], old.indptr[row + 1]
+                    cols, data = old.indices[start:end], old.data[start:end]
+                row_parts.append(np.full(len(cols), new_row, dtype=np.int64))
+                col_parts.append(cols)
+                data_parts.append(data)
+
+            shape = (len(rows), len(vocab))
+            if row_parts:
+                counts = sparse.csr_matrix(
+                    (np.concatenate(data_parts).astype(np.int32),
+                     (np.concatenate(row_parts), np.concatenate(col_parts).astype(np.int64))),
+                    shape=shape
+                )
+            else:
+                counts = sparse.csr_matrix(shape, dtype=np.int32)
+
+            self._snapshot = MatrixSnapshot(episodes, vocab, vocab_index, counts)
+            return max(recounted, 1)
+
+
+def group_sums(values, groups) -> Dict[Any, Any]:
+    """Sum rows of `values` (1-D or 2-D) by the parallel list of group labels"""
+    labels = sorted(set(groups))
+    label_index = {label: i for i, label in enumerate(labels)}
+    idx = np.fromiter((label_index[g] for g in groups), dtype=np.int64, count=len(groups))
+    values = np.asarray(values)
+    if values.ndim == 1:
+        sums = np.bincount(idx, weights=values, minlength=len(labels))
+    else:
+        sums = np.zeros((len(labels), values.shape[1]), dtype=values.dtype)
+        np.add.at(sums, idx, values)
+    return {label: sums[i] for i, label in enumerate(labels)}
+
+
+_matrices: Dict[str, EpisodeMatrix] = {}
+_matrices_lock = threading.Lock()
+
+
+def get_episode_matrix(name: str, cache_dir: str = DEFAULT_CACHE_DIR) -> EpisodeMatrix:
+    """Get (or load) the shared matrix instance for a corpus name"""
+    with _matrices_lock:
+        matrix = _matrices.get(name)
+        if matrix is None:
+            matrix = EpisodeMatrix(name, cache_dir)
+            matrix.load()
+            _matrices[name] = matrix
+        return matrix
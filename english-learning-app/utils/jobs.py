@@ -0,0 +1,289 @@
+"""
+Background Jobs
+Runs long operations (video processing, word maps, transcript downloads) off
+the request thread, persists their state in the jobs table and pushes
+progress over Socket.IO
+"""
+import os
+import time
+import uuid
+import calendar
+import threading
+import traceback
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+STATUS_QUEUED = 'queued'
+STATUS_RUNNING = 'running'
+STATUS_COMPLETED = 'completed'
+STATUS_FAILED = 'failed'
+STATUS_CANCELLED = 'cancelled'
+FINISHED_STATUSES = (STATUS_COMPLETED, STATUS_FAILED, STATUS_CANCELLED)
+
+# Concurrent jobs per type; override with JOB_LIMIT_<TYPE> (e.g. JOB_LIMIT_VIDEO=2)
+JOB_LIMITS = {
+    'video': 1,            # yt-dlp + Whisper, CPU and bandwidth heavy
+    'custom_series': 1,
+    'word_map': 1,         # Rewrites learning packages; never run two at once
+    'levels': 1,
+    'transcripts': 2,
+    'friends': 1,
+    'enrichment': 1,
+}
+DEFAULT_JOB_LIMIT = 1
+PROGRESS_INTERVAL = 1.0  # Seconds between persisted/pushed progress updates
+CANCEL_POLL_INTERVAL = 1.0  # Seconds between reads of the jobs row's cancel flag
+PROGRESS_EVENT = 'job_progress'
+
+
+class JobCancelled(BaseException):
+    """
+    Raised inside a job function when its job was cancelled
+
+    A BaseException (like KeyboardInterrupt) so the many `except Exception`
+    blocks in the ingestion code do not swallow it.
+    """
+
+
+class Job:
+    """
+    Handle passed to a job function.
+
+    The function reports progress with progress(done, total, message) and
+    should call check_cancelled() between units of work; both raise
+    JobCancelled once the job has been cancelled. A cancel may come from
+    another worker process, so the flag in the jobs row is polled too.
+    """
+
+    def __init__(self, manager: 'JobManager', job_id: str, job_type: str,
+                 params: Dict[str, Any], user_id: Optional[int]):
+        self._manager = manager
+        self.id = job_id
+        self.type = job_type
+        self.params = params
+        self.user_id = user_id
+        self.status = STATUS_QUEUED
+        self.done = 0
+        self.total = 0
+        self.message = ''
+        self.started: Optional[float] = None
+        self.future: Optional[Future] = None
+        self._cancel = threading.Event()
+        self._published = 0.0
+        self._polled = 0.0
+
+    @property
+    def cancelled(self) -> bool:
+        if not self._cancel.is_set():
+            now = time.monotonic()
+            if now - self._polled >= CANCEL_POLL_INTERVAL:
+                self._polled = now
+                if self._manager._db.is_job_cancel_requested(self.id):
+                    self._cancel.set()
+        return self._cancel.is_set()
+
+    def check_cancelled(self) -> None:
+        if self.cancelled:
+            raise JobCancelled()
+
+    def progress(self, done: int, total: Optional[int] = None, message: Optional[str] = None) -> None:
+        """Record progress; persisted and pushed at most every PROGRESS_INTERVAL seconds"""
+        self.check_cancelled()
+        self.done = done
+        if total is not None:
+            self.total = total
+        if message is not None:
+            self.message = message
+        now = time.monotonic()
+        if now - self._published >= PROGRESS_INTERVAL or (self.total and self.done >= self.total):
+            self._published = now
+            self._manager._publish(self, persist=True)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current state with throughput (units/s) and ETA (s) once running"""
+        rate = eta = None
+        if self.started is not None and self.done:
+            elapsed = time.monotonic() - self.started
+            rate = self.done / elapsed if elapsed > 0 else None
+            if rate and self.total >= self.done:
+                eta = (self.total - self.done) / rate
+        return {
+            'id': self.id,
+            'type': self.type,
+            'status': self.status,
+            'done': self.done,
+            'total': self.total,
+            'message': self.message,
+            'rate': round(rate, 2) if rate is not None else None,
+            'eta_seconds': round(eta, 1) if eta is not None else None,
+        }
+
+
+class JobManager:
+    """
+    Runs job functions in one thread pool per job type, so each type has its
+    own concurrency limit and a long video job cannot starve a transcript
+    download.
+
+    Jobs are written to the jobs table when submitted and when they finish;
+    progress in between is throttled. Clients poll GET /api/jobs/<id> or
+    join the job's Socket.IO room ('job_<id>') for 'job_progress' events.
+
+    Each job runs in the worker process that accepted it (recorded as its
+    owner in the jobs row). Under prefork, another worker answers status
+    and cancel requests from that row: progress as last persisted, and
+    cancellation through the row's cancel flag.
+    """
+
+    def __init__(self, db, socketio=None, limits: Optional[Dict[str, int]] = None):
+        self._db = db
+        self._socketio = socketio
+        self.limits = dict(JOB_LIMITS, **(limits or {}))
+        self._pools: Dict[str, ThreadPoolExecutor] = {}
+        self._active: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+
+    def _limit(self, job_type: str) -> int:
+        configured = os.getenv(f'JOB_LIMIT_{job_type.upper()}')
+        limit = int(configured) if configured else self.limits.get(job_type, DEFAULT_JOB_LIMIT)
+        return max(1, limit)
+
+    def _pool(self, job_type: str) -> ThreadPoolExecutor:
+        pool = self._pools.get(job_type)
+        if pool is None:
+            pool = ThreadPoolExecutor(max_workers=self._limit(job_type), thread_name_prefix=f'job-{job_type}')
+            self._pools[job_type] = pool
+        return pool
+
+    def submit(self, job_type: str, func: Callable[..., Dict[str, Any]],
+               params: Optional[Dict[str, Any]] = None, user_id: Optional[int] = None) -> Job:
+        """
+        Queue func(job, **params)
+
+        The function returns the JSON-serializable result (what the endpoint
+        used to respond with). Raising marks the job failed with str(error).
+
+        Returns:
+            The queued job
+        """
+        params = params or {}
+        job = Job(self, uuid.uuid4().hex, job_type, params, user_id)
+        self._db.create_job(job.id, job_type, params, user_id)
+        with self._lock:
+            self._active[job.id] = job
+            job.future = self._pool(job_type).submit(self._run, job, func)
+        return job
+
+    def _run(self, job: Job, func: Callable[..., Dict[str, Any]]) -> None:
+        if job.cancelled:
+            self._finish(job, STATUS_CANCELLED)
+            return
+        job.status = STATUS_RUNNING
+        job.started = time.monotonic()
+        self._db.update_job(job.id, status=STATUS_RUNNING, started_date=_now())
+        self._publish(job)
+        try:
+            result = func(job, **job.params)
+        except JobCancelled:
+            self._finish(job, STATUS_CANCELLED)
+        except Exception as e:
+            print(f"❌ İş başarısız ({job.type} {job.id}): {e}")
+            traceback.print_exc()
+            self._finish(job, STATUS_FAILED, error=str(e))
+        else:
+            self._finish(job, STATUS_COMPLETED, result=result)
+
+    def _finish(self, job: Job, status: str, result: Optional[Dict[str, Any]] = None,
+                error: Optional[str] = None) -> None:
+        job.status = status
+        if status == STATUS_COMPLETED and job.total:
+            job.done = job.total
+        self._db.update_job(job.id, status=status, done=job.done, total=job.total, message=job.message,
+                            result=result, error=error, finished_date=_now())
+        with self._lock:
+            self._active.pop(job.id, None)
+        self._publish(job, result=result, error=error)
+
+    def _publish(self, job: Job, persist: bool = False, **extra) -> None:
+        if persist:
+            self._db.update_job(job.id, done=job.done, total=job.total, message=job.message)
+        if self._socketio is not None:
+            payload = job.snapshot()
+            payload.update({k: v for k, v in extra.items() if v is not None})
+            try:
+                self._socketio.emit(PROGRESS_EVENT, payload, to=f'job_{job.id}')
+            except Exception as e:
+                print(f"⚠️ İş ilerlemesi gönderilemedi: {e}")
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Stored job with throughput and ETA while it runs
+
+        Progress is live for jobs running in this process and as last
+        persisted (at most PROGRESS_INTERVAL old) for another worker's jobs.
+        """
+        stored = self._db.get_job(job_id)
+        if stored is None:
+            return None
+        job = self._active.get(job_id)
+        if job is not None:
+            stored.update(job.snapshot())
+        else:
+            stored.update(_stored_rate(stored))
+        return stored
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        Cancel a queued or running job
+
+        The cancel flag is stored in the jobs row, so this works whichever
+        worker process owns the job. Queued jobs of this process are dropped
+        at once; other jobs stop at their next progress() or check_cancelled()
+        call (or when they are dequeued).
+
+        Returns:
+            False if the job is unknown or already finished
+        """
+        flagged = self._db.request_job_cancel(job_id)
+        with self._lock:
+            job = self._active.get(job_id)
+        if job is None:
+            return flagged
+        job._cancel.set()
+        if job.future is not None and job.future.cancel():
+            self._finish(job, STATUS_CANCELLED)
+        return True
+
+
+def _now() -> str:
+    return time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime())
+
+
+def _stored_rate(stored: Dict[str, Any]) -> Dict[str, Any]:
+    """Throughput and ETA of a running job from its persisted row"""
+    rate = eta = None
+    if stored['status'] == STATUS_RUNNING and stored.get('started_date') and stored.get('done'):
+        try:
+            started = calendar.timegm(time.strptime(stored['started_date'], '%Y-%m-%d %H:%M:%S'))
+        except ValueError:
+            started = None
+        elapsed = time.time() - started if started is not None else 0
+        if elapsed > 0:
+            rate = stored['done'] / elapsed
+            if stored['total'] >= stored['done']:
+                eta = (stored['total'] - stored['done']) / rate
+    return {
+        'rate': round(rate, 2) if rate is not None else None,
+        'eta_seconds': round(eta, 1) if eta is not None else None,
+    }
+
+
+_job_manager: Optional[JobManager] = None
+
+
+def get_job_manager(db, socketio=None) -> JobManager:
+    """Get shared job manager instance"""
+    global _job_manager
+    if _job_manager is None:
+        _job_manager = JobManager(db, socketio)
+    return _job_manager
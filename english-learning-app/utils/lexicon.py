@@ -0,0 +1,207 @@
+"""
+Lexical Enrichment
+Fills English glosses, parts of speech and IPA pronunciations for the whole
+vocabulary from NLTK's WordNet and CMU Pronouncing Dictionary in one pass
+"""
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+try:
+    import nltk
+    NLTK_AVAILABLE = True
+except ImportError:
+    NLTK_AVAILABLE = False
+
+CORPORA = {'wordnet': 'corpora/wordnet', 'cmudict': 'corpora/cmudict'}
+ENRICHMENT_REVISION = 2  # Bump when the extraction rules change, so every word is processed again (2: morphy fallback)
+
+POS_NAMES = {'n': 'noun', 'v': 'verb', 'a': 'adjective', 's': 'adjective', 'r': 'adverb'}
+
+ARPABET_TO_IPA = {
+    'AA': 'ɑ', 'AE': 'æ', 'AH': 'ʌ', 'AO': 'ɔ', 'AW': 'aʊ', 'AY': 'aɪ', 'EH': 'ɛ', 'ER': 'ɝ',
+    'EY': 'eɪ', 'IH': 'ɪ', 'IY': 'i', 'OW': 'oʊ', 'OY': 'ɔɪ', 'UH': 'ʊ', 'UW': 'u',
+    'B': 'b', 'CH': 'tʃ', 'D': 'd', 'DH': 'ð', 'F': 'f', 'G': 'ɡ', 'HH': 'h', 'JH': 'dʒ',
+    'K': 'k', 'L': 'l', 'M': 'm', 'N': 'n', 'NG': 'ŋ', 'P': 'p', 'R': 'ɹ', 'S': 's',
+    'SH': 'ʃ', 'T': 't', 'TH': 'θ', 'V': 'v', 'W': 'w', 'Y': 'j', 'Z': 'z', 'ZH': 'ʒ',
+}
+UNSTRESSED_IPA = {'AH': 'ə', 'ER': 'ɚ'}
+STRESS_MARKS = {'1': 'ˈ', '2': 'ˌ'}
+
+# Consonant clusters that can start an English syllable; the stress mark goes before them
+_ONSETS = {
+    ('S', 'T', 'R'), ('S', 'P', 'R'), ('S', 'K', 'R'), ('S', 'P', 'L'), ('S', 'K', 'W'),
+    ('S', 'T'), ('S', 'P'), ('S', 'K'), ('S', 'M'), ('S', 'N'), ('S', 'L'), ('S', 'W'),
+    ('P', 'R'), ('B', 'R'), ('T', 'R'), ('D', 'R'), ('K', 'R'), ('G', 'R'), ('F', 'R'), ('TH', 'R'),
+    ('SH', 'R'), ('P', 'L'), ('B', 'L'), ('K', 'L'), ('G', 'L'), ('F', 'L'), ('T', 'W'), ('D', 'W'),
+    ('K', 'W'), ('G', 'W'), ('TH', 'W'), ('P', 'Y'), ('B', 'Y'), ('K', 'Y'), ('F', 'Y'), ('M', 'Y'),
+    ('HH', 'Y'), ('V', 'Y'),
+}
+
+
+def corpora_available(download: bool = False) -> bool:
+    """
+    Are the WordNet and CMUdict corpora installed?
+
+    Args:
+        download: Fetch missing corpora with nltk.download first
+    """
+    if not NLTK_AVAILABLE:
+        return False
+    for name, path in CORPORA.items():
+        try:
+            nltk.data.find(path)
+        except LookupError:
+            if not download or not nltk.download(name, quiet=True):
+                return False
+    return True
+
+
+def arpabet_to_ipa(phones: List[str]) -> str:
+    """CMUdict phones (e.g. ['AH0', 'B', 'AW1', 'T']) to IPA with stress marks ('əˈbaʊt')"""
+    symbols: List[str] = []
+    cluster_start = 0  # Index in symbols where the consonants before the next vowel begin
+    cluster: List[str] = []
+    for phone in phones:
+        base, stress = (phone[:-1], phone[-1]) if phone[-1].isdigit() else (phone, '')
+        if not stress:
+            symbols.append(ARPABET_TO_IPA.get(base, base.lower()))
+            cluster.append(base)
+            continue
+
+        mark = STRESS_MARKS.get(stress)
+        if mark:
+            # Longest tail of the consonant cluster that is a legal onset belongs to this syllable
+            onset = 0
+            for length in range(min(3, len(cluster)), 0, -1):
+                tail = tuple(cluster[-length:])
+                if length == 1 and tail[0] != 'NG' or tail in _ONSETS:
+                    onset = length
+                    break
+            symbols.insert(cluster_start + len(cluster) - onset, mark)
+        vowel = UNSTRESSED_IPA.get(base) if stress == '0' else None
+        symbols.append(vowel or ARPABET_TO_IPA.get(base, base.lower()))
+        cluster_start, cluster = len(symbols), []
+    return ''.join(symbols)
+
+
+def _best_sense(wn, name: str) -> Optional[Tuple[str, str]]:
+    """Gloss and part of speech of the lemma's sense with the highest tagged-corpus count"""
+    lemmas = wn.lemmas(name)
+    if not lemmas:
+        return None
+    best = max(lemmas, key=lambda lemma: lemma.count())
+    synset = best.synset()
+    return synset.definition(), POS_NAMES.get(synset.pos(), synset.pos())
+
+
+def wordnet_senses(vocabulary: Set[str]) -> Dict[str, Tuple[str, str]]:
+    """
+    Most frequent WordNet sense of every vocabulary word
+
+    Lemma names are streamed once and joined against the vocabulary; only
+    matches are looked up, and the sense with the highest tagged-corpus count
+    wins (first listed on ties). Inflected words that are not lemmas
+    themselves ("ran", "geese") take the sense of their wn.morphy base form.
+
+    Returns:
+        word -> (gloss, part of speech)
+    """
+    from nltk.corpus import wordnet as wn
+
+    senses: Dict[str, Tuple[str, str]] = {}
+    for name in wn.all_lemma_names():
+        word = name.replace('_', ' ')
+        if word not in vocabulary or word in senses:
+            continue
+        sense = _best_sense(wn, name)
+        if sense:
+            senses[word] = sense
+
+    for word in vocabulary:
+        if word in senses or ' ' in word:
+            continue
+        base = wn.morphy(word)
+        if base and base != word:
+            sense = _best_sense(wn, base)
+            if sense:
+                senses[word] = sense
+    return senses
+
+
+def cmudict_pronunciations(vocabulary: Set[str]) -> Dict[str, str]:
+    """First CMUdict pronunciation (as IPA) of every vocabulary word in the dictionary"""
+    from nltk.corpus import cmudict
+
+    pronunciations: Dict[str, str] = {}
+    for word, phones in cmudict.entries():
+        if word in vocabulary and word not in pronunciations:
+            pronunciations[word] = arpabet_to_ipa(phones)
+    return pronunciations
+
+
+def enrichment_version() -> str:
+    """Identifies the data sources and rules; words enriched under another version are processed again"""
+    from nltk.corpus import wordnet as wn
+    return f"wordnet-{wn.get_version()}+cmudict/r{ENRICHMENT_REVISION}"
+
+
+def build_enrichment_rows(words: Iterable[Tuple[int, str]], senses: Dict[str, Tuple[str, str]],
+                          pronunciations: Dict[str, str]) -> List[Dict[str, Optional[str]]]:
+    """One row per word (matched or not), in the shape Database.apply_word_enrichment expects"""
+    rows = []
+    for word_id, word in words:
+        gloss, pos = senses.get(word, (None, None))
+        ipa = pronunciations.get(word)
+        sources = [name for name, hit in (('wordnet', gloss), ('cmudict', ipa)) if hit]
+        rows.append({
+            'word_id': word_id,
+            'gloss': gloss,
+            'pos': pos,
+            'pronunciation': f"/{ipa}/" if ipa else None,
+            'source': '+'.join(sources),
+        })
+    return rows
+
+
+def enrich_vocabulary(db, progress: Optional[Callable[..., None]] = None,
+                      download: bool = False) -> Dict[str, int]:
+    """
+    Fill gloss, pos and pronunciation for words not yet enriched under the current version
+
+    Existing pronunciations are kept. Words without any match are still
+    stamped with the version, so a re-run only touches words added since.
+
+    Args:
+        db: Database instance
+        progress: Optional callback(done, total, message) per phase
+        download: Fetch missing NLTK corpora first
+
+    Returns:
+        Counts: processed, glosses, pronunciations, updated
+
+    Raises:
+        RuntimeError: If NLTK or the corpora are not installed
+    """
+    if not corpora_available(download):
+        raise RuntimeError("NLTK with the wordnet and cmudict corpora is required "
+                           "(pip install nltk; python -m nltk.downloader wordnet cmudict)")
+    version = enrichment_version()
+    words = db.get_words_to_enrich(version)
+    stats = {'processed': len(words), 'glosses': 0, 'pronunciations': 0, 'updated': 0}
+    if not words:
+        return stats
+
+    vocabulary = {word for _, word in words}
+    if progress:
+        progress(0, 3, 'WordNet okunuyor')
+    senses = wordnet_senses(vocabulary)
+    if progress:
+        progress(1, 3, 'CMUdict okunuyor')
+    pronunciations = cmudict_pronunciations(vocabulary)
+    if progress:
+        progress(2, 3, 'Kelimeler güncelleniyor')
+
+    rows = build_enrichment_rows(words, senses, pronunciations)
+    stats['glosses'] = len(senses)
+    stats['pronunciations'] = len(pronunciations)
+    stats['updated'] = db.apply_word_enrichment(rows, version)
+    return stats
@@ -0,0 +1,262 @@
+"""
+Model Registry
+Loads heavy models (Whisper, the chatbot LM, the Argos translator) once per
+process, optionally ahead of the first request, and reports their readiness,
+load time and memory
+
+Preloading is configured with environment variables:
+- PRELOAD_MODELS: comma-separated model names, 'all' or 'none' (default 'argos,whisper')
+- PRELOAD_BEFORE_FORK: 1 under a prefork server that imports the app in the
+  master (e.g. gunicorn --preload). Fork-safe models are then loaded
+  synchronously at import and frozen out of the garbage collector, so every
+  worker shares the weights copy-on-write; the rest load in each worker
+  after the fork.
+
+Models that run in worker processes register a starter that forks them.
+Starters run synchronously on the main thread (start_workers) before the
+preload thread exists, because a fork from a multi-threaded process can
+copy locks held by another thread into the children.
+"""
+import gc
+import os
+import time
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+PRELOAD_MODELS = os.getenv('PRELOAD_MODELS', 'argos,whisper')
+PRELOAD_BEFORE_FORK = os.getenv('PRELOAD_BEFORE_FORK', '0').lower() in ('1', 'true', 'yes')
+RETRY_FAILED_SECONDS = 300  # A failed load is retried on demand after this long
+
+STATUS_NOT_LOADED = 'not_loaded'
+STATUS_LOADING = 'loading'
+STATUS_READY = 'ready'
+STATUS_UNAVAILABLE = 'unavailable'  # Library or model files not installed
+STATUS_FAILED = 'failed'
+
+
+def current_rss(pid: Optional[int] = None) -> Optional[int]:
+    """Resident set size of a process (default: this one) in bytes, None if it cannot be read"""
+    try:
+        if PSUTIL_AVAILABLE:
+            return (psutil.Process(pid) if pid else psutil.Process()).memory_info().rss
+        with open(f"/proc/{pid or 'self'}/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except Exception:
+        return None
+
+
+class ModelEntry:
+    """One registered model and its load state"""
+
+    def __init__(self, name: str, loader: Callable[[], Any], fork_safe: bool = True,
+                 memory_probe: Optional[Callable[[Any], Optional[int]]] = None,
+                 starter: Optional[Callable[[], Any]] = None):
+        self.name = name
+        self.loader = loader
+        self.starter = starter
+        self.fork_safe = fork_safe
+        self.memory_probe = memory_probe
+        self.status = STATUS_NOT_LOADED
+        self.model: Any = None
+        self.error: Optional[str] = None
+        self.load_seconds: Optional[float] = None
+        self.memory_bytes: Optional[int] = None
+        self.loaded_pid: Optional[int] = None
+        self.failed_at = 0.0
+        self.lock = threading.Lock()
+
+    def to_dict(self) -> Dict[str, Any]:
+        if self.memory_probe is not None and self.model is not None:
+            probed = self.memory_probe(self.model)
+            if probed is not None:
+                self.memory_bytes = probed
+        return {
+            'status': self.status,
+            'load_seconds': round(self.load_seconds, 2) if self.load_seconds is not None else None,
+            # RSS growth while loading (approximate if other loads ran at the same time),
+            # or what the model's memory probe reports, e.g. its worker processes
+            'memory_mb': round(self.memory_bytes / 2**20, 1) if self.memory_bytes is not None else None,
+            # Loaded in the prefork master: the weights are shared with the other workers
+            'shared': self.loaded_pid is not None and self.loaded_pid != os.getpid(),
+            'fork_safe': self.fork_safe,
+            'error': self.error,
+        }
+
+
+class ModelRegistry:
+    """
+    Named model loaders with load-once semantics.
+
+    A loader returns the loaded model, None when its library or files are
+    not installed, or raises on failure. get() loads on first use; callers
+    that arrive during a load wait for it instead of loading a second copy.
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, ModelEntry] = {}
+        self._preloading: List[str] = []
+        self._master_pid: Optional[int] = None
+
+    def register(self, name: str, loader: Callable[[], Any], fork_safe: bool = True,
+                 memory_probe: Optional[Callable[[Any], Optional[int]]] = None,
+                 starter: Optional[Callable[[], Any]] = None) -> None:
+        """
+        Register a loader; re-registering a name that is not loaded yet replaces it
+
+        fork_safe=False marks models that start threads or processes while
+        loading (those do not survive a fork), so they are never loaded
+        before the fork. memory_probe(model) reports memory held outside this
+        process's RSS growth, e.g. by worker processes. starter() forks the
+        model's worker processes (see start_workers); the loader then waits
+        for them.
+        """
+        entry = self._entries.get(name)
+        if entry is not None and entry.status == STATUS_READY:
+            return
+        self._entries[name] = ModelEntry(name, loader, fork_safe, memory_probe, starter)
+
+    @property
+    def names(self) -> List[str]:
+        return list(self._entries)
+
+    def _load(self, entry: ModelEntry) -> None:
+        entry.status = STATUS_LOADING
+        rss_before = current_rss()
+        started = time.perf_counter()
+        try:
+            model = entry.loader()
+        except Exception as e:
+            entry.status, entry.error, entry.failed_at = STATUS_FAILED, str(e), time.monotonic()
+            print(f"⚠️ Model yüklenemedi ({entry.name}): {e}")
+            return
+        entry.load_seconds = time.perf_counter() - started
+        rss_after = current_rss()
+        if rss_before is not None and rss_after is not None:
+            entry.memory_bytes = max(0, rss_after - rss_before)
+        if model is None:
+            entry.status, entry.error = STATUS_UNAVAILABLE, None
+            return
+        entry.model, entry.status, entry.error = model, STATUS_READY, None
+        entry.loaded_pid = os.getpid()
+        print(f"✅ Model hazır: {entry.name} ({entry.load_seconds:.1f} sn)")
+
+    def get(self, name: str) -> Any:
+        """
+        Loaded model, loading it now if needed
+
+        Returns:
+            The model, or None if it is unavailable or failed to load
+
+        Raises:
+            KeyError: If no loader is registered under name
+        """
+        entry = self._entries[name]
+        if entry.status == STATUS_READY:
+            return entry.model
+        with entry.lock:
+            retry = entry.status == STATUS_FAILED and time.monotonic() - entry.failed_at > RETRY_FAILED_SECONDS
+            if entry.status == STATUS_NOT_LOADED or retry:
+                self._load(entry)
+        return entry.model
+
+    def _preload(self, names: List[str]) -> None:
+        # One model at a time, so each RSS delta belongs to one model
+        for name in names:
+            try:
+                self.get(name)
+            except Exception as e:
+                print(f"⚠️ Model ön yüklemesi başarısız ({name}): {e}")
+
+    def start_workers(self, names: Optional[List[str]] = None) -> None:
+        """Run the starters of the given models (default: PRELOAD_MODELS) now; call on the main thread before preload()"""
+        names = [n for n in (names if names is not None else configured_models(self.names)) if n in self._entries]
+        for name in names:
+            starter = self._entries[name].starter
+            if starter is None:
+                continue
+            try:
+                starter()
+            except Exception as e:
+                print(f"⚠️ Model işlemleri başlatılamadı ({name}): {e}")
+
+    def preload(self, names: Optional[List[str]] = None, background: bool = True) -> Optional[threading.Thread]:
+        """Load models (default: PRELOAD_MODELS) in a background thread, or right away"""
+        names = [n for n in (names if names is not None else configured_models(self.names)) if n in self._entries]
+        if not names:
+            return None
+        self._preloading = list(dict.fromkeys(self._preloading + names))
+        if not background:
+            self._preload(names)
+            return None
+        thread = threading.Thread(target=self._preload, args=(names,), daemon=True, name='model-preload')
+        thread.start()
+        return thread
+
+    def preload_before_fork(self, names: Optional[List[str]] = None) -> None:
+        """
+        Load fork-safe models now, in the prefork master
+
+        The loaded objects are moved to the GC's permanent generation so
+        collections in the workers do not write to (and un-share) their
+        pages. Models that are not fork safe are loaded in each forked
+        worker: their worker processes are started in the post-fork hook,
+        before the worker serves, and the rest of the loading runs in background.
+        """
+        names = [n for n in (names if names is not None else configured_models(self.names)) if n in self._entries]
+        self.preload([n for n in names if self._entries[n].fork_safe], background=False)
+        gc.freeze()
+
+        deferred = [n for n in names if not self._entries[n].fork_safe]
+        if deferred and hasattr(os, 'register_at_fork'):
+            self._master_pid = os.getpid()
+            os.register_at_fork(after_in_child=lambda: self._after_fork(deferred))
+
+    def _after_fork(self, names: List[str]) -> None:
+        # The hook is inherited by grandchildren (e.g. translation worker pools); only direct workers preload
+        if os.getppid() != self._master_pid:
+            return
+        for name in names:
+            self._entries[name].lock = threading.Lock()
+        # Still single-threaded here: fork the model pools before the preload thread starts
+        self.start_workers(names)
+        self.preload(names)
+
+    def status(self) -> Dict[str, Any]:
+        """Per-model state, readiness of the preloaded models and process memory"""
+        models = {name: entry.to_dict() for name, entry in self._entries.items()}
+        pending = [n for n in self._preloading if self._entries[n].status in (STATUS_NOT_LOADED, STATUS_LOADING)]
+        rss = current_rss()
+        return {
+            'ready': not pending,
+            'loading': pending,
+            'models': models,
+            'pid': os.getpid(),
+            'rss_mb': round(rss / 2**20, 1) if rss is not None else None,
+        }
+
+
+def configured_models(registered: List[str]) -> List[str]:
+    """Model names selected by PRELOAD_MODELS"""
+    value = PRELOAD_MODELS.strip().lower()
+    if value in ('', 'none', '0'):
+        return []
+    if value == 'all':
+        return list(registered)
+    return [name.strip() for name in value.split(',') if name.strip()]
+
+
+_model_registry: Optional[ModelRegistry] = None
+
+
+def get_model_registry() -> ModelRegistry:
+    """Get shared model registry instance"""
+    global _model_registry
+    if _model_registry is None:
+        _model_registry = ModelRegistry()
+    return _model_registry
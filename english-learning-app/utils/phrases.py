@@ -0,0 +1,210 @@
+"""
+Phrase Extraction
+Multi-word expressions (2-4 grams) from the subtitle corpus in bounded memory
+
+The first pass streams every n-gram into a count-min sketch. The second pass
+recounts exactly only the n-grams whose sketch estimate can reach MIN_COUNT,
+and the survivors are filtered by pointwise mutual information.
+"""
+import math
+import re
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+from utils.corpus import iter_text_units, unit_text
+
+MIN_N = 2
+MAX_N = 4
+MIN_COUNT = 10
+MIN_PMI = 3.0  # log2 scale
+MIN_EPISODES = 2
+SKETCH_WIDTH = 1 << 21
+SKETCH_DEPTH = 4
+
+# N-grams starting or ending with these are fragments ("of the", "the one")
+EDGE_STOP_WORDS = frozenset({'the', 'a', 'an', 'and', 'or', 'of'})
+# N-grams made only of these are grammar, not vocabulary ("do you", "it was")
+FUNCTION_WORDS = frozenset({
+    'i', 'me', 'my', 'you', 'your', 'he', 'him', 'his', 'she', 'her', 'it', 'its', 'we', 'us', 'our',
+    'they', 'them', 'their', 'this', 'that', 'these', 'those', 'what', 'who', 'which', 'where', 'when',
+    'how', 'why', 'am', 'is', 'are', 'was', 'were', 'be', 'been', 'being', 'do', 'does', 'did', 'have',
+    'has', 'had', 'will', 'would', 'can', 'could', 'should', 'shall', 'may', 'might', 'must', 'not',
+    'to', 'in', 'on', 'at', 'for', 'with', 'from', 'by', 'about', 'as', 'if', 'so', 'but', 'there',
+    'here', 'all', 'just', 'no', 'yes', 'oh', 'i\'m', 'it\'s', 'you\'re', 'that\'s', 'don\'t',
+    'i\'ll', 'we\'re', 'he\'s', 'she\'s', 'i\'ve', 'can\'t', 'didn\'t', 'isn\'t', 'what\'s',
+    'there\'s', 'they\'re', 'doesn\'t', 'won\'t', 'let\'s', 'you\'ll', 'i\'d', 'you\'ve',
+}) | EDGE_STOP_WORDS
+
+# Words, or punctuation that ends a clause ("Penny: Oh" and "No, no" are not phrases)
+_TOKEN_RE = re.compile(r"[a-z]+(?:'[a-z]+)?|[.,!?:;()\"\[\]]|\s-+\s|--+")
+_KEY_MULTIPLIER = 0x9E3779B97F4A7C15
+
+
+class CountMinSketch:
+    """
+    Count-min sketch over uint64 keys.
+
+    Estimates never undercount, so every n-gram whose estimate is below a
+    threshold is guaranteed to be below it exactly.
+    """
+
+    def __init__(self, width: int = SKETCH_WIDTH, depth: int = SKETCH_DEPTH, seed: int = 0x5EED):
+        if width & (width - 1):
+            raise ValueError("Sketch width must be a power of two")
+        self.width = width
+        self.depth = depth
+        self.table = np.zeros((depth, width), dtype=np.uint32)
+        self._shift = np.uint64(64 - (width.bit_length() - 1))
+        rng = np.random.default_rng(seed)
+        # Multiply-shift hashing needs odd multipliers
+        self._multipliers = rng.integers(1, 2 ** 63, size=depth, dtype=np.uint64) | np.uint64(1)
+
+    def _index(self, row: int, keys: 'np.ndarray') -> 'np.ndarray':
+        return ((keys * self._multipliers[row]) >> self._shift).astype(np.intp)
+
+    def add(self, keys: 'np.ndarray') -> None:
+        for row in range(self.depth):
+            np.add.at(self.table[row], self._index(row, keys), 1)
+
+    def estimate(self, keys: 'np.ndarray') -> 'np.ndarray':
+        result = self.table[0][self._index(0, keys)]
+        for row in range(1, self.depth):
+            np.minimum(result, self.table[row][self._index(row, keys)], out=result)
+        return result
+
+
+def _document_token_ids(path: str, vocab: Dict[str, int]) -> 'np.ndarray':
+    """Token ids of a document, -1 between clauses so n-grams never span punctuation or lines"""
+    ids: List[int] = []
+    for _, _, raw in iter_text_units(path):
+        for token in _TOKEN_RE.findall(unit_text(raw).lower().replace('\u2019', "'")):
+            if token[0].isalpha():
+                token_id = vocab.get(token)
+                if token_id is None:
+                    token_id = vocab[token] = len(vocab)
+                ids.append(token_id)
+            else:
+                ids.append(-1)
+        ids.append(-1)
+    return np.array(ids, dtype=np.int64)
+
+
+def _ngram_windows(ids: 'np.ndarray', n: int) -> Tuple['np.ndarray', 'np.ndarray']:
+    """Start positions of n-grams inside one text unit and their uint64 keys"""
+    if len(ids) < n:
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.uint64)
+    span = len(ids) - n + 1
+    valid = np.ones(span, dtype=bool)
+    for k in range(n):
+        valid &= ids[k:k + span] >= 0
+    starts = np.nonzero(valid)[0]
+
+    keys = np.full(len(starts), n, dtype=np.uint64)
+    multiplier = np.uint64(_KEY_MULTIPLIER)
+    for k in range(n):
+        keys = keys * multiplier + ids[starts + k].astype(np.uint64)
+    return starts, keys
+
+
+def extract_phrases(documents: Iterable[Dict[str, Any]], min_n: int = MIN_N, max_n: int = MAX_N,
+                    min_count: int = MIN_COUNT, min_pmi: float = MIN_PMI, min_episodes: int = MIN_EPISODES,
+                    width: int = SKETCH_WIDTH, depth: int = SKETCH_DEPTH) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+    """
+    Extract frequent, cohesive n-grams from transcript documents
+
+    Args:
+        documents: Document dicts from utils.corpus.iter_transcript_documents
+        min_n / max_n: N-gram lengths to consider
+        min_count: Minimum corpus frequency of a phrase
+        min_pmi: Minimum pointwise mutual information (log2)
+        min_episodes: Minimum number of documents a phrase occurs in
+        width / depth: Count-min sketch size
+
+    Returns:
+        (phrases, stats); each phrase has phrase, n, frequency, pmi and
+        episodes as a list of (document, count) pairs
+    """
+    if not NUMPY_AVAILABLE:
+        raise RuntimeError("numpy is required for phrase extraction")
+
+    documents = list(documents)
+    vocab: Dict[str, int] = {}
+    unigram_counts = np.zeros(0, dtype=np.int64)
+    ngram_totals = dict.fromkeys(range(min_n, max_n + 1), 0)
+    sketch = CountMinSketch(width, depth)
+    readable: List[int] = []
+
+    # Pass 1: unigram counts and a sketch of every n-gram
+    for index, doc in enumerate(documents):
+        try:
+            ids = _document_token_ids(doc['path'], vocab)
+        except OSError as e:
+            print(f"⚠️ {doc['path']} okunamadı: {e}")
+            continue
+        readable.append(index)
+        tokens = ids[ids >= 0]
+        if len(vocab) > len(unigram_counts):
+            unigram_counts = np.concatenate([unigram_counts, np.zeros(len(vocab) - len(unigram_counts), dtype=np.int64)])
+        unigram_counts += np.bincount(tokens, minlength=len(unigram_counts))
+        for n in ngram_totals:
+            _, keys = _ngram_windows(ids, n)
+            ngram_totals[n] += len(keys)
+            sketch.add(keys)
+
+    # Pass 2: exact counts for n-grams the sketch cannot rule out
+    counts: Dict[Tuple[int, ...], int] = defaultdict(int)
+    per_document: Dict[Tuple[int, ...], List[Tuple[int, int]]] = defaultdict(list)
+    for index in readable:
+        ids = _document_token_ids(documents[index]['path'], vocab)
+        for n in ngram_totals:
+            starts, keys = _ngram_windows(ids, n)
+            starts = starts[sketch.estimate(keys) >= min_count]
+            if not len(starts):
+                continue
+            rows = np.stack([ids[starts + k] for k in range(n)], axis=1)
+            unique_rows, row_counts = np.unique(rows, axis=0, return_counts=True)
+            for row, count in zip(map(tuple, unique_rows.tolist()), row_counts.tolist()):
+                counts[row] += count
+                per_document[row].append((index, count))
+
+    words = [''] * len(vocab)
+    for token, token_id in vocab.items():
+        words[token_id] = token
+    total_tokens = int(unigram_counts.sum())
+
+    phrases: List[Dict[str, Any]] = []
+    for row, count in counts.items():
+        if count < min_count or len(per_document[row]) < min_episodes:
+            continue
+        if words[row[0]] in EDGE_STOP_WORDS or words[row[-1]] in EDGE_STOP_WORDS:
+            continue
+        if all(words[w] in FUNCTION_WORDS for w in row):
+            continue
+        log_p_ngram = math.log2(count / ngram_totals[len(row)])
+        log_p_words = sum(math.log2(unigram_counts[w] / total_tokens) for w in row)
+        pmi = log_p_ngram - log_p_words
+        if pmi < min_pmi:
+            continue
+        phrases.append({
+            'phrase': ' '.join(words[w] for w in row),
+            'n': len(row),
+            'frequency': count,
+            'pmi': round(pmi, 3),
+            'episodes': [(documents[index], c) for index, c in per_document[row]],
+        })
+
+    phrases.sort(key=lambda p: (-p['frequency'], p['phrase']))
+    stats = {
+        'documents': len(readable),
+        'tokens': total_tokens,
+        'candidates': len(counts),
+        'phrases': len(phrases),
+    }
+    return phrases, stats
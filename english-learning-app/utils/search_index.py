@@ -0,0 +1,151 @@
+"""
+Transcript Search Index
+Feeds episode transcripts and subtitle cues into the SQLite FTS5 search table
+"""
+import os
+import re
+import hashlib
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from utils.corpus import iter_text_units, parse_season_episode, unit_text
+from utils.cue_index import iter_cues
+from utils.text_io import read_text
+
+VIDEO_KEY_PREFIX = 'video/'
+MAX_QUERY_TERMS = 16
+
+_SENTENCE_SPLIT_RE = re.compile(r'(?<=[.!?])\s+')
+_QUERY_TERM_RE = re.compile(r"[^\W_]+(?:'[^\W_]+)*\*?")
+
+Unit = Tuple[int, Optional[int], str]  # (line, start_ms, text)
+
+
+def file_signature(path: str) -> str:
+    stat = os.stat(path)
+    return f"{stat.st_mtime_ns}:{stat.st_size}"
+
+
+def document_units(path: str) -> List[Unit]:
+    """
+    Searchable units of a transcript or subtitle file
+
+    .srt/.vtt files yield one unit per cue with its start time; .txt files
+    yield the same lines as the concordance index, without timing.
+    """
+    if path.lower().endswith(('.srt', '.vtt')):
+        cues = iter_cues(read_text(path))
+        return [(i, start, text) for i, (start, _, text) in enumerate(cues)]
+
+    units: List[Unit] = []
+    for _, _, raw in iter_text_units(path):
+        text = unit_text(raw)
+        if text:
+            units.append((len(units), None, text))
+    return units
+
+
+def text_units(transcript: str) -> List[Unit]:
+    """Split a stored video transcript into sentence units"""
+    units: List[Unit] = []
+    for line in transcript.splitlines():
+        for sentence in _SENTENCE_SPLIT_RE.split(line.strip()):
+            if sentence:
+                units.append((len(units), None, sentence))
+    return units
+
+
+def index_document(db, doc: Dict[str, Any], force: bool = False) -> Optional[int]:
+    """
+    Index one transcript/subtitle file document
+
+    Args:
+        db: Database instance
+        doc: Document dict from utils.corpus
+        force: Re-index even if the file signature is unchanged
+
+    Returns:
+        Number of indexed units, None if the document was already up to date
+    """
+    signature = file_signature(doc['path'])
+    if not force and db.get_search_document_signatures().get(doc['key']) == signature:
+        return None
+    return db.index_search_document(doc, document_units(doc['path']), signature)
+
+
+def index_video_transcript(db, video_id: int, filename: str, transcript: str) -> int:
+    """Index the transcript stored on a video record"""
+    season, episode = parse_season_episode(filename or '')
+    doc = {
+        'key': f"{VIDEO_KEY_PREFIX}{video_id}",
+        'series': 'video',
+        'season': season,
+        'episode': episode,
+        'title': filename,
+    }
+    signature = hashlib.sha1(transcript.encode('utf-8')).hexdigest()
+    return db.index_search_document(doc, text_units(transcript), signature)
+
+
+def backfill(db, documents: Iterable[Dict[str, Any]], videos: Iterable[Dict[str, Any]] = ()) -> Dict[str, int]:
+    """
+    Bring the search index up to date with the files on disk
+
+    Unchanged documents are skipped by signature and documents whose file
+    has disappeared are removed.
+
+    Args:
+        db: Database instance
+        documents: Document dicts from utils.corpus.iter_transcript_documents
+        videos: Video rows with id, filename and transcript
+
+    Returns:
+        Counts of indexed, skipped and removed documents and indexed units
+    """
+    signatures = db.get_search_document_signatures()
+    stats = {'indexed': 0, 'skipped': 0, 'removed': 0, 'units': 0}
+    seen = set()
+
+    for doc in documents:
+        seen.add(doc['key'])
+        try:
+            signature = file_signature(doc['path'])
+            if signatures.get(doc['key']) == signature:
+                stats['skipped'] += 1
+                continue
+            stats['units'] += db.index_search_document(doc, document_units(doc['path']), signature)
+            stats['indexed'] += 1
+        except OSError as e:
+            print(f"⚠️ {doc['path']} okunamadı: {e}")
+
+    for video in videos:
+        key = f"{VIDEO_KEY_PREFIX}{video['id']}"
+        seen.add(key)
+        transcript = video.get('transcript') or ''
+        if not transcript.strip():
+            continue
+        if signatures.get(key) == hashlib.sha1(transcript.encode('utf-8')).hexdigest():
+            stats['skipped'] += 1
+            continue
+        stats['units'] += index_video_transcript(db, video['id'], video.get('filename') or '', transcript)
+        stats['indexed'] += 1
+
+    for key in signatures.keys() - seen:
+        db.delete_search_document(key)
+        stats['removed'] += 1
+    return stats
+
+
+def quote_query(query: str) -> str:
+    """
+    Rewrite free text into a safe FTS5 query
+
+    Every word becomes a quoted term; a trailing * keeps prefix matching.
+    Used when the raw query is not valid FTS5 syntax.
+    """
+    terms = []
+    for term in _QUERY_TERM_RE.findall(query)[:MAX_QUERY_TERMS]:
+        if term.endswith('*'):
+            terms.append(f'"{term[:-1]}"*')
+        else:
+            terms.append(f'"{term}"')
+    return ' '.join(terms)
@@ -3,10 +3,18 @@ Streaming Utilities
 For processing large files in chunks to avoid memory issues
 """
 import os
-from typing import Iterator, Optional, Tuple
+import mmap
+from collections import Counter
+from typing import Iterable, Iterator
 import re
 
 CHUNK_SIZE = 1024 * 1024  # 1MB chunks
+MAX_LINE_BYTES = 64 * 1024  # Longest line handed out by the mmap reader
+WORD_COUNT_BATCH_LINES = 20000  # Lines per incremental word-count batch
+
+_SUBTITLE_HEADER_PREFIXES = (b'WEBVTT', b'Kind:', b'Language:')
+_SUBTITLE_TAG_RE = re.compile(rb'<[^>]+>|\{[^}]+\}')
+_NON_WORD_BYTES_RE = re.compile(rb"[^a-z\s']")
 
 def read_file_in_chunks(file_path: str, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
     """
@@ -76,7 +84,6 @@ def process_subtitle_streaming(file_path: str) -> Iterator[str]:
     try:
         with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
             buffer = ''
-            in_subtitle_block = False
             
             while True:
                 chunk = f.read(CHUNK_SIZE)
@@ -86,14 +93,14 @@ def process_subtitle_streaming(file_path: str) -> Iterator[str]:
                     break
                 
                 buffer += chunk
+                lines = buffer.split('\n')
+                buffer = lines.pop()  # Keep incomplete line in buffer
                 
-                # Process complete lines
-                while '\n' in buffer:
-                    line, buffer = buffer.split('\n', 1)
+                for line in lines:
                     line = line.strip()
                     
                     # Skip timestamp lines and empty lines
-                    if not line or re.match(r'^\d+$', line) or '-->' in line:
+                    if not line or line.isdigit() or '-->' in line:
                         continue
                     
                     # Skip HTML tags
@@ -106,6 +113,153 @@ def process_subtitle_streaming(file_path: str) -> Iterator[str]:
         print(f"Error processing subtitle stream: {e}")
         raise
 
+def iter_lines_mmap(file_path: str, max_line_bytes: int = MAX_LINE_BYTES) -> Iterator[bytes]:
+    """
+    Iterate over the raw lines of a file through a read-only memory map
+    
+    Only one line is copied out of the map at a time, so memory use stays
+    bounded regardless of file size. Lines longer than max_line_bytes are
+    cut at the last whitespace inside the window.
+    
+    Args:
+        file_path: Path to the file
+        max_line_bytes: Upper bound for a single yielded line
+        
+    Yields:
+        Lines as bytes, without the trailing newline
+    """
+    with open(file_path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return
+        
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            pos = 0
+            while pos < size:
+                end = mm.find(b'\n', pos, min(size, pos + max_line_bytes))
+                if end == -1:
+                    end = min(size, pos + max_line_bytes)
+                    if end < size:
+                        # Very long line: cut at whitespace so words stay whole
+                        cut = mm.rfind(b' ', pos, end)
+                        if cut > pos:
+                            end = cut
+                    yield mm[pos:end]
+                    pos = end
+                else:
+                    yield mm[pos:end]
+                    pos = end + 1
+
+def iter_subtitle_text_lines(file_path: str) -> Iterator[bytes]:
+    """
+    Stream the spoken text lines of an SRT/VTT file as bytes
+    
+    Applies the same cleanup as SpeechProcessor.parse_subtitle_text:
+    timestamps, numeric indexes, WEBVTT headers and markup tags are
+    dropped and consecutive duplicate lines are collapsed.
+    
+    Args:
+        file_path: Path to subtitle file
+        
+    Yields:
+        Cleaned text lines as bytes
+    """
+    previous = None
+    for line in iter_lines_mmap(file_path):
+        line = line.strip()
+        if not line or b'-->' in line or line.isdigit():
+            continue
+        if line == b'WEBVTT' or line.startswith(_SUBTITLE_HEADER_PREFIXES):
+            continue
+        
+        line = _SUBTITLE_TAG_RE.sub(b'', line)
+        if line == previous:
+            continue
+        previous = line
+        yield line
+
+def iter_subtitle_word_counts(file_path: str, stop_words: Iterable[str] = (),
+                              min_length: int = 3,
+                              batch_lines: int = WORD_COUNT_BATCH_LINES) -> Iterator[Counter]:
+    """
+    Tokenize a subtitle file at the bytes level and yield word counts incrementally
+    
+    Tokenization matches SpeechProcessor.extract_words: lowercase, keep
+    a-z and apostrophes, strip surrounding apostrophes, drop short words
+    and stop words. Each yielded Counter covers at most batch_lines lines,
+    so callers can merge or persist counts without holding the file text.
+    
+    Args:
+        file_path: Path to subtitle file
+        stop_words: Words to skip
+        min_length: Minimum word length to keep
+        batch_lines: Number of text lines per yielded batch
+        
+    Yields:
+        Counter of word -> occurrences for each batch
+    """
+    stop_bytes = {w.encode('ascii', 'ignore') for w in stop_words}
+    counts: Counter = Counter()
+    pending = 0
+    
+    for line in iter_subtitle_text_lines(file_path):
+        # Non-breaking spaces separate words in the text-level tokenizer too
+        line = _NON_WORD_BYTES_RE.sub(b'', line.replace(b'\xc2\xa0', b' ').lower())
+        for token in line.split():
+            token = token.strip(b"'")
+            if len(token) >= min_length and token not in stop_bytes:
+                counts[token] += 1
+        
+        pending += 1
+        if pending >= batch_lines:
+            yield Counter({w.decode('ascii'): c for w, c in counts.items()})
+            counts.clear()
+            pending = 0
+    
+    if counts:
+        yield Counter({w.decode('ascii'): c for w, c in counts.items()})
+
+def count_subtitle_words(file_path: str, stop_words: Iterable[str] = (),
+                         min_length: int = 3) -> Counter:
+    """
+    Count words in a subtitle file in bounded memory
+    
+    Memory grows with the vocabulary, not with the file size.
+    
+    Args:
+        file_path: Path to subtitle file
+        stop_words: Words to skip
+        min_length: Minimum word length to keep
+        
+    Returns:
+        Counter of word -> occurrences
+    """
+    total: Counter = Counter()
+    for batch in iter_subtitle_word_counts(file_path, stop_words, min_length):
+        total.update(batch)
+    return total
+
+def read_subtitle_preview(file_path: str, max_chars: int) -> str:
+    """
+    Return the first max_chars characters of the cleaned subtitle text
+    
+    Args:
+        file_path: Path to subtitle file
+        max_chars: Maximum number of characters to return
+        
+    Returns:
+        Space-joined text lines, truncated to max_chars
+    """
+    parts = []
+    length = 0
+    for line in iter_subtitle_text_lines(file_path):
+        text = line.decode('utf-8', errors='ignore')
+        parts.append(text)
+        length += len(text) + 1
+        if length >= max_chars:
+            break
+    return ' '.join(parts)[:max_chars]
+
 def get_file_size_mb(file_path: str) -> float:
     """Get file size in megabytes"""
     try:
@@ -0,0 +1,126 @@
+"""
+Text File Reader
+Decodes subtitle and transcript files once (BOM / UTF-8 sniffing, NFC) and
+caches the text by (path, mtime, size)
+"""
+import os
+import codecs
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+SNIFF_BYTES = 64 * 1024
+FALLBACK_ENCODING = 'cp1252'  # Non-UTF-8 subtitles are almost always Windows-1252
+MAX_CACHED_CHARS = 32 * 1024 * 1024
+
+_BOMS = (
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+)
+
+
+def detect_encoding(head: bytes) -> str:
+    """
+    Guess the encoding of a file from its first bytes
+
+    A BOM wins; otherwise the sample must be valid UTF-8 (a multi-byte
+    character cut off at the end of the sample is allowed), else the file is
+    treated as Windows-1252.
+    """
+    for bom, encoding in _BOMS:
+        if head.startswith(bom):
+            return encoding
+    try:
+        codecs.getincrementaldecoder('utf-8')().decode(head, final=False)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        return FALLBACK_ENCODING
+
+
+def decode_bytes(data: bytes, encoding: Optional[str] = None) -> Tuple[str, str]:
+    """
+    Decode file contents to NFC text
+
+    Returns:
+        (text, encoding actually used)
+    """
+    encoding = encoding or detect_encoding(data[:SNIFF_BYTES])
+    try:
+        text = data.decode(encoding)
+    except UnicodeDecodeError:
+        # The sample looked like UTF-8 but a later byte is not; latin-1 maps every byte
+        encoding = FALLBACK_ENCODING if encoding != FALLBACK_ENCODING else 'latin-1'
+        try:
+            text = data.decode(encoding)
+        except UnicodeDecodeError:
+            encoding = 'latin-1'
+            text = data.decode(encoding)
+    if not text.isascii():
+        text = unicodedata.normalize('NFC', text)
+    return text, encoding
+
+
+class TextFileCache:
+    """Decoded file contents, keyed by path and invalidated by mtime/size"""
+
+    def __init__(self, max_chars: int = MAX_CACHED_CHARS):
+        self.max_chars = max_chars
+        self._cache: 'OrderedDict[str, Tuple[Tuple[int, int], str]]' = OrderedDict()
+        self._chars = 0
+        self._lock = threading.Lock()
+
+    def read(self, path: str) -> str:
+        """
+        Text of a file, decoded once per (mtime, size)
+
+        Raises:
+            OSError: If the file cannot be read
+        """
+        key = os.path.abspath(path)
+        stat = os.stat(key)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None and cached[0] == signature:
+                self._cache.move_to_end(key)
+                return cached[1]
+
+        with open(key, 'rb') as f:
+            text, _ = decode_bytes(f.read())
+
+        with self._lock:
+            previous = self._cache.pop(key, None)
+            if previous is not None:
+                self._chars -= len(previous[1])
+            if len(text) <= self.max_chars:
+                self._cache[key] = (signature, text)
+                self._chars += len(text)
+                while self._chars > self.max_chars:
+                    _, (_, evicted) = self._cache.popitem(last=False)
+                    self._chars -= len(evicted)
+        return text
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+            self._chars = 0
+
+
+_text_cache: Optional[TextFileCache] = None
+
+
+def get_text_cache() -> TextFileCache:
+    """Get shared text file cache instance"""
+    global _text_cache
+    if _text_cache is None:
+        _text_cache = TextFileCache()
+    return _text_cache
+
+
+def read_text(path: str) -> str:
+    """Read a subtitle/transcript file as NFC text through the shared cache"""
+    return get_text_cache().read(path)
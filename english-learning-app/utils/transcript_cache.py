@@ -0,0 +1,173 @@
+"""
+Transcript Cache
+Transcripts cleaned and tokenized once, with a span table mapping tokens to word ids
+"""
+import os
+import re
+import json
+import hashlib
+import threading
+from array import array
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from utils.text_io import read_text
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'cache', 'transcripts')
+FORMAT_VERSION = 2  # Bump when decoding, normalization or tokenization changes (2: encoding sniffed by read_text)
+
+_MERGE_MARKER_RE = re.compile(r'^(?:<<<<<<< .*|=======.*|>>>>>>> .*)$', re.MULTILINE)
+_BLANK_LINES_RE = re.compile(r'\n{3,}')
+_TIMING_RE = re.compile(r'\d{2}:\d{2}:\d{2},\d{3} --> \d{2}:\d{2}:\d{2},\d{3}')
+_CUE_NUMBER_RE = re.compile(r'^\d+\s*$', re.MULTILINE)
+_MARKUP_RE = re.compile(r'<[^>]+>|\[[^\]]*\]')
+# Same token pattern as the transcript viewer (static/js/app.js)
+_TOKEN_RE = re.compile(r"[a-zA-Z']+(?:-[a-zA-Z']+)?")
+
+
+def normalize_transcript(raw: str) -> str:
+    """
+    Clean a transcript or subtitle file for display
+
+    Removes merge-conflict markers, SRT timings and cue numbers, markup and
+    [sound] annotations, and collapses blank lines. The viewer's own cleanup
+    leaves the result unchanged.
+    """
+    text = _MERGE_MARKER_RE.sub('', raw)
+    text = _TIMING_RE.sub('', text)
+    text = _CUE_NUMBER_RE.sub('', text)
+    text = _MARKUP_RE.sub('', text)
+    return _BLANK_LINES_RE.sub('\n\n', text).strip()
+
+
+def file_signature(path: str) -> str:
+    stat = os.stat(path)
+    return f"{stat.st_mtime_ns}:{stat.st_size}"
+
+
+class TranscriptEntry:
+    """
+    A normalized transcript and its token table.
+
+    types holds each distinct lower-cased token once; spans is a flat
+    (start, end, type index) array over the text. Word ids are resolved per
+    type, so a vocabulary change costs one lookup per distinct word.
+    """
+
+    def __init__(self, signature: str, text: str, types: List[str], spans: array):
+        self.signature = signature
+        self.text = text
+        self.types = types
+        self.spans = spans
+        self._resolved: Optional[Tuple[str, List[Optional[int]]]] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_text(cls, signature: str, raw: str) -> 'TranscriptEntry':
+        text = normalize_transcript(raw)
+        type_index: Dict[str, int] = {}
+        spans = array('i')
+        for match in _TOKEN_RE.finditer(text):
+            word = match.group(0).lower()
+            index = type_index.get(word)
+            if index is None:
+                index = type_index[word] = len(type_index)
+            spans.extend((match.start(), match.end(), index))
+        return cls(signature, text, list(type_index), spans)
+
+    @property
+    def etag(self) -> str:
+        return hashlib.sha1(f"{FORMAT_VERSION}:{self.signature}".encode('utf-8')).hexdigest()[:16]
+
+    def word_ids(self, vocabulary_version: str, lookup: Callable[[List[str]], Dict[str, int]]) -> List[Optional[int]]:
+        """Word id of every type (None if not in the vocabulary), re-resolved when the vocabulary changes"""
+        with self._lock:
+            if self._resolved is None or self._resolved[0] != vocabulary_version:
+                ids = lookup(self.types)
+                self._resolved = (vocabulary_version, [ids.get(word) for word in self.types])
+            return self._resolved[1]
+
+    def span_list(self, word_ids: List[Optional[int]]) -> List[List[Optional[int]]]:
+        """[start, end, word_id] per token"""
+        spans = self.spans
+        return [[spans[i], spans[i + 1], word_ids[spans[i + 2]]] for i in range(0, len(spans), 3)]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'format': FORMAT_VERSION,
+            'signature': self.signature,
+            'text': self.text,
+            'types': self.types,
+            'spans': self.spans.tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'TranscriptEntry':
+        return cls(data['signature'], data['text'], data['types'], array('i', data['spans']))
+
+
+class TranscriptCache:
+    """Normalized transcripts on disk, keyed by source path, with an in-memory LRU in front"""
+
+    def __init__(self, directory: str = DEFAULT_CACHE_DIR, max_cached: int = 32):
+        self.directory = directory
+        self.max_cached = max_cached
+        self._cache: 'OrderedDict[str, TranscriptEntry]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _cache_path(self, path: str) -> str:
+        digest = hashlib.sha1(os.path.abspath(path).encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, f"{digest}.json")
+
+    def _remember(self, path: str, entry: TranscriptEntry) -> None:
+        with self._lock:
+            self._cache[path] = entry
+            self._cache.move_to_end(path)
+            while len(self._cache) > self.max_cached:
+                self._cache.popitem(last=False)
+
+    def get(self, path: str) -> TranscriptEntry:
+        """
+        Normalized transcript of a file, rebuilt only when the file changes
+
+        Raises:
+            OSError: If the file cannot be read
+        """
+        signature = file_signature(path)
+        with self._lock:
+            entry = self._cache.get(path)
+            if entry is not None and entry.signature == signature:
+                self._cache.move_to_end(path)
+                return entry
+
+        cache_path = self._cache_path(path)
+        entry = None
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('format') == FORMAT_VERSION and data.get('signature') == signature:
+                entry = TranscriptEntry.from_dict(data)
+        except (OSError, ValueError, KeyError):
+            pass
+
+        if entry is None:
+            entry = TranscriptEntry.from_text(signature, read_text(path))
+            os.makedirs(self.directory, exist_ok=True)
+            tmp_path = cache_path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(entry.to_dict(), f, ensure_ascii=False)
+            os.replace(tmp_path, cache_path)
+
+        self._remember(path, entry)
+        return entry
+
+
+_transcript_cache: Optional[TranscriptCache] = None
+
+
+def get_transcript_cache() -> TranscriptCache:
+    """Get shared transcript cache instance"""
+    global _transcript_cache
+    if _transcript_cache is None:
+        _transcript_cache = TranscriptCache()
+    return _transcript_cache
@@ -0,0 +1,309 @@
+"""
+Chunked Transcription
+Splits 16 kHz audio at silences (energy-based VAD) and transcribes the chunks
+in parallel worker processes that each hold a transcription backend (see
+utils/transcription_backends.py), then stitches the segments back in order
+with absolute timestamps
+"""
+import os
+import time
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+from utils.model_registry import get_model_registry
+from utils.transcription_backends import TRANSCRIBE_BACKEND, WHISPER_MODEL, TranscriptionBackend, load_backend
+
+SAMPLE_RATE = 16000
+# Worker processes, each with its own model copy; 0 or 1 transcribes in this process
+DEFAULT_WORKERS = int(os.getenv('TRANSCRIBE_WORKERS', str(max(1, min(4, (os.cpu_count() or 1) // 2)))))
+# Chunks are cut at a pause between half and twice this length
+TARGET_CHUNK_SECONDS = float(os.getenv('TRANSCRIBE_CHUNK_SECONDS', '60'))
+# Every chunk is decoded as English instead of running language detection per chunk
+TRANSCRIBE_LANGUAGE = os.getenv('TRANSCRIBE_LANGUAGE', 'en') or None
+
+FRAME_MS = 30
+MIN_SILENCE_MS = 400
+SILENCE_MARGIN_DB = 10.0  # A frame is silent below noise floor + margin
+SILENCE_FLOOR_DB = -60.0  # ...and always below this
+DIGITAL_SILENCE_DB = -90.0  # Zero-filled stretches are left out of the noise floor estimate
+
+
+def frame_levels(audio: "np.ndarray", sample_rate: int = SAMPLE_RATE, frame_ms: int = FRAME_MS) -> "np.ndarray":
+    """RMS level in dBFS of each full frame_ms frame"""
+    frame = sample_rate * frame_ms // 1000
+    count = len(audio) // frame
+    if count == 0:
+        return np.zeros(0, dtype=np.float32)
+    frames = audio[:count * frame].reshape(count, frame)
+    power = np.einsum('ij,ij->i', frames, frames) / frame
+    return 10.0 * np.log10(power + 1e-10)
+
+
+def find_silences(audio: "np.ndarray", sample_rate: int = SAMPLE_RATE,
+                  min_silence_ms: int = MIN_SILENCE_MS) -> Tuple[List[Tuple[int, int]], "np.ndarray"]:
+    """
+    Pauses of at least min_silence_ms
+
+    The silence threshold adapts to the recording: the quietest 10% of
+    frames that are not digital silence set the noise floor, and frames
+    within SILENCE_MARGIN_DB of it (or below SILENCE_FLOOR_DB) count as silent.
+
+    Returns:
+        ([(start_sample, end_sample), ...], per-frame speech mask)
+    """
+    levels = frame_levels(audio, sample_rate)
+    if len(levels) == 0:
+        return [], np.zeros(0, dtype=bool)
+    audible = levels[levels > DIGITAL_SILENCE_DB]
+    noise_floor = float(np.percentile(audible, 10)) if len(audible) else DIGITAL_SILENCE_DB
+    threshold = max(noise_floor + SILENCE_MARGIN_DB, SILENCE_FLOOR_DB)
+    threshold = min(threshold, float(np.median(levels)))  # Mostly-silent audio still has speech above the median
+    speech = levels > threshold
+
+    # Run boundaries of the silent stretches
+    padded = np.concatenate(([True], speech, [True]))
+    edges = np.flatnonzero(padded[1:] != padded[:-1])
+    starts, ends = edges[0::2], edges[1::2]
+    frame = sample_rate * FRAME_MS // 1000
+    min_frames = max(1, min_silence_ms // FRAME_MS)
+    silences = [(int(s) * frame, int(e) * frame) for s, e in zip(starts, ends) if e - s >= min_frames]
+    return silences, speech
+
+
+def plan_chunks(audio: "np.ndarray", sample_rate: int = SAMPLE_RATE,
+                target_seconds: float = TARGET_CHUNK_SECONDS) -> List[Tuple[int, int]]:
+    """
+    Chunk boundaries cut in the middle of pauses
+
+    Each cut is the pause midpoint closest to target_seconds after the
+    chunk start, at least half and at most twice the target in; without a
+    pause in that window the chunk is cut at twice the target. Chunks
+    without any speech are dropped.
+
+    Returns:
+        [(start_sample, end_sample), ...] in order
+    """
+    total = len(audio)
+    silences, speech = find_silences(audio, sample_rate)
+    cut_points = [(start + end) // 2 for start, end in silences]
+    target = int(target_seconds * sample_rate)
+    shortest, longest = target // 2, target * 2
+
+    chunks = []
+    start = 0
+    while start < total:
+        if total - start <= longest:
+            end = total
+        else:
+            window = [p for p in cut_points if start + shortest <= p <= start + longest]
+            end = min(window, key=lambda p: abs(p - start - target)) if window else start + longest
+        chunks.append((start, end))
+        start = end
+
+    frame = sample_rate * FRAME_MS // 1000
+    return [(s, e) for s, e in chunks if speech[s // frame:max(s // frame + 1, e // frame)].any()]
+
+
+def _transcribe_with(backend: TranscriptionBackend, samples: "np.ndarray", offset: float) -> List[Dict[str, Any]]:
+    segments = []
+    for segment in backend.transcribe(samples, TRANSCRIBE_LANGUAGE):
+        text = segment['text'].strip()
+        if text:
+            segments.append({
+                'start': round(segment['start'] + offset, 2),
+                'end': round(segment['end'] + offset, 2),
+                'text': text,
+            })
+    return segments
+
+
+# Backend held by each worker process
+_worker_model: Optional[TranscriptionBackend] = None
+
+
+def _init_worker(backend: str, model_size: str, threads: int) -> None:
+    global _worker_model
+    _worker_model = load_backend(backend, model_size, threads)
+
+
+def _transcribe_chunk(task: Tuple["np.ndarray", float]) -> List[Dict[str, Any]]:
+    samples, offset = task
+    if _worker_model is None:
+        raise RuntimeError("Transcription backend could not be loaded in the worker")
+    return _transcribe_with(_worker_model, samples, offset)
+
+
+class ChunkedTranscriber:
+    """
+    Whisper transcription that scales with cores.
+
+    Audio is cut at pauses into chunks of about TARGET_CHUNK_SECONDS (so no
+    word is split), silent chunks are skipped, and the rest go to a pool of
+    worker processes that load the model once and split the CPU threads
+    between them. Results are stitched in chunk order with timestamps
+    relative to the whole recording. With one worker the chunks run in this
+    process, on the shared registry model ('whisper') when the backend and
+    model size are the configured ones; with DEFAULT_WORKERS > 1 the
+    registry entry starts the shared transcriber's workers instead, and an
+    in-process model is only loaded if the pool is not running.
+
+    The workers are forked only by start() on the main thread (at startup,
+    before the preload and request threads exist): a fork from another
+    thread can copy locks held by a third one into the children. A pool
+    that breaks is not re-forked; later chunks run in this process.
+    """
+
+    def __init__(self, workers: int = DEFAULT_WORKERS, chunk_seconds: float = TARGET_CHUNK_SECONDS,
+                 backend: Optional[str] = None, model_size: Optional[str] = None):
+        self.workers = max(1, workers)
+        self.chunk_seconds = chunk_seconds
+        self.backend = backend or TRANSCRIBE_BACKEND
+        self.model_size = model_size or WHISPER_MODEL
+        self._model: Optional[TranscriptionBackend] = None
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _local_model(self) -> Optional[TranscriptionBackend]:
+        if DEFAULT_WORKERS <= 1 and (self.backend, self.model_size) == (TRANSCRIBE_BACKEND, WHISPER_MODEL):
+            return get_model_registry().get('whisper')
+        with self._lock:
+            if self._model is None:
+                self._model = load_backend(self.backend, self.model_size)
+            return self._model
+
+    def start(self) -> bool:
+        """
+        Fork the worker processes now (main thread only); they load their models in the background
+
+        Returns:
+            True if the worker pool is running
+        """
+        if self.workers <= 1:
+            return False
+        with self._lock:
+            if self._pool is None:
+                if threading.current_thread() is not threading.main_thread():
+                    print("⚠️ Transkripsiyon işlemleri yalnızca ana iş parçacığında başlatılır, tek işlemde devam ediliyor")
+                    return False
+                threads = max(1, (os.cpu_count() or 1) // self.workers)
+                # Same start method choice as the translation engine: fork avoids re-importing app.py
+                context = (multiprocessing.get_context('fork')
+                           if 'fork' in multiprocessing.get_all_start_methods() else None)
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=context, initializer=_init_worker,
+                    initargs=(self.backend, self.model_size, threads)
+                )
+                # A fork pool starts all workers on its first submit
+                self._pool.submit(os.getpid)
+            return True
+
+    def _discard_pool(self, pool: ProcessPoolExecutor) -> None:
+        # Only the pool that failed; other callers may still be using it and see the same error
+        with self._lock:
+            if self._pool is pool:
+                pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+
+    @property
+    def worker_pids(self) -> List[int]:
+        if self._pool is None:
+            return []
+        return list(getattr(self._pool, '_processes', None) or {})
+
+    def warm_up(self) -> None:
+        """Start the workers (or load the in-process model) and wait until the models are loaded"""
+        if self.start():
+            pool = self._pool
+            probe = (np.zeros(SAMPLE_RATE, dtype=np.float32), 0.0)
+            try:
+                list(pool.map(_transcribe_chunk, [probe] * self.workers))
+            except Exception as e:
+                print(f"⚠️ Transkripsiyon işlemleri başlatılamadı: {e}")
+                self._discard_pool(pool)
+        else:
+            self._local_model()
+
+    def transcribe(self, audio: "np.ndarray",
+                   progress: Optional[Callable[[int, int], None]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Transcribe 16 kHz mono float32 samples
+
+        Args:
+            audio: Samples as returned by SpeechProcessor.load_audio_pcm
+            progress: Optional callback(done, total) over the chunks
+
+        Returns:
+            text, segments ([{start, end, text}] in seconds), duration,
+            elapsed, chunks and workers; None if the backend is not installed
+        """
+        started = time.perf_counter()
+        duration = len(audio) / SAMPLE_RATE
+        chunks = plan_chunks(audio, SAMPLE_RATE, self.chunk_seconds)
+        tasks = [(audio[s:e], s / SAMPLE_RATE) for s, e in chunks]
+        if not tasks:
+            # Nothing but silence: no model is needed
+            return {'text': '', 'segments': [], 'duration': duration,
+                    'elapsed': time.perf_counter() - started, 'chunks': 0, 'workers': 0}
+        # Even a single chunk goes to the pool, so no second model copy is loaded in this process
+        pool = self._pool if self.workers > 1 else None
+        workers = self.workers if pool is not None else 1
+
+        segments: List[Dict[str, Any]] = []
+        if pool is not None:
+            try:
+                results = pool.map(_transcribe_chunk, tasks)
+                for done, chunk_segments in enumerate(results, 1):
+                    segments.extend(chunk_segments)
+                    if progress:
+                        progress(done, len(tasks))
+            except Exception as e:
+                print(f"⚠️ Paralel transkripsiyon başarısız, tek işlemde devam ediliyor: {e}")
+                self._discard_pool(pool)
+                segments, workers = [], 1
+        if workers <= 1:
+            model = self._local_model()
+            if model is None:
+                return None
+            for done, (samples, offset) in enumerate(tasks, 1):
+                segments.extend(_transcribe_with(model, samples, offset))
+                if progress:
+                    progress(done, len(tasks))
+
+        elapsed = time.perf_counter() - started
+        workers = min(workers, len(tasks))  # Processes that actually had a chunk
+        print(f"🎙️ {duration:.0f} sn ses {elapsed:.1f} sn'de yazıya döküldü "
+              f"({len(tasks)} parça, {workers} işlem, RTF {elapsed / duration if duration else 0:.2f})")
+        return {
+            'text': ' '.join(segment['text'] for segment in segments),
+            'segments': segments,
+            'duration': duration,
+            'elapsed': elapsed,
+            'chunks': len(tasks),
+            'workers': workers,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+_transcriber: Optional[ChunkedTranscriber] = None
+
+
+def get_transcriber() -> ChunkedTranscriber:
+    """Get shared chunked transcriber instance"""
+    global _transcriber
+    if _transcriber is None:
+        _transcriber = ChunkedTranscriber()
+    return _transcriber
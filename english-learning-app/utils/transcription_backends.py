@@ -0,0 +1,130 @@
+"""
+Transcription Backends
+Interchangeable speech-to-text engines behind one interface: openai-whisper
+(PyTorch, the default) and faster-whisper (CTranslate2, int8 by default)
+
+Selected with environment variables:
+- TRANSCRIBE_BACKEND: 'openai-whisper' or 'faster-whisper'
+- WHISPER_MODEL: model size or name (tiny, base, small, medium, ...; default 'base')
+- WHISPER_COMPUTE_TYPE: faster-whisper weight type (default 'int8'; e.g. 'int8_float32', 'float32')
+- WHISPER_DEVICE: 'auto' (CUDA when available, the default), 'cpu' or 'cuda'
+"""
+import os
+import importlib.util
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional
+
+TRANSCRIBE_BACKEND = os.getenv('TRANSCRIBE_BACKEND', 'openai-whisper')
+WHISPER_MODEL = os.getenv('WHISPER_MODEL', 'base')
+WHISPER_COMPUTE_TYPE = os.getenv('WHISPER_COMPUTE_TYPE', 'int8')
+WHISPER_DEVICE = os.getenv('WHISPER_DEVICE', 'auto')
+
+# Checked without importing: both libraries pull in large native runtimes
+WHISPER_AVAILABLE = importlib.util.find_spec('whisper') is not None
+FASTER_WHISPER_AVAILABLE = importlib.util.find_spec('faster_whisper') is not None
+
+
+class TranscriptionBackend(ABC):
+    """
+    A loaded speech-to-text model.
+
+    transcribe() takes 16 kHz mono float32 samples and returns segments as
+    dicts with start and end (seconds from the start of the samples) and text.
+    """
+
+    name = ''
+
+    def __init__(self, model: Any, model_size: str, device: str = 'cpu'):
+        self.model = model
+        self.model_size = model_size
+        self.device = device
+
+    @classmethod
+    @abstractmethod
+    def load(cls, model_size: str, threads: int = 0) -> Optional['TranscriptionBackend']:
+        """Load a model; None if the library is not installed. threads=0 keeps the library default."""
+
+    @abstractmethod
+    def transcribe(self, samples: Any, language: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Segments of 16 kHz mono float32 samples"""
+
+    def __repr__(self) -> str:
+        return f"{self.name}:{self.model_size}@{self.device}"
+
+
+class OpenAIWhisperBackend(TranscriptionBackend):
+    """Reference implementation: openai-whisper on PyTorch, float16 on CUDA and float32 on CPU"""
+
+    name = 'openai-whisper'
+
+    @classmethod
+    def load(cls, model_size: str, threads: int = 0) -> Optional['OpenAIWhisperBackend']:
+        if not WHISPER_AVAILABLE:
+            return None
+        import torch
+        import whisper
+        if threads:
+            torch.set_num_threads(threads)
+        device = WHISPER_DEVICE
+        if device == 'auto':
+            device = 'cuda' if torch.cuda.is_available() else 'cpu'
+        return cls(whisper.load_model(model_size, device=device), model_size, device)
+
+    def transcribe(self, samples: Any, language: Optional[str] = None) -> List[Dict[str, Any]]:
+        result = self.model.transcribe(samples, fp16=self.device != 'cpu', language=language)
+        segments = [{'start': s['start'], 'end': s['end'], 'text': s['text']} for s in result.get('segments') or []]
+        if not segments and (result.get('text') or '').strip():
+            segments.append({'start': 0.0, 'end': len(samples) / 16000, 'text': result['text']})
+        return segments
+
+
+class FasterWhisperBackend(TranscriptionBackend):
+    """faster-whisper: the same models converted to CTranslate2, quantized to int8 by default"""
+
+    name = 'faster-whisper'
+
+    @classmethod
+    def load(cls, model_size: str, threads: int = 0) -> Optional['FasterWhisperBackend']:
+        if not FASTER_WHISPER_AVAILABLE:
+            return None
+        from faster_whisper import WhisperModel
+        # CTranslate2 resolves 'auto' to CUDA when it is available
+        model = WhisperModel(model_size, device=WHISPER_DEVICE, compute_type=WHISPER_COMPUTE_TYPE, cpu_threads=threads)
+        return cls(model, model_size, getattr(model.model, 'device', WHISPER_DEVICE))
+
+    def transcribe(self, samples: Any, language: Optional[str] = None) -> List[Dict[str, Any]]:
+        # Greedy decoding like openai-whisper's default, so the two are compared like for like
+        segments, _ = self.model.transcribe(samples, language=language, beam_size=1)
+        return [{'start': s.start, 'end': s.end, 'text': s.text} for s in segments]
+
+
+BACKENDS = {backend.name: backend for backend in (OpenAIWhisperBackend, FasterWhisperBackend)}
+
+
+def available_backends() -> List[str]:
+    """Names of the backends whose library is installed"""
+    installed = {'openai-whisper': WHISPER_AVAILABLE, 'faster-whisper': FASTER_WHISPER_AVAILABLE}
+    return [name for name in BACKENDS if installed[name]]
+
+
+def load_backend(name: Optional[str] = None, model_size: Optional[str] = None,
+                 threads: int = 0) -> Optional[TranscriptionBackend]:
+    """
+    Load a transcription backend (default: TRANSCRIBE_BACKEND with WHISPER_MODEL)
+
+    Args:
+        name: Backend name, see BACKENDS
+        model_size: Model size or name
+        threads: CPU threads for the model (0 = library default)
+
+    Returns:
+        The loaded backend, or None if its library is not installed
+
+    Raises:
+        ValueError: If the backend name is unknown
+    """
+    name = name or TRANSCRIBE_BACKEND
+    backend = BACKENDS.get(name)
+    if backend is None:
+        raise ValueError(f"Unknown transcription backend '{name}' (choose from {', '.join(BACKENDS)})")
+    return backend.load(model_size or WHISPER_MODEL, threads)
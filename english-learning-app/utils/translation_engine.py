@@ -0,0 +1,442 @@
+"""
+Translation Engine
+Batched word and sentence translation with Argos Translate in worker
+processes, backed by the translation_cache and sentence_translation_cache
+tables so nothing is sent to the model twice
+"""
+import os
+import re
+import hashlib
+import threading
+import unicodedata
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+try:
+    import argostranslate.package
+    import argostranslate.translate
+    ARGOS_AVAILABLE = True
+except ImportError:
+    ARGOS_AVAILABLE = False
+
+try:
+    import ctranslate2
+    import sentencepiece
+    BATCH_BACKEND_AVAILABLE = True
+except ImportError:
+    BATCH_BACKEND_AVAILABLE = False
+
+SOURCE_LANG = 'en'
+TARGET_LANG = 'tr'
+DEFAULT_WORKERS = int(os.getenv('TRANSLATION_WORKERS', '2'))  # 0 translates in the calling process
+DEFAULT_BATCH_SIZE = int(os.getenv('TRANSLATION_BATCH_SIZE', '64'))
+BEAM_SIZE = 2
+MAX_DECODING_LENGTH = 32  # Single words and short phrases only
+SENTENCE_BATCH_SIZE = int(os.getenv('TRANSLATION_SENTENCE_BATCH_SIZE', '16'))  # Small, so results stream early
+MAX_SENTENCE_DECODING_LENGTH = 256
+
+_SENTENCE_END_RE = re.compile(r'(?:(?<=[.!?…])|(?<=[.!?…]["\')\]]))\s+(?=["\'(\[]?[A-Z0-9])')
+_SPEAKER_RE = re.compile(r"^([A-Z][\w .'-]{0,30}):\s+(?=\S)")
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def _cue_blocks(text: str) -> Iterator[Tuple[int, str]]:
+    """
+    Lines of each cue joined with spaces
+
+    Cues are separated by blank lines; a line opening with a speaker label
+    starts a new cue too, so script lines without blank lines stay apart.
+
+    Yields:
+        (number of the cue's first line among non-empty lines, cue text)
+    """
+    block: List[str] = []
+    first_line = line_no = 0
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or (block and _SPEAKER_RE.match(line)):
+            if block:
+                yield first_line, ' '.join(block)
+                block = []
+            if not line:
+                continue
+        if not block:
+            first_line = line_no
+        block.append(line)
+        line_no += 1
+    if block:
+        yield first_line, ' '.join(block)
+
+
+def split_sentences(text: str) -> List[Dict[str, object]]:
+    """
+    Split a normalized transcript into sentences
+
+    The lines of every cue (a subtitle block or a script line) are joined
+    first, so a sentence wrapped over two subtitle lines stays whole, then
+    split at sentence-final punctuation. A leading speaker label
+    ("Monica: ...") is kept apart, so the same line is cached once whoever says it.
+
+    Returns:
+        Dicts with line (0-based number of the cue's first line among
+        non-empty lines), speaker (or None) and text
+    """
+    sentences = []
+    for line_no, cue in _cue_blocks(text):
+        speaker = None
+        match = _SPEAKER_RE.match(cue)
+        if match:
+            speaker, cue = match.group(1).strip(), cue[match.end():]
+        for sentence in _SENTENCE_END_RE.split(cue):
+            sentence = sentence.strip()
+            if sentence:
+                sentences.append({'line': line_no, 'speaker': speaker, 'text': sentence})
+    return sentences
+
+
+def normalize_sentence(sentence: str) -> str:
+    """Form that identical lines share regardless of case, spacing or Unicode composition"""
+    return _WHITESPACE_RE.sub(' ', unicodedata.normalize('NFKC', sentence)).strip().casefold()
+
+
+def sentence_hash(sentence: str) -> str:
+    """Cache key of a sentence"""
+    return hashlib.sha1(normalize_sentence(sentence).encode('utf-8')).hexdigest()
+
+
+def find_argos_package(src: str, tgt: str, install: bool = False):
+    """
+    Installed Argos package for src -> tgt, downloading it if install is set
+
+    Returns:
+        The package, or None if it is not installed/available
+    """
+    if not ARGOS_AVAILABLE:
+        return None
+    for pkg in argostranslate.package.get_installed_packages():
+        if pkg.from_code == src and pkg.to_code == tgt:
+            return pkg
+    if not install:
+        return None
+
+    print(f"📥 {src}->{tgt} dil paketi indiriliyor...")
+    argostranslate.package.update_package_index()
+    available = next(
+        (pkg for pkg in argostranslate.package.get_available_packages()
+         if pkg.from_code == src and pkg.to_code == tgt),
+        None
+    )
+    if available is None:
+        print(f"❌ {src}->{tgt} dil paketi bulunamadı!")
+        return None
+    argostranslate.package.install_from_path(available.download())
+    print("✅ Dil paketi kuruldu!")
+    return find_argos_package(src, tgt)
+
+
+def model_version(pkg) -> str:
+    """Cache key part that changes when a different model is installed"""
+    return f"argos-{pkg.from_code}-{pkg.to_code}-{getattr(pkg, 'package_version', '') or 'unknown'}"
+
+
+class _BatchTranslator:
+    """
+    One loaded model. Translates a list of words in a single model call
+    (CTranslate2 translate_batch) when possible, word by word otherwise.
+    """
+
+    def __init__(self, src: str, tgt: str, threads: int = 0):
+        self.pkg = find_argos_package(src, tgt)
+        if self.pkg is None:
+            raise RuntimeError(f"Argos {src}->{tgt} package is not installed")
+
+        self._translator = None
+        self._tokenizer = None
+        self._fallback = None
+        model_dir = os.path.join(str(self.pkg.package_path), 'model')
+        sp_model = os.path.join(str(self.pkg.package_path), 'sentencepiece.model')
+        if BATCH_BACKEND_AVAILABLE and os.path.isdir(model_dir) and os.path.exists(sp_model):
+            self._translator = ctranslate2.Translator(model_dir, device='cpu', inter_threads=1, intra_threads=threads)
+            self._tokenizer = sentencepiece.SentencePieceProcessor(model_file=sp_model)
+            self._target_prefix = getattr(self.pkg, 'target_prefix', '') or ''
+        else:
+            languages = {lang.code: lang for lang in argostranslate.translate.get_installed_languages()}
+            self._fallback = languages[src].get_translation(languages[tgt])
+
+    def translate(self, words: List[str], max_decoding_length: int = MAX_DECODING_LENGTH) -> List[str]:
+        if self._translator is None:
+            results = []
+            for word in words:
+                try:
+                    results.append((self._fallback.translate(word) or '').strip())
+                except Exception:
+                    results.append('')
+            return results
+
+        tokens = self._tokenizer.encode(words, out_type=str)
+        target_prefix = [[self._target_prefix]] * len(words) if self._target_prefix else None
+        outputs = self._translator.translate_batch(
+            tokens, target_prefix=target_prefix, beam_size=BEAM_SIZE,
+            max_decoding_length=max_decoding_length, max_batch_size=DEFAULT_BATCH_SIZE
+        )
+        results = []
+        for output in outputs:
+            pieces = output.hypotheses[0]
+            if self._target_prefix and pieces and pieces[0] == self._target_prefix:
+                pieces = pieces[1:]
+            results.append(self._tokenizer.decode(pieces).strip())
+        return results
+
+
+# Model held by each worker process
+_worker_translator: Optional[_BatchTranslator] = None
+
+
+def _init_worker(src: str, tgt: str, threads: int) -> None:
+    global _worker_translator
+    _worker_translator = _BatchTranslator(src, tgt, threads)
+
+
+def _translate_chunk(words: List[str]) -> List[str]:
+    return _worker_translator.translate(words)
+
+
+def _translate_sentence_chunk(sentences: List[str]) -> List[str]:
+    return _worker_translator.translate(sentences, MAX_SENTENCE_DECODING_LENGTH)
+
+
+class TranslationEngine:
+    """
+    Word and sentence translation front end.
+
+    Lookups go to the translation_cache table first. Missing words are
+    deduplicated, split into chunks of batch_size and translated by a pool
+    of worker processes that each load the model once. Every finished chunk
+    is written to the cache right away, so an interrupted run loses at most
+    the chunks in flight.
+
+    The workers are forked only on the main thread (at startup, before the
+    preload and request threads exist), since a fork from another thread can
+    copy locks held by a third one into the children. Loaded from any other
+    thread, or after the pool breaks there, the model runs in this process.
+    """
+
+    def __init__(self, db, src: str = SOURCE_LANG, tgt: str = TARGET_LANG,
+                 workers: int = DEFAULT_WORKERS, batch_size: int = DEFAULT_BATCH_SIZE):
+        self._db = db
+        self.src = src
+        self.tgt = tgt
+        self.workers = max(0, workers)
+        self.batch_size = max(1, batch_size)
+        self.model_version: Optional[str] = None
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._local: Optional[_BatchTranslator] = None
+        self._lock = threading.Lock()
+
+    @property
+    def available(self) -> bool:
+        return ARGOS_AVAILABLE
+
+    def load(self, install: bool = True) -> bool:
+        """Start the workers, downloading the language package first if install is set"""
+        with self._lock:
+            if self.model_version is not None:
+                return True
+            pkg = find_argos_package(self.src, self.tgt, install=install)
+            if pkg is None:
+                return False
+
+            if self.workers and threading.current_thread() is threading.main_thread():
+                self._pool = self._start_pool()
+            else:
+                self._local = _BatchTranslator(self.src, self.tgt, os.cpu_count() or 1)
+            self.model_version = model_version(pkg)
+            print(f"✅ Çeviri motoru hazır ({self.model_version}, {self.workers if self._pool is not None else 'tek'} işlem)")
+            return True
+
+    def _start_pool(self) -> ProcessPoolExecutor:
+        threads = max(1, (os.cpu_count() or 1) // self.workers)
+        # Same start method choice as srt_analyzer: fork avoids re-importing app.py
+        context = (multiprocessing.get_context('fork')
+                   if 'fork' in multiprocessing.get_all_start_methods() else None)
+        pool = ProcessPoolExecutor(
+            max_workers=self.workers, mp_context=context,
+            initializer=_init_worker, initargs=(self.src, self.tgt, threads)
+        )
+        # A fork pool starts all workers on its first submit: do it now, from the calling (main) thread
+        pool.submit(os.getpid)
+        return pool
+
+    def _backend(self) -> Tuple[Optional[ProcessPoolExecutor], Optional[_BatchTranslator]]:
+        with self._lock:
+            return self._pool, self._local
+
+    def _replace_broken_pool(self, broken: ProcessPoolExecutor) -> None:
+        """Swap a crashed pool for a working backend; threads that hit the same pool share one replacement"""
+        with self._lock:
+            if self._pool is not broken:
+                return  # Already replaced by another thread
+            broken.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+            if threading.current_thread() is threading.main_thread():
+                self._pool = self._start_pool()
+                return
+            print("⚠️ Çeviri işlemleri ana iş parçacığı dışında yeniden başlatılmaz, tek işlemde devam ediliyor")
+            try:
+                self._local = _BatchTranslator(self.src, self.tgt, os.cpu_count() or 1)
+            except Exception:
+                self.model_version = None  # Next load() starts over
+                raise
+
+    def warm_up(self) -> None:
+        """
+        Start the worker processes now instead of on the first translation
+        and wait for one probe per worker, so the model is loaded when this returns
+        """
+        pool, local = self._backend()
+        if pool is not None:
+            list(pool.map(_translate_chunk, [['hello']] * self.workers))
+        elif local is not None:
+            local.translate(['hello'])
+
+    @property
+    def worker_pids(self) -> List[int]:
+        if self._pool is None:
+            return []
+        return list(getattr(self._pool, '_processes', None) or {})
+
+    def translate_words(self, words: Iterable[str],
+                        progress: Optional[Callable[[int, int], None]] = None) -> Dict[str, str]:
+        """
+        Translate words, reusing cached translations
+
+        Args:
+            words: Words to translate (duplicates are translated once)
+            progress: Optional callback(done, total) over the words that needed the model
+
+        Returns:
+            Dict mapping each word to its translation; words the model could
+            not translate are left out
+
+        Raises:
+            RuntimeError: If the translation model cannot be loaded
+        """
+        unique = list(dict.fromkeys(w.strip().lower() for w in words if w and w.strip()))
+        if not unique:
+            return {}
+        if not self.load():
+            raise RuntimeError("Translation model is not available")
+
+        translations = self._db.get_cached_translations(unique, self.src, self.tgt, self.model_version)
+        missing = [w for w in unique if w not in translations]
+        if missing:
+            chunks = [missing[i:i + self.batch_size] for i in range(0, len(missing), self.batch_size)]
+            results = self._translate_chunks(chunks)
+
+            done = 0
+            for chunk, translated in zip(chunks, results):
+                # Empty results are cached too, so untranslatable words are not retried
+                self._db.save_cached_translations(list(zip(chunk, translated)), self.src, self.tgt, self.model_version)
+                translations.update(zip(chunk, translated))
+                done += len(chunk)
+                if progress:
+                    progress(done, len(missing))
+
+        return {word: translations[word] for word in unique if translations.get(word)}
+
+    def iter_sentence_translations(self, sentences: Iterable[str]) -> Iterator[Tuple[bool, List[Tuple[str, str]]]]:
+        """
+        Translate sentences, cached ones first
+
+        Sentences are keyed by sentence_hash, so a line repeated across
+        episodes (or differing only in case and spacing) is translated once.
+        Uncached sentences go to the workers in chunks of
+        SENTENCE_BATCH_SIZE and are cached as each chunk finishes.
+
+        Yields:
+            (from_cache, [(sentence, translation), ...]): one batch with every
+            cached sentence, then one per translated chunk in input order.
+            Each distinct sentence appears once; empty translations are included.
+
+        Raises:
+            RuntimeError: If the translation package is not installed
+        """
+        by_hash: Dict[str, str] = {}
+        for sentence in sentences:
+            if sentence and sentence.strip():
+                by_hash.setdefault(sentence_hash(sentence), sentence.strip())
+        if not by_hash:
+            return
+        # Runs under request and job threads: use an installed package, never download one here
+        if not self.load(install=False):
+            raise RuntimeError("Translation model is not installed")
+
+        cached = self._db.get_cached_sentence_translations(list(by_hash), self.src, self.tgt, self.model_version)
+        if cached:
+            yield True, [(by_hash[key], translation) for key, translation in cached.items()]
+
+        missing = [key for key in by_hash if key not in cached]
+        if not missing:
+            return
+        chunks = [missing[i:i + SENTENCE_BATCH_SIZE] for i in range(0, len(missing), SENTENCE_BATCH_SIZE)]
+        texts = [[by_hash[key] for key in chunk] for chunk in chunks]
+        results = self._translate_chunks(texts, sentences=True)
+
+        for chunk, chunk_texts, translated in zip(chunks, texts, results):
+            self._db.save_cached_sentence_translations(
+                list(zip(chunk, chunk_texts, translated)), self.src, self.tgt, self.model_version
+            )
+            yield False, list(zip(chunk_texts, translated))
+
+    def _translate_chunks(self, chunks: Sequence[List[str]], sentences: bool = False) -> Iterator[List[str]]:
+        """
+        Translations of each chunk, in order
+
+        If a worker dies (BrokenProcessPool), the pool is replaced once (see
+        _replace_broken_pool) and the chunks not yet returned are sent again.
+        Each attempt works on the pool or model it started with, so a
+        replacement by another thread does not pull it away mid-call.
+        """
+        done = 0
+        for attempt in range(2):
+            pool, local = self._backend()
+            try:
+                remaining = chunks[done:]
+                if pool is not None:
+                    results = pool.map(_translate_sentence_chunk if sentences else _translate_chunk, remaining)
+                elif local is not None:
+                    length = MAX_SENTENCE_DECODING_LENGTH if sentences else MAX_DECODING_LENGTH
+                    results = (local.translate(chunk, length) for chunk in remaining)
+                else:
+                    raise RuntimeError("Translation model is not loaded")
+                for translated in results:
+                    done += 1
+                    yield translated
+                return
+            except BrokenProcessPool as e:
+                if attempt:
+                    raise RuntimeError("Translation workers crashed") from e
+                print(f"⚠️ Çeviri işlemi çöktü, havuz değiştiriliyor: {e}")
+                self._replace_broken_pool(pool)
+
+    def close(self) -> None:
+        """Stop the workers (at shutdown; translations still running fail)"""
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+            self._local = None
+            self.model_version = None
+
+
+_translation_engine: Optional[TranslationEngine] = None
+
+
+def get_translation_engine(db) -> TranslationEngine:
+    """Get shared translation engine instance"""
+    global _translation_engine
+    if _translation_engine is None:
+        _translation_engine = TranslationEngine(db)
+    return _translation_engine
@@ -0,0 +1,309 @@
+"""
+Vocabulary Index
+In-memory typo-tolerant lookup and prefix autocomplete over the words table,
+rebuilt when the vocabulary changes
+"""
+import time
+import heapq
+import threading
+from bisect import bisect_left
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+MAX_EDIT_DISTANCE = 2
+PREFIX_LENGTH = 7  # SymSpell only indexes deletes of the first PREFIX_LENGTH characters
+VERSION_CHECK_SECONDS = 5.0
+LOOKUP_CACHE_SIZE = 4096  # Recent misspellings; popups repeat the same words
+SUGGEST_LIMIT = 20
+SHORT_PREFIX_LENGTH = 3  # Prefixes up to this length have their top words precomputed
+
+# (suffix, replacement) pairs for mapping inflected forms back to a base form
+_SUFFIX_RULES = (
+    ('ies', 'y'), ('ied', 'y'), ('ing', ''), ('ing', 'e'), ('ed', ''), ('ed', 'e'),
+    ('es', ''), ('s', ''), ('er', ''), ('est', ''), ('ly', ''),
+)
+
+
+def _deletes(word: str, max_distance: int) -> Set[str]:
+    """All strings reachable from word by removing up to max_distance characters"""
+    result: Set[str] = set()
+    frontier = {word}
+    for _ in range(max_distance):
+        following = set()
+        for item in frontier:
+            if len(item) > 1:
+                following.update(item[:i] + item[i + 1:] for i in range(len(item)))
+        following -= result
+        result |= following
+        frontier = following
+    return result
+
+
+def edit_distance(a: str, b: str, max_distance: int) -> int:
+    """
+    Optimal string alignment distance (Damerau-Levenshtein without repeated edits)
+
+    Only the diagonal band of width max_distance is computed; returns
+    max_distance + 1 as soon as the distance is known to exceed it.
+    """
+    if a == b:
+        return 0
+    len_a, len_b = len(a), len(b)
+    if abs(len_a - len_b) > max_distance:
+        return max_distance + 1
+
+    too_far = max_distance + 1
+    previous2: List[int] = []
+    previous = [j if j <= max_distance else too_far for j in range(len_b + 1)]
+    for i in range(1, len_a + 1):
+        current = [too_far] * (len_b + 1)
+        if i <= max_distance:
+            current[0] = i
+        row_min = current[0]
+        char_a = a[i - 1]
+        for j in range(max(1, i - max_distance), min(len_b, i + max_distance) + 1):
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != b[j - 1]))
+            if i > 1 and j > 1 and char_a == b[j - 2] and a[i - 2] == b[j - 1]:
+                value = min(value, previous2[j - 2] + 1)
+            current[j] = value
+            if value < row_min:
+                row_min = value
+        if row_min > max_distance:
+            return too_far
+        previous2, previous = previous, current
+    return min(previous[len_b], too_far)
+
+
+def base_forms(term: str) -> Iterator[str]:
+    """Candidate base forms of an inflected word ("tries" -> "try", "running" -> "run")"""
+    for suffix, replacement in _SUFFIX_RULES:
+        if term.endswith(suffix) and len(term) - len(suffix) >= 2:
+            base = term[:-len(suffix)] + replacement
+            yield base
+            # Doubled final consonant: running -> runn -> run
+            if not replacement and len(base) >= 3 and base[-1] == base[-2] and base[-1] not in 'aeiouls':
+                yield base[:-1]
+
+
+class SymSpellIndex:
+    """
+    Symmetric delete spelling index.
+
+    Every word's prefix is stored under each string obtained by deleting up
+    to max_distance characters from it. A query generates the deletes of its
+    own prefix, so candidates are found with hash lookups only and just a
+    handful need a real edit-distance check.
+    """
+
+    def __init__(self, entries: Iterable[Dict[str, Any]], max_distance: int = MAX_EDIT_DISTANCE,
+                 prefix_length: int = PREFIX_LENGTH):
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+        self.entries: List[Dict[str, Any]] = []
+        self.positions: Dict[str, int] = {}
+        self._deletes: Dict[str, Any] = {}
+        self._cached_lookup = lru_cache(maxsize=LOOKUP_CACHE_SIZE)(self._lookup)
+
+        for entry in entries:
+            word = (entry.get('word') or '').lower()
+            if not word or word in self.positions:
+                continue
+            position = len(self.entries)
+            self.entries.append(entry)
+            self.positions[word] = position
+            if ' ' in word:
+                continue  # Phrases are looked up exactly only
+            prefix = word[:prefix_length]
+            for key in _deletes(prefix, max_distance) | {prefix}:
+                # Most keys have a single word; store a bare int until a second one arrives
+                bucket = self._deletes.get(key)
+                if bucket is None:
+                    self._deletes[key] = position
+                elif isinstance(bucket, int):
+                    self._deletes[key] = [bucket, position]
+                else:
+                    bucket.append(position)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, word: str) -> Optional[Dict[str, Any]]:
+        position = self.positions.get(word.lower())
+        return self.entries[position] if position is not None else None
+
+    def lookup(self, term: str, limit: int = 5) -> List[Dict[str, Any]]:
+        """
+        Exact hit, else base forms of an inflection, else the closest words
+
+        Returns:
+            Entry dicts with distance and match ('exact', 'inflection' or
+            'fuzzy'), best first: lower distance, then higher frequency
+        """
+        term = term.lower().strip()
+        if not term:
+            return []
+        return [
+            dict(self.entries[position], distance=distance, match=match)
+            for position, distance, match in self._cached_lookup(term, limit)
+        ]
+
+    def _lookup(self, term: str, limit: int) -> Tuple[Tuple[int, int, str], ...]:
+        position = self.positions.get(term)
+        if position is not None:
+            return ((position, 0, 'exact'),)
+
+        bases = {self.positions[base] for base in base_forms(term) if base in self.positions}
+        if bases:
+            ranked = sorted(bases, key=lambda p: -(self.entries[p].get('frequency') or 0))
+            return tuple((p, 0, 'inflection') for p in ranked[:limit])
+
+        prefix = term[:self.prefix_length]
+        candidates: Set[int] = set()
+        for key in _deletes(prefix, self.max_distance) | {prefix}:
+            bucket = self._deletes.get(key)
+            if bucket is None:
+                continue
+            if isinstance(bucket, int):
+                candidates.add(bucket)
+            else:
+                candidates.update(bucket)
+
+        matches = []
+        for position in candidates:
+            word = self.entries[position]['word'].lower()
+            if abs(len(word) - len(term)) > self.max_distance:
+                continue
+            distance = edit_distance(term, word, self.max_distance)
+            if distance <= self.max_distance:
+                matches.append((distance, -(self.entries[position].get('frequency') or 0), position))
+        matches.sort()
+        return tuple((position, distance, 'fuzzy') for distance, _, position in matches[:limit])
+
+
+class PrefixIndex:
+    """
+    Sorted word array for prefix autocomplete.
+
+    Words starting with a prefix form one contiguous range, found with two
+    bisects. Short prefixes match thousands of words, so their top
+    SUGGEST_LIMIT by frequency are precomputed; longer prefixes rank their
+    (small) range on the fly.
+    """
+
+    def __init__(self, entries: List[Dict[str, Any]]):
+        self.entries = entries
+        order = sorted(range(len(entries)), key=lambda p: entries[p]['word'].lower())
+        self.words = [entries[p]['word'].lower() for p in order]
+        self.order = order
+        self.frequencies = [entries[p].get('frequency') or 0 for p in range(len(entries))]
+
+        self._top: Dict[str, List[int]] = {}
+        by_frequency = sorted(range(len(entries)), key=lambda p: -self.frequencies[p])
+        for position in by_frequency:
+            word = entries[position]['word'].lower()
+            for length in range(1, min(len(word), SHORT_PREFIX_LENGTH) + 1):
+                top = self._top.setdefault(word[:length], [])
+                if len(top) < SUGGEST_LIMIT:
+                    top.append(position)
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def suggest(self, prefix: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Words starting with prefix, most frequent first
+
+        Returns:
+            Entry dicts (id, word, frequency, level), at most
+            min(limit, SUGGEST_LIMIT)
+        """
+        prefix = prefix.lower().strip()
+        limit = min(limit, SUGGEST_LIMIT)
+        if not prefix or limit < 1:
+            return []
+
+        if len(prefix) <= SHORT_PREFIX_LENGTH:
+            positions = self._top.get(prefix, [])[:limit]
+        else:
+            low = bisect_left(self.words, prefix)
+            high = bisect_left(self.words, prefix + '\uffff', low)
+            positions = heapq.nsmallest(
+                limit, self.order[low:high], key=lambda p: (-self.frequencies[p], self.entries[p]['word'])
+            )
+        return [self.entries[p] for p in positions]
+
+
+class VocabularyIndex:
+    """
+    In-memory indexes over the words table.
+
+    The vocabulary version is checked at most every VERSION_CHECK_SECONDS.
+    The first build blocks; later rebuilds run in a background thread while
+    the previous index keeps answering.
+    """
+
+    def __init__(self, db, check_interval: float = VERSION_CHECK_SECONDS):
+        self._db = db
+        self.check_interval = check_interval
+        self.version: Optional[str] = None
+        self._symspell: Optional[SymSpellIndex] = None
+        self._prefix: Optional[PrefixIndex] = None
+        self._checked = 0.0
+        self._building = False
+        self._lock = threading.Lock()
+
+    def _rebuild(self, version: str) -> None:
+        try:
+            entries = self._db.get_vocabulary_entries()
+            symspell = SymSpellIndex(entries)
+            self._symspell, self._prefix = symspell, PrefixIndex(symspell.entries)
+            self.version = version
+        except Exception as e:
+            print(f"⚠️ Kelime indeksi oluşturulamadı: {e}")
+        finally:
+            self._building = False
+
+    def refresh(self, wait: bool = False) -> None:
+        """Rebuild the indexes if the vocabulary version changed"""
+        with self._lock:
+            self._checked = time.monotonic()
+            version = self._db.get_vocabulary_version()
+            if version == self.version or self._building:
+                return
+            self._building = True
+            if wait or self._symspell is None:
+                self._rebuild(version)
+                return
+        threading.Thread(target=self._rebuild, args=(version,), daemon=True).start()
+
+    def _ensure_fresh(self) -> None:
+        if self._symspell is None or time.monotonic() - self._checked > self.check_interval:
+            self.refresh()
+
+    @property
+    def symspell(self) -> SymSpellIndex:
+        self._ensure_fresh()
+        # Empty index if the first build failed
+        return self._symspell or SymSpellIndex(())
+
+    @property
+    def prefix(self) -> PrefixIndex:
+        self._ensure_fresh()
+        return self._prefix or PrefixIndex([])
+
+    def lookup(self, term: str, limit: int = 5) -> List[Dict[str, Any]]:
+        return self.symspell.lookup(term, limit)
+
+    def suggest(self, prefix: str, limit: int = 10) -> List[Dict[str, Any]]:
+        return self.prefix.suggest(prefix, limit)
+
+
+_vocabulary_index: Optional[VocabularyIndex] = None
+
+
+def get_vocabulary_index(db) -> VocabularyIndex:
+    """Get shared vocabulary index instance"""
+    global _vocabulary_index
+    if _vocabulary_index is None:
+        _vocabulary_index = VocabularyIndex(db)
+    return _vocabulary_index